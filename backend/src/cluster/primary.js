@@ -0,0 +1,50 @@
+/**
+ * Cluster mode: runs WORKERS backend processes, one episode shard each.
+ *
+ * Worker i serves the full app on PORT + i (and SOCKET_PATH.i when
+ * SOCKET_PATH is set) and only owns the episodes whose id hashes to i
+ * (see sharding.js). Episodes live in the worker's memory, so requests for
+ * an episode must reach its worker: ShardedTeamsEnvClient routes by
+ * episode id, and GET /env/load on any worker lists every shard's port.
+ *
+ * Usage: WORKERS=4 npm run start:cluster
+ */
+import cluster from "cluster";
+import os from "os";
+import { fileURLToPath } from "url";
+import { config } from "../config/config.js";
+
+const shardCount = config.workers || os.availableParallelism?.() || os.cpus().length;
+const RESTART_DELAY_MS = 1000;
+let shuttingDown = false;
+
+cluster.setupPrimary({
+  exec: fileURLToPath(new URL("../server.js", import.meta.url)),
+});
+
+function forkWorker(shardIndex) {
+  const worker = cluster.fork({
+    SHARD_INDEX: String(shardIndex),
+    SHARD_COUNT: String(shardCount),
+  });
+  worker.on("exit", (code, signal) => {
+    if (shuttingDown) return;
+    // The shard's episodes are lost with the process; bring the port back
+    console.error(
+      `⚠️  Shard ${shardIndex} (pid ${worker.process.pid}) exited (${signal || code}), restarting`
+    );
+    setTimeout(() => forkWorker(shardIndex), RESTART_DELAY_MS);
+  });
+}
+
+for (const signal of ["SIGINT", "SIGTERM"]) {
+  process.once(signal, () => {
+    shuttingDown = true;
+    for (const worker of Object.values(cluster.workers)) worker.kill(signal);
+  });
+}
+
+console.log(
+  `🧩 Cluster mode: ${shardCount} shards on ports ${config.port}-${config.port + shardCount - 1}`
+);
+for (let i = 0; i < shardCount; i++) forkWorker(i);
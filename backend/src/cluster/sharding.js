@@ -0,0 +1,37 @@
+import zlib from "zlib";
+import { v4 as uuidv4 } from "uuid";
+
+// CRC-32 (IEEE), the same checksum as Python's zlib.crc32; zlib.crc32 is
+// built in from Node 20.15 / 22.2, older versions use the table below
+const CRC_TABLE = Array.from({ length: 256 }, (_, n) => {
+  let c = n;
+  for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+  return c >>> 0;
+});
+
+function crc32(text) {
+  if (zlib.crc32) return zlib.crc32(text);
+  let crc = 0xffffffff;
+  for (const byte of Buffer.from(text, "utf8")) {
+    crc = CRC_TABLE[(crc ^ byte) & 0xff] ^ (crc >>> 8);
+  }
+  return (crc ^ 0xffffffff) >>> 0;
+}
+
+/**
+ * Shard that owns an episode: crc32(episodeId) % shardCount.
+ * Clients route with the same function (python_agent/sharded_client.py).
+ */
+export function shardFor(episodeId, shardCount) {
+  return crc32(episodeId) % shardCount;
+}
+
+/**
+ * Random episode id that hashes to the given shard (about shardCount tries)
+ */
+export function shardEpisodeId(shardIndex, shardCount) {
+  for (;;) {
+    const episodeId = uuidv4();
+    if (shardFor(episodeId, shardCount) === shardIndex) return episodeId;
+  }
+}
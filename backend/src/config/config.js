@@ -1,5 +1,32 @@
 export const config = {
-  port: process.env.PORT || 3001,
+  port: parseInt(process.env.PORT) || 3001,
+  // Optional Unix domain socket for agents on the same host (HTTP API only)
+  socketPath: process.env.SOCKET_PATH || null,
+  // Octal permissions for the socket file, e.g. "660" (default: process umask)
+  socketMode: process.env.SOCKET_MODE ? parseInt(process.env.SOCKET_MODE, 8) : null,
+  // Cluster mode (src/cluster/primary.js): number of shard workers (0 = one per core)
+  workers: parseInt(process.env.WORKERS) || 0,
+  // Set by the cluster primary for each worker; a standalone server is shard 0 of 1
+  shard: {
+    index: parseInt(process.env.SHARD_INDEX) || 0,
+    count: parseInt(process.env.SHARD_COUNT) || 1,
+  },
+  // Reject RL calls that name no episode (episodeId or session token) instead
+  // of using the most recently reset one; set when several clients share a server
+  requireEpisode: process.env.ENV_REQUIRE_EPISODE === "true",
+  // Bounded episode store (models/episodeStore.js)
+  episodeStore: {
+    // Episodes held in full, live and finished
+    maxEpisodes: parseInt(process.env.ENV_MAX_EPISODES) || 10000,
+    // Estimated memory for those episodes
+    maxBytes: (parseInt(process.env.ENV_MAX_EPISODE_MEMORY_MB) || 512) * 1024 * 1024,
+    // Finished episodes are compacted to their summary after this idle time
+    finishedTtlMs: (parseInt(process.env.ENV_FINISHED_EPISODE_TTL_S) || 60) * 1000,
+    // Unfinished episodes idle this long are treated as abandoned and dropped
+    idleTtlMs: (parseInt(process.env.ENV_IDLE_EPISODE_TTL_S) || 3600) * 1000,
+    // Summaries kept for /env/history
+    maxHistory: parseInt(process.env.ENV_MAX_HISTORY) || 10000,
+  },
   corsOrigin: process.env.CORS_ORIGIN || "http://localhost:5173",
   nodeEnv: process.env.NODE_ENV || "development",
 };
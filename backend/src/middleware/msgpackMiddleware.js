@@ -0,0 +1,44 @@
+import express from "express";
+import { encode, decode } from "@msgpack/msgpack";
+
+export const MSGPACK_TYPES = ["application/msgpack", "application/x-msgpack"];
+
+/**
+ * Parse MessagePack request bodies into req.body.
+ * JSON bodies are left to express.json().
+ */
+export const msgpackBodyParser = [
+  express.raw({ type: MSGPACK_TYPES, limit: "10mb" }),
+  (req, res, next) => {
+    if (!Buffer.isBuffer(req.body)) return next();
+
+    try {
+      req.body = req.body.length > 0 ? decode(req.body) : {};
+      next();
+    } catch (error) {
+      res.status(400).json({
+        success: false,
+        error: "Invalid MessagePack body",
+      });
+    }
+  },
+];
+
+/**
+ * Content negotiation for responses.
+ * When the Accept header prefers MessagePack, res.json() sends a MessagePack
+ * body instead; JSON remains the default for every other client.
+ */
+export const negotiateFormat = (req, res, next) => {
+  res.vary("Accept");
+
+  const format = req.accepts(["application/json", ...MSGPACK_TYPES]);
+  if (MSGPACK_TYPES.includes(format)) {
+    res.json = (body) => {
+      res.type(format);
+      return res.send(Buffer.from(encode(body, { ignoreUndefined: true })));
+    };
+  }
+
+  next();
+};
@@ -0,0 +1,19 @@
+/**
+ * Report handler time in a Server-Timing header ("app;dur=<ms>"), so clients
+ * can tell server compute apart from network time.
+ * Must run after any middleware that replaces res.json (e.g. negotiateFormat).
+ */
+export const serverTiming = (req, res, next) => {
+  const start = process.hrtime.bigint();
+  const json = res.json.bind(res);
+
+  res.json = (body) => {
+    if (!res.headersSent) {
+      const ms = Number(process.hrtime.bigint() - start) / 1e6;
+      res.set("Server-Timing", `app;dur=${ms.toFixed(3)}`);
+    }
+    return json(body);
+  };
+
+  next();
+};
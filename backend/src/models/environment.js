@@ -1,4 +1,49 @@
+import { randomBytes } from "crypto";
 import { v4 as uuidv4 } from "uuid";
+import { EpisodeStore } from "./episodeStore.js";
+import { config } from "../config/config.js";
+
+// Observation sections that can be sent independently in delta mode, or
+// selected with getState's `fields`
+export const STATE_SECTIONS = [
+  "agentState",
+  "currentChannel",
+  "recentMessages",
+  "teams",
+  "users",
+  "stats",
+  "task",
+];
+
+/**
+ * Parse a state field selection ("stats,agentState", or an array of names)
+ * into `fields` for getState (null: every section) and the names that are
+ * not observation sections
+ */
+export function parseStateFields(value) {
+  if (value === undefined || value === null || value === "") {
+    return { fields: null, unknown: [] };
+  }
+  const names = (Array.isArray(value) ? value : String(value).split(","))
+    .map((name) => String(name).trim())
+    .filter(Boolean);
+  return {
+    fields: STATE_SECTIONS.filter((section) => names.includes(section)),
+    unknown: names.filter((name) => !STATE_SECTIONS.includes(name)),
+  };
+}
+
+/**
+ * Error for requests that name no episode, or one they may not use.
+ * `status` is the HTTP status the routes answer with.
+ */
+export class EpisodeScopeError extends Error {
+  constructor(message, status) {
+    super(message);
+    this.name = "EpisodeScopeError";
+    this.status = status;
+  }
+}
 
 /**
  * RL Environment State Management
@@ -6,10 +51,35 @@ import { v4 as uuidv4 } from "uuid";
  * Supports multiple episodes, task-based goals, and sophisticated reward structures
  */
 class Environment {
-  constructor() {
-    this.episodes = new Map(); // episodeId -> episode data
-    this.currentEpisodeId = null;
-    this.episodeHistory = []; // completed episodes
+  /**
+   * @param {object} options.episodeStore - EpisodeStore limits (maxEpisodes,
+   *   maxBytes, finishedTtlMs, idleTtlMs, maxHistory)
+   */
+  constructor(options = {}) {
+    // episodeId -> episode data; finished episodes are compacted to their
+    // history summary after a TTL or under memory pressure
+    this.episodes = new EpisodeStore({
+      ...options.episodeStore,
+      onEvict: (episode) => {
+        // A compacted episode keeps its token until its summary is dropped,
+        // so calls by token get the same 410 as calls by id
+        if (this.episodes.getSummary(episode.id)) {
+          this.compactedTokens.set(episode.id, episode.sessionToken);
+        } else {
+          this.sessions.delete(episode.sessionToken);
+        }
+      },
+      onForget: (episodeId) => this.dropCompactedToken(episodeId),
+    });
+    this.currentEpisodeId = null; // most recent reset; fallback for unscoped calls
+    this.sessions = new Map(); // sessionToken -> episodeId
+    this.compactedTokens = new Map(); // episodeId -> sessionToken, compacted episodes
+    // Reject calls that name neither an episodeId nor a session token instead
+    // of falling back to the most recently reset episode (ENV_REQUIRE_EPISODE)
+    this.requireEpisode = false;
+    // Id for resets without an episodeId; cluster workers replace it so the
+    // id hashes to their own shard
+    this.newEpisodeId = () => uuidv4();
     this.taskDefinitions = this.initializeTaskDefinitions();
   }
 
@@ -90,8 +160,12 @@ class Environment {
    * Reset environment and start new episode
    */
   reset(config = {}) {
-    const episodeId = config.episodeId || uuidv4();
+    const episodeId = config.episodeId || this.newEpisodeId();
     const taskType = config.taskType || this.selectRandomTask();
+    // Checked before anything is stored, so a bad request leaves no episode
+    if (!Object.hasOwn(this.taskDefinitions, taskType)) {
+      throw Object.assign(new Error(`Unknown task type: ${taskType}`), { status: 400 });
+    }
 
     const episode = {
       id: episodeId,
@@ -153,23 +227,46 @@ class Environment {
       },
       actionHistory: [],
       done: false,
+      // Observation version, bumped on every step; sectionVersions records
+      // the version at which each observation section last changed, and
+      // messageVersions (parallel to messages) the version each message was
+      // added at. recentMessages is only marked changed when the window
+      // moves (channel switch) or an old message gets a reaction; plain
+      // appends are found through messageVersions.
+      version: 0,
+      sectionVersions: Object.fromEntries(STATE_SECTIONS.map((s) => [s, 0])),
+      messageVersions: {},
+      // Lookup indexes so steps do not scan teams or message history:
+      // channelId -> { channel, team } and messageId -> message. Channels are
+      // fixed per episode; messages are indexed by addMessageToEpisode.
+      channelsById: new Map(),
+      messagesById: new Map(),
     };
 
     // Initialize message arrays for each channel
     episode.teams.forEach((team) => {
       team.channels.forEach((channel) => {
         episode.messages[channel.id] = [];
+        episode.channelsById.set(channel.id, { channel, team });
       });
     });
 
     // Add initial contextual messages based on task
     this.initializeTaskContext(episode);
 
+    const previous = this.episodes.get(episodeId);
+    // Resetting an existing id invalidates the token of its previous run,
+    // also when that run was compacted
+    if (previous) this.sessions.delete(previous.sessionToken);
+    this.dropCompactedToken(episodeId);
+    episode.sessionToken = randomBytes(16).toString("hex");
+    this.sessions.set(episode.sessionToken, episodeId);
     this.episodes.set(episodeId, episode);
     this.currentEpisodeId = episodeId;
 
     return {
       episodeId,
+      sessionToken: episode.sessionToken,
       state: this.getState(episodeId),
       task: {
         type: taskType,
@@ -276,67 +373,228 @@ class Environment {
     }
   }
 
+  /**
+   * Resolve the episode a call is scoped to.
+   * A session token names the run started by one reset; given together with
+   * an episodeId it must belong to that episode's latest reset, so a client
+   * notices when someone else has reset "its" episode id. Calls with neither
+   * fall back to the most recently reset episode unless requireEpisode is set
+   * (then they fail, or resolve to null when `optional`).
+   */
+  resolveEpisodeId({ episodeId = null, sessionToken = null, optional = false } = {}) {
+    if (sessionToken) {
+      const tokenEpisodeId = this.sessions.get(sessionToken);
+      if (episodeId && episodeId !== tokenEpisodeId) {
+        if (!this.episodes.has(episodeId)) {
+          throw new EpisodeScopeError("Episode not found", 404);
+        }
+        throw new EpisodeScopeError(
+          "Session token is not valid for this episode (it may have been reset by another session)",
+          409
+        );
+      }
+      if (!tokenEpisodeId) {
+        throw new EpisodeScopeError("Invalid or expired session token", 401);
+      }
+      return tokenEpisodeId;
+    }
+    if (episodeId) return episodeId;
+    if (this.requireEpisode) {
+      if (optional) return null;
+      throw new EpisodeScopeError("Missing episodeId or session token", 400);
+    }
+    return this.currentEpisodeId;
+  }
+
+  /**
+   * Forget the session token kept for a compacted episode
+   */
+  dropCompactedToken(episodeId) {
+    const token = this.compactedTokens.get(episodeId);
+    if (token === undefined) return;
+    this.sessions.delete(token);
+    this.compactedTokens.delete(episodeId);
+  }
+
+  /**
+   * Error for an id the store no longer (or never) held
+   */
+  missingEpisodeError(episodeId) {
+    if (this.episodes.getSummary(episodeId)) {
+      return new EpisodeScopeError(
+        "Episode finished and was compacted to its summary (see /env/info)",
+        410
+      );
+    }
+    return new Error("No active episode found");
+  }
+
   /**
    * Get current environment state (observation)
+   * `fields` (observation section names) builds only those sections;
+   * episodeId, version and timestamp are always included
    */
-  getState(episodeId = null) {
-    const id = episodeId || this.currentEpisodeId;
+  getState(episodeId = null, fields = null) {
+    const id = this.resolveEpisodeId({ episodeId });
     const episode = this.episodes.get(id);
 
     if (!episode) {
-      throw new Error("No active episode found");
+      throw this.missingEpisodeError(id);
     }
 
-    const currentChannel = this.getCurrentChannel(episode);
-    const recentMessages =
-      episode.messages[episode.agentState.currentChannelId].slice(-10);
+    const state = {
+      episodeId: episode.id,
+      version: episode.version,
+    };
+    for (const section of fields || STATE_SECTIONS) {
+      state[section] = this.buildStateSection(episode, section);
+    }
+    state.timestamp = Date.now();
+    return state;
+  }
 
-    return {
+  /**
+   * Get an episode's statistics without building the observation
+   */
+  getStats(episodeId = null) {
+    const id = this.resolveEpisodeId({ episodeId });
+    const episode = this.episodes.get(id);
+
+    if (!episode) {
+      throw this.missingEpisodeError(id);
+    }
+
+    return { ...episode.stats };
+  }
+
+  /**
+   * Build one section of the observation
+   */
+  buildStateSection(episode, section) {
+    switch (section) {
+      case "agentState":
+        return { ...episode.agentState };
+      case "currentChannel":
+        return this.getCurrentChannel(episode);
+      case "recentMessages":
+        return episode.messages[episode.agentState.currentChannelId].slice(-10);
+      case "teams":
+        return episode.teams;
+      case "users":
+        return episode.users;
+      case "stats":
+        return { ...episode.stats };
+      case "task":
+        return {
+          type: episode.taskType,
+          name: episode.task.name,
+          description: episode.task.description,
+          maxSteps: episode.task.maxSteps,
+          completed: episode.stats.taskCompleted,
+        };
+      default:
+        return undefined;
+    }
+  }
+
+  /**
+   * Get only the observation sections that changed after baseVersion.
+   * The client applies `changed` on top of the full state it holds for
+   * baseVersion to rebuild the current observation.
+   */
+  getStateDelta(episodeId, baseVersion) {
+    const id = this.resolveEpisodeId({ episodeId });
+    const episode = this.episodes.get(id);
+
+    if (!episode) {
+      throw this.missingEpisodeError(id);
+    }
+
+    // Unknown or future base: send every section
+    const base =
+      Number.isInteger(baseVersion) && baseVersion <= episode.version
+        ? baseVersion
+        : -1;
+
+    const changed = {};
+    for (const section of STATE_SECTIONS) {
+      if (section === "recentMessages") continue;
+      if (episode.sectionVersions[section] > base) {
+        changed[section] = this.buildStateSection(episode, section);
+      }
+    }
+
+    const delta = {
       episodeId: episode.id,
-      agentState: { ...episode.agentState },
-      currentChannel,
-      recentMessages,
-      teams: episode.teams,
-      users: episode.users,
-      stats: { ...episode.stats },
-      task: {
-        type: episode.taskType,
-        name: episode.task.name,
-        description: episode.task.description,
-        maxSteps: episode.task.maxSteps,
-        completed: episode.stats.taskCompleted,
-      },
+      version: episode.version,
+      baseVersion: base,
+      changed,
       timestamp: Date.now(),
     };
+
+    // Messages only appended since base: send just the new ones
+    const channelId = episode.agentState.currentChannelId;
+    const versions = episode.messageVersions[channelId] || [];
+    let appended = 0;
+    while (
+      appended < versions.length &&
+      versions[versions.length - 1 - appended] > base
+    ) {
+      appended++;
+    }
+
+    if (episode.sectionVersions.recentMessages > base || appended >= 10) {
+      changed.recentMessages = this.buildStateSection(episode, "recentMessages");
+    } else if (appended > 0) {
+      delta.appendedMessages = episode.messages[channelId].slice(-appended);
+    }
+
+    return delta;
+  }
+
+  /**
+   * Record that observation sections changed in the current step
+   */
+  markChanged(episode, ...sections) {
+    for (const section of sections) {
+      episode.sectionVersions[section] = episode.version;
+    }
+  }
+
+  /**
+   * Build the observation returned by step: a delta when the caller passed
+   * the version it already holds, the full state otherwise
+   */
+  buildStepObservation(episodeId, options) {
+    if (options.baseVersion !== undefined && options.baseVersion !== null) {
+      return { stateDelta: this.getStateDelta(episodeId, options.baseVersion) };
+    }
+    return { state: this.getState(episodeId) };
   }
 
   /**
    * Get current channel for an episode
    */
   getCurrentChannel(episode) {
-    for (const team of episode.teams) {
-      const channel = team.channels.find(
-        (ch) => ch.id === episode.agentState.currentChannelId
-      );
-      if (channel) return channel;
-    }
-    return null;
+    const entry = episode.channelsById.get(episode.agentState.currentChannelId);
+    return entry ? entry.channel : null;
   }
 
   /**
    * Execute an action and return new state + reward
+   * Pass options.baseVersion to receive a stateDelta instead of the full state
    */
-  step(action, episodeId = null) {
-    const id = episodeId || this.currentEpisodeId;
+  step(action, episodeId = null, options = {}) {
+    const id = this.resolveEpisodeId({ episodeId });
     const episode = this.episodes.get(id);
 
     if (!episode) {
-      throw new Error("No active episode found");
+      throw this.missingEpisodeError(id);
     }
 
     if (episode.done) {
       return {
-        state: this.getState(id),
+        ...this.buildStepObservation(id, options),
         reward: 0,
         done: true,
         info: { error: "Episode already completed" },
@@ -344,6 +602,8 @@ class Environment {
     }
 
     episode.stats.stepCount++;
+    episode.version++;
+    this.markChanged(episode, "stats");
     let reward = 0;
     let info = {};
 
@@ -402,6 +662,7 @@ class Environment {
       episode.stats.totalReward += episode.task.reward;
       info.taskCompleted = true;
       info.taskReward = episode.task.reward;
+      this.markChanged(episode, "task");
     }
 
     // Episode termination conditions
@@ -409,18 +670,25 @@ class Environment {
 
     if (episode.done) {
       episode.endTime = Date.now();
-      this.episodeHistory.push({
+      this.episodes.finish(id, {
         id: episode.id,
         taskType: episode.taskType,
         completed: episode.stats.taskCompleted,
         totalReward: episode.stats.totalReward,
         steps: episode.stats.stepCount,
         duration: episode.endTime - episode.startTime,
+        endTime: episode.endTime,
       });
+    } else {
+      this.episodes.touch(id);
     }
 
-    const state = this.getState(id);
-    return { state, reward, done: episode.done, info };
+    return {
+      ...this.buildStepObservation(id, options),
+      reward,
+      done: episode.done,
+      info,
+    };
   }
 
   /**
@@ -515,28 +783,23 @@ class Environment {
     }
 
     // Validate channel exists
-    let channelExists = false;
-    for (const team of episode.teams) {
-      const channel = team.channels.find((ch) => ch.id === channelId);
-      if (channel) {
-        channelExists = true;
-        episode.agentState.currentTeamId = team.id;
-        // Clear unread for this channel
-        channel.unread = 0;
-        break;
-      }
-    }
-
-    if (!channelExists) {
+    const entry = episode.channelsById.get(channelId);
+    if (!entry) {
       return -0.3;
     }
 
+    episode.agentState.currentTeamId = entry.team.id;
+    // Clear unread for this channel
+    entry.channel.unread = 0;
+    this.markChanged(episode, "agentState", "teams", "currentChannel");
+
     if (channelId === episode.agentState.currentChannelId) {
       return -0.1; // Already in this channel
     }
 
     episode.agentState.currentChannelId = channelId;
     episode.stats.channelsSwitched++;
+    this.markChanged(episode, "recentMessages");
 
     // Reward for exploring new channels
     return 0.05;
@@ -553,28 +816,22 @@ class Environment {
     }
 
     // Find the message
-    let messageFound = false;
-    for (const channelId in episode.messages) {
-      const message = episode.messages[channelId].find(
-        (msg) => msg.id === messageId
-      );
-      if (message) {
-        if (!message.reactions) {
-          message.reactions = [];
-        }
-        message.reactions.push({
-          userId: episode.agentState.userId,
-          reaction,
-          timestamp: Date.now(),
-        });
-        messageFound = true;
-        episode.stats.reactionsGiven++;
-        break;
-      }
+    const message = episode.messagesById.get(messageId);
+    if (!message) {
+      return -0.2; // Message not found
     }
 
-    if (!messageFound) {
-      return -0.2; // Message not found
+    if (!message.reactions) {
+      message.reactions = [];
+    }
+    message.reactions.push({
+      userId: episode.agentState.userId,
+      reaction,
+      timestamp: Date.now(),
+    });
+    episode.stats.reactionsGiven++;
+    if (message.channelId === episode.agentState.currentChannelId) {
+      this.markChanged(episode, "recentMessages");
     }
 
     return 0.05; // Small reward for engagement
@@ -619,6 +876,7 @@ class Environment {
     const agent = episode.users.find((u) => u.id === episode.agentState.userId);
     if (agent) {
       agent.status = status;
+      this.markChanged(episode, "users");
     }
 
     return 0.02; // Small reward
@@ -642,22 +900,27 @@ class Environment {
     }
 
     episode.messages[channelId].push(message);
+    if (!episode.messageVersions[channelId]) {
+      episode.messageVersions[channelId] = [];
+    }
+    episode.messageVersions[channelId].push(episode.version);
+    episode.messagesById.set(message.id, message);
 
     // Update unread count for other channels
-    for (const team of episode.teams) {
-      const channel = team.channels.find((ch) => ch.id === channelId);
-      if (channel && channelId !== episode.agentState.currentChannelId) {
-        channel.unread++;
-      }
+    const entry = episode.channelsById.get(channelId);
+    if (entry && channelId !== episode.agentState.currentChannelId) {
+      entry.channel.unread++;
+      this.markChanged(episode, "teams");
     }
 
     return message;
   }
 
   /**
-   * Get available actions
+   * Get available actions and the channels of an episode
    */
-  getAvailableActions() {
+  getAvailableActions(episodeId = null) {
+    const episode = this.episodes.get(this.resolveEpisodeId({ episodeId }));
     return {
       actions: [
         {
@@ -719,7 +982,7 @@ class Environment {
         },
       ],
       channels:
-        this.episodes.get(this.currentEpisodeId)?.teams.flatMap((team) =>
+        episode?.teams.flatMap((team) =>
           team.channels.map((ch) => ({
             id: ch.id,
             name: ch.name,
@@ -735,7 +998,9 @@ class Environment {
   getEpisodeInfo(episodeId) {
     const episode = this.episodes.get(episodeId);
     if (!episode) {
-      return null;
+      // Finished and compacted: only the summary record is left
+      const summary = this.episodes.getSummary(episodeId);
+      return summary ? { ...summary, done: true, compacted: true } : null;
     }
 
     return {
@@ -754,10 +1019,28 @@ class Environment {
   }
 
   /**
-   * Get episode history
+   * Episode counts, used to balance new episodes across cluster shards
+   */
+  getLoad() {
+    return {
+      activeEpisodes: this.episodes.live.size,
+      episodes: this.episodes.size,
+      completedEpisodes: this.episodes.completedEpisodes,
+    };
+  }
+
+  /**
+   * Episode store occupancy, limits and eviction counters
+   */
+  getStoreStats() {
+    return this.episodes.stats();
+  }
+
+  /**
+   * Get episode history (the most recent maxHistory finished episodes)
    */
   getHistory(limit = 10) {
-    return this.episodeHistory.slice(-limit);
+    return this.episodes.history(limit);
   }
 
   /**
@@ -775,5 +1058,5 @@ class Environment {
 }
 
 // Singleton instance
-export const environment = new Environment();
+export const environment = new Environment({ episodeStore: config.episodeStore });
 export default Environment;
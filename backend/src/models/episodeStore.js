@@ -0,0 +1,226 @@
+// Rough per-episode memory estimate (bytes): fixed structures (teams,
+// users, stats, delta bookkeeping) plus what grows while the episode runs
+const EPISODE_BASE_BYTES = 4096;
+const MESSAGE_BYTES = 400;
+const ACTION_BYTES = 200;
+
+/**
+ * Bounded episode store
+ *
+ * Holds the full state of live and recently finished episodes in two maps
+ * kept in least-recently-used order (Map insertion order, refreshed by
+ * set/touch). Finished episodes are compacted to their summary record once
+ * they have been idle for finishedTtlMs, or earlier when the store is over
+ * maxEpisodes or maxBytes. Unfinished episodes are only evicted when they
+ * have been idle for idleTtlMs (abandoned), or when there are no finished
+ * episodes left to make room. Summaries go to a history capped at maxHistory.
+ *
+ * Expired entries are swept on every write, oldest first, so there is no
+ * timer and a sweep stops at the first entry that has not expired.
+ */
+export class EpisodeStore {
+  constructor({
+    maxEpisodes = 10000,
+    maxBytes = 512 * 1024 * 1024,
+    finishedTtlMs = 60 * 1000,
+    idleTtlMs = 60 * 60 * 1000,
+    maxHistory = 10000,
+    onEvict = null,
+    onForget = null,
+    now = Date.now,
+  } = {}) {
+    this.maxEpisodes = maxEpisodes;
+    this.maxBytes = maxBytes;
+    this.finishedTtlMs = finishedTtlMs;
+    this.idleTtlMs = idleTtlMs;
+    this.maxHistory = maxHistory;
+    this.onEvict = onEvict; // (episode, reason) after an episode is dropped
+    this.onForget = onForget; // (episodeId) after its summary leaves the history
+    this.now = now;
+
+    this.live = new Map(); // episodeId -> { episode, lastAccess, bytes }
+    this.finished = new Map();
+    this.summaries = new Map(); // episodeId -> summary record, oldest first
+    this.bytes = 0;
+    this.completedEpisodes = 0;
+    this.evictions = { finished: 0, active: 0, ttl: 0, capacity: 0, memory: 0 };
+  }
+
+  get size() {
+    return this.live.size + this.finished.size;
+  }
+
+  get(episodeId) {
+    const entry = this.live.get(episodeId) || this.finished.get(episodeId);
+    return entry ? entry.episode : undefined;
+  }
+
+  has(episodeId) {
+    return this.live.has(episodeId) || this.finished.has(episodeId);
+  }
+
+  /**
+   * Compacted summary of a finished episode that is no longer held in full
+   */
+  getSummary(episodeId) {
+    return this.summaries.get(episodeId);
+  }
+
+  /**
+   * Add (or replace) a live episode
+   */
+  set(episodeId, episode) {
+    this.remove(episodeId);
+    this.insert(this.live, episodeId, episode);
+    this.enforceLimits(episodeId);
+  }
+
+  /**
+   * Mark an episode as used: refreshes its LRU position and size estimate.
+   * Called on every step, so only the memory cap is checked here; expiry
+   * and the episode cap are enforced when episodes are added or finish.
+   */
+  touch(episodeId) {
+    const map = this.live.has(episodeId) ? this.live : this.finished;
+    const entry = map.get(episodeId);
+    if (!entry) return;
+    map.delete(episodeId);
+    map.set(episodeId, entry);
+    entry.lastAccess = this.now();
+    const bytes = estimateEpisodeBytes(entry.episode);
+    this.bytes += bytes - entry.bytes;
+    entry.bytes = bytes;
+    if (this.bytes > this.maxBytes) this.enforceLimits(episodeId);
+  }
+
+  /**
+   * Move a live episode to the finished set and record its summary
+   */
+  finish(episodeId, summary) {
+    const entry = this.live.get(episodeId);
+    if (entry) {
+      this.live.delete(episodeId);
+      this.bytes -= entry.bytes;
+      this.insert(this.finished, episodeId, entry.episode);
+    }
+    this.completedEpisodes++;
+    this.summaries.delete(episodeId);
+    this.summaries.set(episodeId, summary);
+    if (this.summaries.size > this.maxHistory) {
+      const oldestId = this.summaries.keys().next().value;
+      this.summaries.delete(oldestId);
+      if (this.onForget) this.onForget(oldestId);
+    }
+    // The caller still builds the final step's observation from this episode
+    this.enforceLimits(episodeId);
+  }
+
+  /**
+   * Most recent summaries, oldest first
+   */
+  history(limit = 10) {
+    const summaries = Array.from(this.summaries.values());
+    return limit > 0 ? summaries.slice(-limit) : summaries;
+  }
+
+  insert(map, episodeId, episode) {
+    const bytes = estimateEpisodeBytes(episode);
+    map.set(episodeId, { episode, lastAccess: this.now(), bytes });
+    this.bytes += bytes;
+  }
+
+  remove(episodeId) {
+    const map = this.live.has(episodeId) ? this.live : this.finished;
+    const entry = map.get(episodeId);
+    if (entry) {
+      map.delete(episodeId);
+      this.bytes -= entry.bytes;
+    }
+    return entry;
+  }
+
+  evict(map, episodeId, reason) {
+    const { episode } = this.remove(episodeId);
+    this.evictions[map === this.live ? "active" : "finished"]++;
+    this.evictions[reason]++;
+    if (this.onEvict) this.onEvict(episode, reason);
+  }
+
+  /**
+   * Sweep expired episodes, then evict until the store is within its caps.
+   * `keepId` (the episode just written) is never evicted, even if it alone
+   * is over a cap.
+   */
+  enforceLimits(keepId = null) {
+    const now = this.now();
+    for (const [map, ttl] of [
+      [this.finished, this.finishedTtlMs],
+      [this.live, this.idleTtlMs],
+    ]) {
+      for (const [episodeId, entry] of map) {
+        if (episodeId === keepId) continue;
+        if (now - entry.lastAccess < ttl) break;
+        this.evict(map, episodeId, "ttl");
+      }
+    }
+
+    while (this.size > this.maxEpisodes || this.bytes > this.maxBytes) {
+      const reason = this.size > this.maxEpisodes ? "capacity" : "memory";
+      // Least recently used finished episode first, then live
+      const finishedId = oldestExcept(this.finished, keepId);
+      const map = finishedId !== undefined ? this.finished : this.live;
+      const episodeId = finishedId ?? oldestExcept(this.live, keepId);
+      if (episodeId === undefined) break;
+      this.evict(map, episodeId, reason);
+    }
+  }
+
+  /**
+   * Occupancy, limits and eviction counters
+   */
+  stats() {
+    return {
+      liveEpisodes: this.live.size,
+      finishedEpisodes: this.finished.size,
+      estimatedBytes: this.bytes,
+      historySize: this.summaries.size,
+      completedEpisodes: this.completedEpisodes,
+      evictions: {
+        total: this.evictions.finished + this.evictions.active,
+        ...this.evictions,
+      },
+      limits: {
+        maxEpisodes: this.maxEpisodes,
+        maxBytes: this.maxBytes,
+        finishedTtlMs: this.finishedTtlMs,
+        idleTtlMs: this.idleTtlMs,
+        maxHistory: this.maxHistory,
+      },
+    };
+  }
+}
+
+/**
+ * Least recently used key of an LRU map, skipping `keepId`
+ */
+function oldestExcept(map, keepId) {
+  for (const episodeId of map.keys()) {
+    if (episodeId !== keepId) return episodeId;
+  }
+  return undefined;
+}
+
+/**
+ * Approximate memory held by one episode
+ */
+export function estimateEpisodeBytes(episode) {
+  let messages = 0;
+  for (const channelMessages of Object.values(episode.messages || {})) {
+    messages += channelMessages.length;
+  }
+  return (
+    EPISODE_BASE_BYTES +
+    messages * MESSAGE_BYTES +
+    (episode.actionHistory?.length || 0) * ACTION_BYTES
+  );
+}
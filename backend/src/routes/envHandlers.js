@@ -0,0 +1,380 @@
+import {
+  environment,
+  parseStateFields,
+  STATE_SECTIONS,
+} from "../models/environment.js";
+import { config } from "../config/config.js";
+
+/**
+ * Handlers of the /env RL routes. They only use req.method, req.params,
+ * req.query, req.body and req.get() and answer with res.status().json(), so
+ * they run without express; routes/env.js mounts them behind its middleware.
+ */
+
+// Upper bound on items per batch request, so one call cannot stall the server
+const MAX_BATCH_SIZE = parseInt(process.env.ENV_MAX_BATCH_SIZE) || 1024;
+
+// Header carrying the session token issued by /env/reset
+const SESSION_TOKEN_HEADER = "X-Session-Token";
+
+/**
+ * Episode a request is scoped to: the :episodeId path parameter, or
+ * episodeId / sessionToken from the query (GET) or body, or the
+ * X-Session-Token header. Throws EpisodeScopeError (with .status) when the
+ * token does not match or, with ENV_REQUIRE_EPISODE, nothing names an
+ * episode (unless `optional`, which resolves to null instead).
+ */
+function resolveEpisode(req, { optional = false } = {}) {
+  const source = (req.method === "GET" ? req.query : req.body) || {};
+  return environment.resolveEpisodeId({
+    episodeId: req.params.episodeId || source.episodeId || null,
+    sessionToken: source.sessionToken || req.get(SESSION_TOKEN_HEADER) || null,
+    optional,
+  });
+}
+
+/**
+ * Validate a batch request body and return its items, or send a 4xx response
+ */
+function getBatchItems(req, res) {
+  const { items } = req.body || {};
+
+  if (!Array.isArray(items)) {
+    res.status(400).json({
+      success: false,
+      error: "Invalid batch format. Expected: { items: [...] }",
+    });
+    return null;
+  }
+
+  if (items.length > MAX_BATCH_SIZE) {
+    res.status(413).json({
+      success: false,
+      error: `Batch too large: ${items.length} items (max ${MAX_BATCH_SIZE})`,
+    });
+    return null;
+  }
+
+  return items;
+}
+
+/**
+ * Parse the ?fields= selection of a state request, or send a 400 for unknown
+ * names. Returns the sections to build (null: all), or false after an error.
+ */
+function getStateFields(req, res) {
+  const { fields, unknown } = parseStateFields(req.query.fields);
+  if (unknown.length > 0) {
+    res.status(400).json({
+      success: false,
+      error: `Unknown state fields: ${unknown.join(", ")} (expected: ${STATE_SECTIONS.join(", ")})`,
+    });
+    return false;
+  }
+  return fields;
+}
+
+/**
+ * POST /env/reset
+ * Reset the environment to initial state and start a new episode
+ * Body: { episodeId?: string, taskType?: string }
+ * Returns the episodeId and a sessionToken that scopes later calls to this
+ * run of the episode (see resolveEpisode)
+ */
+function reset(req, res) {
+  try {
+    const config = req.body || {};
+    const result = environment.reset(config);
+    res.json({
+      success: true,
+      ...result,
+      message: "Environment reset successfully",
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * GET /env/state, GET /env/episodes/:episodeId/state
+ * Get an episode's state (observation)
+ * Query: ?episodeId= or ?sessionToken= (without either: the most recently
+ * reset episode, unless ENV_REQUIRE_EPISODE is set); ?fields=stats,agentState
+ * returns only those sections (plus episodeId, version and timestamp)
+ */
+function getState(req, res) {
+  try {
+    const fields = getStateFields(req, res);
+    if (fields === false) return;
+    const state = environment.getState(resolveEpisode(req), fields);
+    res.json({
+      success: true,
+      state,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * POST /env/step, POST /env/episodes/:episodeId/step
+ * Execute an action and get next state + reward
+ * Body: { action: { type: string, payload: object }, episodeId?: string, sessionToken?: string, baseVersion?: number }
+ * With baseVersion (the state version the client already holds) the response
+ * carries `stateDelta` with only the sections changed since then, instead
+ * of the full `state`.
+ */
+function step(req, res) {
+  try {
+    const { action, baseVersion } = req.body;
+
+    if (!action || !action.type) {
+      return res.status(400).json({
+        success: false,
+        error:
+          "Invalid action format. Expected: { action: { type: string, payload: object } }",
+      });
+    }
+
+    const result = environment.step(action, resolveEpisode(req), { baseVersion });
+    res.json({
+      success: true,
+      ...result,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * POST /env/reset_batch
+ * Start several episodes in one request
+ * Body: { items: [{ episodeId?: string, taskType?: string }] }
+ * Returns one reset result per item, in order. A failing item does not
+ * affect the others; it is reported as { success: false, error }.
+ */
+function resetBatch(req, res) {
+  const items = getBatchItems(req, res);
+  if (!items) return;
+
+  const results = items.map((config) => {
+    try {
+      return { success: true, ...environment.reset(config || {}) };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  });
+
+  res.json({
+    success: true,
+    results,
+    count: results.length,
+  });
+}
+
+/**
+ * POST /env/step_batch
+ * Execute one action in each of several episodes in one request
+ * Body: { items: [{ episodeId: string, sessionToken?: string, action: { type: string, payload: object }, baseVersion?: number }] }
+ * Returns one step result per item, in order. Every item must name its
+ * episode (episodeId and/or sessionToken); items are applied in order, so repeated episodeIds step that
+ * episode several times. Items with baseVersion get a stateDelta (see /step).
+ */
+function stepBatch(req, res) {
+  const items = getBatchItems(req, res);
+  if (!items) return;
+
+  const results = items.map((item) => {
+    const { action, episodeId, sessionToken, baseVersion } = item || {};
+
+    if (!episodeId && !sessionToken) {
+      return { success: false, error: "Missing episodeId" };
+    }
+    if (!action || !action.type) {
+      return {
+        success: false,
+        error:
+          "Invalid action format. Expected: { action: { type: string, payload: object } }",
+      };
+    }
+
+    try {
+      const id = environment.resolveEpisodeId({ episodeId, sessionToken });
+      return {
+        success: true,
+        ...environment.step(action, id, { baseVersion }),
+      };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  });
+
+  res.json({
+    success: true,
+    results,
+    count: results.length,
+  });
+}
+
+/**
+ * GET /env/actions, GET /env/episodes/:episodeId/actions
+ * Get list of available actions and the episode's channels
+ */
+function getActions(req, res) {
+  try {
+    const actions = environment.getAvailableActions(resolveEpisode(req));
+    res.json({
+      success: true,
+      ...actions,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * GET /env/stats, GET /env/episodes/:episodeId/stats
+ * Get episode statistics, plus the episode store's occupancy and eviction
+ * counters under `store`. Without any episode to report on, `stats` is null.
+ */
+function getStats(req, res) {
+  try {
+    const episodeId = resolveEpisode(req, { optional: true });
+    res.json({
+      success: true,
+      stats: episodeId ? environment.getStats(episodeId) : null,
+      store: environment.getStoreStats(),
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * GET /env/info/:episodeId, GET /env/episodes/:episodeId
+ * Get detailed information about a specific episode
+ */
+function getInfo(req, res) {
+  try {
+    const { episodeId } = req.params;
+    const info = environment.getEpisodeInfo(episodeId);
+
+    if (!info) {
+      return res.status(404).json({
+        success: false,
+        error: "Episode not found",
+      });
+    }
+
+    res.json({
+      success: true,
+      episode: info,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * GET /env/load
+ * Episode counts of this process and its place in the cluster, if any.
+ * Sharded clients pick the shard with the fewest active episodes for resets.
+ */
+function getLoad(req, res) {
+  const { index, count } = config.shard;
+  res.json({
+    success: true,
+    ...environment.getLoad(),
+    shard: {
+      index,
+      count,
+      ports: Array.from({ length: count }, (_, i) => config.port + i),
+    },
+    pid: process.pid,
+    uptime: process.uptime(),
+  });
+}
+
+/**
+ * GET /env/history
+ * Get episode history
+ */
+function getHistory(req, res) {
+  try {
+    const limit = parseInt(req.query.limit) || 10;
+    const history = environment.getHistory(limit);
+
+    res.json({
+      success: true,
+      history,
+      count: history.length,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * GET /env/tasks
+ * Get all available tasks
+ */
+function getTasks(req, res) {
+  try {
+    const tasksArray = environment.getTasks();
+
+    // Convert array to object with type as key for easier access
+    const tasks = {};
+    tasksArray.forEach((task) => {
+      tasks[task.type] = task;
+    });
+
+    res.json({
+      success: true,
+      tasks,
+      count: tasksArray.length,
+    });
+  } catch (error) {
+    res.status(error.status || 500).json({
+      success: false,
+      error: error.message,
+    });
+  }
+}
+
+/**
+ * [method, paths, handler] for every /env route, in registration order
+ */
+export const envRoutes = [
+  ["post", ["/reset"], reset],
+  ["get", ["/state", "/episodes/:episodeId/state"], getState],
+  ["post", ["/step", "/episodes/:episodeId/step"], step],
+  ["post", ["/reset_batch"], resetBatch],
+  ["post", ["/step_batch"], stepBatch],
+  ["get", ["/actions", "/episodes/:episodeId/actions"], getActions],
+  ["get", ["/stats", "/episodes/:episodeId/stats"], getStats],
+  ["get", ["/info/:episodeId", "/episodes/:episodeId"], getInfo],
+  ["get", ["/load"], getLoad],
+  ["get", ["/history"], getHistory],
+  ["get", ["/tasks"], getTasks],
+];
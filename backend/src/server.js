@@ -1,4 +1,5 @@
 import express from "express";
+import fs from "fs";
 import { createServer } from "http";
 import { Server } from "socket.io";
 import cors from "cors";
@@ -10,7 +11,21 @@ import messagesRoutes from './routes/messages.js';
 import UserRoutes from './routes/UserRoutes.js'
 import { initSocketHandlers } from "./socket/handlers.js";
 import { initCallSignaling } from "./socket/callSignaling.js";
+import { initEnvSession } from "./socket/envSession.js";
 import { config } from "./config/config.js";
+import { environment } from "./models/environment.js";
+import { shardEpisodeId } from "./cluster/sharding.js";
+
+// In cluster mode each worker owns the episodes whose id hashes to its shard
+// and listens on PORT + shard index (see cluster/primary.js)
+const { shard } = config;
+const port = config.port + shard.index;
+const socketPath =
+  config.socketPath && shard.count > 1 ? `${config.socketPath}.${shard.index}` : config.socketPath;
+if (shard.count > 1) {
+  environment.newEpisodeId = () => shardEpisodeId(shard.index, shard.count);
+}
+environment.requireEpisode = config.requireEpisode;
 
 const app = express();
 const httpServer = createServer(app);
@@ -65,14 +80,52 @@ app.use("/api/messages", messagesRoutes);
 // Initialize Socket.IO handlers
 initSocketHandlers(io);
 initCallSignaling(io);
+initEnvSession(io);
 
 // Start server
-httpServer.listen(config.port, () => {
-  console.log(`🚀 TeamsClone-RL Backend running on port ${config.port}`);
+httpServer.listen(port, () => {
+  if (shard.count > 1) {
+    console.log(`🧩 Shard ${shard.index}/${shard.count} (pid ${process.pid}) on port ${port}`);
+    return;
+  }
+  console.log(`🚀 TeamsClone-RL Backend running on port ${port}`);
   console.log(`📡 Socket.IO enabled`);
-  console.log(`🤖 RL Environment API: http://localhost:${config.port}/env`);
-  console.log(`📞 Call Management API: http://localhost:${config.port}/calls`);
-  console.log(`📅 Calendar API: http://localhost:${config.port}/calendar`);
+  console.log(`🤖 RL Environment API: http://localhost:${port}/env`);
+  console.log(`🔌 RL Socket.IO session: ws://localhost:${port}/env`);
+  console.log(`📞 Call Management API: http://localhost:${port}/calls`);
+  console.log(`📅 Calendar API: http://localhost:${port}/calendar`);
 });
 
+// Optional Unix domain socket: the same HTTP app without the TCP loopback
+// stack, for agents running on this host (Socket.IO stays on the TCP port)
+if (socketPath) {
+  listenOnUnixSocket(createServer(app), socketPath, config.socketMode);
+}
+
+function listenOnUnixSocket(server, socketPath, mode) {
+  // A socket file left behind by a previous run would make listen() fail
+  try {
+    if (fs.statSync(socketPath).isSocket()) fs.unlinkSync(socketPath);
+  } catch (error) {
+    if (error.code !== "ENOENT") throw error;
+  }
+
+  server.listen(socketPath, () => {
+    if (mode !== null) fs.chmodSync(socketPath, mode);
+    console.log(`🔗 RL Environment API over Unix socket: unix://${socketPath}`);
+  });
+
+  const removeSocket = () => {
+    try {
+      fs.unlinkSync(socketPath);
+    } catch {
+      // Already gone
+    }
+  };
+  process.on("exit", removeSocket);
+  for (const signal of ["SIGINT", "SIGTERM"]) {
+    process.once(signal, () => process.exit(0));
+  }
+}
+
 export { io };
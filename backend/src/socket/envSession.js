@@ -0,0 +1,139 @@
+import {
+  environment,
+  parseStateFields,
+  STATE_SECTIONS,
+} from "../models/environment.js";
+import { config } from "../config/config.js";
+
+/**
+ * Socket.IO namespace for RL sessions
+ */
+export const ENV_NAMESPACE = "/env";
+
+/**
+ * Error carrying the HTTP status the matching /env route answers with
+ */
+function requestError(message, status) {
+  return Object.assign(new Error(message), { status });
+}
+
+/**
+ * RL operations available over the socket, mirroring the /env HTTP routes.
+ * Each takes the request message and returns the response fields.
+ */
+const operations = {
+  reset: ({ episodeId, taskType }) => environment.reset({ episodeId, taskType }),
+
+  step: ({ action, baseVersion, ...scope }) => {
+    if (!action || !action.type) {
+      throw requestError(
+        "Invalid action format. Expected: { action: { type: string, payload: object } }",
+        400
+      );
+    }
+    return environment.step(action, environment.resolveEpisodeId(scope), { baseVersion });
+  },
+
+  state: ({ fields: selection, ...scope }) => {
+    const { fields, unknown } = parseStateFields(selection);
+    if (unknown.length > 0) {
+      throw requestError(
+        `Unknown state fields: ${unknown.join(", ")} (expected: ${STATE_SECTIONS.join(", ")})`,
+        400
+      );
+    }
+    return { state: environment.getState(environment.resolveEpisodeId(scope), fields) };
+  },
+
+  stats: (scope) => {
+    const episodeId = environment.resolveEpisodeId({ ...scope, optional: true });
+    return {
+      stats: episodeId ? environment.getStats(episodeId) : null,
+      store: environment.getStoreStats(),
+    };
+  },
+
+  actions: (scope) => environment.getAvailableActions(environment.resolveEpisodeId(scope)),
+
+  info: ({ episodeId }) => {
+    const info = environment.getEpisodeInfo(episodeId);
+    if (!info) {
+      throw requestError("Episode not found", 404);
+    }
+    return { episode: info };
+  },
+
+  history: ({ limit }) => {
+    const history = environment.getHistory(parseInt(limit) || 10);
+    return { history, count: history.length };
+  },
+
+  load: () => {
+    const { index, count } = config.shard;
+    return {
+      ...environment.getLoad(),
+      shard: {
+        index,
+        count,
+        ports: Array.from({ length: count }, (_, i) => config.port + i),
+      },
+      pid: process.pid,
+      uptime: process.uptime(),
+    };
+  },
+
+  tasks: () => {
+    const tasksArray = environment.getTasks();
+    const tasks = {};
+    tasksArray.forEach((task) => {
+      tasks[task.type] = task;
+    });
+    return { tasks, count: tasksArray.length };
+  },
+};
+
+/**
+ * Run one request message and build its response
+ * Message: { id, op, episodeId?, sessionToken?, ...fields }
+ * Response: { id, success: true, ...result } or { id, success: false, error, status }
+ * where status is the HTTP status the matching /env route would answer with
+ */
+function handleRequest(message) {
+  const { id, op, ...fields } = message || {};
+  const operation = operations[op];
+
+  if (!operation) {
+    return { id, success: false, error: `Unknown operation: ${op}`, status: 404 };
+  }
+
+  try {
+    return { id, success: true, ...operation(fields) };
+  } catch (error) {
+    return { id, success: false, error: error.message, status: error.status || 500 };
+  }
+}
+
+/**
+ * Initialize the RL session namespace
+ *
+ * A client keeps one connection open and sends "env:request" messages tagged
+ * with a request id. Requests are handled in arrival order and each one gets
+ * an "env:response" carrying the same id, so clients can pipeline many
+ * requests (e.g. one step per episode) without waiting for each reply.
+ * Several requests can also be sent as one array message.
+ */
+export function initEnvSession(io) {
+  const namespace = io.of(ENV_NAMESPACE);
+
+  namespace.on("connection", (socket) => {
+    socket.on("env:request", (message) => {
+      // An array of requests is answered with one array of responses
+      const response = Array.isArray(message)
+        ? message.map(handleRequest)
+        : handleRequest(message);
+      socket.emit("env:response", response);
+    });
+  });
+
+  console.log(`🤖 RL session namespace initialized: ${ENV_NAMESPACE}`);
+}
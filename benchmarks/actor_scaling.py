@@ -0,0 +1,53 @@
+"""
+Actor-learner rollout scaling benchmark.
+
+Runs RLAgent's actor-learner mode on the local simulator for an increasing
+number of actor processes and reports environment steps per second. With
+``--no-learn`` the learner only drains chunks (learning never starts), which
+isolates rollout throughput; otherwise the learner trains as usual and the
+replay ratio is reported too.
+
+Usage:
+    python benchmarks/actor_scaling.py --actors 1 2 4 8 16 32 --steps 100000
+    python benchmarks/actor_scaling.py --actors 1 2 4 --no-learn
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent', 'agents'))
+
+from local_env import LocalTeamsEnv  # noqa: E402
+from rl_agent import RLAgent  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--actors', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--steps', type=int, default=50_000)
+    parser.add_argument('--no-learn', action='store_true',
+                        help='Measure rollout throughput only')
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}, steps per run: {args.steps}")
+    print(f"{'actors':>6} {'steps/s':>10} {'per actor':>10} {'updates/s':>10} "
+          f"{'updates/step':>12} {'learner idle':>12}")
+    baseline = None
+    for num_actors in args.actors:
+        agent = RLAgent(LocalTeamsEnv(seed=0), replay_capacity=max(args.steps * 2, 10_000),
+                        learning_starts=args.steps * 10 if args.no_learn else 500, seed=0)
+        stats = agent.train_actor_learner(args.steps, num_actors=num_actors,
+                                          seed=0, verbose=False)
+        rate = stats['steps_per_second']
+        baseline = baseline or rate / num_actors
+        print(f"{num_actors:>6} {rate:>10.0f} {rate / num_actors:>10.0f} "
+              f"{stats['updates_per_second']:>10.0f} "
+              f"{stats['updates'] / stats['steps']:>12.2f} "
+              f"{stats['learner_idle_fraction']:>12.0%}"
+              f"   ({rate / baseline:.1f}x one actor)")
+
+
+if __name__ == '__main__':
+    main()
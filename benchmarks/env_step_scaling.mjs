@@ -0,0 +1,97 @@
+/**
+ * Step cost vs message history for the backend environment model.
+ *
+ * Drives backend/src/models/environment.js in-process (no server). For each
+ * history size, prefills one episode with that many messages spread over its
+ * channels, then times a fixed mix of steps: react to the newest prefilled
+ * message of the last channel (the last one a scan over all channels would
+ * reach), switch channel, send a message to another channel (unread
+ * bookkeeping) and set status. Each size is timed --repeats times and the median is reported.
+ * With the channel/message indexes the time per step should not depend on
+ * the history size.
+ *
+ * Usage:
+ *   node benchmarks/env_step_scaling.mjs
+ *   node benchmarks/env_step_scaling.mjs --steps 20000 --sizes 0,1000,10000,50000 --repeats 5
+ */
+
+import Environment from "../backend/src/models/environment.js";
+
+function parseArgs(argv) {
+  const args = { steps: 20000, sizes: [0, 1000, 10000, 50000], repeats: 5 };
+  for (let i = 0; i < argv.length; i += 2) {
+    if (argv[i] === "--steps") args.steps = parseInt(argv[i + 1]);
+    else if (argv[i] === "--repeats") args.repeats = parseInt(argv[i + 1]);
+    else if (argv[i] === "--sizes") args.sizes = argv[i + 1].split(",").map(Number);
+    else throw new Error(`Unknown argument: ${argv[i]}`);
+  }
+  return args;
+}
+
+// A task that never completes, so one episode can run for every timed step
+const BENCHMARK_TASK = {
+  name: "Benchmark",
+  description: "Never completes",
+  checkCompletion: () => false,
+  reward: 0,
+  maxSteps: Infinity,
+};
+
+function prefilledEpisode(historySize) {
+  const env = new Environment();
+  env.taskDefinitions.benchmark = BENCHMARK_TASK;
+  const { episodeId } = env.reset({ taskType: "benchmark" });
+  const episode = env.episodes.get(episodeId);
+  const channelIds = [...episode.channelsById.keys()];
+  for (let i = 0; i < historySize; i++) {
+    env.addMessageToEpisode(
+      episode,
+      channelIds[i % channelIds.length],
+      "user-1",
+      `Message ${i}`
+    );
+  }
+  return { env, episode, episodeId, channelIds };
+}
+
+function timeSteps(historySize, steps) {
+  const { env, episode, episodeId, channelIds } = prefilledEpisode(historySize);
+  const lastChannelMessages = episode.messages[channelIds.at(-1)];
+  const messageId = lastChannelMessages.at(-1)?.id ?? episode.messages[channelIds[0]][0].id;
+  const actions = [
+    { type: "react_to_message", payload: { messageId, reaction: "👍" } },
+    { type: "switch_channel", payload: { channelId: channelIds[1] } },
+    { type: "send_message", payload: { content: "Update", channelId: channelIds[4] } },
+    { type: "switch_channel", payload: { channelId: channelIds[0] } },
+    { type: "set_status", payload: { status: "busy" } },
+  ];
+
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < steps; i++) {
+    env.step(actions[i % actions.length], episodeId);
+  }
+  const elapsedNs = Number(process.hrtime.bigint() - start);
+  if (episode.stats.invalidActions > 0) {
+    throw new Error("Benchmark actions were rejected");
+  }
+  return elapsedNs / steps / 1000;
+}
+
+function median(values) {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+const { steps, sizes, repeats } = parseArgs(process.argv.slice(2));
+for (let i = 0; i < 3; i++) timeSteps(sizes[0], steps); // warm up the JIT
+
+console.log(`${steps} steps per size, median of ${repeats} runs\n`);
+console.log("messages     µs/step   vs first");
+let baseline = null;
+for (const size of sizes) {
+  const micros = median(Array.from({ length: repeats }, () => timeSteps(size, steps)));
+  baseline ??= micros;
+  console.log(
+    `${String(size).padStart(8)}  ${micros.toFixed(2).padStart(10)}  ${(micros / baseline).toFixed(2).padStart(8)}x`
+  );
+}
@@ -0,0 +1,130 @@
+"""
+ObservationWrapper construction + query microbenchmark.
+
+Replays states from a LocalTeamsEnv rollout and times, per step, building a
+wrapper and running the queries a typical agent makes (channel ids, current
+channel, mention flag, message count, stats, messages by user). Compares the
+previous eager implementation (reproduced below) with the current one, both
+built fresh per step and reused through ``update()``.
+
+Usage:
+    python benchmarks/observation_wrapper.py --steps 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import ObservationWrapper  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+
+
+class EagerObservationWrapper:
+    """The ObservationWrapper implementation before the lazy/slotted rewrite."""
+
+    def __init__(self, state):
+        self.state = state
+        self.agent_state = state.get('agentState', {})
+        self.current_channel = state.get('currentChannel', {})
+        self.recent_messages = state.get('recentMessages', [])
+        self.teams = state.get('teams', [])
+        self.users = state.get('users', [])
+        self.episode_stats = state.get('episodeStats', {})
+
+    def get_current_channel_id(self):
+        return self.agent_state.get('currentChannelId', '')
+
+    def has_unread_mentions(self):
+        agent_id = self.agent_state.get('userId', 'agent')
+        for msg in self.recent_messages:
+            if f'@{agent_id}' in msg.get('content', ''):
+                return True
+        return False
+
+    def get_all_channel_ids(self):
+        channel_ids = []
+        for team in self.teams:
+            for channel in team.get('channels', []):
+                channel_ids.append(channel.get('id'))
+        return channel_ids
+
+    def get_messages_by_user(self, user_id):
+        return [msg for msg in self.recent_messages if msg.get('userId') == user_id]
+
+
+def collect_states(num_steps, seed=0):
+    env = LocalTeamsEnv(seed=seed)
+    agent = TaskAgent()
+    states = []
+    while len(states) < num_steps:
+        result = env.reset()
+        state = result['state']
+        done = False
+        while not done and len(states) < num_steps:
+            response = env.step(agent.select_action(state), result['episodeId'])
+            state = response['state']
+            done = response['done']
+            states.append(state)
+    return states
+
+
+def query(obs):
+    """The lookups an agent makes per step; channel ids are needed twice."""
+    obs.get_all_channel_ids()
+    obs.get_current_channel_id()
+    obs.has_unread_mentions()
+    obs.has_unread_mentions()
+    len(obs.recent_messages)
+    obs.episode_stats.get('stepCount', 0)
+    obs.get_messages_by_user('agent')
+    obs.get_all_channel_ids()
+
+
+def run_fresh(cls, states):
+    for state in states:
+        query(cls(state))
+
+
+def run_reused(states):
+    obs = ObservationWrapper(states[0])
+    for state in states:
+        query(obs.update(state))
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--steps', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    states = collect_states(args.steps)
+    cases = [
+        ('before (eager)', lambda: run_fresh(EagerObservationWrapper, states)),
+        ('after (fresh)', lambda: run_fresh(ObservationWrapper, states)),
+        ('after (update)', lambda: run_reused(states)),
+    ]
+
+    print(f"{len(states)} states, best of {args.repeat}\n")
+    print(f"{'variant':<18}{'µs/step':>10}{'speedup':>10}")
+    baseline = None
+    for name, fn in cases:
+        per_step = best_of(fn, args.repeat) / len(states) * 1e6
+        baseline = baseline or per_step
+        print(f"{name:<18}{per_step:>10.2f}{baseline / per_step:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Replay buffer insertion + sampling microbenchmark.
+
+Compares a deque of per-transition tuples sampled with ``random.sample`` and
+stacked with NumPy (the usual first implementation) with the column-array
+ReplayBuffer and PrioritizedReplayBuffer, reporting insert and sample cost
+and memory per transition.
+
+Usage:
+    python benchmarks/replay_memory.py --transitions 200000 --obs-dim 112
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer  # noqa: E402
+
+
+class DequeReplay:
+    """A list-of-tuples buffer, for comparison."""
+
+    def __init__(self, capacity):
+        self.memory = deque(maxlen=capacity)
+
+    def add(self, obs, action, reward, next_obs, done):
+        self.memory.append((obs, action, reward, next_obs, done))
+
+    def sample(self, batch_size):
+        batch = random.sample(self.memory, batch_size)
+        obs, actions, rewards, next_obs, dones = zip(*batch)
+        return (np.stack(obs), np.array(actions), np.array(rewards, dtype=np.float32),
+                np.stack(next_obs), np.array(dones))
+
+
+def fill(buffer, observations):
+    for i, obs in enumerate(observations):
+        # Fresh arrays per step, like encode_state() returns
+        buffer.add(obs.copy(), i % 4, 1.0, obs.copy(), False)
+
+
+def run(make, observations, batch_size, samples):
+    buffer = make()
+    start = time.perf_counter()
+    fill(buffer, observations)
+    insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(samples):
+        buffer.sample(batch_size)
+    sample = time.perf_counter() - start
+    del buffer
+
+    # Separate pass: tracemalloc slows down allocation-heavy code
+    tracemalloc.start()
+    buffer = make()
+    fill(buffer, observations)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return insert / len(observations) * 1e6, sample / samples * 1e3, memory / len(observations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--transitions', type=int, default=200000)
+    parser.add_argument('--obs-dim', type=int, default=112)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    observations = [rng.random(args.obs_dim, dtype=np.float32) for _ in range(args.transitions)]
+    capacity = args.transitions
+    cases = [
+        ('deque of tuples', lambda: DequeReplay(capacity)),
+        ('ReplayBuffer', lambda: ReplayBuffer(capacity, args.obs_dim)),
+        ('PrioritizedReplay', lambda: PrioritizedReplayBuffer(capacity, args.obs_dim)),
+    ]
+
+    print(f"{args.transitions} transitions, obs_dim={args.obs_dim}, batch={args.batch_size}\n")
+    print(f"{'buffer':<20}{'insert µs':>11}{'sample ms':>11}{'bytes/transition':>18}")
+    for name, make in cases:
+        insert, sample, memory = run(make, observations, args.batch_size, args.samples)
+        print(f"{name:<20}{insert:>11.2f}{sample:>11.3f}{memory:>18.0f}")
+
+
+if __name__ == '__main__':
+    main()
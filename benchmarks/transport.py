@@ -0,0 +1,72 @@
+"""
+HTTP vs Socket.IO transport benchmark for the RL API.
+
+Runs the same rollout against a live backend twice: once with
+TeamsEnvClient (one HTTP request per call) and once with SocketTeamsEnvClient
+(one persistent connection). Reports sequential per-step latency and, with
+--num-envs > 1, the pipelined throughput of step_many across N episodes.
+
+Usage:
+    python benchmarks/transport.py --base-url http://localhost:3001
+    python benchmarks/transport.py --steps 5000 --num-envs 64
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from socket_client import SocketTeamsEnvClient  # noqa: E402
+
+ACTION = {'type': 'set_status', 'payload': {'status': 'busy'}}
+
+
+def sequential(client, num_steps):
+    """Step one episode at a time; returns seconds per step."""
+    steps = 0
+    start = time.perf_counter()
+    while steps < num_steps:
+        episode_id = client.reset(task_type='active_participant')['episodeId']
+        done = False
+        while not done and steps < num_steps:
+            done = client.step(ACTION, episode_id)['done']
+            steps += 1
+    return (time.perf_counter() - start) / steps
+
+
+def pipelined(client, num_steps, num_envs):
+    """Step num_envs episodes per call with step_many; returns steps per second."""
+    episode_ids = [r['episodeId'] for r in
+                   client.reset_many(count=num_envs, task_types='active_participant')]
+    steps = 0
+    start = time.perf_counter()
+    while steps < num_steps:
+        results = client.step_many([ACTION] * num_envs, episode_ids, raise_on_error=False)
+        steps += num_envs
+        for i, result in enumerate(results):
+            if result.get('done') or not result.get('success', True):
+                episode_ids[i] = client.reset(task_type='active_participant')['episodeId']
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--num-envs', type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'transport':<10}{'ms/step':>10}{'steps/s':>10}{'batched steps/s':>18}")
+    for name, factory in (('http', TeamsEnvClient), ('socket', SocketTeamsEnvClient)):
+        with factory(args.base_url) as client:
+            per_step = sequential(client, args.steps)
+            batched = pipelined(client, args.steps, args.num_envs) if args.num_envs > 1 else float('nan')
+            print(f"{name:<10}{per_step * 1000:>10.3f}{1 / per_step:>10.0f}{batched:>18.0f}")
+            print(f"{'':<10}{client.connection_stats()}")
+
+
+if __name__ == '__main__':
+    main()
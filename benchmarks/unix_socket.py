@@ -0,0 +1,132 @@
+"""
+Loopback TCP vs Unix domain socket benchmark for the RL API.
+
+Steps episodes sequentially with TeamsEnvClient over http://localhost and
+over unix:// and reports per-step latency percentiles for each.
+
+Against the backend, start it with a socket path first:
+
+    SOCKET_PATH=/tmp/teamsclone.sock npm start
+
+--standalone serves /env/reset and /env/step from an in-process LocalTeamsEnv
+on both transports instead (Python http.server), which isolates the transport
+cost when Node is not available.
+
+Usage:
+    python benchmarks/unix_socket.py --socket-path /tmp/teamsclone.sock
+    python benchmarks/unix_socket.py --standalone --steps 5000
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+ACTION = {'type': 'set_status', 'payload': {'status': 'busy'}}
+
+
+def make_handler(env, lock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Buffer the response so headers and body leave in one write
+        # (separate small writes stall on Nagle + delayed ACK over TCP)
+        wbufsize = 1 << 16
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])) or b'{}')
+            with lock:
+                if self.path == '/env/reset':
+                    result = env.reset(episode_id=body.get('episodeId'), task_type=body.get('taskType'))
+                else:
+                    result = env.step(body['action'], body.get('episodeId'))
+            payload = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+
+def start_standalone(socket_path):
+    """Serve one LocalTeamsEnv over TCP and UDS; returns (base_url, servers)."""
+    env, lock = LocalTeamsEnv(seed=0), threading.Lock()
+    handler = make_handler(env, lock)
+    tcp = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    uds = UnixHTTPServer(socket_path, handler)
+    for server in (tcp, uds):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{tcp.server_address[1]}", (tcp, uds)
+
+
+def step_latencies(client, num_steps):
+    """Step episodes one at a time; returns per-step latencies in seconds."""
+    latencies = []
+    while len(latencies) < num_steps:
+        episode_id = client.reset(task_type='active_participant')['episodeId']
+        done = False
+        while not done and len(latencies) < num_steps:
+            start = time.perf_counter()
+            done = client.step(ACTION, episode_id)['done']
+            latencies.append(time.perf_counter() - start)
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    parser.add_argument('--socket-path', default='/tmp/teamsclone.sock')
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--standalone', action='store_true',
+                        help='Serve a LocalTeamsEnv from this process instead of the backend')
+    args = parser.parse_args()
+
+    servers = ()
+    socket_path = args.socket_path
+    base_url = args.base_url
+    if args.standalone:
+        socket_path = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+        base_url, servers = start_standalone(socket_path)
+
+    print(f"{'transport':<10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'steps/s':>10}")
+    try:
+        for name, url in (('tcp', base_url), ('unix', f'unix://{socket_path}')):
+            with TeamsEnvClient(url) as client:
+                step_latencies(client, min(args.steps // 10, 200))  # warm-up
+                latencies = step_latencies(client, args.steps) * 1000
+                print(f"{name:<10}{latencies.mean():>10.3f}{np.percentile(latencies, 50):>10.3f}"
+                      f"{np.percentile(latencies, 99):>10.3f}{1000 / latencies.mean():>10.0f}")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if args.standalone:
+            os.unlink(socket_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+JSON vs MessagePack wire format benchmark for the RL API.
+
+Offline mode (default) replays step responses produced by LocalTeamsEnv and
+measures, per step, the encoded size and the encode/decode time of each
+format. With --base-url it also measures end-to-end step latency against a
+running backend with TeamsEnvClient(wire_format=...).
+
+Usage:
+    python benchmarks/wire_format.py
+    python benchmarks/wire_format.py --base-url http://localhost:3001 --steps 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+import msgpack  # noqa: E402
+
+from local_env import LocalTeamsEnv  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+
+
+def collect_step_responses(num_steps, seed=0):
+    """Roll out TaskAgent locally and keep every /env/step response body."""
+    env = LocalTeamsEnv(seed=seed)
+    agent = TaskAgent()
+    responses = []
+    while len(responses) < num_steps:
+        result = env.reset(task_type='active_participant')
+        state = result['state']
+        done = False
+        while not done and len(responses) < num_steps:
+            response = env.step(agent.select_action(state), result['episodeId'])
+            responses.append(response)
+            state = response['state']
+            done = response['done']
+    return responses
+
+
+def time_per_item(fn, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+
+def offline_benchmark(num_steps, repeat):
+    responses = collect_step_responses(num_steps)
+    formats = {
+        'json': (lambda obj: json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                 json.loads),
+        'msgpack': (msgpack.packb, lambda data: msgpack.unpackb(data, raw=False)),
+    }
+
+    print(f"Offline: {len(responses)} step responses (best of {repeat})\n")
+    print(f"{'format':<10}{'bytes/step':>12}{'encode µs':>12}{'decode µs':>12}")
+    results = {}
+    for name, (encode, decode) in formats.items():
+        encoded = [encode(r) for r in responses]
+        assert decode(encoded[0]) == responses[0]
+        results[name] = {
+            'bytes': sum(len(e) for e in encoded) / len(encoded),
+            'encode': time_per_item(encode, responses, repeat) * 1e6,
+            'decode': time_per_item(decode, encoded, repeat) * 1e6,
+        }
+        r = results[name]
+        print(f"{name:<10}{r['bytes']:>12.0f}{r['encode']:>12.1f}{r['decode']:>12.1f}")
+
+    j, m = results['json'], results['msgpack']
+    print(f"\nmsgpack vs json: {m['bytes'] / j['bytes']:.2f}x bytes, "
+          f"{j['encode'] / m['encode']:.2f}x faster encode, "
+          f"{j['decode'] / m['decode']:.2f}x faster decode")
+
+
+def live_benchmark(base_url, num_steps):
+    from client import TeamsEnvClient
+
+    print(f"\nLive: {num_steps} steps per format against {base_url}\n")
+    print(f"{'format':<10}{'ms/step':>10}{'steps/s':>10}")
+    agent = TaskAgent()
+    for wire_format in ('json', 'msgpack'):
+        client = TeamsEnvClient(base_url, wire_format=wire_format)
+        steps = 0
+        start = time.perf_counter()
+        while steps < num_steps:
+            result = client.reset(task_type='active_participant')
+            state = result['state']
+            done = False
+            while not done and steps < num_steps:
+                response = client.step(agent.select_action(state), result['episodeId'])
+                state = response['state']
+                done = response['done']
+                steps += 1
+        elapsed = time.perf_counter() - start
+        client.close()
+        print(f"{wire_format:<10}{elapsed / steps * 1000:>10.3f}{steps / elapsed:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--base-url', default=None,
+                        help='also benchmark round trips against this backend')
+    args = parser.parse_args()
+
+    offline_benchmark(args.steps, args.repeat)
+    if args.base_url:
+        live_benchmark(args.base_url, args.steps)
+
+
+if __name__ == '__main__':
+    main()
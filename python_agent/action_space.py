@@ -0,0 +1,189 @@
+"""
+Discrete Action Space for TeamsClone-RL
+
+A fixed catalog of discrete actions for learning agents, plus masks of the
+actions that are valid for an observation. Index ``i`` always means the same
+action (e.g. 'switch_channel[channel-3]' or 'react_to_message[1]'); ``to_action``
+fills in the state-dependent parts (message ids, message text).
+
+Invalid actions cost -0.1 to -0.5 reward and still use up a step, so agents
+should only pick from ``mask(state)``:
+
+    space = ActionSpace()
+    mask = space.mask(state)                    # bool (space.n,)
+    masks = space.mask_batch(states)            # bool (len(states), space.n)
+    action = space.to_action(index, state)      # action dict for the API
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from encoders import CHANNEL_IDS
+from local_env import VALID_STATUSES
+
+# Message templates; templates with several texts cycle by messages sent so
+# consecutive messages differ (the server penalizes repeated messages)
+MESSAGE_TEMPLATES: Dict[str, List[str]] = {
+    'greeting': ['Hello! Thanks for the warm welcome! 👋'],
+    'update': [
+        "I'm working on the RL environment today!",
+        "Great progress everyone! 🎉",
+        "Let me know if anyone needs help with their tasks",
+        "Just finished implementing the task system",
+        "Looking forward to our next team meeting",
+    ],
+    'mention_reply': ["Thanks for the mention! I'm here to help."],
+}
+
+
+class ActionSpec(NamedTuple):
+    """One catalog entry: action type and its fixed argument."""
+    type: str
+    argument: Any
+    name: str
+
+
+class ActionSpace:
+    """
+    Fixed discrete action catalog with validity masks.
+
+    Catalog order: one send_message per template, switch_channel per channel,
+    react_to_message on the k-th most recent message (k = 0 is the newest),
+    join_call, then set_status per status.
+    """
+
+    def __init__(self, templates: Optional[Dict[str, List[str]]] = None,
+                 channels: Sequence[str] = CHANNEL_IDS,
+                 react_slots: int = 3,
+                 reaction: str = '👍',
+                 statuses: Sequence[str] = VALID_STATUSES,
+                 agent_id: str = 'agent'):
+        """
+        Args:
+            templates: Message templates (name -> texts); MESSAGE_TEMPLATES by default
+            channels: Channel ids for switch_channel actions
+            react_slots: Number of react_to_message actions (newest k messages)
+            reaction: Emoji used for reactions
+            statuses: Statuses for set_status actions
+            agent_id: User id of the agent
+        """
+        self.templates = dict(templates or MESSAGE_TEMPLATES)
+        self.reaction = reaction
+        self.agent_id = agent_id
+
+        specs = [ActionSpec('send_message', name, f'send_message[{name}]')
+                 for name in self.templates]
+        specs += [ActionSpec('switch_channel', channel_id, f'switch_channel[{channel_id}]')
+                  for channel_id in channels]
+        specs += [ActionSpec('react_to_message', k, f'react_to_message[{k}]')
+                  for k in range(react_slots)]
+        specs.append(ActionSpec('join_call', None, 'join_call'))
+        specs += [ActionSpec('set_status', status, f'set_status[{status}]')
+                  for status in statuses]
+        self.specs = specs
+        self.n = len(specs)
+        self.names = [spec.name for spec in specs]
+
+        self._message_slots = [i for i, s in enumerate(specs) if s.type == 'send_message']
+        self._channel_slots = {s.argument: i for i, s in enumerate(specs) if s.type == 'switch_channel'}
+        self._react_start = next((i for i, s in enumerate(specs) if s.type == 'react_to_message'), 0)
+        self.react_slots = react_slots
+
+    def __len__(self) -> int:
+        return self.n
+
+    def index(self, name: str) -> int:
+        """Index of the action named e.g. 'switch_channel[channel-2]'."""
+        return self.names.index(name)
+
+    def message_content(self, template: str, state: Dict[str, Any]) -> str:
+        """Text a send_message template produces in ``state``."""
+        texts = self.templates[template]
+        sent = (state.get('stats') or {}).get('messagesSent', 0)
+        return texts[sent % len(texts)]
+
+    def to_action(self, index: int, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a catalog index into an action dict for ``state``.
+
+        Args:
+            index: Catalog index
+            state: Current state (for message ids and the message count)
+
+        Returns:
+            Action dictionary
+        """
+        spec = self.specs[int(index)]
+        if spec.type == 'send_message':
+            return {'type': 'send_message',
+                    'payload': {'content': self.message_content(spec.argument, state)}}
+        if spec.type == 'switch_channel':
+            return {'type': 'switch_channel', 'payload': {'channelId': spec.argument}}
+        if spec.type == 'react_to_message':
+            messages = state.get('recentMessages') or []
+            message_id = messages[-1 - spec.argument]['id'] if spec.argument < len(messages) else None
+            return {'type': 'react_to_message',
+                    'payload': {'messageId': message_id, 'reaction': self.reaction}}
+        if spec.type == 'set_status':
+            return {'type': 'set_status', 'payload': {'status': spec.argument}}
+        return {'type': 'join_call', 'payload': {}}
+
+    def mask(self, state: Dict[str, Any]) -> np.ndarray:
+        """
+        Valid actions for one state.
+
+        Masked out:
+            - send_message templates whose text repeats one of the agent's
+              last two messages in the channel (spam penalty)
+            - switch_channel to the current channel or to a channel that is
+              not in the state
+            - react_to_message slots beyond the number of recent messages
+
+        Returns:
+            bool array of shape (n,)
+        """
+        out = np.empty(self.n, dtype=np.bool_)
+        self._write_mask(state, out)
+        return out
+
+    def mask_batch(self, states: Sequence[Dict[str, Any]],
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Masks for several states.
+
+        Args:
+            states: State observations
+            out: Optional bool array of shape (len(states), n) to fill
+
+        Returns:
+            bool array of shape (len(states), n)
+        """
+        if out is None:
+            out = np.empty((len(states), self.n), dtype=np.bool_)
+        elif out.shape != (len(states), self.n) or out.dtype != np.bool_:
+            raise ValueError(f"out must be a bool array of shape ({len(states)}, {self.n})")
+        for i, state in enumerate(states):
+            self._write_mask(state, out[i])
+        return out
+
+    def _write_mask(self, state: Dict[str, Any], row: np.ndarray):
+        row[:] = True
+        messages = state.get('recentMessages') or []
+
+        recent_own = [m.get('content') for m in messages[-2:] if m.get('userId') == self.agent_id]
+        if recent_own:
+            for i in self._message_slots:
+                if self.message_content(self.specs[i].argument, state) in recent_own:
+                    row[i] = False
+
+        if self._channel_slots:
+            existing = {channel.get('id') for team in state.get('teams') or ()
+                        for channel in team.get('channels') or ()}
+            current = (state.get('agentState') or {}).get('currentChannelId')
+            for channel_id, i in self._channel_slots.items():
+                if channel_id == current or channel_id not in existing:
+                    row[i] = False
+
+        available = min(len(messages), self.react_slots)
+        row[self._react_start + available:self._react_start + self.react_slots] = False
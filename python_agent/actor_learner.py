@@ -0,0 +1,393 @@
+"""
+Actor-Learner Training for TeamsClone-RL
+
+Runs the DQN RLAgent with its rollouts spread over ``num_actors`` worker
+processes. Each actor drives its own episodes (local simulator or HTTP
+backend) with a snapshot of the Q-network and writes transitions into its own
+shared-memory block; the learner (the calling process) copies finished chunks
+into the agent's replay buffer, runs gradient updates and publishes new
+weights through a second shared-memory block that actors pick up between
+chunks.
+
+Only small control messages (actor id, chunk slot, episode totals) go through
+queues; observations never get pickled.
+
+    agent = RLAgent(LocalTeamsEnv(seed=0))
+    stats = ActorLearner(agent, num_actors=8).train(total_steps=200_000)
+"""
+
+import os
+import queue
+import time
+from contextlib import contextmanager
+from multiprocessing import get_context, shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from action_space import ActionSpace
+from client import TeamsEnvClient
+from dqn import DQN, LinearSchedule
+from encoders import ConcatEncoder
+from local_env import LocalTeamsEnv
+
+# Actors each run a batch-of-one forward pass, so BLAS thread pools only
+# oversubscribe the cores the other actors are using
+BLAS_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays packed into one SharedMemory block.
+
+    Create it in the parent with ``SharedArrays(specs)`` and attach in a child
+    with ``SharedArrays(specs, name=parent.name)``.
+    """
+
+    def __init__(self, specs: Dict[str, Tuple[tuple, Any]], name: Optional[str] = None):
+        """
+        Args:
+            specs: Array name -> (shape, dtype)
+            name: Name of an existing block to attach to (None creates one)
+        """
+        offsets = {}
+        size = 0
+        for key, (shape, dtype) in specs.items():
+            dtype = np.dtype(dtype)
+            size = -(-size // 64) * 64  # cache-line align every array
+            offsets[key] = (shape, dtype, size)
+            size += int(np.prod(shape)) * dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=max(size, 1))
+        self.name = self.shm.name
+        self.arrays = {key: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+                       for key, (shape, dtype, offset) in offsets.items()}
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.arrays[key]
+
+    def close(self, unlink: bool = False):
+        """Drop the array views and detach; ``unlink`` also frees the block."""
+        self.arrays = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def transition_specs(slots: int, chunk_size: int, obs_dim: int,
+                     num_actions: int) -> Dict[str, Tuple[tuple, Any]]:
+    """Layout of one actor's transition block: ``slots`` chunks of ``chunk_size`` rows."""
+    rows = (slots, chunk_size)
+    return {
+        'obs': ((*rows, obs_dim), np.float32),
+        'actions': (rows, np.int64),
+        'rewards': (rows, np.float32),
+        'next_obs': ((*rows, obs_dim), np.float32),
+        'dones': (rows, np.bool_),
+        'next_masks': ((*rows, num_actions), np.bool_),
+    }
+
+
+@contextmanager
+def _single_threaded_blas():
+    """Set the BLAS thread variables to 1 while child processes start."""
+    saved = {key: os.environ.get(key) for key in BLAS_THREAD_VARS}
+    os.environ.update({key: '1' for key in BLAS_THREAD_VARS})
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _make_client(backend: str, base_url: str, seed: Optional[int]):
+    if backend == 'local':
+        return LocalTeamsEnv(seed=seed)
+    if backend == 'http':
+        return TeamsEnvClient(base_url)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def run_actor(actor_id: int, config: Dict[str, Any], transitions_name: str,
+              weights_name: str, version, ready, free, stop):
+    """
+    Actor process body: act, step, and hand full chunks to the learner.
+
+    Weights are re-read from shared memory whenever ``version`` changed,
+    checked once per chunk. A chunk slot is reused only after the learner
+    returns it on ``free``.
+    """
+    num_actions = config['action_space'].n
+    obs_dim = config['encoder'].dim
+    client = _make_client(config['backend'], config['base_url'], config['seed'])
+    encoder: ConcatEncoder = config['encoder']
+    action_space: ActionSpace = config['action_space']
+    epsilon: LinearSchedule = config['epsilon']
+    policy = DQN(obs_dim, num_actions, hidden_sizes=config['hidden_sizes'],
+                 target_update=0, seed=config['seed'])
+    chunk_size = config['chunk_size']
+    transitions = SharedArrays(
+        transition_specs(config['slots'], chunk_size, obs_dim, num_actions), transitions_name)
+    weights = SharedArrays({'params': (policy.online.flat_params.shape, np.float32)}, weights_name)
+    seen_version = -1
+
+    def sync():
+        nonlocal seen_version
+        if version.value != seen_version:
+            with version.get_lock():
+                np.copyto(policy.online.flat_params, weights['params'])
+                seen_version = version.value
+
+    def next_slot():
+        while not stop.is_set():
+            try:
+                return free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+
+    try:
+        steps = 0
+        slot = next_slot()
+        sync()
+        count = 0
+        episodes = []
+        while slot is not None:
+            state = client.reset()['state']
+            obs, mask = encoder.encode(state), action_space.mask(state)
+            episode_reward, done, length = 0.0, False, 0
+            while not done and length < config['max_steps']:
+                # The schedule counts global steps; every actor contributes equally
+                index = policy.act(obs, epsilon(steps * config['num_actors']), mask)
+                result = client.step(action_space.to_action(index, state))
+                state, reward, done = result['state'], result['reward'], result['done']
+                next_obs, next_mask = encoder.encode(state), action_space.mask(state)
+
+                transitions['obs'][slot, count] = obs
+                transitions['actions'][slot, count] = index
+                transitions['rewards'][slot, count] = reward
+                transitions['next_obs'][slot, count] = next_obs
+                transitions['dones'][slot, count] = done
+                transitions['next_masks'][slot, count] = next_mask
+                obs, mask = next_obs, next_mask
+                episode_reward += reward
+                length += 1
+                steps += 1
+                count += 1
+
+                if count == chunk_size:
+                    ready.put((actor_id, slot, count, episodes))
+                    count, episodes = 0, []
+                    slot = next_slot()
+                    if slot is None:
+                        break
+                    sync()
+            else:
+                completed = state.get('stats', {}).get('taskCompleted', False)
+                episodes.append((episode_reward, length, completed))
+    finally:
+        transitions.close()
+        weights.close()
+        if hasattr(client, 'close'):
+            client.close()
+
+
+class ActorLearner:
+    """
+    Multiprocess training driver for an RLAgent.
+
+    The learner never waits for a particular actor: it drains whatever chunks
+    are ready, then runs updates. Updates are capped at one per
+    ``agent.train_freq`` collected transitions (as in RLAgent.train), so when
+    the learner keeps up it waits on the actors, and when it does not the
+    actors keep collecting and the replay ratio drops.
+    """
+
+    def __init__(self, agent, num_actors: int = 4, backend: str = 'local',
+                 base_url: str = 'http://localhost:3001', chunk_size: int = 64,
+                 slots_per_actor: int = 4, sync_every: int = 50, max_steps: int = 50,
+                 seed: Optional[int] = None, start_method: str = 'spawn'):
+        """
+        Args:
+            agent: RLAgent whose network, replay buffer, action space,
+                encoders and schedule are used
+            num_actors: Number of actor processes
+            backend: 'local' (a LocalTeamsEnv per actor) or 'http'
+            base_url: Backend URL for the 'http' backend
+            chunk_size: Transitions per chunk handed to the learner
+            slots_per_actor: Chunks an actor can fill before the learner has
+                taken the earlier ones
+            sync_every: Gradient updates between weight broadcasts
+            max_steps: Step limit per episode
+            seed: Base seed; actor i uses seed + 1 + i
+            start_method: multiprocessing start method
+        """
+        if num_actors < 1:
+            raise ValueError("num_actors must be at least 1")
+        self.agent = agent
+        self.num_actors = num_actors
+        self.backend = backend
+        self.base_url = base_url
+        self.chunk_size = chunk_size
+        self.slots_per_actor = slots_per_actor
+        self.sync_every = sync_every
+        self.max_steps = max_steps
+        self.seed = seed
+        self.ctx = get_context(start_method)
+
+    def _actor_config(self, actor_id: int) -> Dict[str, Any]:
+        agent = self.agent
+        return {
+            'backend': self.backend,
+            'base_url': self.base_url,
+            'seed': None if self.seed is None else self.seed + 1 + actor_id,
+            'encoder': ConcatEncoder(agent.encoder, agent.text_featurizer),
+            'action_space': agent.action_space,
+            'epsilon': agent.epsilon,
+            'hidden_sizes': agent.dqn.online.sizes[1:-1],
+            'chunk_size': self.chunk_size,
+            'slots': self.slots_per_actor,
+            'num_actors': self.num_actors,
+            'max_steps': self.max_steps,
+        }
+
+    def train(self, total_steps: int, verbose: bool = True) -> dict:
+        """
+        Collect ``total_steps`` environment steps across the actors and train.
+
+        Args:
+            total_steps: Environment steps to collect (rounded up to whole chunks)
+            verbose: Print progress about every 10% of the steps
+
+        Returns:
+            Dictionary with episode_rewards, losses, steps, updates,
+            steps_per_second, updates_per_second, actor_steps (per actor)
+            and learner_idle_fraction (share of time waiting for chunks)
+        """
+        agent = self.agent
+        dqn, replay = agent.dqn, agent.replay
+        ctx = self.ctx
+        specs = transition_specs(self.slots_per_actor, self.chunk_size,
+                                 agent.state_dim, agent.num_actions)
+        weights = SharedArrays({'params': (dqn.online.flat_params.shape, np.float32)})
+        transitions = [SharedArrays(specs) for _ in range(self.num_actors)]
+        version = ctx.Value('q', 0)
+        ready = ctx.Queue()
+        free = [ctx.Queue() for _ in range(self.num_actors)]
+        stop = ctx.Event()
+        np.copyto(weights['params'], dqn.online.flat_params)
+        for slots in free:
+            for slot in range(self.slots_per_actor):
+                slots.put(slot)
+
+        actors = [ctx.Process(target=run_actor, daemon=True, name=f'actor-{i}',
+                              args=(i, self._actor_config(i), transitions[i].name,
+                                    weights.name, version, ready, free[i], stop))
+                  for i in range(self.num_actors)]
+
+        print(f"🤖 Starting Actor-Learner Training ({self.num_actors} actors)")
+        print("=" * 50)
+        episode_rewards, losses = [], []
+        actor_steps = [0] * self.num_actors
+        steps = updates = 0
+        update_seconds = idle_seconds = 0.0
+        report_every = max(total_steps // 10, 1)
+        next_report = report_every
+
+        with _single_threaded_blas():
+            for actor in actors:
+                actor.start()
+        start = time.perf_counter()
+        try:
+            while steps < total_steps:
+                can_update = (len(replay) >= agent.learning_starts
+                              and updates < steps // agent.train_freq)
+                wait_start = time.perf_counter()
+                try:
+                    item = ready.get_nowait() if can_update else ready.get(timeout=1.0)
+                except queue.Empty:
+                    item = None
+                    if not can_update:
+                        self._check_actors(actors)
+                if not can_update:
+                    idle_seconds += time.perf_counter() - wait_start
+
+                while item is not None:
+                    actor_id, slot, count, episodes = item
+                    block = transitions[actor_id]
+                    replay.add_batch(block['obs'][slot, :count], block['actions'][slot, :count],
+                                     block['rewards'][slot, :count], block['next_obs'][slot, :count],
+                                     block['dones'][slot, :count],
+                                     next_masks=block['next_masks'][slot, :count])
+                    free[actor_id].put(slot)
+                    steps += count
+                    actor_steps[actor_id] += count
+                    episode_rewards.extend(reward for reward, _, _ in episodes)
+                    try:
+                        item = ready.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                if len(replay) >= agent.learning_starts and updates < steps // agent.train_freq:
+                    update_start = time.perf_counter()
+                    loss, _ = dqn.update(replay.sample(agent.batch_size))
+                    update_seconds += time.perf_counter() - update_start
+                    losses.append(loss)
+                    updates += 1
+                    if updates % self.sync_every == 0:
+                        with version.get_lock():
+                            np.copyto(weights['params'], dqn.online.flat_params)
+                            version.value += 1
+
+                if verbose and steps >= next_report:
+                    next_report += report_every
+                    recent = np.mean(episode_rewards[-100:]) if episode_rewards else float('nan')
+                    print(f"Steps {steps}/{total_steps} | Episodes: {len(episode_rewards)}"
+                          f" | Reward (last 100): {recent:.2f} | Updates: {updates}"
+                          f" | {steps / (time.perf_counter() - start):.0f} steps/s")
+        finally:
+            elapsed = time.perf_counter() - start
+            stop.set()
+            self._shutdown(actors, ready)
+            weights.close(unlink=True)
+            for block in transitions:
+                block.close(unlink=True)
+
+        agent.total_steps += steps
+        print("\n✅ Training Complete!")
+        print(f"   {steps} steps, {updates} updates, {steps / elapsed:.0f} steps/s,"
+              f" learner idle {idle_seconds / elapsed:.0%}")
+        return {
+            'episode_rewards': episode_rewards,
+            'losses': losses,
+            'steps': steps,
+            'updates': updates,
+            'steps_per_second': steps / elapsed if elapsed else 0.0,
+            'updates_per_second': updates / update_seconds if update_seconds else 0.0,
+            'actor_steps': actor_steps,
+            'learner_idle_fraction': idle_seconds / elapsed if elapsed else 0.0,
+        }
+
+    @staticmethod
+    def _check_actors(actors):
+        for actor in actors:
+            if actor.exitcode not in (None, 0):
+                raise RuntimeError(f"{actor.name} exited with code {actor.exitcode}")
+
+    @staticmethod
+    def _shutdown(actors, ready, timeout: float = 5.0):
+        """Join the actors, draining ``ready`` so their queue feeders can exit."""
+        deadline = time.monotonic() + timeout
+        for actor in actors:
+            while actor.is_alive() and time.monotonic() < deadline:
+                try:
+                    while True:
+                        ready.get_nowait()
+                except queue.Empty:
+                    pass
+                actor.join(timeout=0.05)
+            if actor.is_alive():
+                actor.terminate()
+                actor.join()
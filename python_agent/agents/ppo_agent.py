@@ -0,0 +1,236 @@
+"""
+PPO Agent for TeamsClone-RL
+
+On-policy counterpart to the DQN RLAgent. Rollouts of a fixed horizon are
+collected from ``num_envs`` concurrent episodes through VecTeamsEnv, GAE
+advantages are computed with NumPy across all episodes at once, and the
+actor-critic network (ppo.PPO) is trained with minibatched epochs.
+
+Environment time and update time are measured separately, so the printed
+steps/sec is the rollout throughput and the update time is the learner cost.
+
+Usage:
+    PYTHONPATH=. python agents/ppo_agent.py --num-envs 16 --iterations 50
+    PYTHONPATH=. python agents/ppo_agent.py --backend http --num-envs 32 --batch-requests
+"""
+
+from action_space import ActionSpace
+from encoders import ConcatEncoder, StateEncoder
+from ppo import PPO, RolloutBuffer, compute_gae
+from text_features import TextFeaturizer
+from vec_env import VecTeamsEnv
+import argparse
+import numpy as np
+import sys
+import os
+import time
+
+# Add parent directory to path to import client
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class PPOAgent:
+    """
+    PPO learner driving a VecTeamsEnv.
+
+    Each iteration collects ``horizon`` steps from every slot
+    (horizon * num_envs transitions) and then runs the PPO update.
+    """
+
+    def __init__(self, env: VecTeamsEnv = None, num_envs: int = 16,
+                 horizon: int = 64, gamma: float = 0.95, gae_lambda: float = 0.95,
+                 hidden_sizes=(64, 64), lr: float = 3e-4, clip_range: float = 0.2,
+                 vf_coef: float = 0.5, ent_coef: float = 0.01, epochs: int = 4,
+                 minibatch_size: int = 256, action_space: ActionSpace = None,
+                 mask_invalid: bool = True, seed: int = None, **env_kwargs):
+        """
+        Args:
+            env: Optional VecTeamsEnv; one is created from num_envs and
+                env_kwargs (backend, base_url, batch_requests, ...) when omitted.
+                Its encode_fn and action_fn are set by the agent.
+            num_envs: Number of concurrent episodes (when creating the env)
+            horizon: Steps per slot per rollout
+            gamma: Discount factor
+            gae_lambda: GAE lambda
+            hidden_sizes: Actor-critic trunk widths
+            lr: Adam learning rate
+            clip_range: PPO clip epsilon
+            vf_coef: Value loss coefficient
+            ent_coef: Entropy bonus coefficient
+            epochs: Update passes per rollout
+            minibatch_size: Samples per gradient step
+            action_space: Discrete action catalog (ActionSpace() by default)
+            mask_invalid: Sample only actions ActionSpace.mask allows
+            seed: Seed for the simulator, network and sampling
+        """
+        self.encoder = ConcatEncoder(StateEncoder(), TextFeaturizer(dim=64))
+        if env is None:
+            env = VecTeamsEnv(num_envs, seed=seed, **env_kwargs)
+        self.action_space = action_space or ActionSpace()
+        self.mask_invalid = mask_invalid
+        env.encode_fn = self.encoder
+        env.action_fn = self.action_space.to_action
+        self.env = env
+        self.horizon = horizon
+        self.gamma = gamma
+        self.gae_lambda = gae_lambda
+        self.ppo = PPO(self.encoder.dim, self.action_space.n, hidden_sizes=hidden_sizes,
+                       lr=lr, clip_range=clip_range, vf_coef=vf_coef, ent_coef=ent_coef,
+                       epochs=epochs, minibatch_size=minibatch_size, seed=seed)
+        self.rollout = RolloutBuffer(horizon, env.num_envs, self.encoder.dim,
+                                     num_actions=self.action_space.n if mask_invalid else None)
+        self.obs = None
+        self.total_steps = 0
+
+    def collect(self) -> dict:
+        """
+        Fill the rollout buffer with ``horizon`` steps from every slot.
+
+        Returns:
+            Dictionary with env_seconds (time inside env.step), policy_seconds,
+            last_values and the finished episodes' info dicts
+        """
+        if self.obs is None:
+            self.obs = self.env.reset()
+        rollout = self.rollout
+        env_seconds = policy_seconds = 0.0
+        episodes = []
+
+        for t in range(self.horizon):
+            start = time.perf_counter()
+            mask = None
+            if self.mask_invalid:
+                mask = self.action_space.mask_batch(self.env.states, out=rollout.masks[t])
+            actions, log_probs, values = self.ppo.act(self.obs, mask)
+            policy_seconds += time.perf_counter() - start
+
+            rollout.obs[t] = self.obs
+            rollout.actions[t] = actions
+            rollout.log_probs[t] = log_probs
+            rollout.values[t] = values
+
+            start = time.perf_counter()
+            self.obs, rewards, dones, infos = self.env.step(actions)
+            env_seconds += time.perf_counter() - start
+
+            rollout.rewards[t] = rewards
+            rollout.dones[t] = dones
+            episodes.extend(info['episode'] for info in infos if 'episode' in info)
+
+        self.total_steps += self.horizon * self.env.num_envs
+        return {
+            'env_seconds': env_seconds,
+            'policy_seconds': policy_seconds,
+            'last_values': self.ppo.value(self.obs),
+            'episodes': episodes,
+        }
+
+    def train(self, iterations: int = 50, verbose: bool = True) -> list:
+        """
+        Alternate rollouts and PPO updates.
+
+        Args:
+            iterations: Number of rollout + update iterations
+            verbose: Print one line per iteration
+
+        Returns:
+            List of per-iteration metric dicts (env_steps_per_second,
+            update_seconds, mean_episode_reward, completion_rate and the
+            PPO loss statistics)
+        """
+        print("🤖 Starting PPO Training")
+        print("=" * 50)
+        history = []
+        steps_per_iteration = self.horizon * self.env.num_envs
+
+        for iteration in range(iterations):
+            collected = self.collect()
+            rollout = self.rollout
+
+            start = time.perf_counter()
+            advantages, returns = compute_gae(rollout.rewards, rollout.values, rollout.dones,
+                                              collected['last_values'],
+                                              self.gamma, self.gae_lambda)
+            stats = self.ppo.update(rollout.obs, rollout.actions, rollout.log_probs,
+                                    advantages, returns, rollout.masks)
+            update_seconds = time.perf_counter() - start
+
+            episodes = collected['episodes']
+            metrics = {
+                'iteration': iteration + 1,
+                'env_steps': self.total_steps,
+                'env_steps_per_second': steps_per_iteration / collected['env_seconds'],
+                'policy_seconds': collected['policy_seconds'],
+                'update_seconds': update_seconds,
+                'episodes': len(episodes),
+                'mean_episode_reward': float(np.mean([e['r'] for e in episodes])) if episodes else float('nan'),
+                'completion_rate': float(np.mean([e['completed'] for e in episodes])) if episodes else float('nan'),
+                **stats,
+            }
+            history.append(metrics)
+            if verbose:
+                print(f"Iter {iteration + 1}/{iterations} | "
+                      f"Reward: {metrics['mean_episode_reward']:.2f} | "
+                      f"Completed: {metrics['completion_rate']:.0%} | "
+                      f"Env: {metrics['env_steps_per_second']:.0f} steps/s | "
+                      f"Update: {update_seconds * 1000:.0f} ms | "
+                      f"KL: {stats['approx_kl']:.4f}")
+
+        print("\n✅ Training Complete!")
+        return history
+
+    def evaluate(self, num_episodes: int = 20, deterministic: bool = True) -> list:
+        """
+        Run the policy until ``num_episodes`` episodes have finished.
+
+        Returns:
+            List of finished episode info dicts (r, l, task_type, completed)
+        """
+        obs = self.env.reset()
+        finished = []
+        while len(finished) < num_episodes:
+            mask = self.action_space.mask_batch(self.env.states) if self.mask_invalid else None
+            actions, _, _ = self.ppo.act(obs, mask, deterministic=deterministic)
+            obs, _, _, infos = self.env.step(actions)
+            finished.extend(info['episode'] for info in infos if 'episode' in info)
+        self.obs = None
+        finished = finished[:num_episodes]
+        rewards = [e['r'] for e in finished]
+        print(f"📈 Average Reward: {np.mean(rewards):.2f} ± {np.std(rewards):.2f} | "
+              f"Completed: {np.mean([e['completed'] for e in finished]):.0%}")
+        return finished
+
+    def save(self, path: str):
+        """Save a checkpoint (.npz) of the network and optimizer state."""
+        self.ppo.save(path, total_steps=self.total_steps)
+
+    def load(self, path: str):
+        """Load a checkpoint written by save()."""
+        self.total_steps = int(self.ppo.load(path).get('total_steps', 0))
+
+    def close(self):
+        self.env.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the NumPy PPO agent')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--num-envs', type=int, default=16)
+    parser.add_argument('--horizon', type=int, default=64)
+    parser.add_argument('--backend', default='local', choices=['local', 'http', 'socket', 'sharded'])
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    parser.add_argument('--batch-requests', action='store_true')
+    parser.add_argument('--save', default=None, help='Checkpoint path to write after training')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    agent = PPOAgent(num_envs=args.num_envs, horizon=args.horizon, seed=args.seed,
+                     backend=args.backend, base_url=args.base_url,
+                     batch_requests=args.batch_requests)
+    try:
+        agent.train(iterations=args.iterations)
+        agent.evaluate(num_episodes=20)
+        if args.save:
+            agent.save(args.save)
+    finally:
+        agent.close()
@@ -1,37 +1,98 @@
 """
-RL Agent Template for TeamsClone-RL
-
-Template for implementing reinforcement learning agents (DQN, PPO, A3C, etc.)
-
-This is a starting point - team members can implement their own RL algorithms here.
+RL Agent for TeamsClone-RL
+
+DQN agent implemented with NumPy only (see dqn.py and mlp.py), so it trains
+on plain CPU machines. States are encoded with StateEncoder + TextFeaturizer,
+transitions go into a ReplayBuffer, and actions come from the discrete
+ActionSpace catalog, with actions that are invalid in the current state
+masked out.
+
+Usage:
+    PYTHONPATH=. python agents/rl_agent.py --episodes 300 --local
+    PYTHONPATH=. python agents/rl_agent.py --episodes 300 --checkpoint-dir checkpoints
+    PYTHONPATH=. python agents/rl_agent.py --local --actors 8 --total-steps 200000
 """
 
-from client import TeamsEnvClient, ObservationWrapper
+from action_space import ActionSpace
+from actor_learner import ActorLearner
+from client import TeamsEnvClient
+from dqn import DQN, LinearSchedule
+from encoders import StateEncoder
+from episode_driver import EpisodeDriver
+from replay_buffer import ReplayBuffer
+from text_features import TextFeaturizer
+import argparse
 import numpy as np
 import sys
 import os
+import time
 
 # Add parent directory to path to import client
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-
 class RLAgent:
     """
-    Template for RL Agent implementation.
+    DQN agent.
 
-    Team members should implement:
-    - State representation/encoding
-    - Neural network architecture
-    - Training loop
-    - Action selection policy
+    Learning starts after ``learning_starts`` environment steps; after that the
+    network is updated every ``train_freq`` steps on a replay batch, epsilon
+    decays linearly over ``epsilon_decay_steps`` steps, and checkpoints are
+    written every ``checkpoint_every`` episodes when ``checkpoint_dir`` is set.
     """
 
-    def __init__(self):
-        self.client = TeamsEnvClient()
-
-        # TODO: Initialize your RL model here
-        # Example: self.model = DQN(...) or self.model = PPO(...)
-        pass
+    def __init__(self, client=None, hidden_sizes=(128, 128), lr: float = 1e-3,
+                 gamma: float = 0.95, batch_size: int = 64,
+                 replay_capacity: int = 100_000, learning_starts: int = 500,
+                 train_freq: int = 1, target_update: int = 500,
+                 epsilon_start: float = 1.0, epsilon_end: float = 0.05,
+                 epsilon_decay_steps: int = 10_000,
+                 checkpoint_dir: str = None, checkpoint_every: int = 50,
+                 action_space: ActionSpace = None, mask_invalid: bool = True,
+                 prefetch_resets: bool = True, seed: int = None):
+        """
+        Args:
+            client: TeamsEnvClient-compatible client (LocalTeamsEnv works too);
+                a TeamsEnvClient() for the default server when omitted
+            hidden_sizes: Q-network hidden layer widths
+            lr: Adam learning rate
+            gamma: Discount factor
+            batch_size: Replay batch size
+            replay_capacity: Replay buffer capacity (transitions)
+            learning_starts: Environment steps before the first update
+            train_freq: Environment steps per gradient update
+            target_update: Gradient updates between target network syncs
+            epsilon_start: Initial exploration rate
+            epsilon_end: Final exploration rate
+            epsilon_decay_steps: Steps over which epsilon decays
+            checkpoint_dir: Directory for periodic checkpoints (None disables)
+            checkpoint_every: Episodes between checkpoints
+            action_space: Discrete action catalog (ActionSpace() by default)
+            mask_invalid: Only choose (and bootstrap from) actions that
+                ActionSpace.mask allows in the current state
+            prefetch_resets: Reset the next episode in the background while
+                the current one runs (remote clients only; see episode_driver)
+            seed: Seed for network initialization, exploration and sampling
+        """
+        self.client = client if client is not None else TeamsEnvClient()
+        self.episodes = EpisodeDriver(self.client, prefetch=prefetch_resets)
+        self.encoder = StateEncoder()
+        self.text_featurizer = TextFeaturizer(dim=64)
+        self.action_space = action_space or ActionSpace()
+        self.num_actions = self.action_space.n
+        self.mask_invalid = mask_invalid
+        self.dqn = DQN(self.state_dim, self.num_actions, hidden_sizes=hidden_sizes,
+                       lr=lr, gamma=gamma, target_update=target_update, seed=seed)
+        # Encoded transitions; actions are ActionSpace indices
+        self.replay = ReplayBuffer(
+            replay_capacity, self.state_dim, seed=seed,
+            extra_columns={'next_masks': ((self.num_actions,), np.bool_)})
+        self.batch_size = batch_size
+        self.learning_starts = learning_starts
+        self.train_freq = train_freq
+        self.epsilon = LinearSchedule(epsilon_start, epsilon_end, epsilon_decay_steps)
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.total_steps = 0
 
     def encode_state(self, state: dict) -> np.ndarray:
         """
@@ -41,35 +102,26 @@ class RLAgent:
             state: Raw state dictionary from environment
 
         Returns:
-            Encoded state as numpy array
-
-        TODO: Implement state encoding
-        - Extract relevant features (channel info, message history, etc.)
-        - Normalize values
-        - Return fixed-size vector
+            Encoded state as a fixed-width float32 array: the structured
+            features (see encoders.StateEncoder) followed by the mean hashed
+            text features of the recent messages (see text_features)
         """
-        obs = ObservationWrapper(state)
-
-        # Example encoding (team should improve this):
-        features = []
+        return np.concatenate([self.encoder.encode(state),
+                               self.text_featurizer.encode_state(state)])
 
-        # 1. One-hot encode current channel
-        all_channels = obs.get_all_channel_ids()
-        current_channel = obs.get_current_channel_id()
-        channel_encoding = [1 if ch ==
-                            current_channel else 0 for ch in all_channels]
-        features.extend(channel_encoding)
-
-        # 2. Number of recent messages
-        features.append(len(obs.recent_messages) / 10.0)  # Normalize
-
-        # 3. Has unread mentions
-        features.append(1.0 if obs.has_unread_mentions() else 0.0)
-
-        # 4. Episode statistics
-        features.append(obs.episode_stats.get('stepCount', 0) / 100.0)
+    def encode_states(self, states: list) -> np.ndarray:
+        """
+        Encode a batch of states into one (len(states), state_dim) float32 matrix.
+        """
+        out = np.empty((len(states), self.state_dim), dtype=np.float32)
+        self.encoder.encode_batch(states, out=out[:, :self.encoder.dim])
+        self.text_featurizer.encode_batch(states, out=out[:, self.encoder.dim:])
+        return out
 
-        return np.array(features, dtype=np.float32)
+    @property
+    def state_dim(self) -> int:
+        """Width of encode_state / encode_states rows."""
+        return self.encoder.dim + self.text_featurizer.dim
 
     def select_action(self, state: dict, epsilon: float = 0.1):
         """
@@ -81,73 +133,61 @@ class RLAgent:
 
         Returns:
             Action dictionary
-
-        TODO: Implement action selection
-        - Use neural network to predict Q-values or policy
-        - Apply exploration strategy
-        - Map network output to valid action
         """
-        # TODO: Replace with actual RL policy
-
-        # Placeholder: Random action with epsilon-greedy
-        import random
-
-        if random.random() < epsilon:
-            # Explore: random action
-            action_types = ['send_message', 'switch_channel', 'join_call']
-            action_type = random.choice(action_types)
-        else:
-            # Exploit: use learned policy
-            # TODO: Get action from neural network
-            action_type = 'send_message'
-
-        # Build action
-        if action_type == 'send_message':
-            return {
-                'type': 'send_message',
-                'payload': {'content': 'RL Agent message'}
-            }
-        elif action_type == 'switch_channel':
-            obs = ObservationWrapper(state)
-            channels = obs.get_all_channel_ids()
-            return {
-                'type': 'switch_channel',
-                'payload': {'channelId': random.choice(channels)}
-            }
-        else:
-            return {'type': 'join_call', 'payload': {}}
-
-    def train(self, num_episodes: int = 100):
+        index = self.dqn.act(self.encode_state(state), epsilon, self._mask(state))
+        return self.action_space.to_action(index, state)
+
+    def _mask(self, state: dict) -> np.ndarray:
+        if self.mask_invalid:
+            return self.action_space.mask(state)
+        return np.ones(self.num_actions, dtype=np.bool_)
+
+    def _reset(self, prefetch_next: bool = True):
+        """Start an episode; returns (episode_id, state)."""
+        result = self.episodes.next_episode(prefetch_next=prefetch_next)
+        return result.get('episodeId'), result.get('state', result)
+
+    def train(self, num_episodes: int = 100, max_steps: int = 50,
+              verbose: bool = True) -> dict:
         """
         Training loop for RL agent.
 
         Args:
             num_episodes: Number of training episodes
+            max_steps: Step limit per episode (the task's own limit usually
+                ends the episode first)
+            verbose: Print one line per episode
 
-        TODO: Implement training logic
-        - Collect experience
-        - Update neural network
-        - Log metrics
-        - Save checkpoints
+        Returns:
+            Dictionary with episode_rewards, losses, steps, updates,
+            steps_per_second, updates_per_second and resets (the
+            EpisodeDriver counters for this run, e.g. saved_seconds)
         """
         print("🤖 Starting RL Agent Training")
         print("=" * 50)
 
+        episode_rewards = []
+        losses = []
+        updates = 0
+        update_seconds = 0.0
+        reset_counters = self.episodes.stats()
+        start = time.perf_counter()
+
         for episode in range(num_episodes):
-            state = self.client.reset()
+            episode_id, state = self._reset(prefetch_next=episode < num_episodes - 1)
+            obs = self.encode_state(state)
+            mask = self._mask(state)
             episode_reward = 0
             done = False
             step = 0
 
-            # TODO: Initialize episode-specific variables
-            # episode_buffer = []
-
-            while not done and step < 50:
+            while not done and step < max_steps:
                 # Select action
-                action = self.select_action(state, epsilon=0.1)
+                action_index = self.dqn.act(obs, self.epsilon(self.total_steps), mask)
+                action = self.action_space.to_action(action_index, state)
 
                 # Execute action
-                result = self.client.step(action)
+                result = self.client.step(action, episode_id)
 
                 next_state = result.get('state', {})
                 reward = result.get('reward', 0)
@@ -155,70 +195,156 @@ class RLAgent:
 
                 episode_reward += reward
 
-                # TODO: Store transition in replay buffer
-                # episode_buffer.append((state, action, reward, next_state, done))
+                next_obs = self.encode_state(next_state)
+                next_mask = self._mask(next_state)
+                self.replay.add(obs, action_index, reward, next_obs, done,
+                                next_masks=next_mask)
+                self.total_steps += 1
 
-                # TODO: Update model
-                # if len(replay_buffer) > batch_size:
-                #     batch = sample_batch(replay_buffer)
-                #     loss = update_model(batch)
+                if (self.total_steps >= self.learning_starts
+                        and self.total_steps % self.train_freq == 0):
+                    update_start = time.perf_counter()
+                    loss, _ = self.dqn.update(self.replay.sample(self.batch_size))
+                    update_seconds += time.perf_counter() - update_start
+                    losses.append(loss)
+                    updates += 1
 
                 state = next_state
+                obs = next_obs
+                mask = next_mask
                 step += 1
 
-            # TODO: Log metrics
-            print(
-                f"Episode {episode + 1}/{num_episodes} | Reward: {episode_reward:.2f}")
+            episode_rewards.append(episode_reward)
+            if verbose:
+                recent_loss = np.mean(losses[-step:]) if losses else float('nan')
+                print(f"Episode {episode + 1}/{num_episodes} | Reward: {episode_reward:.2f}"
+                      f" | Epsilon: {self.epsilon(self.total_steps):.2f} | Loss: {recent_loss:.4f}")
 
-            # TODO: Save checkpoint periodically
-            # if (episode + 1) % 10 == 0:
-            #     save_model(f'checkpoint_{episode + 1}.pth')
+            if (self.checkpoint_dir and self.checkpoint_every
+                    and (episode + 1) % self.checkpoint_every == 0):
+                os.makedirs(self.checkpoint_dir, exist_ok=True)
+                self.save(os.path.join(self.checkpoint_dir, f'checkpoint_{episode + 1}.npz'))
 
+        elapsed = time.perf_counter() - start
+        resets = {key: value - reset_counters[key] for key, value in self.episodes.stats().items()}
         print("\n✅ Training Complete!")
+        print(f"   {self.total_steps} steps, {updates} updates,"
+              f" {updates / update_seconds if update_seconds else 0:.0f} updates/s")
+        if resets['prefetch_hits']:
+            print(f"   Reset prefetch saved {resets['saved_seconds']:.2f}s"
+                  f" ({resets['prefetch_hits']}/{resets['resets']} resets prefetched)")
+        return {
+            'episode_rewards': episode_rewards,
+            'losses': losses,
+            'steps': self.total_steps,
+            'updates': updates,
+            'steps_per_second': self.total_steps / elapsed if elapsed else 0.0,
+            'updates_per_second': updates / update_seconds if update_seconds else 0.0,
+            'resets': resets,
+        }
+
+    def train_actor_learner(self, total_steps: int, num_actors: int = 4,
+                            verbose: bool = True, **kwargs) -> dict:
+        """
+        Train with rollouts collected by ``num_actors`` worker processes.
+
+        Actors run their own environments (see actor_learner.ActorLearner for
+        the backend options) while this process learns; the replay buffer,
+        network and schedule are the same ones train() uses.
 
-    def evaluate(self, num_episodes: int = 10):
+        Args:
+            total_steps: Environment steps to collect across all actors
+            num_actors: Number of actor processes
+            verbose: Print progress lines
+            **kwargs: Further ActorLearner options (backend, base_url,
+                chunk_size, sync_every, seed, ...)
+
+        Returns:
+            Dictionary like train() returns, plus actor_steps and
+            learner_idle_fraction
+        """
+        learner = ActorLearner(self, num_actors=num_actors, **kwargs)
+        return learner.train(total_steps, verbose=verbose)
+
+    def evaluate(self, num_episodes: int = 10, max_steps: int = 50) -> list:
         """
         Evaluate trained agent.
 
         Args:
             num_episodes: Number of evaluation episodes
+            max_steps: Step limit per episode
+
+        Returns:
+            List of episode rewards
         """
         print("📊 Evaluating Agent")
 
         total_rewards = []
 
         for episode in range(num_episodes):
-            state = self.client.reset()
+            episode_id, state = self._reset(prefetch_next=episode < num_episodes - 1)
             episode_reward = 0
             done = False
+            step = 0
 
-            while not done:
+            while not done and step < max_steps:
                 action = self.select_action(
                     state, epsilon=0.0)  # No exploration
-                result = self.client.step(action)
+                result = self.client.step(action, episode_id)
 
                 state = result.get('state', {})
                 reward = result.get('reward', 0)
                 done = result.get('done', False)
 
                 episode_reward += reward
+                step += 1
 
             total_rewards.append(episode_reward)
             print(f"Episode {episode + 1}: Reward = {episode_reward:.2f}")
 
         print(
             f"\n📈 Average Reward: {np.mean(total_rewards):.2f} ± {np.std(total_rewards):.2f}")
+        return total_rewards
 
+    def save(self, path: str):
+        """Save a checkpoint (.npz) of the Q-networks and optimizer state."""
+        self.dqn.save(path, total_steps=self.total_steps)
 
-if __name__ == '__main__':
-    # Example usage
-    agent = RLAgent()
-
-    # TODO: Implement training
-    # agent.train(num_episodes=100)
+    def load(self, path: str):
+        """Load a checkpoint written by save()."""
+        extra = self.dqn.load(path)
+        self.total_steps = int(extra.get('total_steps', 0))
 
-    # TODO: Implement evaluation
-    # agent.evaluate(num_episodes=10)
 
-    print("\n⚠️  This is a template. Implement the RL algorithm!")
-    print("Suggested libraries: PyTorch, Stable-Baselines3, RLlib")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the NumPy DQN agent')
+    parser.add_argument('--episodes', type=int, default=300)
+    parser.add_argument('--eval-episodes', type=int, default=10)
+    parser.add_argument('--local', action='store_true',
+                        help='Use the in-process simulator instead of the backend')
+    parser.add_argument('--checkpoint-dir', default=None)
+    parser.add_argument('--load', default=None, help='Checkpoint to resume from')
+    parser.add_argument('--actors', type=int, default=0,
+                        help='Collect rollouts in this many actor processes')
+    parser.add_argument('--total-steps', type=int, default=20_000,
+                        help='Environment steps to collect with --actors')
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.local:
+        from local_env import LocalTeamsEnv
+        client = LocalTeamsEnv(seed=args.seed)
+    else:
+        client = TeamsEnvClient(args.base_url)
+
+    agent = RLAgent(client, checkpoint_dir=args.checkpoint_dir, seed=args.seed)
+    if args.load:
+        agent.load(args.load)
+    if args.actors:
+        agent.train_actor_learner(args.total_steps, num_actors=args.actors,
+                                  backend='local' if args.local else 'http',
+                                  base_url=args.base_url, seed=args.seed)
+    else:
+        agent.train(num_episodes=args.episodes, verbose=False)
+    agent.evaluate(num_episodes=args.eval_episodes)
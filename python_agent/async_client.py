@@ -0,0 +1,314 @@
+"""
+Asyncio Client for TeamsClone-RL
+
+Non-blocking counterpart of TeamsEnvClient plus an episode driver that keeps
+many episodes in flight against one backend at the same time.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import aiohttp
+
+from client import MAX_SESSION_TOKENS, unix_socket_path
+
+
+class AsyncTeamsEnvClient:
+    """Asyncio client for interacting with TeamsClone-RL environment."""
+
+    def __init__(self, base_url: str = 'http://localhost:3001',
+                 max_connections: int = 100,
+                 timeout: Optional[float] = 10.0):
+        """
+        Initialize the async environment client.
+
+        The underlying ``aiohttp.ClientSession`` is created lazily on first
+        use so the client can be constructed outside of a running event loop.
+
+        Args:
+            base_url: Base URL of the TeamsClone-RL backend, or
+                ``unix:///path/to/server.sock`` (see TeamsEnvClient)
+            max_connections: Maximum number of simultaneous keep-alive connections
+            timeout: Default timeout in seconds for each call (None waits forever)
+        """
+        self.base_url = base_url
+        self.socket_path = unix_socket_path(base_url)
+        self.env_url = f"{'http://localhost' if self.socket_path else base_url}/env"
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.last_episode_id: Optional[str] = None
+        # episodeId -> session token from its reset (see TeamsEnvClient)
+        self._session_tokens: 'OrderedDict[str, str]' = OrderedDict()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            if self.socket_path:
+                connector = aiohttp.UnixConnector(path=self.socket_path, limit=self.max_connections)
+            else:
+                connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _request(self, method: str, path: str,
+                       timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        """Send a request to an ``/env`` endpoint and decode the JSON body."""
+        session = await self._get_session()
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        async with session.request(method, f"{self.env_url}{path}", **kwargs) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def _scope(self, episode_id: Optional[str]) -> Dict[str, str]:
+        """
+        Request fields naming an episode: its id (by default the episode this
+        client last reset) and the session token from its reset, if this
+        client started it.
+        """
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        if not episode_id:
+            return {}
+        scope = {'episodeId': episode_id}
+        token = self._session_tokens.get(episode_id)
+        if token:
+            scope['sessionToken'] = token
+        return scope
+
+    def _track_reset(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember the new episode and its session token."""
+        episode_id = result.get('episodeId')
+        if episode_id:
+            self.last_episode_id = episode_id
+            self._session_tokens.pop(episode_id, None)
+            token = result.get('sessionToken')
+            if token:
+                self._session_tokens[episode_id] = token
+                while len(self._session_tokens) > MAX_SESSION_TOKENS:
+                    self._session_tokens.popitem(last=False)
+        return result
+
+    async def close(self):
+        """Close the underlying HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def reset(self, episode_id: Optional[str] = None, task_type: Optional[str] = None,
+                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Reset the environment and start a new episode.
+
+        Args:
+            episode_id: Optional episode ID to use
+            task_type: Optional task type to assign (e.g., 'greeting_response')
+            timeout: Optional timeout override for this call
+
+        Returns:
+            Dictionary with episodeId, sessionToken, state and task (see
+            TeamsEnvClient.reset)
+        """
+        payload = {}
+        if episode_id:
+            payload['episodeId'] = episode_id
+        if task_type:
+            payload['taskType'] = task_type
+        return self._track_reset(
+            await self._request('POST', '/reset', json=payload, timeout=timeout))
+
+    async def get_state(self, timeout: Optional[float] = None,
+                        episode_id: Optional[str] = None,
+                        fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get an episode's state (defaults to the episode this client last
+        reset). ``fields`` fetches only those observation sections.
+        """
+        params = self._scope(episode_id)
+        if fields is not None:
+            params['fields'] = ','.join(fields)
+        data = await self._request('GET', '/state', params=params, timeout=timeout)
+        return data.get('state', {})
+
+    async def step(self, action: Dict[str, Any], episode_id: Optional[str] = None,
+                   timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute an action in the environment.
+
+        Args:
+            action: Action dictionary with 'type' and 'payload'
+            episode_id: Episode ID to act in (defaults to the episode this
+                client last reset). Always pass it when several episodes are
+                running concurrently.
+            timeout: Optional timeout override for this call
+
+        Returns:
+            Dictionary with state, reward, done and info
+        """
+        payload = {'action': action, **self._scope(episode_id)}
+        return await self._request('POST', '/step', json=payload, timeout=timeout)
+
+    async def get_actions(self, timeout: Optional[float] = None,
+                          episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get available actions and an episode's channels."""
+        params = self._scope(episode_id)
+        return await self._request('GET', '/actions', params=params, timeout=timeout)
+
+    async def get_stats(self, episode_id: Optional[str] = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get episode statistics (defaults to the episode this client last reset)."""
+        params = self._scope(episode_id)
+        data = await self._request('GET', '/stats', params=params, timeout=timeout)
+        return data.get('stats', {})
+
+    async def get_episode_info(self, episode_id: str,
+                               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get detailed information about a specific episode."""
+        data = await self._request('GET', f'/info/{episode_id}', timeout=timeout)
+        return data.get('episode', {})
+
+    async def get_history(self, limit: int = 10, timeout: Optional[float] = None) -> list:
+        """Get episode history."""
+        data = await self._request('GET', '/history', params={'limit': limit}, timeout=timeout)
+        return data.get('history', [])
+
+    async def get_tasks(self, timeout: Optional[float] = None) -> list:
+        """Get all available task definitions."""
+        data = await self._request('GET', '/tasks', timeout=timeout)
+        return data.get('tasks', [])
+
+
+async def run_episode_async(client: AsyncTeamsEnvClient,
+                            select_action: Callable[[Dict[str, Any]], Dict[str, Any]],
+                            task_type: Optional[str] = None,
+                            max_steps: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run one episode to completion, always addressing it by its episodeId.
+
+    Args:
+        client: Async environment client
+        select_action: Policy mapping a state dict to an action dict
+            (e.g. ``TaskAgent().select_action``)
+        task_type: Specific task to attempt (None for random)
+        max_steps: Optional safety limit on steps
+
+    Returns:
+        Episode summary dictionary
+    """
+    reset_result = await client.reset(task_type=task_type)
+    episode_id = reset_result['episodeId']
+    state = reset_result['state']
+
+    step = 0
+    total_reward = 0.0
+    done = False
+    info: Dict[str, Any] = {}
+
+    while not done:
+        action = select_action(state)
+        result = await client.step(action, episode_id)
+        state = result['state']
+        total_reward += result['reward']
+        done = result['done']
+        info = result.get('info', {})
+        step += 1
+
+        if max_steps and step >= max_steps:
+            break
+
+    return {
+        'episode_id': episode_id,
+        'task_type': reset_result['task']['type'],
+        'total_reward': total_reward,
+        'steps': step,
+        'completed': state.get('stats', {}).get('taskCompleted', False),
+        'reason': info.get('reason'),
+    }
+
+
+async def run_concurrent_episodes(num_episodes: int,
+                                  select_action: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                                  client: Optional[AsyncTeamsEnvClient] = None,
+                                  base_url: str = 'http://localhost:3001',
+                                  concurrency: int = 32,
+                                  task_type: Optional[str] = None,
+                                  max_steps: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run many episodes concurrently against one backend.
+
+    At most ``concurrency`` episodes are in flight at any time. Each episode
+    is keyed by its own episodeId, so they never interfere with each other.
+    Episodes that raise are recorded in ``errors`` instead of aborting the run.
+
+    Args:
+        num_episodes: Total number of episodes to run
+        select_action: Policy mapping a state dict to an action dict.
+            Defaults to ``TaskAgent().select_action``.
+        client: Optional shared client (one is created and closed otherwise)
+        base_url: Backend URL used when no client is given
+        concurrency: Maximum number of episodes in flight
+        task_type: Specific task to attempt (None for random)
+        max_steps: Optional safety limit on steps per episode
+
+    Returns:
+        Aggregated results with per-episode summaries and throughput
+    """
+    if select_action is None:
+        from task_agent import TaskAgent
+        select_action = TaskAgent().select_action
+
+    owns_client = client is None
+    if owns_client:
+        client = AsyncTeamsEnvClient(base_url, max_connections=concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_episode():
+        async with semaphore:
+            return await run_episode_async(client, select_action, task_type, max_steps)
+
+    start = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(
+            *(bounded_episode() for _ in range(num_episodes)),
+            return_exceptions=True
+        )
+    finally:
+        if owns_client:
+            await client.close()
+    elapsed = time.perf_counter() - start
+
+    episodes = [o for o in outcomes if not isinstance(o, BaseException)]
+    errors = [repr(o) for o in outcomes if isinstance(o, BaseException)]
+    total_steps = sum(e['steps'] for e in episodes)
+
+    return {
+        'episodes': episodes,
+        'errors': errors,
+        'num_episodes': len(episodes),
+        'completed': sum(1 for e in episodes if e['completed']),
+        'average_reward': (sum(e['total_reward'] for e in episodes) / len(episodes)) if episodes else 0.0,
+        'total_steps': total_steps,
+        'elapsed': elapsed,
+        'steps_per_sec': total_steps / elapsed if elapsed > 0 else 0.0,
+        'episodes_per_sec': len(episodes) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+if __name__ == '__main__':
+    results = asyncio.run(run_concurrent_episodes(num_episodes=50, concurrency=16))
+    print(f"Episodes: {results['num_episodes']} "
+          f"(completed {results['completed']}, errors {len(results['errors'])})")
+    print(f"Average reward: {results['average_reward']:.2f}")
+    print(f"Throughput: {results['steps_per_sec']:.1f} steps/s "
+          f"in {results['elapsed']:.2f}s")
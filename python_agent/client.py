@@ -4,30 +4,372 @@ TeamsClone-RL Environment Client
 Python client for interacting with the TeamsClone-RL environment API.
 """
 
+import socket
+import threading
+import time
+from collections import OrderedDict
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Any, List, Optional, Sequence, Union
+
+from metrics import ClientMetrics, endpoint_name, parse_server_timing
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for wire_format='msgpack'
+    msgpack = None
+
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+UNIX_SCHEME = 'unix://'
+# Session tokens kept for episodes this client started (oldest dropped first)
+MAX_SESSION_TOKENS = 4096
+
+
+def unix_socket_path(base_url: str) -> Optional[str]:
+    """Socket path of a ``unix:///path/to/server.sock`` URL, or None for other URLs."""
+    if not base_url.startswith(UNIX_SCHEME):
+        return None
+    path = base_url[len(UNIX_SCHEME):].rstrip('/')
+    if not path:
+        raise ValueError(f"No socket path in {base_url!r}")
+    return path
+
+
+class _CountingPoolMixin:
+    """Connection pool mixin that records whether each request reused a socket."""
+
+    counters: Dict[str, int] = {}
+    counters_lock = threading.Lock()
+
+    def _make_request(self, conn, *args, **kwargs):
+        key = 'new_connections' if getattr(conn, 'sock', None) is None else 'reused_connections'
+        with self.counters_lock:
+            self.counters[key] += 1
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    """urllib3 connection that connects to ``socket_path`` instead of host:port."""
+
+    socket_path = ''
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise NewConnectionError(self, f"Failed to connect to {self.socket_path}: {e}") from e
+        return sock
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts new versus reused keep-alive connections.
+
+    With ``socket_path`` every http:// connection goes to that Unix domain
+    socket; the URL's host only fills the Host header.
+    """
+
+    def __init__(self, *args, socket_path: Optional[str] = None, **kwargs):
+        self.counters = {'new_connections': 0, 'reused_connections': 0}
+        self.counters_lock = threading.Lock()
+        self.socket_path = socket_path
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {'counters': self.counters, 'counters_lock': self.counters_lock}
+        classes = {
+            scheme: type(f"Counting{pool_cls.__name__}", (_CountingPoolMixin, pool_cls), attrs)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+        if self.socket_path:
+            connection_cls = type('UnixHTTPConnection', (_UnixHTTPConnection,),
+                                  {'socket_path': self.socket_path})
+            classes['http'] = type('UnixHTTPConnectionPool', (classes['http'],),
+                                   {'ConnectionCls': connection_cls})
+        self.poolmanager.pool_classes_by_scheme = classes
+
+
+class _TTLCache:
+    """Thread-safe TTL cache for responses of static endpoints."""
+
+    def __init__(self, ttl: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Any]:
+        if not self.ttl:
+            return None   # caching is off: nothing to look up or count
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, value: Any):
+        if self.ttl:
+            with self._lock:
+                self._entries[key] = (self.clock() + self.ttl, value)
+
+    def discard(self, key: tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, prefix: Optional[str] = None):
+        """Drop every entry, or only those whose key begins with ``prefix``."""
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == prefix]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
 
 
 class TeamsEnvClient:
-    """Client for interacting with TeamsClone-RL environment."""
-
-    def __init__(self, base_url: str = 'http://localhost:3001'):
+    """
+    Client for interacting with TeamsClone-RL environment.
+
+    All calls go through one persistent ``requests.Session`` so TCP
+    connections are kept alive and reused between ``reset``/``step`` calls
+    instead of being re-established for every request.
+
+    Episode-scoped calls (``step``, ``get_state``, ``get_actions``,
+    ``get_stats``) default to the episode this client last reset, never to
+    whatever episode another client reset on the same server, and carry the
+    session token issued by that reset.
+    """
+
+    def __init__(self, base_url: str = 'http://localhost:3001',
+                 pool_connections: int = 4,
+                 pool_maxsize: int = 16,
+                 keep_alive: bool = True,
+                 timeout: Optional[float] = 10.0,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.1,
+                 delta_observations: bool = False,
+                 max_delta_bases: int = 4096,
+                 wire_format: str = 'json',
+                 cache_ttl: Optional[float] = 60.0,
+                 prefetch: bool = False,
+                 metrics: Optional[ClientMetrics] = None):
         """
         Initialize the environment client.
 
         Args:
-            base_url: Base URL of the TeamsClone-RL backend
+            base_url: Base URL of the TeamsClone-RL backend, or
+                ``unix:///path/to/server.sock`` to connect over the Unix domain
+                socket the backend listens on with ``SOCKET_PATH`` (same host
+                only; skips the TCP loopback stack)
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of connections kept open per host
+                (raise this when stepping many episodes from threads)
+            keep_alive: Reuse connections between requests; set to False to
+                send ``Connection: close`` on every request
+            timeout: Default timeout in seconds for each call (None waits forever).
+                Every method also accepts a per-call ``timeout`` override.
+            max_retries: Retries for failed connections and for idempotent
+                requests answered with 502/503/504. POST requests are only
+                retried when the connection could not be established, so an
+                action is never applied twice.
+            backoff_factor: Exponential backoff factor between retries
+            delta_observations: Ask ``step`` for delta-encoded observations
+                (only the sections changed since the last state this client
+                received) and rebuild the full state locally. Returned states
+                share unchanged sections with the previous one, so treat them
+                as read-only.
+            max_delta_bases: Maximum number of episodes whose last state is
+                kept for delta decoding
+            wire_format: 'json' or 'msgpack'. With 'msgpack' the client sends
+                MessagePack bodies and asks for MessagePack responses via
+                ``Accept``; if the server answers with JSON, the client falls
+                back to JSON. Requires the ``msgpack`` package.
+            cache_ttl: Seconds to cache ``get_tasks`` and ``get_actions``
+                responses (None or 0 disables caching). The action/channel
+                list is cached per episode and dropped on ``reset``. Cached
+                responses are shared between calls, so treat them as read-only.
+            prefetch: Fetch the task and action lists right away so the first
+                calls are served from the cache
+            metrics: ClientMetrics instance to record request latency, sizes,
+                decode time and errors into (e.g. one shared by several
+                clients). A new one is created by default; see ``self.metrics``.
         """
+        if wire_format not in ('json', 'msgpack'):
+            raise ValueError(f"Unknown wire_format: {wire_format}")
+        if wire_format == 'msgpack' and msgpack is None:
+            raise ImportError("wire_format='msgpack' requires the msgpack package "
+                              "(pip install msgpack)")
+
         self.base_url = base_url
-        self.env_url = f"{base_url}/env"
+        self.socket_path = unix_socket_path(base_url)
+        self.env_url = f"{'http://localhost' if self.socket_path else base_url}/env"
+        self.timeout = timeout
+        self.last_episode_id: Optional[str] = None
+        self._session_tokens: 'OrderedDict[str, str]' = OrderedDict()
+        self._session_lock = threading.Lock()
+        self.metrics = metrics if metrics is not None else ClientMetrics()
+
+        self.delta_observations = delta_observations
+        self.max_delta_bases = max_delta_bases
+        self._delta_bases: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = PooledHTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize,
+                                    max_retries=retry,
+                                    socket_path=self.socket_path)
+        self._adapter = adapter
+
+        self.session = requests.Session()
+        if self.socket_path:
+            # Proxy settings from the environment would send requests past the socket
+            self.session.trust_env = False
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        self.wire_format = wire_format
+        self._msgpack_requests = wire_format == 'msgpack'
+        if self._msgpack_requests:
+            self.session.headers['Accept'] = f"{MSGPACK_CONTENT_TYPE}, application/json;q=0.5"
+
+        self._cache = _TTLCache(cache_ttl)
+        if prefetch:
+            self.prefetch()
+
+    def _request(self, method: str, path: str,
+                 timeout: Optional[float] = None,
+                 json: Optional[Any] = None, **kwargs) -> Dict[str, Any]:
+        """Send a request to an ``/env`` endpoint and return the decoded body."""
+        if json is not None:
+            if self._msgpack_requests:
+                kwargs['data'] = msgpack.packb(json)
+                kwargs['headers'] = {'Content-Type': MSGPACK_CONTENT_TYPE}
+            else:
+                kwargs['json'] = json
+
+        endpoint = endpoint_name(method, path)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                f"{self.env_url}{path}",
+                timeout=self.timeout if timeout is None else timeout,
+                **kwargs
+            )
+        except requests.RequestException as e:
+            self.metrics.record(endpoint, time.perf_counter() - start, error=str(e))
+            raise
+        latency = time.perf_counter() - start
+
+        server_time = parse_server_timing(response.headers.get('Server-Timing'))
+        bytes_out = len(response.request.body or b'')
+        if not response.ok:
+            self.metrics.record(endpoint, latency, bytes_out, len(response.content),
+                                server_time=server_time, status=response.status_code,
+                                error=f"HTTP {response.status_code}")
+            response.raise_for_status()
+
+        decode_start = time.perf_counter()
+        data = self._decode(response)
+        self.metrics.record(endpoint, latency, bytes_out, len(response.content),
+                            decode_time=time.perf_counter() - decode_start,
+                            server_time=server_time, status=response.status_code)
+        return data
+
+    def _decode(self, response: requests.Response) -> Dict[str, Any]:
+        """Decode a JSON or MessagePack body based on its Content-Type."""
+        content_type = response.headers.get('Content-Type', '')
+        if 'msgpack' in content_type:
+            return msgpack.unpackb(response.content, raw=False)
+        if self.wire_format == 'msgpack':
+            # Server without MessagePack support: fall back to JSON both ways
+            self._msgpack_requests = False
+        return response.json()
 
-    def reset(self, episode_id: Optional[str] = None, task_type: Optional[str] = None) -> Dict[str, Any]:
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Report how many requests reused a pooled connection.
+
+        Returns:
+            Dictionary with:
+                - requests: Requests sent (including retries)
+                - new_connections: Requests that had to open a new connection
+                - reused_connections: Requests served by an already open connection
+        """
+        with self._adapter.counters_lock:
+            counters = dict(self._adapter.counters)
+        counters['requests'] = counters['new_connections'] + counters['reused_connections']
+        return counters
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Report how often ``get_tasks``/``get_actions`` were served from the cache.
+
+        Returns:
+            Dictionary with hits, misses and size (entries currently cached)
+        """
+        return self._cache.stats()
+
+    def invalidate_cache(self):
+        """Drop every cached response."""
+        self._cache.invalidate()
+
+    def prefetch(self, timeout: Optional[float] = None):
+        """
+        Fill the cache with the task list and the current action list.
+
+        Args:
+            timeout: Optional timeout override for these calls
+        """
+        self.get_tasks(timeout=timeout)
+        self.get_actions(timeout=timeout)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def reset(self, episode_id: Optional[str] = None, task_type: Optional[str] = None,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Reset the environment to initial state and start a new episode.
 
         Args:
             episode_id: Optional episode ID to use
             task_type: Optional task type to assign (e.g., 'greeting_response')
+            timeout: Optional timeout override for this call
 
         Returns:
             Dictionary with:
@@ -41,30 +383,43 @@ class TeamsEnvClient:
         if task_type:
             payload['taskType'] = task_type
 
-        response = requests.post(f"{self.env_url}/reset", json=payload)
-        response.raise_for_status()
-        return response.json()
+        data = self._request('POST', '/reset', json=payload, timeout=timeout)
+        return self._track_reset(data)
 
-    def get_state(self) -> Dict[str, Any]:
+    def get_state(self, timeout: Optional[float] = None,
+                  episode_id: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Get current environment state.
 
+        Args:
+            timeout: Optional timeout override for this call
+            episode_id: Optional episode ID (defaults to the episode this
+                client last reset)
+            fields: Optional observation sections to fetch (e.g.
+                ``['stats', 'agentState']``); the server builds only those.
+                episodeId, version and timestamp are always included.
+
         Returns:
             Current state observation
         """
-        response = requests.get(f"{self.env_url}/state")
-        response.raise_for_status()
-        data = response.json()
+        params = self._scope(episode_id)
+        if fields is not None:
+            params['fields'] = ','.join(fields)
+        data = self._request('GET', '/state', params=params, timeout=timeout)
         return data.get('state', {})
 
-    def step(self, action: Dict[str, Any], episode_id: Optional[str] = None) -> Dict[str, Any]:
+    def step(self, action: Dict[str, Any], episode_id: Optional[str] = None,
+             timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Execute an action in the environment.
 
         Args:
             action: Action dictionary with 'type' and 'payload'
                    Example: {'type': 'send_message', 'payload': {'content': 'Hello'}}
-            episode_id: Optional episode ID to use
+            episode_id: Optional episode ID (defaults to the episode this
+                client last reset)
+            timeout: Optional timeout override for this call
 
         Returns:
             Dictionary with:
@@ -73,104 +428,376 @@ class TeamsEnvClient:
                 - done: Whether episode is finished
                 - info: Additional information
         """
-        payload = {'action': action}
+        if episode_id is None:
+            episode_id = self.last_episode_id
+
+        base = self._delta_base(episode_id)
+        payload = self._step_item(action, episode_id, base)
+        data = self._request('POST', '/step', json=payload, timeout=timeout)
+        return self._track_step(episode_id, data, base)
+
+    def _cached(self, endpoint: str, key: tuple) -> Optional[Any]:
+        """Cached response for ``key``, counted in the metrics; None (and not counted) when caching is off."""
+        if not self._cache.ttl:
+            return None
+        value = self._cache.get(key)
+        self.metrics.record_cache(endpoint, hit=value is not None)
+        return value
+
+    def _delta_base(self, episode_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """State held for an episode to decode its next delta (None outside delta mode)."""
+        if not self.delta_observations or not episode_id:
+            return None
+        return self._delta_bases.get(episode_id)
+
+    def _step_item(self, action: Dict[str, Any], episode_id: Optional[str],
+                   base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a step request body, asking for a delta against ``base`` when one is held."""
+        item = {'action': action, **self._scope(episode_id, default=False)}
+        if base is not None and base.get('version') is not None:
+            item['baseVersion'] = base['version']
+        return item
+
+    def _scope(self, episode_id: Optional[str], default: bool = True) -> Dict[str, str]:
+        """
+        Request fields naming an episode: its id and, for episodes this client
+        started, the session token from their reset. With ``default`` a
+        missing id means the episode this client last reset.
+        """
+        if episode_id is None and default:
+            episode_id = self.last_episode_id
+        if not episode_id:
+            return {}
+        scope = {'episodeId': episode_id}
+        token = self._session_tokens.get(episode_id)
+        if token:
+            scope['sessionToken'] = token
+        return scope
+
+    def _track_reset(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember the new episode, its session token and (in delta mode) its state."""
+        self._cache.invalidate('actions')
+        episode_id = result.get('episodeId')
         if episode_id:
-            payload['episodeId'] = episode_id
+            self.last_episode_id = episode_id
+            token = result.get('sessionToken')
+            with self._session_lock:
+                self._session_tokens.pop(episode_id, None)
+                if token:
+                    self._session_tokens[episode_id] = token
+                    while len(self._session_tokens) > MAX_SESSION_TOKENS:
+                        self._session_tokens.popitem(last=False)
+            if self.delta_observations and 'state' in result:
+                self._store_delta_base(episode_id, result['state'])
+        return result
+
+    def _track_step(self, episode_id: Optional[str], result: Dict[str, Any],
+                    base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Rebuild the full state from a delta response and update the base.
 
-        response = requests.post(
-            f"{self.env_url}/step",
-            json=payload
-        )
-        response.raise_for_status()
-        return response.json()
+        ``base`` is the state the request's baseVersion came from; the delta
+        is relative to it even if another result for the same episode (an
+        earlier item of the same batch) has updated the held base since.
+        """
+        if result.get('done'):
+            # Its action/channel list will not be asked for again
+            self._cache.discard(('actions', episode_id))
+        if not self.delta_observations:
+            return result
+
+        delta = result.pop('stateDelta', None)
+        if delta is not None:
+            episode_id = delta.get('episodeId', episode_id)
+            if base is None:
+                base = self._delta_bases.get(episode_id, {})
+            result['state'] = ObservationWrapper.apply_delta(base, delta)
+
+        state = result.get('state')
+        if episode_id and state is not None:
+            if result.get('done'):
+                with self._session_lock:
+                    self._delta_bases.pop(episode_id, None)
+            else:
+                self._store_delta_base(episode_id, state)
+        return result
+
+    def _store_delta_base(self, episode_id: str, state: Dict[str, Any]):
+        # Threads share the client (VecTeamsEnv's 'http' backend steps every slot at once)
+        with self._session_lock:
+            self._delta_bases[episode_id] = state
+            self._delta_bases.move_to_end(episode_id)
+            while len(self._delta_bases) > self.max_delta_bases:
+                self._delta_bases.popitem(last=False)
+
+    def _batch(self, path: str, items: List[Dict[str, Any]],
+               raise_on_error: bool, timeout: Optional[float]) -> List[Dict[str, Any]]:
+        """Send a batch request and return its per-item results."""
+        data = self._request('POST', path, json={'items': items}, timeout=timeout)
+        return self._check_batch(data.get('results', []), raise_on_error)
+
+    @staticmethod
+    def _check_batch(results: List[Dict[str, Any]], raise_on_error: bool) -> List[Dict[str, Any]]:
+        """Raise on the first failed item when requested."""
+        if raise_on_error:
+            for index, result in enumerate(results):
+                if not result.get('success', False):
+                    raise RuntimeError(
+                        f"Batch item {index} failed: {result.get('error', 'unknown error')}")
+        return results
+
+    def reset_many(self, count: Optional[int] = None,
+                   task_types: Union[None, str, Sequence[Optional[str]]] = None,
+                   episode_ids: Optional[Sequence[Optional[str]]] = None,
+                   raise_on_error: bool = True,
+                   timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Start several episodes in one round trip (POST /env/reset_batch).
+
+        Args:
+            count: Number of episodes (inferred from the lists when omitted)
+            task_types: One task type for all episodes, or one per episode
+            episode_ids: Optional episode IDs, one per episode
+            raise_on_error: Raise RuntimeError if any item failed; otherwise
+                failed items are returned as {'success': False, 'error': ...}
+            timeout: Optional timeout override for this call
+
+        Returns:
+            List of reset results (same shape as reset()), in order
+        """
+        if count is None:
+            if isinstance(task_types, (list, tuple)):
+                count = len(task_types)
+            elif episode_ids is not None:
+                count = len(episode_ids)
+            else:
+                raise ValueError("reset_many needs count, task_types or episode_ids")
+
+        items = []
+        for i in range(count):
+            item = {}
+            task_type = task_types[i] if isinstance(task_types, (list, tuple)) else task_types
+            if task_type:
+                item['taskType'] = task_type
+            if episode_ids is not None and episode_ids[i]:
+                item['episodeId'] = episode_ids[i]
+            items.append(item)
+
+        results = self._batch('/reset_batch', items, raise_on_error, timeout)
+        return [self._track_reset(result) for result in results]
+
+    def step_many(self, actions: Sequence[Dict[str, Any]], episode_ids: Sequence[str],
+                  raise_on_error: bool = True,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Step several episodes in one round trip (POST /env/step_batch).
+
+        Args:
+            actions: One action dictionary per episode
+            episode_ids: Episode ID for each action
+            raise_on_error: Raise RuntimeError if any item failed; otherwise
+                failed items are returned as {'success': False, 'error': ...}
+            timeout: Optional timeout override for this call
 
-    def get_actions(self) -> Dict[str, Any]:
+        Returns:
+            List of step results (same shape as step()), in order
+        """
+        if len(actions) != len(episode_ids):
+            raise ValueError("actions and episode_ids must have the same length")
+
+        # Every item is encoded against the state held before the batch, also
+        # when an episode id repeats (the server steps it once per item)
+        bases = [self._delta_base(episode_id) for episode_id in episode_ids]
+        items = [self._step_item(action, episode_id, base)
+                 for action, episode_id, base in zip(actions, episode_ids, bases)]
+        results = self._batch('/step_batch', items, raise_on_error, timeout)
+        return [self._track_step(episode_id, result, base) if result.get('success', True) else result
+                for episode_id, result, base in zip(episode_ids, results, bases)]
+
+    def get_actions(self, timeout: Optional[float] = None,
+                    episode_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get available actions in the environment.
 
+        Args:
+            timeout: Optional timeout override for this call
+            episode_id: Episode whose channels to list (defaults to the
+                episode this client last reset)
+
         Returns:
             Dictionary containing:
                 - actions: List of available action types
-                - channels: List of available channels
+                - channels: List of the episode's channels
         """
-        response = requests.get(f"{self.env_url}/actions")
-        response.raise_for_status()
-        return response.json()
-
-    def get_stats(self, episode_id: Optional[str] = None) -> Dict[str, Any]:
+        scope = self._scope(episode_id)
+        key = ('actions', scope.get('episodeId'))
+        actions = self._cached('GET /actions', key)
+        if actions is None:
+            actions = self._request('GET', '/actions', params=scope, timeout=timeout)
+            self._cache.put(key, actions)
+        return actions
+
+    def get_stats(self, episode_id: Optional[str] = None,
+                  timeout: Optional[float] = None,
+                  include_store: bool = False) -> Dict[str, Any]:
         """
         Get episode statistics.
 
         Args:
-            episode_id: Optional episode ID
+            episode_id: Optional episode ID (defaults to the episode this
+                client last reset)
+            timeout: Optional timeout override for this call
+            include_store: Add the server's episode store counters under
+                'store' (liveEpisodes, finishedEpisodes, estimatedBytes,
+                completedEpisodes, evictions, limits)
 
         Returns:
             Statistics dictionary with stepCount, totalReward, etc.
         """
-        params = {}
-        if episode_id:
-            params['episodeId'] = episode_id
-
-        response = requests.get(f"{self.env_url}/stats", params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data.get('stats', {})
-
-    def get_episode_info(self, episode_id: str) -> Dict[str, Any]:
+        data = self._request('GET', '/stats', params=self._scope(episode_id), timeout=timeout)
+        stats = data.get('stats') or {}
+        if include_store:
+            stats = dict(stats, store=data.get('store', {}))
+        return stats
+
+    def get_episode_info(self, episode_id: str,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Get detailed information about a specific episode.
 
         Args:
             episode_id: Episode ID to query
+            timeout: Optional timeout override for this call
 
         Returns:
             Episode information dictionary
         """
-        response = requests.get(f"{self.env_url}/info/{episode_id}")
-        response.raise_for_status()
-        data = response.json()
+        data = self._request('GET', f'/info/{episode_id}', timeout=timeout)
         return data.get('episode', {})
 
-    def get_history(self, limit: int = 10) -> list:
+    def get_load(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the server's episode counts and cluster shard info.
+
+        Args:
+            timeout: Optional timeout override for this call
+
+        Returns:
+            Dictionary with activeEpisodes, episodes, completedEpisodes and
+            shard (index, count and the ports of all shards)
+        """
+        return self._request('GET', '/load', timeout=timeout)
+
+    def get_history(self, limit: int = 10, timeout: Optional[float] = None) -> list:
         """
         Get episode history.
 
         Args:
             limit: Maximum number of episodes to return
+            timeout: Optional timeout override for this call
 
         Returns:
             List of completed episode summaries
         """
-        response = requests.get(
-            f"{self.env_url}/history", params={'limit': limit})
-        response.raise_for_status()
-        data = response.json()
+        data = self._request(
+            'GET', '/history', params={'limit': limit}, timeout=timeout)
         return data.get('history', [])
 
-    def get_tasks(self) -> list:
+    def get_tasks(self, timeout: Optional[float] = None) -> list:
         """
         Get all available task definitions.
 
+        Args:
+            timeout: Optional timeout override for this call
+
         Returns:
             List of task dictionaries
         """
-        response = requests.get(f"{self.env_url}/tasks")
-        response.raise_for_status()
-        data = response.json()
-        return data.get('tasks', [])
+        tasks = self._cached('GET /tasks', ('tasks',))
+        if tasks is None:
+            data = self._request('GET', '/tasks', timeout=timeout)
+            tasks = data.get('tasks', [])
+            self._cache.put(('tasks',), tasks)
+        return tasks
 
 
 class ObservationWrapper:
-    """Helper class to parse and access observation data."""
+    """
+    Helper class to parse and access observation data.
+
+    The derived lookups (channel id list and index, mention flag, per-user
+    message index) are built lazily, at most once per observation. To avoid
+    allocating a wrapper per step, keep one and call ``update(state)``;
+    indexes built from sections that are the same objects as in the previous
+    state (as with delta observations) are kept instead of being rebuilt.
+    """
+
+    __slots__ = ('state', 'agent_state', 'current_channel', 'recent_messages',
+                 'teams', 'users', 'episode_stats',
+                 '_channel_ids', '_channel_index', '_mentioned', '_messages_by_user')
+
+    RECENT_MESSAGE_WINDOW = 10
+
+    @staticmethod
+    def apply_delta(base_state: Dict[str, Any], state_delta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a full observation from a delta-encoded step response.
+
+        Args:
+            base_state: Full state at ``state_delta['baseVersion']``
+            state_delta: The ``stateDelta`` block returned by /env/step
+
+        Returns:
+            New full state dictionary (``base_state`` is not modified)
+        """
+        state = dict(base_state)
+        state.update(state_delta.get('changed', {}))
+
+        appended = state_delta.get('appendedMessages')
+        if appended:
+            messages = list(base_state.get('recentMessages', [])) + appended
+            state['recentMessages'] = messages[-ObservationWrapper.RECENT_MESSAGE_WINDOW:]
+
+        state['episodeId'] = state_delta.get('episodeId', state.get('episodeId'))
+        state['version'] = state_delta.get('version')
+        state['timestamp'] = state_delta.get('timestamp')
+        return state
 
     def __init__(self, state: Dict[str, Any]):
+        self.teams = None
+        self.recent_messages = None
+        self.update(state)
+
+    def update(self, state: Dict[str, Any]) -> 'ObservationWrapper':
+        """
+        Point the wrapper at a new observation.
+
+        Args:
+            state: New state observation
+
+        Returns:
+            This wrapper
+        """
+        get = state.get
+        teams = get('teams', [])
+        messages = get('recentMessages', [])
+
         self.state = state
-        self.agent_state = state.get('agentState', {})
-        self.current_channel = state.get('currentChannel', {})
-        self.recent_messages = state.get('recentMessages', [])
-        self.teams = state.get('teams', [])
-        self.users = state.get('users', [])
-        self.episode_stats = state.get('episodeStats', {})
+        self.agent_state = get('agentState', {})
+        self.current_channel = get('currentChannel') or {}
+        self.users = get('users', [])
+        # The server sends 'stats'; 'episodeStats' is kept for old recordings
+        self.episode_stats = get('stats') or get('episodeStats', {})
+        self._mentioned = None
+
+        if teams is not self.teams:
+            self.teams = teams
+            self._channel_ids = None
+            self._channel_index = None
+        if messages is not self.recent_messages:
+            self.recent_messages = messages
+            self._messages_by_user = None
+        return self
 
     def get_current_channel_id(self) -> str:
         """Get current channel ID."""
@@ -182,16 +809,38 @@ class ObservationWrapper:
 
     def has_unread_mentions(self) -> bool:
         """Check if there are unread mentions."""
-        agent_id = self.agent_state.get('userId', 'agent')
-        for msg in self.recent_messages:
-            if f'@{agent_id}' in msg.get('content', ''):
-                return True
-        return False
+        if self._mentioned is None:
+            mention = '@' + self.agent_state.get('userId', 'agent')
+            self._mentioned = False
+            for msg in self.recent_messages:
+                if mention in msg.get('content', ''):
+                    self._mentioned = True
+                    break
+        return self._mentioned
 
     def get_all_channel_ids(self) -> list:
-        """Get all available channel IDs."""
-        channel_ids = []
-        for team in self.teams:
-            for channel in team.get('channels', []):
-                channel_ids.append(channel.get('id'))
-        return channel_ids
+        """Get all available channel IDs (shared list, do not modify)."""
+        if self._channel_ids is None:
+            self._channel_ids = [channel.get('id') for team in self.teams
+                                 for channel in team.get('channels', [])]
+        return self._channel_ids
+
+    def get_channel(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """Get a channel by ID, or None if it does not exist."""
+        if self._channel_index is None:
+            self._channel_index = {channel.get('id'): channel for team in self.teams
+                                   for channel in team.get('channels', [])}
+        return self._channel_index.get(channel_id)
+
+    def get_messages_by_user(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get the recent messages sent by one user, oldest first."""
+        if self._messages_by_user is None:
+            by_user: Dict[str, List[Dict[str, Any]]] = {}
+            for msg in self.recent_messages:
+                user_messages = by_user.get(msg.get('userId'))
+                if user_messages is None:
+                    by_user[msg.get('userId')] = [msg]
+                else:
+                    user_messages.append(msg)
+            self._messages_by_user = by_user
+        return self._messages_by_user.get(user_id, [])
@@ -0,0 +1,211 @@
+"""
+NumPy DQN for TeamsClone-RL
+
+Deep Q-learning on top of mlp.MLP: an online and a target network, Huber
+loss, optional Double DQN targets, importance weights for prioritized replay
+and npz checkpoints. Everything runs on the CPU with NumPy.
+
+    dqn = DQN(obs_dim, num_actions, hidden_sizes=(128, 128))
+    epsilon = LinearSchedule(1.0, 0.05, 10000)
+    action = dqn.act(obs, epsilon(step))
+    loss, td_errors = dqn.update(replay.sample(64))
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mlp import MLP, Adam
+
+
+class LinearSchedule:
+    """Value interpolated linearly from ``start`` to ``end`` over ``steps`` steps."""
+
+    def __init__(self, start: float, end: float, steps: int):
+        self.start = start
+        self.end = end
+        self.steps = max(steps, 1)
+
+    def __call__(self, step: int) -> float:
+        fraction = min(step / self.steps, 1.0)
+        return self.start + fraction * (self.end - self.start)
+
+
+class DQN:
+    """
+    Q-network learner.
+
+    ``update`` takes a batch dict as returned by ReplayBuffer.sample (obs,
+    actions, rewards, next_obs, dones and optionally weights) and performs one
+    gradient step; the target network is synced every ``target_update``
+    updates.
+    """
+
+    def __init__(self, obs_dim: int, num_actions: int,
+                 hidden_sizes: Sequence[int] = (128, 128),
+                 lr: float = 1e-3, gamma: float = 0.99,
+                 target_update: int = 500, double: bool = True,
+                 huber_delta: float = 1.0, max_grad_norm: Optional[float] = 10.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            obs_dim: Width of the encoded observation
+            num_actions: Number of discrete actions
+            hidden_sizes: Hidden layer widths
+            lr: Adam learning rate
+            gamma: Discount factor
+            target_update: Updates between target network syncs
+            double: Use Double DQN targets (online argmax, target value)
+            huber_delta: Huber loss threshold
+            max_grad_norm: Global gradient norm clip (None disables)
+            seed: Seed for initialization and exploration
+        """
+        sizes = [obs_dim, *hidden_sizes, num_actions]
+        self.obs_dim = obs_dim
+        self.num_actions = num_actions
+        self.gamma = gamma
+        self.target_update = target_update
+        self.double = double
+        self.huber_delta = huber_delta
+        self.online = MLP(sizes, seed=seed)
+        self.target = MLP(sizes)
+        self.target.copy_from(self.online)
+        self.optimizer = Adam(self.online, lr=lr, max_grad_norm=max_grad_norm)
+        self.rng = np.random.default_rng(seed)
+        self.updates = 0
+        self._grad: Dict[int, np.ndarray] = {}
+
+    def q_values(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Q-values of the online network.
+
+        Args:
+            obs: (obs_dim,) or (batch, obs_dim) observations
+
+        Returns:
+            (batch, num_actions) array (an internal buffer; copy to keep)
+        """
+        return self.online.forward(obs)
+
+    def act(self, obs: np.ndarray, epsilon: float = 0.0,
+            mask: Optional[np.ndarray] = None) -> int:
+        """
+        Epsilon-greedy action for one observation.
+
+        Args:
+            obs: (obs_dim,) observation
+            epsilon: Probability of a uniformly random action
+            mask: Optional (num_actions,) bool array of allowed actions
+
+        Returns:
+            Action index
+        """
+        if mask is not None and not mask.any():
+            mask = None
+        if self.rng.random() < epsilon:
+            if mask is None:
+                return int(self.rng.integers(self.num_actions))
+            return int(self.rng.choice(np.flatnonzero(mask)))
+        q = self.online.forward(obs)[0]
+        if mask is not None:
+            q = np.where(mask, q, -np.inf)
+        return int(np.argmax(q))
+
+    def update(self, batch: Dict[str, np.ndarray]) -> Tuple[float, np.ndarray]:
+        """
+        One gradient step on a batch of transitions.
+
+        Args:
+            batch: Dict with obs, actions, rewards, next_obs, dones and
+                optionally weights (importance-sampling weights) and
+                next_masks (valid actions in next_obs; the bootstrap target
+                only considers those)
+
+        Returns:
+            (mean loss, per-sample |TD error|) - the latter is what
+            PrioritizedReplayBuffer.update_priorities expects
+        """
+        obs, actions = batch['obs'], batch['actions']
+        rewards, dones = batch['rewards'], batch['dones']
+        size = len(actions)
+        rows = np.arange(size)
+
+        next_q = self.target.forward(batch['next_obs'])
+        next_masks = batch.get('next_masks')
+        if next_masks is not None:
+            # Rows with no valid action fall back to all actions
+            next_masks = next_masks | ~next_masks.any(axis=1, keepdims=True)
+        if self.double:
+            online_next_q = self.online.forward(batch['next_obs'])
+            if next_masks is not None:
+                online_next_q = np.where(next_masks, online_next_q, -np.inf)
+            next_actions = np.argmax(online_next_q, axis=1)
+            next_values = next_q[rows, next_actions]
+        else:
+            if next_masks is not None:
+                next_q = np.where(next_masks, next_q, -np.inf)
+            next_values = next_q.max(axis=1)
+        targets = rewards + self.gamma * (1.0 - dones) * next_values
+
+        q = self.online.forward(obs)
+        td = q[rows, actions] - targets
+
+        # Huber loss: quadratic inside huber_delta, linear outside
+        delta = self.huber_delta
+        abs_td = np.abs(td)
+        quadratic = np.minimum(abs_td, delta)
+        losses = 0.5 * quadratic ** 2 + delta * (abs_td - quadratic)
+        grad_td = np.clip(td, -delta, delta)
+        weights = batch.get('weights')
+        if weights is not None:
+            losses = losses * weights
+            grad_td = grad_td * weights
+
+        grad = self._grad.get(size)
+        if grad is None:
+            grad = self._grad[size] = np.zeros((size, self.num_actions), dtype=np.float32)
+        else:
+            grad.fill(0.0)
+        grad[rows, actions] = grad_td / size
+        self.online.backward(grad)
+        self.optimizer.step()
+
+        self.updates += 1
+        if self.target_update and self.updates % self.target_update == 0:
+            self.sync_target()
+        return float(losses.mean()), abs_td
+
+    def sync_target(self):
+        """Copy the online network into the target network."""
+        self.target.copy_from(self.online)
+
+    def save(self, path: str, **extra):
+        """
+        Write a checkpoint (.npz) with both networks, optimizer state and
+        any extra scalars or arrays (e.g. step counters).
+        """
+        state = {f'online.{k}': v for k, v in self.online.state_dict().items()}
+        state.update({f'target.{k}': v for k, v in self.target.state_dict().items()})
+        state.update({f'optimizer.{k}': v for k, v in self.optimizer.state_dict().items()})
+        state['updates'] = np.array(self.updates)
+        state.update({f'extra.{k}': np.asarray(v) for k, v in extra.items()})
+        np.savez(path, **state)
+
+    def load(self, path: str) -> Dict[str, np.ndarray]:
+        """
+        Restore a checkpoint written by save().
+
+        Returns:
+            The extra values passed to save()
+        """
+        with np.load(path) as data:
+            state = dict(data)
+
+        def section(prefix):
+            return {k[len(prefix):]: v for k, v in state.items() if k.startswith(prefix)}
+
+        self.online.load_state_dict(section('online.'))
+        self.target.load_state_dict(section('target.'))
+        self.optimizer.load_state_dict(section('optimizer.'))
+        self.updates = int(state['updates'])
+        return section('extra.')
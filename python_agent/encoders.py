@@ -0,0 +1,318 @@
+"""
+State Encoders for TeamsClone-RL
+
+Turns state observations into fixed-width float32 feature vectors for neural
+policies. Channels, users, teams, tasks, statuses and action types are looked
+up in fixed vocabularies (with one extra slot for unknown ids), so a feature
+always lands in the same column no matter how many channels a state lists or
+in which order.
+
+``StateEncoder.encode_batch`` writes a whole batch into one preallocated
+matrix, which is what vectorized rollouts and batched training use:
+
+    encoder = StateEncoder()
+    obs = encoder.encode_batch(states)        # (len(states), encoder.dim) float32
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from local_env import AVAILABLE_ACTIONS, TASK_DEFINITIONS, VALID_STATUSES
+
+# Ids seeded by backend/src/models/environment.js (and local_env.py)
+CHANNEL_IDS = ('channel-1', 'channel-2', 'channel-3', 'channel-4', 'channel-5')
+TEAM_IDS = ('team-1', 'team-2')
+USER_IDS = ('user-1', 'user-2', 'user-3', 'agent')
+TASK_TYPES = tuple(TASK_DEFINITIONS)
+ACTION_TYPES = tuple(action['type'] for action in AVAILABLE_ACTIONS)
+STATUSES = tuple(VALID_STATUSES)
+
+# Same substring checks as the server's join_call and greeting_response logic
+CALL_PATTERN = re.compile('call|meeting|standup')
+GREETING_PATTERN = re.compile('hello|hi|hey|welcome')
+
+
+class Vocabulary:
+    """Fixed token -> index mapping; unknown tokens share the last index."""
+
+    def __init__(self, tokens: Sequence[str]):
+        self.tokens = tuple(tokens)
+        self.index = {token: i for i, token in enumerate(self.tokens)}
+        self.unknown = len(self.tokens)
+        self.size = len(self.tokens) + 1
+
+    def lookup(self, token: Optional[str]) -> int:
+        """Index of ``token``, or the unknown index."""
+        return self.index.get(token, self.unknown)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+CHANNEL_VOCAB = Vocabulary(CHANNEL_IDS)
+TEAM_VOCAB = Vocabulary(TEAM_IDS)
+USER_VOCAB = Vocabulary(USER_IDS)
+TASK_VOCAB = Vocabulary(TASK_TYPES)
+ACTION_VOCAB = Vocabulary(ACTION_TYPES)
+STATUS_VOCAB = Vocabulary(STATUSES)
+
+
+class StateEncoder:
+    """
+    Fixed-width float32 encoder for state observations.
+
+    Feature blocks (in column order; ``layout`` maps names to slices):
+        - channel:      one-hot current channel
+        - team:         one-hot current team
+        - task:         one-hot task type
+        - status:       one-hot agent status
+        - unread:       unread count per channel (scaled)
+        - sender_count: recent messages per sender (scaled)
+        - last_sender:  one-hot sender of the newest recent message
+        - messages:     number of recent messages, messages the agent has not
+                        reacted to yet, and flags for a mention, a call
+                        invitation and a greeting in the recent messages
+        - stats:        step progress, messages sent, channels switched,
+                        reactions given, calls joined, invalid actions,
+                        task completed
+    """
+
+    MESSAGE_SCALE = 10.0
+    UNREAD_SCALE = 10.0
+
+    def __init__(self, channels: Vocabulary = CHANNEL_VOCAB,
+                 teams: Vocabulary = TEAM_VOCAB,
+                 users: Vocabulary = USER_VOCAB,
+                 tasks: Vocabulary = TASK_VOCAB,
+                 statuses: Vocabulary = STATUS_VOCAB,
+                 agent_id: str = 'agent'):
+        """
+        Args:
+            channels: Channel id vocabulary
+            teams: Team id vocabulary
+            users: User id vocabulary
+            tasks: Task type vocabulary
+            statuses: User status vocabulary
+            agent_id: User id of the agent
+        """
+        self.channels = channels
+        self.teams = teams
+        self.users = users
+        self.tasks = tasks
+        self.statuses = statuses
+        self.agent_id = agent_id
+        self.mention = f'@{agent_id}'
+
+        blocks = [
+            ('channel', len(channels)),
+            ('team', len(teams)),
+            ('task', len(tasks)),
+            ('status', len(statuses)),
+            ('unread', len(channels)),
+            ('sender_count', len(users)),
+            ('last_sender', len(users)),
+            ('messages', 5),
+            ('stats', 7),
+        ]
+        self.layout: Dict[str, slice] = {}
+        offset = 0
+        for name, width in blocks:
+            self.layout[name] = slice(offset, offset + width)
+            offset += width
+        self.dim = offset
+        self._offsets = {name: s.start for name, s in self.layout.items()}
+        self._buffer = np.zeros((0, self.dim), dtype=np.float32)
+        # Scratch row reused for every state in encode_batch
+        self._zeros = [0.0] * self.dim
+        self._row = [0.0] * self.dim
+
+    def __call__(self, state: Dict[str, Any]) -> np.ndarray:
+        return self.encode(state)
+
+    def encode(self, state: Dict[str, Any]) -> np.ndarray:
+        """
+        Encode one state.
+
+        Args:
+            state: State observation
+
+        Returns:
+            New float32 array of shape (dim,)
+        """
+        row = [0.0] * self.dim
+        self._write(state, row)
+        return np.array(row, dtype=np.float32)
+
+    def encode_batch(self, states: Sequence[Dict[str, Any]],
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode several states into one matrix.
+
+        Args:
+            states: State observations
+            out: Optional float32 array of shape (len(states), dim) to fill.
+                When omitted, an internal buffer is used and grown as needed;
+                the returned array is then overwritten by the next call.
+
+        Returns:
+            float32 array of shape (len(states), dim)
+        """
+        count = len(states)
+        if out is None:
+            if self._buffer.shape[0] < count:
+                self._buffer = np.zeros((count, self.dim), dtype=np.float32)
+            out = self._buffer[:count]
+        elif out.shape != (count, self.dim) or out.dtype != np.float32:
+            raise ValueError(f"out must be a float32 array of shape ({count}, {self.dim})")
+
+        row, zeros = self._row, self._zeros
+        for i, state in enumerate(states):
+            row[:] = zeros
+            self._write(state, row)
+            out[i] = row
+        return out
+
+    def _write(self, state: Dict[str, Any], row: List[float]):
+        """Write one state's features into ``row`` (a zeroed list of length dim)."""
+        offsets = self._offsets
+        channels, users, agent_id = self.channels, self.users, self.agent_id
+        agent_state = state.get('agentState') or {}
+        task = state.get('task') or {}
+        stats = state.get('stats') or {}
+
+        row[offsets['channel'] + channels.lookup(agent_state.get('currentChannelId'))] = 1.0
+        row[offsets['team'] + self.teams.lookup(agent_state.get('currentTeamId'))] = 1.0
+        row[offsets['task'] + self.tasks.lookup(task.get('type'))] = 1.0
+
+        agent_status = None
+        for user in state.get('users') or ():
+            if user.get('id') == agent_id:
+                agent_status = user.get('status')
+                break
+        row[offsets['status'] + self.statuses.lookup(agent_status)] = 1.0
+
+        unread = offsets['unread']
+        for team in state.get('teams') or ():
+            for channel in team.get('channels') or ():
+                count = channel.get('unread', 0)
+                if count:
+                    row[unread + channels.lookup(channel.get('id'))] += count / self.UNREAD_SCALE
+
+        messages = state.get('recentMessages') or ()
+        sender_count = offsets['sender_count']
+        unreacted = 0
+        mentioned = invited = greeted = False
+        for msg in messages:
+            user_id = msg.get('userId')
+            row[sender_count + users.lookup(user_id)] += 1.0 / self.MESSAGE_SCALE
+            if user_id == agent_id:
+                continue
+            for reaction in msg.get('reactions') or ():
+                if reaction.get('userId') == agent_id:
+                    break
+            else:
+                unreacted += 1
+            content = msg.get('content', '')
+            lowered = content.lower()
+            if self.mention in content:
+                mentioned = True
+                invited = invited or CALL_PATTERN.search(lowered) is not None
+            greeted = greeted or GREETING_PATTERN.search(lowered) is not None
+        if messages:
+            row[offsets['last_sender'] + users.lookup(messages[-1].get('userId'))] = 1.0
+
+        m = offsets['messages']
+        row[m] = len(messages) / self.MESSAGE_SCALE
+        row[m + 1] = unreacted / self.MESSAGE_SCALE
+        row[m + 2] = float(mentioned)
+        row[m + 3] = float(invited)
+        row[m + 4] = float(greeted)
+
+        s = offsets['stats']
+        row[s] = stats.get('stepCount', 0) / max(task.get('maxSteps') or 100, 1)
+        row[s + 1] = stats.get('messagesSent', 0) / 5.0
+        row[s + 2] = stats.get('channelsSwitched', 0) / 3.0
+        row[s + 3] = stats.get('reactionsGiven', 0) / 3.0
+        row[s + 4] = float(stats.get('callsJoined', 0))
+        row[s + 5] = stats.get('invalidActions', 0) / 5.0
+        row[s + 6] = float(bool(stats.get('taskCompleted', False)))
+
+    def feature_names(self) -> List[str]:
+        """Column names, e.g. 'channel[channel-2]' or 'stats[1]'."""
+        vocabularies = {
+            'channel': self.channels, 'team': self.teams, 'task': self.tasks,
+            'status': self.statuses, 'unread': self.channels,
+            'sender_count': self.users, 'last_sender': self.users,
+        }
+        names = []
+        for name, block in self.layout.items():
+            vocab = vocabularies.get(name)
+            for i in range(block.stop - block.start):
+                token = (vocab.tokens[i] if i < len(vocab.tokens) else '<unk>') if vocab else i
+                names.append(f'{name}[{token}]')
+        return names
+
+
+class ConcatEncoder:
+    """
+    Concatenates batch encoders (anything with ``dim`` and
+    ``encode_batch(states, out=)``), e.g. StateEncoder and TextFeaturizer.
+    """
+
+    def __init__(self, *encoders):
+        self.encoders = encoders
+        self.dim = sum(encoder.dim for encoder in encoders)
+        self._slices = []
+        offset = 0
+        for encoder in encoders:
+            self._slices.append(slice(offset, offset + encoder.dim))
+            offset += encoder.dim
+
+    def __call__(self, state: Dict[str, Any]) -> np.ndarray:
+        return self.encode(state)
+
+    def encode(self, state: Dict[str, Any]) -> np.ndarray:
+        """Encode one state into a new float32 array of shape (dim,)."""
+        return self.encode_batch([state])[0].copy()
+
+    def encode_batch(self, states: Sequence[Dict[str, Any]],
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode several states; each encoder fills its own column block.
+
+        Args:
+            states: State observations
+            out: Optional float32 array of shape (len(states), dim) to fill
+
+        Returns:
+            float32 array of shape (len(states), dim)
+        """
+        if out is None:
+            out = np.empty((len(states), self.dim), dtype=np.float32)
+        elif out.shape != (len(states), self.dim) or out.dtype != np.float32:
+            raise ValueError(f"out must be a float32 array of shape ({len(states)}, {self.dim})")
+        for encoder, block in zip(self.encoders, self._slices):
+            encoder.encode_batch(states, out=out[:, block])
+        return out
+
+
+def encode_action_types(actions: Sequence[Dict[str, Any]],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Map action dicts to ACTION_VOCAB indices.
+
+    Args:
+        actions: Action dictionaries
+        out: Optional int64 array of shape (len(actions),) to fill
+
+    Returns:
+        int64 array of action type indices
+    """
+    if out is None:
+        out = np.empty(len(actions), dtype=np.int64)
+    for i, action in enumerate(actions):
+        out[i] = ACTION_VOCAB.lookup(action.get('type'))
+    return out
+
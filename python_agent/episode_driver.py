@@ -0,0 +1,134 @@
+"""
+Episode Driver with Reset Prefetching for TeamsClone-RL
+
+Hands out fresh episodes to an agent loop. While the agent plays one episode,
+the reset for the next one is already in flight on a background thread, so
+at the episode boundary the next episode is usually ready and the agent does
+not wait a full round trip.
+
+    driver = EpisodeDriver(TeamsEnvClient())
+    for i in range(num_episodes):
+        reset = driver.next_episode(task_type, prefetch_next=i < num_episodes - 1)
+        episode_id, state = reset['episodeId'], reset['state']
+        ... client.step(action, episode_id) until done ...
+    print(driver.stats())     # resets, prefetch hits, wait vs round-trip time
+    driver.close()
+
+Steps must pass the episode id: the prefetched reset makes the new episode the
+client's default one while the old episode is still being played.
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from local_env import LocalTeamsEnv
+
+# Default for next_task_type: prefetch the same task type again
+SAME_TASK = object()
+
+
+class EpisodeDriver:
+    """
+    Reset source that keeps the next reset in flight.
+
+    A prefetched episode is used when the next request asks for the task type
+    it was started with. Otherwise it is discarded (left unplayed on the
+    server): the driver waits for it to finish, then resets synchronously.
+    """
+
+    def __init__(self, client, prefetch: bool = True):
+        """
+        Args:
+            client: TeamsEnvClient-compatible client
+            prefetch: Issue resets in the background. Always off for the
+                in-process LocalTeamsEnv, which has no round trip to hide and
+                is not thread-safe.
+        """
+        self.client = client
+        self.prefetch_enabled = prefetch and not isinstance(client, LocalTeamsEnv)
+        self._executor = (ThreadPoolExecutor(max_workers=1, thread_name_prefix='reset-prefetch')
+                          if self.prefetch_enabled else None)
+        self._pending: Optional[Tuple[Optional[str], Future]] = None
+        self.resets = 0
+        self.prefetch_hits = 0
+        self.discarded = 0
+        self.reset_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _timed_reset(self, task_type: Optional[str]) -> Tuple[Dict[str, Any], float]:
+        start = time.perf_counter()
+        result = self.client.reset(task_type=task_type)
+        return result, time.perf_counter() - start
+
+    def prefetch(self, task_type: Optional[str] = None):
+        """Start a background reset for ``task_type`` unless one is already pending."""
+        if self._executor is not None and self._pending is None:
+            self._pending = (task_type, self._executor.submit(self._timed_reset, task_type))
+
+    def next_episode(self, task_type: Optional[str] = None, prefetch_next: bool = True,
+                     next_task_type: Any = SAME_TASK) -> Dict[str, Any]:
+        """
+        Return a started episode, then prefetch the one after it.
+
+        Args:
+            task_type: Task type for this episode (None for random)
+            prefetch_next: Start the following reset in the background now
+            next_task_type: Task type for the following episode
+                (defaults to ``task_type``)
+
+        Returns:
+            The reset result (episodeId, state, task, ...)
+        """
+        start = time.perf_counter()
+        pending, self._pending = self._pending, None
+        if pending is not None and pending[0] == task_type:
+            result, reset_seconds = pending[1].result()
+            self.prefetch_hits += 1
+        else:
+            if pending is not None:
+                self.discarded += 1
+                # Let a discarded reset land first: finishing after the one
+                # below, it would become the client's default episode
+                if not pending[1].cancel():
+                    pending[1].exception()
+            result, reset_seconds = self._timed_reset(task_type)
+        self.wait_seconds += time.perf_counter() - start
+        self.reset_seconds += reset_seconds
+        self.resets += 1
+
+        if prefetch_next:
+            self.prefetch(task_type if next_task_type is SAME_TASK else next_task_type)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reset counters.
+
+        ``reset_seconds`` is the summed round-trip time of the resets handed
+        out, ``wait_seconds`` the time callers actually blocked in
+        next_episode; the difference is the idle time prefetching removed.
+        """
+        return {
+            'resets': self.resets,
+            'prefetch_hits': self.prefetch_hits,
+            'discarded': self.discarded,
+            'reset_seconds': self.reset_seconds,
+            'wait_seconds': self.wait_seconds,
+            'saved_seconds': max(self.reset_seconds - self.wait_seconds, 0.0),
+        }
+
+    def close(self):
+        """Drop any pending prefetch and stop the background thread."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending[1].cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
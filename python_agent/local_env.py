@@ -0,0 +1,1049 @@
+"""
+In-Process TeamsClone-RL Environment
+
+Pure-Python port of the backend ``Environment`` class
+(``backend/src/models/environment.js``). It reproduces the task definitions,
+reward rules and termination logic of the ``/env`` API without a server, so
+agents can step episodes at memory speed.
+
+``LocalTeamsEnv`` exposes the same methods and return shapes as
+``TeamsEnvClient`` and can be passed anywhere a client is expected.
+"""
+
+import random
+import re
+import secrets
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+GREETING_PATTERN = re.compile(r'\b(hello|hi|hey|greetings)\b', re.ASCII)
+VALID_STATUSES = ('available', 'busy', 'away', 'dnd')
+MAX_INVALID_ACTIONS = 5
+# Session tokens a LocalTeamsEnv remembers, like TeamsEnvClient
+MAX_SESSION_TOKENS = 4096
+# Observation sections, in the backend's order; get_state(fields=...) selects some
+STATE_SECTIONS = ('agentState', 'currentChannel', 'recentMessages', 'teams',
+                  'users', 'stats', 'task')
+
+
+def _check_greeting_response(episode: Dict[str, Any]) -> bool:
+    messages = episode['messages'].get('channel-1', [])
+    has_greeting = any(
+        msg['userId'] != 'agent' and (
+            'hello' in msg['content'].lower()
+            or 'hi' in msg['content'].lower()
+            or 'welcome' in msg['content'].lower()
+        )
+        for msg in messages
+    )
+    has_response = any(
+        msg['userId'] == 'agent' and episode['stats']['stepCount'] <= 5
+        for msg in messages
+    )
+    return has_greeting and has_response
+
+
+TASK_DEFINITIONS: Dict[str, Dict[str, Any]] = {
+    'greeting_response': {
+        'name': 'Greeting Response',
+        'description': 'Respond to a greeting message within 5 steps',
+        'checkCompletion': _check_greeting_response,
+        'reward': 2.0,
+        'maxSteps': 10,
+    },
+    'channel_explorer': {
+        'name': 'Channel Explorer',
+        'description': 'Visit at least 3 different channels',
+        'checkCompletion': lambda episode: episode['stats']['channelsSwitched'] >= 3,
+        'reward': 1.5,
+        'maxSteps': 20,
+    },
+    'active_participant': {
+        'name': 'Active Participant',
+        'description': 'Send at least 5 relevant messages',
+        'checkCompletion': lambda episode: episode['stats']['messagesSent'] >= 5,
+        'reward': 2.5,
+        'maxSteps': 30,
+    },
+    'meeting_joiner': {
+        'name': 'Meeting Joiner',
+        'description': 'Join a call when invited',
+        'checkCompletion': lambda episode: episode['stats']['callsJoined'] >= 1,
+        'reward': 3.0,
+        'maxSteps': 15,
+    },
+    'social_butterfly': {
+        'name': 'Social Butterfly',
+        'description': 'React to at least 3 messages and send 3 messages',
+        'checkCompletion': lambda episode: (
+            episode['stats']['reactionsGiven'] >= 3
+            and episode['stats']['messagesSent'] >= 3
+        ),
+        'reward': 2.0,
+        'maxSteps': 25,
+    },
+}
+
+TASK_CONTEXT: Dict[str, List[tuple]] = {
+    'greeting_response': [
+        ('channel-1', 'user-1', 'Hello! Welcome to the team! 👋'),
+        ('channel-1', 'user-2', "Hey there! How's everyone doing?"),
+    ],
+    'channel_explorer': [
+        ('channel-1', 'user-1', 'Check out the other channels!'),
+        ('channel-2', 'user-3', 'Anyone up for lunch?'),
+        ('channel-4', 'user-2', 'Dev team sync at 3pm'),
+    ],
+    'active_participant': [
+        ('channel-1', 'user-1', "What's everyone working on today?"),
+        ('channel-1', 'user-2', "I'm finishing up the API docs"),
+    ],
+    'meeting_joiner': [
+        ('channel-1', 'user-1', "@agent Hey! We're having a quick standup, want to join?"),
+    ],
+    'social_butterfly': [
+        ('channel-1', 'user-1', 'Great work on the project! 🎉'),
+        ('channel-1', 'user-2', "Thanks! Couldn't have done it without the team"),
+        ('channel-2', 'user-3', 'Pizza party tomorrow! 🍕'),
+    ],
+}
+
+AVAILABLE_ACTIONS: List[Dict[str, Any]] = [
+    {
+        'type': 'send_message',
+        'description': 'Send a message to a channel',
+        'payload': {
+            'content': 'string (required)',
+            'channelId': 'string (optional, defaults to current channel)',
+        },
+        'example': {'type': 'send_message', 'payload': {'content': 'Hello team!'}},
+    },
+    {
+        'type': 'switch_channel',
+        'description': 'Switch to a different channel',
+        'payload': {'channelId': 'string (required)'},
+        'example': {'type': 'switch_channel', 'payload': {'channelId': 'channel-2'}},
+    },
+    {
+        'type': 'react_to_message',
+        'description': 'React to a message with an emoji',
+        'payload': {
+            'messageId': 'string (required)',
+            'reaction': 'string (required)',
+        },
+        'example': {'type': 'react_to_message', 'payload': {'messageId': 'msg-123', 'reaction': '👍'}},
+    },
+    {
+        'type': 'join_call',
+        'description': 'Join a call in a channel',
+        'payload': {'channelId': 'string (optional, defaults to current channel)'},
+        'example': {'type': 'join_call', 'payload': {}},
+    },
+    {
+        'type': 'set_status',
+        'description': 'Set agent status',
+        'payload': {'status': 'string (available, busy, away, dnd)'},
+        'example': {'type': 'set_status', 'payload': {'status': 'available'}},
+    },
+]
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# Rough per-episode memory estimate, same constants as episodeStore.js
+EPISODE_BASE_BYTES = 4096
+MESSAGE_BYTES = 400
+ACTION_BYTES = 200
+
+
+def estimate_episode_bytes(episode: Dict[str, Any]) -> int:
+    """Approximate memory held by one episode."""
+    messages = sum(len(channel) for channel in episode.get('messages', {}).values())
+    return (EPISODE_BASE_BYTES + messages * MESSAGE_BYTES
+            + len(episode.get('actionHistory', ())) * ACTION_BYTES)
+
+
+def _oldest_except(entries: 'OrderedDict[str, list]', keep_id: Optional[str]) -> Optional[str]:
+    """Least recently used key of an LRU OrderedDict, skipping ``keep_id``."""
+    for episode_id in entries:
+        if episode_id != keep_id:
+            return episode_id
+    return None
+
+
+class EpisodeStore:
+    """
+    Bounded episode store (port of ``backend/src/models/episodeStore.js``).
+
+    Live and finished episodes are kept in two OrderedDicts in
+    least-recently-used order. Finished episodes are compacted to their
+    summary record after ``finished_ttl_ms`` idle, or earlier when the store
+    is over ``max_episodes`` or ``max_bytes``. Unfinished episodes are
+    dropped after ``idle_ttl_ms`` idle, or when no finished episode is left to
+    make room. Expired entries are swept on every write.
+    """
+
+    def __init__(self, max_episodes: int = 10000,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 finished_ttl_ms: int = 60 * 1000,
+                 idle_ttl_ms: int = 60 * 60 * 1000,
+                 max_history: int = 10000,
+                 on_evict: Optional[Callable[[Dict[str, Any], str], None]] = None,
+                 on_forget: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], int] = _now_ms):
+        self.max_episodes = max_episodes
+        self.max_bytes = max_bytes
+        self.finished_ttl_ms = finished_ttl_ms
+        self.idle_ttl_ms = idle_ttl_ms
+        self.max_history = max_history
+        self.on_evict = on_evict
+        self.on_forget = on_forget  # (episode id) after its summary leaves the history
+        self.clock = clock
+
+        # episode id -> [episode, last access (ms), estimated bytes]
+        self.live: 'OrderedDict[str, list]' = OrderedDict()
+        self.finished: 'OrderedDict[str, list]' = OrderedDict()
+        self.summaries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.bytes = 0
+        self.completed_episodes = 0
+        self.evictions = {'finished': 0, 'active': 0, 'ttl': 0, 'capacity': 0, 'memory': 0}
+
+    def __len__(self) -> int:
+        return len(self.live) + len(self.finished)
+
+    def __contains__(self, episode_id: str) -> bool:
+        return episode_id in self.live or episode_id in self.finished
+
+    def get(self, episode_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        entry = self.live.get(episode_id) or self.finished.get(episode_id)
+        return entry[0] if entry else None
+
+    def get_summary(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        """Summary of a finished episode that is no longer held in full."""
+        return self.summaries.get(episode_id)
+
+    def set(self, episode_id: str, episode: Dict[str, Any]):
+        """Add (or replace) a live episode."""
+        self._remove(episode_id)
+        self._insert(self.live, episode_id, episode)
+        self._enforce_limits(episode_id)
+
+    def touch(self, episode_id: str):
+        """
+        Refresh an episode's LRU position and size estimate.
+
+        Called on every step, so only the memory cap is checked here; expiry
+        and the episode cap are enforced when episodes are added or finish.
+        """
+        entries = self.live if episode_id in self.live else self.finished
+        entry = entries.get(episode_id)
+        if entry is None:
+            return
+        entries.move_to_end(episode_id)
+        entry[1] = self.clock()
+        size = estimate_episode_bytes(entry[0])
+        self.bytes += size - entry[2]
+        entry[2] = size
+        if self.bytes > self.max_bytes:
+            self._enforce_limits(episode_id)
+
+    def finish(self, episode_id: str, summary: Dict[str, Any]):
+        """Move a live episode to the finished set and record its summary."""
+        entry = self.live.pop(episode_id, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+            self._insert(self.finished, episode_id, entry[0])
+        self.completed_episodes += 1
+        self.summaries.pop(episode_id, None)
+        self.summaries[episode_id] = summary
+        if len(self.summaries) > self.max_history:
+            oldest_id, _ = self.summaries.popitem(last=False)
+            if self.on_forget is not None:
+                self.on_forget(oldest_id)
+        # The caller still builds the final step's observation from this episode
+        self._enforce_limits(episode_id)
+
+    def history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent summaries, oldest first."""
+        summaries = list(self.summaries.values())
+        return summaries[-limit:] if limit > 0 else summaries
+
+    def _insert(self, entries: 'OrderedDict[str, list]', episode_id: str, episode: Dict[str, Any]):
+        size = estimate_episode_bytes(episode)
+        entries[episode_id] = [episode, self.clock(), size]
+        self.bytes += size
+
+    def _remove(self, episode_id: str) -> Optional[list]:
+        entries = self.live if episode_id in self.live else self.finished
+        entry = entries.pop(episode_id, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+        return entry
+
+    def _evict(self, entries: 'OrderedDict[str, list]', episode_id: str, reason: str):
+        episode = self._remove(episode_id)[0]
+        self.evictions['active' if entries is self.live else 'finished'] += 1
+        self.evictions[reason] += 1
+        if self.on_evict is not None:
+            self.on_evict(episode, reason)
+
+    def _enforce_limits(self, keep_id: Optional[str] = None):
+        """
+        Sweep expired episodes, then evict until the store is within its caps.
+        ``keep_id`` (the episode just written) is never evicted, even if it
+        alone is over a cap.
+        """
+        now = self.clock()
+        for entries, ttl in ((self.finished, self.finished_ttl_ms), (self.live, self.idle_ttl_ms)):
+            expired = []
+            for episode_id, entry in entries.items():
+                if episode_id == keep_id:
+                    continue
+                if now - entry[1] < ttl:
+                    break
+                expired.append(episode_id)
+            for episode_id in expired:
+                self._evict(entries, episode_id, 'ttl')
+
+        while len(self) > self.max_episodes or self.bytes > self.max_bytes:
+            reason = 'capacity' if len(self) > self.max_episodes else 'memory'
+            # Least recently used finished episode first, then live
+            entries = self.finished
+            episode_id = _oldest_except(entries, keep_id)
+            if episode_id is None:
+                entries = self.live
+                episode_id = _oldest_except(entries, keep_id)
+            if episode_id is None:
+                break
+            self._evict(entries, episode_id, reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy, limits and eviction counters (same keys as the backend)."""
+        return {
+            'liveEpisodes': len(self.live),
+            'finishedEpisodes': len(self.finished),
+            'estimatedBytes': self.bytes,
+            'historySize': len(self.summaries),
+            'completedEpisodes': self.completed_episodes,
+            'evictions': {
+                'total': self.evictions['finished'] + self.evictions['active'],
+                **self.evictions,
+            },
+            'limits': {
+                'maxEpisodes': self.max_episodes,
+                'maxBytes': self.max_bytes,
+                'finishedTtlMs': self.finished_ttl_ms,
+                'idleTtlMs': self.idle_ttl_ms,
+                'maxHistory': self.max_history,
+            },
+        }
+
+
+def _js_length(text: str) -> int:
+    """Length of a string as JavaScript counts it (UTF-16 code units)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _destructure(payload: Any, field: str, missing: bool) -> Dict[str, Any]:
+    """Mirror JS ``const { field } = payload`` which throws on null/undefined."""
+    if payload is None:
+        kind = 'undefined' if missing else 'null'
+        raise TypeError(
+            f"Cannot destructure property '{field}' of 'payload' as it is {kind}.")
+    return payload if isinstance(payload, dict) else {}
+
+
+class EpisodeScopeError(LookupError):
+    """A call names no episode, or one it may not use; ``status`` is the backend's HTTP status."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class LocalEnvironment:
+    """
+    In-memory RL environment with the same semantics as the backend.
+
+    States, rewards and termination follow ``environment.js`` step for step;
+    message ids and timestamps are generated locally.
+    """
+
+    def __init__(self, seed: Optional[int] = None,
+                 clock: Callable[[], int] = _now_ms,
+                 episode_store: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            seed: Seed for random task selection and message ids (None for
+                non-deterministic behaviour like the server)
+            clock: Function returning the current time in milliseconds
+            episode_store: EpisodeStore limits (max_episodes, max_bytes,
+                finished_ttl_ms, idle_ttl_ms, max_history)
+        """
+        self.episodes = EpisodeStore(clock=clock, on_evict=self._on_evict,
+                                     on_forget=self._drop_compacted_token,
+                                     **(episode_store or {}))
+        self.current_episode_id: Optional[str] = None
+        self.sessions: Dict[str, str] = {}  # session token -> episode id
+        self.compacted_tokens: Dict[str, str] = {}  # episode id -> token, compacted episodes
+        # Reject calls that name neither an episode id nor a session token
+        # instead of using the most recent reset (ENV_REQUIRE_EPISODE)
+        self.require_episode = False
+        self.task_definitions = TASK_DEFINITIONS
+        self.rng = random.Random(seed)
+        self.clock = clock
+
+    def _on_evict(self, episode: Dict[str, Any], reason: str):
+        # A compacted episode keeps its token until its summary is dropped,
+        # so calls by token get the same error as calls by id
+        if self.episodes.get_summary(episode['id']) is not None:
+            self.compacted_tokens[episode['id']] = episode['sessionToken']
+        else:
+            self.sessions.pop(episode['sessionToken'], None)
+
+    def _drop_compacted_token(self, episode_id: str):
+        token = self.compacted_tokens.pop(episode_id, None)
+        if token is not None:
+            self.sessions.pop(token, None)
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def select_random_task(self) -> str:
+        """Select a random task for the episode."""
+        return self.rng.choice(list(self.task_definitions))
+
+    def reset(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Reset environment and start new episode."""
+        config = config or {}
+        episode_id = config.get('episodeId') or self._new_id()
+        task_type = config.get('taskType') or self.select_random_task()
+
+        task = self.task_definitions.get(task_type)
+        if task is None:
+            raise ValueError(f"Unknown task type: {task_type}")
+
+        now = self.clock()
+        episode = {
+            'id': episode_id,
+            'task': task,
+            'taskType': task_type,
+            'startTime': now,
+            'endTime': None,
+            'teams': [
+                {
+                    'id': 'team-1',
+                    'name': 'General Team',
+                    'channels': [
+                        {'id': 'channel-1', 'name': 'General', 'teamId': 'team-1', 'unread': 0},
+                        {'id': 'channel-2', 'name': 'Random', 'teamId': 'team-1', 'unread': 0},
+                        {'id': 'channel-3', 'name': 'Announcements', 'teamId': 'team-1', 'unread': 0},
+                    ],
+                },
+                {
+                    'id': 'team-2',
+                    'name': 'Project Alpha',
+                    'channels': [
+                        {'id': 'channel-4', 'name': 'Development', 'teamId': 'team-2', 'unread': 0},
+                        {'id': 'channel-5', 'name': 'Design', 'teamId': 'team-2', 'unread': 0},
+                    ],
+                },
+            ],
+            'messages': {},
+            'users': [
+                {'id': 'user-1', 'name': 'Alice', 'status': 'available', 'avatar': '👩'},
+                {'id': 'user-2', 'name': 'Bob', 'status': 'busy', 'avatar': '👨'},
+                {'id': 'user-3', 'name': 'Charlie', 'status': 'away', 'avatar': '🧑'},
+                {'id': 'agent', 'name': 'RL Agent', 'status': 'available', 'avatar': '🤖'},
+            ],
+            'agentState': {
+                'currentTeamId': 'team-1',
+                'currentChannelId': 'channel-1',
+                'userId': 'agent',
+            },
+            'stats': {
+                'stepCount': 0,
+                'totalReward': 0,
+                'messagesSent': 0,
+                'channelsSwitched': 0,
+                'reactionsGiven': 0,
+                'callsJoined': 0,
+                'invalidActions': 0,
+                'taskCompleted': False,
+                'startTime': now,
+            },
+            'actionHistory': [],
+            'done': False,
+            'version': 0,
+            # Lookup indexes, as in the backend: channel id -> (team, channel)
+            # and message id -> message
+            'channelsById': {},
+            'messagesById': {},
+        }
+
+        for team in episode['teams']:
+            for channel in team['channels']:
+                episode['messages'][channel['id']] = []
+                episode['channelsById'][channel['id']] = (team, channel)
+
+        for channel_id, user_id, content in TASK_CONTEXT[task_type]:
+            self.add_message_to_episode(episode, channel_id, user_id, content)
+
+        # Resetting an existing id invalidates the token of its previous run,
+        # also when that run was compacted
+        previous = self.episodes.get(episode_id)
+        if previous is not None:
+            self.sessions.pop(previous['sessionToken'], None)
+        self._drop_compacted_token(episode_id)
+        # Not drawn from self.rng, so seeded runs keep the server's id sequence
+        episode['sessionToken'] = secrets.token_hex(16)
+        self.sessions[episode['sessionToken']] = episode_id
+        self.episodes.set(episode_id, episode)
+        self.current_episode_id = episode_id
+
+        return {
+            'episodeId': episode_id,
+            'sessionToken': episode['sessionToken'],
+            'state': self.get_state(episode_id),
+            'task': {
+                'type': task_type,
+                'name': task['name'],
+                'description': task['description'],
+                'maxSteps': task['maxSteps'],
+            },
+        }
+
+    def resolve_episode_id(self, episode_id: Optional[str] = None,
+                           session_token: Optional[str] = None,
+                           optional: bool = False) -> Optional[str]:
+        """
+        Resolve the episode a call is scoped to, like the backend: a session
+        token given with an episode id must belong to that id's latest reset.
+        Calls naming neither fall back to the most recent reset unless
+        ``require_episode`` is set. Raises EpisodeScopeError.
+        """
+        if session_token:
+            token_episode_id = self.sessions.get(session_token)
+            if episode_id and episode_id != token_episode_id:
+                if episode_id not in self.episodes:
+                    raise EpisodeScopeError('Episode not found', 404)
+                raise EpisodeScopeError(
+                    'Session token is not valid for this episode '
+                    '(it may have been reset by another session)', 409)
+            if token_episode_id is None:
+                raise EpisodeScopeError('Invalid or expired session token', 401)
+            return token_episode_id
+        if episode_id:
+            return episode_id
+        if self.require_episode:
+            if optional:
+                return None
+            raise EpisodeScopeError('Missing episodeId or session token', 400)
+        return self.current_episode_id
+
+    def _get_episode(self, episode_id: Optional[str]) -> Dict[str, Any]:
+        episode_id = episode_id or self.current_episode_id
+        episode = self.episodes.get(episode_id)
+        if episode is None:
+            if self.episodes.get_summary(episode_id) is not None:
+                raise LookupError('Episode finished and was compacted to its summary')
+            raise LookupError('No active episode found')
+        return episode
+
+    def get_state(self, episode_id: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Get current environment state (observation).
+
+        ``fields`` (names from STATE_SECTIONS) builds only those sections;
+        episodeId, version and timestamp are always included.
+        """
+        episode = self._get_episode(episode_id)
+        state = {'episodeId': episode['id'], 'version': episode['version']}
+        for section in STATE_SECTIONS if fields is None else fields:
+            state[section] = self.build_state_section(episode, section)
+        state['timestamp'] = self.clock()
+        return state
+
+    def get_stats(self, episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get an episode's statistics without building the observation."""
+        return dict(self._get_episode(episode_id)['stats'])
+
+    def build_state_section(self, episode: Dict[str, Any], section: str) -> Any:
+        """Build one section of the observation."""
+        if section == 'agentState':
+            return dict(episode['agentState'])
+        if section == 'currentChannel':
+            current_channel = self.get_current_channel(episode)
+            return dict(current_channel) if current_channel else None
+        if section == 'recentMessages':
+            recent = episode['messages'][episode['agentState']['currentChannelId']][-10:]
+            return [dict(msg, reactions=[dict(r) for r in msg['reactions']]) for msg in recent]
+        if section == 'teams':
+            return [dict(team, channels=[dict(ch) for ch in team['channels']])
+                    for team in episode['teams']]
+        if section == 'users':
+            return [dict(user) for user in episode['users']]
+        if section == 'stats':
+            return dict(episode['stats'])
+        if section == 'task':
+            return {
+                'type': episode['taskType'],
+                'name': episode['task']['name'],
+                'description': episode['task']['description'],
+                'maxSteps': episode['task']['maxSteps'],
+                'completed': episode['stats']['taskCompleted'],
+            }
+        raise ValueError(f"Unknown state section: {section}")
+
+    def get_current_channel(self, episode: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get current channel for an episode."""
+        entry = episode['channelsById'].get(episode['agentState']['currentChannelId'])
+        return entry[1] if entry else None
+
+    def step(self, action: Dict[str, Any], episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute an action and return new state + reward."""
+        episode = self._get_episode(episode_id)
+
+        if episode['done']:
+            return {
+                'state': self.get_state(episode['id']),
+                'reward': 0,
+                'done': True,
+                'info': {'error': 'Episode already completed'},
+            }
+
+        stats = episode['stats']
+        stats['stepCount'] += 1
+        episode['version'] += 1
+        reward = 0
+        info: Dict[str, Any] = {}
+
+        episode['actionHistory'].append({
+            'step': stats['stepCount'],
+            'action': dict(action),
+            'timestamp': self.clock(),
+        })
+
+        action_type = action.get('type')
+        payload = action.get('payload')
+        missing = 'payload' not in action
+
+        try:
+            if action_type == 'send_message':
+                reward = self.action_send_message(episode, payload, missing)
+                info['action'] = 'message_sent'
+            elif action_type == 'switch_channel':
+                reward = self.action_switch_channel(episode, payload, missing)
+                info['action'] = 'channel_switched'
+            elif action_type == 'react_to_message':
+                reward = self.action_react_to_message(episode, payload, missing)
+                info['action'] = 'reacted'
+            elif action_type == 'join_call':
+                reward = self.action_join_call(episode, payload)
+                info['action'] = 'joined_call'
+            elif action_type == 'set_status':
+                reward = self.action_set_status(episode, payload, missing)
+                info['action'] = 'status_changed'
+            else:
+                reward = -0.1
+                stats['invalidActions'] += 1
+                info['action'] = 'invalid'
+                info['error'] = f"Unknown action type: {action_type}"
+        except Exception as error:  # Mirrors the server's catch-all
+            reward = -0.5
+            stats['invalidActions'] += 1
+            info['error'] = str(error)
+
+        stats['totalReward'] += reward
+
+        task = episode['task']
+        if not stats['taskCompleted'] and task['checkCompletion'](episode):
+            stats['taskCompleted'] = True
+            reward += task['reward']
+            stats['totalReward'] += task['reward']
+            info['taskCompleted'] = True
+            info['taskReward'] = task['reward']
+
+        episode['done'] = self.check_episode_done(episode, info)
+
+        if episode['done']:
+            episode['endTime'] = self.clock()
+            self.episodes.finish(episode['id'], {
+                'id': episode['id'],
+                'taskType': episode['taskType'],
+                'completed': stats['taskCompleted'],
+                'totalReward': stats['totalReward'],
+                'steps': stats['stepCount'],
+                'duration': episode['endTime'] - episode['startTime'],
+                'endTime': episode['endTime'],
+            })
+        else:
+            self.episodes.touch(episode['id'])
+
+        return {
+            'state': self.get_state(episode['id']),
+            'reward': reward,
+            'done': episode['done'],
+            'info': info,
+        }
+
+    def check_episode_done(self, episode: Dict[str, Any], info: Dict[str, Any]) -> bool:
+        """Check if episode should terminate."""
+        stats = episode['stats']
+        if stats['taskCompleted']:
+            info['reason'] = 'task_completed'
+            return True
+        if stats['stepCount'] >= episode['task']['maxSteps']:
+            info['reason'] = 'max_steps_reached'
+            return True
+        if stats['invalidActions'] >= MAX_INVALID_ACTIONS:
+            info['reason'] = 'too_many_invalid_actions'
+            return True
+        return False
+
+    def action_send_message(self, episode: Dict[str, Any], payload: Any, missing: bool = False) -> float:
+        """Action: Send a message."""
+        payload = _destructure(payload, 'content', missing)
+        content = payload.get('content')
+        target_channel = payload.get('channelId') or episode['agentState']['currentChannelId']
+
+        if not content:
+            return -0.2
+        if not isinstance(content, str):
+            raise TypeError('content.trim is not a function')
+        if len(content.strip()) == 0:
+            return -0.2  # Empty message penalty
+        if _js_length(content) > 500:
+            return -0.1  # Too long message penalty
+
+        agent_id = episode['agentState']['userId']
+        self.add_message_to_episode(episode, target_channel, agent_id, content)
+        episode['stats']['messagesSent'] += 1
+
+        reward = 0.1  # Base reward
+
+        # Bonus for responding to mentions (excluding the just-sent message)
+        channel_messages = episode['messages'][target_channel]
+        if any('@agent' in msg['content'] and msg['userId'] != agent_id
+               for msg in channel_messages[-5:-1]):
+            reward += 0.5
+
+        if episode['taskType'] == 'greeting_response':
+            if GREETING_PATTERN.search(content.lower()):
+                reward += 0.3
+
+        # Penalty for spam (repeated messages)
+        duplicates = sum(1 for msg in channel_messages[-3:]
+                         if msg['userId'] == 'agent' and msg['content'] == content)
+        if duplicates > 1:
+            reward = -0.3
+
+        return reward
+
+    def action_switch_channel(self, episode: Dict[str, Any], payload: Any, missing: bool = False) -> float:
+        """Action: Switch channel."""
+        channel_id = _destructure(payload, 'channelId', missing).get('channelId')
+        if not channel_id:
+            return -0.2
+
+        # Ids that are not strings never match (and may not be hashable)
+        entry = episode['channelsById'].get(channel_id) if isinstance(channel_id, str) else None
+        if entry is None:
+            return -0.3
+
+        team, channel = entry
+        episode['agentState']['currentTeamId'] = team['id']
+        channel['unread'] = 0
+
+        if channel_id == episode['agentState']['currentChannelId']:
+            return -0.1  # Already in this channel
+
+        episode['agentState']['currentChannelId'] = channel_id
+        episode['stats']['channelsSwitched'] += 1
+        return 0.05
+
+    def action_react_to_message(self, episode: Dict[str, Any], payload: Any, missing: bool = False) -> float:
+        """Action: React to a message."""
+        payload = _destructure(payload, 'messageId', missing)
+        message_id = payload.get('messageId')
+        reaction = payload.get('reaction')
+
+        if not message_id or not reaction:
+            return -0.2
+
+        message = episode['messagesById'].get(message_id) if isinstance(message_id, str) else None
+        if message is None:
+            return -0.2  # Message not found
+
+        message['reactions'].append({
+            'userId': episode['agentState']['userId'],
+            'reaction': reaction,
+            'timestamp': self.clock(),
+        })
+        episode['stats']['reactionsGiven'] += 1
+        return 0.05  # Small reward for engagement
+
+    def action_join_call(self, episode: Dict[str, Any], payload: Any) -> float:
+        """Action: Join a call."""
+        channel_id = (payload.get('channelId') if isinstance(payload, dict) else None) \
+            or episode['agentState']['currentChannelId']
+
+        messages = episode['messages'].get(channel_id)
+        if messages is None:
+            raise TypeError("Cannot read properties of undefined (reading 'slice')")
+
+        has_call_invitation = any(
+            '@agent' in msg['content'] and any(
+                word in msg['content'].lower() for word in ('call', 'meeting', 'standup'))
+            for msg in messages[-5:]
+        )
+
+        episode['stats']['callsJoined'] += 1
+        return 0.5 if has_call_invitation else 0.1
+
+    def action_set_status(self, episode: Dict[str, Any], payload: Any, missing: bool = False) -> float:
+        """Action: Set agent status."""
+        status = _destructure(payload, 'status', missing).get('status')
+        if status not in VALID_STATUSES:
+            return -0.1
+
+        for user in episode['users']:
+            if user['id'] == episode['agentState']['userId']:
+                user['status'] = status
+                break
+        return 0.02
+
+    def add_message_to_episode(self, episode: Dict[str, Any], channel_id: str,
+                               user_id: str, content: str) -> Dict[str, Any]:
+        """Add a message to episode."""
+        message = {
+            'id': self._new_id(),
+            'channelId': channel_id,
+            'userId': user_id,
+            'content': content,
+            'timestamp': self.clock(),
+            'reactions': [],
+        }
+        episode['messages'].setdefault(channel_id, []).append(message)
+        episode['messagesById'][message['id']] = message
+
+        entry = episode['channelsById'].get(channel_id)
+        if entry is not None and channel_id != episode['agentState']['currentChannelId']:
+            entry[1]['unread'] += 1
+
+        return message
+
+    def get_available_actions(self, episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get available actions and the channels of an episode."""
+        episode = self.episodes.get(episode_id or self.current_episode_id)
+        channels = []
+        if episode is not None:
+            channels = [
+                {'id': ch['id'], 'name': ch['name'], 'teamName': team['name']}
+                for team in episode['teams'] for ch in team['channels']
+            ]
+        return {'actions': AVAILABLE_ACTIONS, 'channels': channels}
+
+    def get_episode_info(self, episode_id: str) -> Optional[Dict[str, Any]]:
+        """Get episode information."""
+        episode = self.episodes.get(episode_id)
+        if episode is None:
+            # Finished and compacted: only the summary record is left
+            summary = self.episodes.get_summary(episode_id)
+            return dict(summary, done=True, compacted=True) if summary else None
+        end_time = episode['endTime']
+        return {
+            'id': episode['id'],
+            'taskType': episode['taskType'],
+            'taskName': episode['task']['name'],
+            'taskDescription': episode['task']['description'],
+            'stats': dict(episode['stats']),
+            'done': episode['done'],
+            'startTime': episode['startTime'],
+            'endTime': end_time,
+            'duration': (end_time if end_time else self.clock()) - episode['startTime'],
+        }
+
+    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get episode history (the most recent max_history finished episodes)."""
+        return self.episodes.history(limit)
+
+    def get_store_stats(self) -> Dict[str, Any]:
+        """Episode store occupancy, limits and eviction counters."""
+        return self.episodes.stats()
+
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        """Get all task definitions."""
+        return [
+            {
+                'type': task_type,
+                'name': task['name'],
+                'description': task['description'],
+                'maxSteps': task['maxSteps'],
+                'reward': task['reward'],
+            }
+            for task_type, task in self.task_definitions.items()
+        ]
+
+
+class LocalTeamsEnv:
+    """
+    Drop-in replacement for TeamsEnvClient backed by LocalEnvironment.
+
+    Method signatures and return values match TeamsEnvClient, so agents can
+    switch between the HTTP backend and the in-process simulator by swapping
+    the client object. Like the client, calls without an episode id act on
+    this object's last reset, and episodes it started are checked against
+    their session token (EpisodeScopeError, with the server's status, when
+    another client has reset the id since).
+    """
+
+    def __init__(self, seed: Optional[int] = None,
+                 environment: Optional[LocalEnvironment] = None,
+                 episode_store: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            seed: Seed for task selection and message ids
+            environment: Optional shared LocalEnvironment (several clients
+                can drive episodes in one environment, like one server)
+            episode_store: EpisodeStore limits for a new environment
+        """
+        self.env = environment or LocalEnvironment(seed=seed, episode_store=episode_store)
+        self.last_episode_id: Optional[str] = None
+        self._session_tokens: 'OrderedDict[str, str]' = OrderedDict()
+
+    def _resolve(self, episode_id: Optional[str]) -> Optional[str]:
+        """Episode a call acts on: ``episode_id`` or the last reset, checked against its token."""
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        return self.env.resolve_episode_id(episode_id, self._session_tokens.get(episode_id))
+
+    def reset(self, episode_id: Optional[str] = None, task_type: Optional[str] = None,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Reset the environment and start a new episode."""
+        config = {}
+        if episode_id:
+            config['episodeId'] = episode_id
+        if task_type:
+            config['taskType'] = task_type
+        result = self.env.reset(config)
+        self.last_episode_id = result['episodeId']
+        self._session_tokens.pop(result['episodeId'], None)
+        self._session_tokens[result['episodeId']] = result['sessionToken']
+        while len(self._session_tokens) > MAX_SESSION_TOKENS:
+            self._session_tokens.popitem(last=False)
+        return {'success': True, **result, 'message': 'Environment reset successfully'}
+
+    def get_state(self, timeout: Optional[float] = None,
+                  episode_id: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Get an episode's state (defaults to the most recent reset), optionally only some sections."""
+        if fields is not None:
+            unknown = [name for name in fields if name not in STATE_SECTIONS]
+            if unknown:
+                raise ValueError(f"Unknown state fields: {', '.join(unknown)} "
+                                 f"(expected: {', '.join(STATE_SECTIONS)})")
+            fields = [section for section in STATE_SECTIONS if section in fields]
+        return self.env.get_state(self._resolve(episode_id), fields)
+
+    def step(self, action: Dict[str, Any], episode_id: Optional[str] = None,
+             timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute an action in the environment."""
+        if not action or not action.get('type'):
+            raise ValueError(
+                'Invalid action format. Expected: { action: { type: string, payload: object } }')
+        return {'success': True, **self.env.step(action, self._resolve(episode_id))}
+
+    def reset_many(self, count: Optional[int] = None,
+                   task_types: Union[None, str, Sequence[Optional[str]]] = None,
+                   episode_ids: Optional[Sequence[Optional[str]]] = None,
+                   raise_on_error: bool = True,
+                   timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Start several episodes (same contract as TeamsEnvClient.reset_many)."""
+        if count is None:
+            if isinstance(task_types, (list, tuple)):
+                count = len(task_types)
+            elif episode_ids is not None:
+                count = len(episode_ids)
+            else:
+                raise ValueError("reset_many needs count, task_types or episode_ids")
+
+        results = []
+        for i in range(count):
+            task_type = task_types[i] if isinstance(task_types, (list, tuple)) else task_types
+            episode_id = episode_ids[i] if episode_ids is not None else None
+            try:
+                results.append(self.reset(episode_id=episode_id, task_type=task_type))
+            except Exception as error:
+                if raise_on_error:
+                    raise RuntimeError(f"Batch item {i} failed: {error}") from error
+                results.append({'success': False, 'error': str(error)})
+        return results
+
+    def step_many(self, actions: Sequence[Dict[str, Any]], episode_ids: Sequence[str],
+                  raise_on_error: bool = True,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Step several episodes (same contract as TeamsEnvClient.step_many)."""
+        if len(actions) != len(episode_ids):
+            raise ValueError("actions and episode_ids must have the same length")
+
+        results = []
+        for i, (action, episode_id) in enumerate(zip(actions, episode_ids)):
+            try:
+                if not episode_id:
+                    raise ValueError('Missing episodeId')
+                results.append(self.step(action, episode_id))
+            except Exception as error:
+                if raise_on_error:
+                    raise RuntimeError(f"Batch item {i} failed: {error}") from error
+                results.append({'success': False, 'error': str(error)})
+        return results
+
+    def get_actions(self, timeout: Optional[float] = None,
+                    episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get available actions and an episode's channels."""
+        return {'success': True, **self.env.get_available_actions(self._resolve(episode_id))}
+
+    def get_stats(self, episode_id: Optional[str] = None,
+                  timeout: Optional[float] = None,
+                  include_store: bool = False) -> Dict[str, Any]:
+        """Get episode statistics (plus the episode store counters under 'store')."""
+        stats = self.env.get_stats(self._resolve(episode_id))
+        if include_store:
+            stats = dict(stats, store=self.env.get_store_stats())
+        return stats
+
+    def get_episode_info(self, episode_id: str,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get detailed information about a specific episode."""
+        info = self.env.get_episode_info(episode_id)
+        if info is None:
+            raise LookupError('Episode not found')
+        return info
+
+    def get_history(self, limit: int = 10, timeout: Optional[float] = None) -> list:
+        """Get episode history."""
+        return self.env.get_history(limit)
+
+    def get_tasks(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get all available task definitions, keyed by task type."""
+        return {task['type']: task for task in self.env.get_tasks()}
+
+    def connection_stats(self) -> Dict[str, int]:
+        """No connections are used in-process; provided for API parity."""
+        return {'new_connections': 0, 'reused_connections': 0, 'requests': 0}
+
+    def close(self):
+        """Nothing to release; provided for API parity."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,292 @@
+"""
+Client-side Request Metrics for TeamsClone-RL
+
+Per-endpoint latency histograms (p50/p95/p99), bytes in/out, decode time,
+server time, error counts and response cache hits/misses for TeamsEnvClient,
+plus hooks for custom sinks and JSON / Prometheus text exports.
+
+Each request's latency is split into server time (from the backend's
+``Server-Timing`` header) and the rest (network and HTTP overhead). Decode
+time is measured separately, and time spent outside the client (policy,
+training, sleeps) is reported as ``outside_seconds``.
+"""
+
+import bisect
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Prometheus histogram bucket bounds, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Episode ids in paths are collapsed so each route is one endpoint
+_PATH_IDS = re.compile(r'^/(info)/[^/]+$')
+_EPISODE_ID_LABEL = r'/\1/:episodeId'
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Label for a request, e.g. 'POST /step' or 'GET /info/:episodeId'."""
+    return f"{method} {_PATH_IDS.sub(_EPISODE_ID_LABEL, path)}"
+
+
+class LatencyHistogram:
+    """Latency distribution: cumulative bucket counts plus a window of recent samples."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, window: int = 10000):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (0-100) over the recent sample window, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = math.ceil(q / 100 * len(ordered))
+        return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class EndpointStats:
+    """Counters for one endpoint."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.decode_seconds = 0.0
+        self.server_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class ClientMetrics:
+    """
+    Request metrics collected by TeamsEnvClient.
+
+    Every finished request is recorded with ``record`` and handed to the
+    registered hooks as a dict with: endpoint, latency, server_time,
+    decode_time, bytes_out, bytes_in, status and error.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.reset()
+
+    def reset(self):
+        """Clear all counters (hooks are kept)."""
+        with self._lock:
+            self.endpoints: Dict[str, EndpointStats] = {}
+            self.started = time.perf_counter()
+            self.client_seconds = 0.0
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Register a custom sink called after every request.
+
+        Args:
+            hook: Callable receiving the request record dict
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """Unregister a hook added with add_hook."""
+        self._hooks.remove(hook)
+
+    def _endpoint(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_cache(self, endpoint: str, hit: bool):
+        """
+        Record one lookup in the client's response cache.
+
+        Args:
+            endpoint: Endpoint label of the cached response (see endpoint_name)
+            hit: Whether the response was served from the cache
+        """
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record(self, endpoint: str, latency: float,
+               bytes_out: int = 0, bytes_in: int = 0,
+               decode_time: float = 0.0, server_time: Optional[float] = None,
+               status: Optional[int] = None, error: Optional[str] = None):
+        """
+        Record one finished request.
+
+        Args:
+            endpoint: Endpoint label (see endpoint_name)
+            latency: Seconds from sending the request to receiving the response
+            bytes_out: Request body size
+            bytes_in: Response body size
+            decode_time: Seconds spent decoding the response body
+            server_time: Seconds the server spent handling it, when known
+            status: HTTP status code, when there was a response
+            error: Error message for failed requests
+        """
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.latency.observe(latency)
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            stats.decode_seconds += decode_time
+            stats.server_seconds += server_time or 0.0
+            if error is not None:
+                stats.errors += 1
+            self.client_seconds += latency + decode_time
+
+        if self._hooks:
+            event = {
+                'endpoint': endpoint,
+                'latency': latency,
+                'server_time': server_time,
+                'decode_time': decode_time,
+                'bytes_out': bytes_out,
+                'bytes_in': bytes_in,
+                'status': status,
+                'error': error,
+            }
+            for hook in self._hooks:
+                hook(event)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize everything recorded since creation or the last reset.
+
+        Returns:
+            Dictionary with:
+                - endpoints: Per-endpoint count, errors, mean/p50/p95/p99
+                  latency (ms), server_ms and decode_ms (means), bytes_out,
+                  bytes_in, cache_hits and cache_misses
+                - wall_seconds: Time since the metrics were created/reset
+                - client_seconds: Time spent in requests and decoding
+                - outside_seconds: The rest (policy, training, sleeps, ...)
+        """
+        with self._lock:
+            endpoints = {}
+            for name, stats in sorted(self.endpoints.items()):
+                hist = stats.latency
+                count = max(hist.count, 1)
+                endpoints[name] = {
+                    'count': hist.count,
+                    'errors': stats.errors,
+                    'mean_ms': hist.total / count * 1000,
+                    'p50_ms': hist.percentile(50) * 1000,
+                    'p95_ms': hist.percentile(95) * 1000,
+                    'p99_ms': hist.percentile(99) * 1000,
+                    'server_ms': stats.server_seconds / count * 1000,
+                    'decode_ms': stats.decode_seconds / count * 1000,
+                    'bytes_out': stats.bytes_out,
+                    'bytes_in': stats.bytes_in,
+                    'cache_hits': stats.cache_hits,
+                    'cache_misses': stats.cache_misses,
+                }
+            wall = time.perf_counter() - self.started
+            client = self.client_seconds
+
+        return {
+            'endpoints': endpoints,
+            'wall_seconds': wall,
+            'client_seconds': client,
+            'outside_seconds': max(wall - client, 0.0),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Summary as a JSON string."""
+        return json.dumps(self.summary(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'teams_env_client') -> str:
+        """
+        Export counters in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Prometheus text (one histogram plus counters, labelled by endpoint)
+        """
+        lines = [
+            f"# HELP {prefix}_request_seconds Request latency in seconds",
+            f"# TYPE {prefix}_request_seconds histogram",
+        ]
+        counters = {
+            'request_errors_total': ('Failed requests', lambda s: s.errors),
+            'request_bytes_out_total': ('Request body bytes sent', lambda s: s.bytes_out),
+            'request_bytes_in_total': ('Response body bytes received', lambda s: s.bytes_in),
+            'decode_seconds_total': ('Time spent decoding responses', lambda s: s.decode_seconds),
+            'server_seconds_total': ('Server handling time reported via Server-Timing',
+                                     lambda s: s.server_seconds),
+            'cache_hits_total': ('Calls answered from the response cache', lambda s: s.cache_hits),
+            'cache_misses_total': ('Cache lookups that went to the server', lambda s: s.cache_misses),
+        }
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            for name, stats in endpoints:
+                label = f'endpoint="{name}"'
+                hist = stats.latency
+                cumulative = 0
+                for bound, bucket_count in zip(hist.buckets, hist.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{prefix}_request_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_request_seconds_bucket{{{label},le="+Inf"}} {hist.count}')
+                lines.append(f'{prefix}_request_seconds_sum{{{label}}} {hist.total}')
+                lines.append(f'{prefix}_request_seconds_count{{{label}}} {hist.count}')
+
+            for metric, (help_text, getter) in counters.items():
+                lines.append(f"# HELP {prefix}_{metric} {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric} counter")
+                for name, stats in endpoints:
+                    lines.append(f'{prefix}_{metric}{{endpoint="{name}"}} {getter(stats)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def format_summary(self) -> str:
+        """Human-readable summary table."""
+        summary = self.summary()
+        lines = [
+            f"{'endpoint':<24}{'count':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'server':>9}{'decode':>9}{'KB out':>9}{'KB in':>9}",
+        ]
+        for name, e in summary['endpoints'].items():
+            lines.append(
+                f"{name:<24}{e['count']:>7}{e['errors']:>5}{e['p50_ms']:>9.2f}{e['p95_ms']:>9.2f}"
+                f"{e['p99_ms']:>9.2f}{e['server_ms']:>9.2f}{e['decode_ms']:>9.3f}"
+                f"{e['bytes_out'] / 1024:>9.1f}{e['bytes_in'] / 1024:>9.1f}")
+        lines.append(
+            f"wall {summary['wall_seconds']:.2f}s = client {summary['client_seconds']:.2f}s"
+            f" + outside client (policy etc.) {summary['outside_seconds']:.2f}s")
+        return '\n'.join(lines)
+
+
+def parse_server_timing(header: Optional[str]) -> Optional[float]:
+    """Total duration in seconds from a ``Server-Timing`` header, if present."""
+    if not header:
+        return None
+    total = 0.0
+    found = False
+    for match in re.finditer(r'dur=([0-9.]+)', header):
+        total += float(match.group(1))
+        found = True
+    return total / 1000 if found else None
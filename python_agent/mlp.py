@@ -0,0 +1,235 @@
+"""
+NumPy Multi-Layer Perceptron for TeamsClone-RL
+
+A small fully connected network (ReLU hidden layers, linear output) with a
+batched forward and backward pass and an Adam optimizer, written against
+plain NumPy so agents can train on CPU-only machines without a deep learning
+framework.
+
+Activations, gradients and optimizer moments live in preallocated float32
+buffers (per batch size), and every matmul writes into them with ``out=``, so
+a training step allocates almost nothing. All weights and biases are views
+into one flat parameter vector (and likewise for gradients), so the optimizer
+update is a few whole-vector operations instead of a few per layer.
+
+    net = MLP([obs_dim, 128, 128, num_actions], seed=0)
+    optimizer = Adam(net, lr=1e-3)
+    q = net.forward(obs_batch)              # (batch, num_actions), reused buffer
+    net.backward(grad_q)                    # fills net.grads
+    optimizer.step()
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class MLP:
+    """
+    Fully connected network: ReLU hidden layers, linear output layer.
+
+    ``forward`` returns an internal buffer that the next forward call with the
+    same batch size overwrites; copy it if you need to keep it. ``backward``
+    uses the activations of the most recent forward call.
+    """
+
+    def __init__(self, sizes: Sequence[int], seed: Optional[int] = None):
+        """
+        Args:
+            sizes: Layer widths, input first and output last
+                (e.g. [48, 128, 128, 10])
+            seed: Seed for the weight initialization
+        """
+        if len(sizes) < 2:
+            raise ValueError("sizes needs at least an input and an output width")
+        rng = np.random.default_rng(seed)
+        self.sizes = tuple(sizes)
+        layers = list(zip(sizes[:-1], sizes[1:]))
+        count = sum(fan_in * fan_out + fan_out for fan_in, fan_out in layers)
+        self.flat_params = np.zeros(count, dtype=np.float32)
+        self.flat_grads = np.zeros(count, dtype=np.float32)
+        self.weights, self.grad_weights = self._views(
+            [(fan_in, fan_out) for fan_in, fan_out in layers], 0)
+        offset = sum(fan_in * fan_out for fan_in, fan_out in layers)
+        self.biases, self.grad_biases = self._views(
+            [(fan_out,) for _, fan_out in layers], offset)
+        for w, (fan_in, _) in zip(self.weights, layers):
+            # He initialization for the ReLU layers
+            w[...] = rng.standard_normal(w.shape) * np.sqrt(2.0 / fan_in)
+        self._buffers: Dict[int, Dict[str, list]] = {}
+        self._input: Optional[np.ndarray] = None
+        self._batch = 0
+
+    def _views(self, shapes, offset):
+        params, grads = [], []
+        for shape in shapes:
+            size = int(np.prod(shape))
+            params.append(self.flat_params[offset:offset + size].reshape(shape))
+            grads.append(self.flat_grads[offset:offset + size].reshape(shape))
+            offset += size
+        return params, grads
+
+    @property
+    def params(self) -> List[np.ndarray]:
+        """Weights and biases, in the same order as ``grads``."""
+        return self.weights + self.biases
+
+    @property
+    def grads(self) -> List[np.ndarray]:
+        """Gradients from the last backward call, in the order of ``params``."""
+        return self.grad_weights + self.grad_biases
+
+    def _buffers_for(self, batch: int) -> Dict[str, list]:
+        buffers = self._buffers.get(batch)
+        if buffers is None:
+            widths = self.sizes[1:]
+            buffers = self._buffers[batch] = {
+                'activations': [np.zeros((batch, w), dtype=np.float32) for w in widths],
+                'deltas': [np.zeros((batch, w), dtype=np.float32) for w in widths],
+                'masks': [np.zeros((batch, w), dtype=np.bool_) for w in widths[:-1]],
+            }
+        return buffers
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """
+        Batched forward pass.
+
+        Args:
+            x: float32 input of shape (batch, sizes[0])
+
+        Returns:
+            Output of shape (batch, sizes[-1]) (an internal buffer)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        batch = x.shape[0]
+        activations = self._buffers_for(batch)['activations']
+        last = len(self.weights) - 1
+        h = x
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            out = activations[i]
+            np.matmul(h, w, out=out)
+            out += b
+            if i < last:
+                np.maximum(out, 0.0, out=out)
+            h = out
+        self._input = x
+        self._batch = batch
+        return h
+
+    def backward(self, grad_output: np.ndarray):
+        """
+        Backpropagate ``grad_output`` (dLoss/dOutput of the last forward call)
+        and store parameter gradients in ``grads``.
+
+        Args:
+            grad_output: float32 array of shape (batch, sizes[-1])
+        """
+        if self._input is None or grad_output.shape[0] != self._batch:
+            raise ValueError("backward must follow a forward call with the same batch size")
+        buffers = self._buffers_for(self._batch)
+        activations, deltas, masks = buffers['activations'], buffers['deltas'], buffers['masks']
+        delta = grad_output
+        for i in range(len(self.weights) - 1, -1, -1):
+            prev = activations[i - 1] if i > 0 else self._input
+            np.matmul(prev.T, delta, out=self.grad_weights[i])
+            np.sum(delta, axis=0, out=self.grad_biases[i])
+            if i > 0:
+                prev_delta = deltas[i - 1]
+                np.matmul(delta, self.weights[i].T, out=prev_delta)
+                np.greater(prev, 0.0, out=masks[i - 1])
+                prev_delta *= masks[i - 1]
+                delta = prev_delta
+
+    def copy_from(self, other: 'MLP'):
+        """Copy parameters from a network of the same shape (e.g. target sync)."""
+        np.copyto(self.flat_params, other.flat_params)
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """Parameters keyed 'w0', 'b0', 'w1', ... (for np.savez)."""
+        state = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            state[f'w{i}'] = w
+            state[f'b{i}'] = b
+        return state
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]):
+        """Load parameters saved with state_dict (shapes must match)."""
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            np.copyto(w, state[f'w{i}'])
+            np.copyto(b, state[f'b{i}'])
+
+
+class Adam:
+    """Adam optimizer updating an MLP's flat parameter vector in place."""
+
+    FLUSH_EVERY = 100
+    FLUSH_BELOW = 1e-30
+
+    def __init__(self, net: MLP, lr: float = 1e-3, beta1: float = 0.9,
+                 beta2: float = 0.999, eps: float = 1e-8,
+                 max_grad_norm: Optional[float] = 10.0):
+        """
+        Args:
+            net: Network to optimize
+            lr: Learning rate
+            beta1: First moment decay
+            beta2: Second moment decay
+            eps: Numerical stability term
+            max_grad_norm: Clip the global gradient norm to this value (None disables)
+        """
+        self.net = net
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.max_grad_norm = max_grad_norm
+        self.m = np.zeros_like(net.flat_params)
+        self.v = np.zeros_like(net.flat_params)
+        self._scratch = np.zeros_like(net.flat_params)
+        self.t = 0
+
+    def step(self) -> float:
+        """
+        Apply one update from the network's current gradients.
+
+        Returns:
+            Global gradient norm before clipping
+        """
+        g, m, v, scratch = self.net.flat_grads, self.m, self.v, self._scratch
+        norm = float(np.sqrt(np.dot(g, g)))
+        if self.max_grad_norm is not None and norm > self.max_grad_norm:
+            g *= self.max_grad_norm / (norm + 1e-12)
+
+        self.t += 1
+        step_size = self.lr * np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+        m *= self.beta1
+        np.multiply(g, 1 - self.beta1, out=scratch)
+        m += scratch
+        v *= self.beta2
+        np.multiply(g, g, out=scratch)
+        scratch *= 1 - self.beta2
+        v += scratch
+        np.sqrt(v, out=scratch)
+        scratch += self.eps
+        np.divide(m, scratch, out=scratch)
+        scratch *= step_size
+        self.net.flat_params -= scratch
+
+        # Moments of parameters that stopped getting gradient decay towards
+        # float32 denormals, which make every vector op above many times slower
+        if self.t % self.FLUSH_EVERY == 0:
+            for moment in (m, v):
+                np.abs(moment, out=scratch)
+                np.copyto(moment, 0.0, where=scratch < self.FLUSH_BELOW)
+        return norm
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        """Moments and step count, keyed 'm', 'v' and 't'."""
+        return {'m': self.m, 'v': self.v, 't': np.array(self.t)}
+
+    def load_state_dict(self, state: Dict[str, np.ndarray]):
+        self.t = int(state['t'])
+        np.copyto(self.m, state['m'])
+        np.copyto(self.v, state['v'])
@@ -0,0 +1,275 @@
+"""
+NumPy PPO for TeamsClone-RL
+
+Proximal Policy Optimization (clipped surrogate objective) on top of
+mlp.MLP. One network with a shared trunk outputs the action logits and the
+state value, so acting and training need a single forward pass per batch.
+
+    rollout = RolloutBuffer(horizon=128, num_envs=16, obs_dim=encoder.dim)
+    ... fill rollout.obs/actions/log_probs/values/rewards/dones per step ...
+    advantages, returns = compute_gae(rollout.rewards, rollout.values,
+                                      rollout.dones, last_values, 0.99, 0.95)
+    stats = ppo.update(rollout.obs, rollout.actions, rollout.log_probs,
+                       advantages, returns)
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mlp import MLP, Adam
+
+
+def compute_gae(rewards: np.ndarray, values: np.ndarray, dones: np.ndarray,
+                last_values: np.ndarray, gamma: float = 0.99,
+                lam: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generalized Advantage Estimation over a (horizon, num_envs) rollout.
+
+    The recursion runs backwards over time, but each step is one vector
+    operation across all environments.
+
+    Args:
+        rewards: (T, N) rewards
+        values: (T, N) value estimates of the observations
+        dones: (T, N) flags; True when the episode ended with that step
+        last_values: (N,) value estimates of the observations after the last step
+        gamma: Discount factor
+        lam: GAE lambda
+
+    Returns:
+        (advantages, returns), both float32 arrays of shape (T, N)
+    """
+    horizon = rewards.shape[0]
+    advantages = np.zeros_like(rewards, dtype=np.float32)
+    not_done = 1.0 - dones.astype(np.float32)
+    next_values = last_values.astype(np.float32)
+    gae = np.zeros(rewards.shape[1], dtype=np.float32)
+    for t in range(horizon - 1, -1, -1):
+        delta = rewards[t] + gamma * next_values * not_done[t] - values[t]
+        gae = delta + gamma * lam * not_done[t] * gae
+        advantages[t] = gae
+        next_values = values[t]
+    return advantages, advantages + values
+
+
+class RolloutBuffer:
+    """
+    Preallocated (horizon, num_envs, ...) arrays for one PPO rollout.
+
+    ``masks`` (allowed actions per step) is only allocated when
+    ``num_actions`` is given; otherwise it is None.
+    """
+
+    def __init__(self, horizon: int, num_envs: int, obs_dim: int,
+                 num_actions: Optional[int] = None):
+        self.horizon = horizon
+        self.num_envs = num_envs
+        self.obs = np.zeros((horizon, num_envs, obs_dim), dtype=np.float32)
+        self.actions = np.zeros((horizon, num_envs), dtype=np.int64)
+        self.log_probs = np.zeros((horizon, num_envs), dtype=np.float32)
+        self.values = np.zeros((horizon, num_envs), dtype=np.float32)
+        self.rewards = np.zeros((horizon, num_envs), dtype=np.float32)
+        self.dones = np.zeros((horizon, num_envs), dtype=np.bool_)
+        self.masks = (np.ones((horizon, num_envs, num_actions), dtype=np.bool_)
+                      if num_actions else None)
+
+
+class PPO:
+    """
+    Actor-critic network plus the clipped PPO update.
+
+    The network outputs ``num_actions`` logits followed by one value.
+    Gradients of the policy, value and entropy terms are derived by hand and
+    backpropagated together in one backward pass.
+    """
+
+    def __init__(self, obs_dim: int, num_actions: int,
+                 hidden_sizes: Sequence[int] = (64, 64),
+                 lr: float = 3e-4, clip_range: float = 0.2,
+                 vf_coef: float = 0.5, ent_coef: float = 0.01,
+                 epochs: int = 4, minibatch_size: int = 256,
+                 max_grad_norm: Optional[float] = 0.5,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            obs_dim: Width of the encoded observation
+            num_actions: Number of discrete actions
+            hidden_sizes: Shared trunk hidden layer widths
+            lr: Adam learning rate
+            clip_range: PPO ratio clip epsilon
+            vf_coef: Value loss coefficient
+            ent_coef: Entropy bonus coefficient
+            epochs: Passes over each rollout
+            minibatch_size: Samples per gradient step
+            max_grad_norm: Global gradient norm clip (None disables)
+            seed: Seed for initialization, sampling and minibatch shuffling
+        """
+        self.obs_dim = obs_dim
+        self.num_actions = num_actions
+        self.clip_range = clip_range
+        self.vf_coef = vf_coef
+        self.ent_coef = ent_coef
+        self.epochs = epochs
+        self.minibatch_size = minibatch_size
+        self.net = MLP([obs_dim, *hidden_sizes, num_actions + 1], seed=seed)
+        self.optimizer = Adam(self.net, lr=lr, max_grad_norm=max_grad_norm)
+        self.rng = np.random.default_rng(seed)
+
+    def _policy(self, obs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Forward pass -> (log-probabilities, probabilities, values)."""
+        out = self.net.forward(obs)
+        logits = out[:, :self.num_actions]
+        shifted = logits - logits.max(axis=1, keepdims=True)
+        log_probs = shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+        return log_probs, np.exp(log_probs), out[:, self.num_actions].copy()
+
+    def act(self, obs: np.ndarray, mask: Optional[np.ndarray] = None,
+            deterministic: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample actions for a batch of observations.
+
+        Args:
+            obs: (batch, obs_dim) observations
+            mask: Optional (batch, num_actions) bool array of allowed actions
+            deterministic: Take the most likely action instead of sampling
+
+        Returns:
+            (actions int64[batch], log_probs float32[batch], values float32[batch])
+        """
+        log_probs, probs, values = self._policy(obs)
+        if mask is not None:
+            log_probs, probs = self._masked(log_probs, mask)
+        if deterministic:
+            actions = probs.argmax(axis=1)
+        else:
+            # Inverse-CDF sampling for the whole batch at once
+            u = self.rng.random((len(probs), 1))
+            actions = (np.cumsum(probs, axis=1) < u).sum(axis=1)
+            np.minimum(actions, self.num_actions - 1, out=actions)
+        rows = np.arange(len(actions))
+        return actions, log_probs[rows, actions].astype(np.float32), values
+
+    @staticmethod
+    def _masked(log_probs: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Renormalize the distribution over allowed actions."""
+        mask = mask | ~mask.any(axis=1, keepdims=True)
+        masked = np.where(mask, log_probs, -np.inf)
+        top = masked.max(axis=1, keepdims=True)
+        masked = masked - top - np.log(np.exp(masked - top).sum(axis=1, keepdims=True))
+        return masked, np.exp(masked)
+
+    def value(self, obs: np.ndarray) -> np.ndarray:
+        """State values for a batch of observations."""
+        return self.net.forward(obs)[:, self.num_actions].copy()
+
+    def update(self, obs: np.ndarray, actions: np.ndarray, old_log_probs: np.ndarray,
+               advantages: np.ndarray, returns: np.ndarray,
+               masks: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """
+        Run ``epochs`` passes of minibatch gradient steps over one rollout.
+
+        Inputs may be (T, N, ...) rollout arrays; they are flattened here.
+
+        Args:
+            obs: Observations
+            actions: Actions taken
+            old_log_probs: Log-probabilities of the actions when they were taken
+            advantages: GAE advantages (normalized per minibatch here)
+            returns: Value targets
+            masks: Optional allowed-action masks used when acting
+
+        Returns:
+            Mean policy_loss, value_loss, entropy, approx_kl, clip_fraction
+            and the number of gradient steps
+        """
+        obs = obs.reshape(-1, self.obs_dim)
+        actions = actions.reshape(-1)
+        old_log_probs = old_log_probs.reshape(-1)
+        advantages = advantages.reshape(-1)
+        returns = returns.reshape(-1)
+        if masks is not None:
+            masks = masks.reshape(-1, self.num_actions)
+        size = len(actions)
+        minibatch = min(self.minibatch_size, size)
+
+        totals = {'policy_loss': 0.0, 'value_loss': 0.0, 'entropy': 0.0,
+                  'approx_kl': 0.0, 'clip_fraction': 0.0}
+        steps = 0
+        for _ in range(self.epochs):
+            order = self.rng.permutation(size)
+            for start in range(0, size - minibatch + 1, minibatch):
+                idx = order[start:start + minibatch]
+                stats = self._step(obs[idx], actions[idx], old_log_probs[idx],
+                                   advantages[idx], returns[idx],
+                                   masks[idx] if masks is not None else None)
+                for key, value in stats.items():
+                    totals[key] += value
+                steps += 1
+
+        result = {key: value / max(steps, 1) for key, value in totals.items()}
+        result['gradient_steps'] = steps
+        return result
+
+    def _step(self, obs, actions, old_log_probs, advantages, returns, mask) -> Dict[str, float]:
+        size = len(actions)
+        rows = np.arange(size)
+        advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+
+        log_probs, probs, values = self._policy(obs)
+        if mask is not None:
+            log_probs, probs = self._masked(log_probs, mask)
+        new_log_probs = log_probs[rows, actions]
+        ratio = np.exp(new_log_probs - old_log_probs)
+        clipped = np.clip(ratio, 1.0 - self.clip_range, 1.0 + self.clip_range)
+        surrogate = np.minimum(ratio * advantages, clipped * advantages)
+
+        # d(-surrogate)/d(log pi(a)): the unclipped term is active unless the
+        # ratio has moved past the clip boundary in the advantage's direction
+        active = np.where(advantages >= 0, ratio <= 1.0 + self.clip_range,
+                          ratio >= 1.0 - self.clip_range)
+        grad_log_prob = np.where(active, -ratio * advantages, 0.0)
+
+        # d log pi(a) / d logits = onehot(a) - pi
+        grad_logits = -probs * grad_log_prob[:, None]
+        grad_logits[rows, actions] += grad_log_prob
+
+        # Entropy bonus: d(-H)/d logits = pi * (log pi + H)
+        safe_log_probs = np.where(probs > 0, log_probs, 0.0)
+        entropy = -(probs * safe_log_probs).sum(axis=1)
+        grad_logits += self.ent_coef * probs * (safe_log_probs + entropy[:, None])
+
+        value_error = values - returns
+        grad = np.empty((size, self.num_actions + 1), dtype=np.float32)
+        grad[:, :self.num_actions] = grad_logits / size
+        grad[:, self.num_actions] = self.vf_coef * value_error / size
+        self.net.backward(grad)
+        self.optimizer.step()
+
+        log_ratio = new_log_probs - old_log_probs
+        return {
+            'policy_loss': float(-surrogate.mean()),
+            'value_loss': float(0.5 * (value_error ** 2).mean()),
+            'entropy': float(entropy.mean()),
+            'approx_kl': float(((ratio - 1.0) - log_ratio).mean()),
+            'clip_fraction': float((np.abs(ratio - 1.0) > self.clip_range).mean()),
+        }
+
+    def save(self, path: str, **extra):
+        """Write a checkpoint (.npz) with the network, optimizer state and extras."""
+        state = {f'net.{k}': v for k, v in self.net.state_dict().items()}
+        state.update({f'optimizer.{k}': v for k, v in self.optimizer.state_dict().items()})
+        state.update({f'extra.{k}': np.asarray(v) for k, v in extra.items()})
+        np.savez(path, **state)
+
+    def load(self, path: str) -> Dict[str, np.ndarray]:
+        """Restore a checkpoint written by save(); returns the extras."""
+        with np.load(path) as data:
+            state = dict(data)
+
+        def section(prefix):
+            return {k[len(prefix):]: v for k, v in state.items() if k.startswith(prefix)}
+
+        self.net.load_state_dict(section('net.'))
+        self.optimizer.load_state_dict(section('optimizer.'))
+        return section('extra.')
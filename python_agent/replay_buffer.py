@@ -0,0 +1,313 @@
+"""
+Replay Memory for TeamsClone-RL
+
+Transitions are stored column-wise in preallocated NumPy arrays (obs, action,
+reward, next_obs, done) that are used as a ring buffer: adding is O(1), the
+oldest transitions are overwritten once the buffer is full, and sampling is a
+handful of vectorized fancy-indexing operations. No Python object is kept per
+transition, so millions of transitions cost only their array bytes.
+
+With ``storage_dir`` the columns are memory-mapped ``.npy`` files instead of
+in-memory arrays, for buffers larger than RAM (the OS pages them in and out).
+
+    buffer = ReplayBuffer(capacity=1_000_000, obs_dim=encoder.dim)
+    buffer.add(obs, action, reward, next_obs, done)
+    batch = buffer.sample(256)              # dict of (256, ...) arrays
+
+    per = PrioritizedReplayBuffer(capacity=1_000_000, obs_dim=encoder.dim)
+    batch = per.sample(256, beta=0.4)       # also 'weights' and 'indices'
+    per.update_priorities(batch['indices'], td_errors)
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# Columns every buffer has; extra_columns are stored after them
+COLUMNS = ('obs', 'actions', 'rewards', 'next_obs', 'dones')
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions with uniform sampling.
+    """
+
+    def __init__(self, capacity: int, obs_dim: int,
+                 obs_dtype=np.float32, action_dtype=np.int64,
+                 storage_dir: Optional[str] = None,
+                 seed: Optional[int] = None,
+                 extra_columns: Optional[Dict[str, Tuple[tuple, Any]]] = None):
+        """
+        Args:
+            capacity: Maximum number of transitions
+            obs_dim: Width of one encoded observation
+            obs_dtype: dtype of obs/next_obs (float16 halves the memory)
+            action_dtype: dtype of actions (int64 indices by default)
+            storage_dir: Directory for memory-mapped ``<column>.npy`` files;
+                in-memory arrays when omitted. Existing files are overwritten.
+            seed: Seed for the sampling generator
+            extra_columns: Additional per-transition columns, name ->
+                (shape, dtype), e.g. {'next_masks': ((n_actions,), np.bool_)};
+                filled through keyword arguments of add/add_batch
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.obs_dim = obs_dim
+        self.storage_dir = storage_dir
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.size = 0
+
+        specs = {
+            'obs': ((capacity, obs_dim), obs_dtype),
+            'actions': ((capacity,), action_dtype),
+            'rewards': ((capacity,), np.float32),
+            'next_obs': ((capacity, obs_dim), obs_dtype),
+            'dones': ((capacity,), np.bool_),
+        }
+        for name, (shape, dtype) in (extra_columns or {}).items():
+            specs[name] = ((capacity, *shape), dtype)
+        self.columns = tuple(specs)
+        if storage_dir is not None:
+            os.makedirs(storage_dir, exist_ok=True)
+        for name, (shape, dtype) in specs.items():
+            setattr(self, name, self._allocate(name, shape, dtype))
+
+    def _allocate(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        if self.storage_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        path = os.path.join(self.storage_dir, f'{name}.npy')
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes of the column arrays."""
+        return sum(getattr(self, name).nbytes for name in self.columns)
+
+    def add(self, obs: np.ndarray, action: Union[int, np.ndarray], reward: float,
+            next_obs: np.ndarray, done: bool, **extras) -> int:
+        """
+        Store one transition, overwriting the oldest one when full.
+
+        Args:
+            obs: Encoded observation, shape (obs_dim,)
+            action: Action index
+            reward: Reward
+            next_obs: Encoded next observation, shape (obs_dim,)
+            done: Whether the episode ended
+            **extras: Values for the extra columns
+
+        Returns:
+            Slot index the transition was written to
+        """
+        index = self.position
+        self.obs[index] = obs
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_obs[index] = next_obs
+        self.dones[index] = done
+        for name, value in extras.items():
+            getattr(self, name)[index] = value
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def add_batch(self, obs: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                  next_obs: np.ndarray, dones: np.ndarray, **extras) -> np.ndarray:
+        """
+        Store several transitions (e.g. one step of a VecTeamsEnv).
+
+        Args:
+            obs: (n, obs_dim) observations
+            actions: (n,) action indices
+            rewards: (n,) rewards
+            next_obs: (n, obs_dim) next observations
+            dones: (n,) done flags
+            **extras: (n, ...) values for the extra columns
+
+        Returns:
+            (n,) slot indices the transitions were written to
+        """
+        count = len(rewards)
+        if count > self.capacity:
+            raise ValueError(f"batch of {count} exceeds capacity {self.capacity}")
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.obs[indices] = obs
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_obs[indices] = next_obs
+        self.dones[indices] = dones
+        for name, values in extras.items():
+            getattr(self, name)[indices] = values
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def sample(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """
+        Sample transitions uniformly (with replacement).
+
+        Args:
+            batch_size: Number of transitions
+
+        Returns:
+            Dictionary with obs, actions, rewards, next_obs, dones, any extra
+            columns and indices
+        """
+        if self.size == 0:
+            raise ValueError("cannot sample from an empty buffer")
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        return self.gather(indices)
+
+    def gather(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Columns at ``indices`` (copies), plus the indices themselves."""
+        batch = {name: getattr(self, name)[indices] for name in self.columns}
+        batch['indices'] = indices
+        return batch
+
+    def flush(self):
+        """Write memory-mapped columns to disk (no-op for in-memory buffers)."""
+        if self.storage_dir is not None:
+            for name in self.columns:
+                getattr(self, name).flush()
+
+
+class SumTree:
+    """
+    Array-backed binary sum tree over ``capacity`` leaf priorities.
+
+    The tree is padded to a power of two so that node ``i`` has children
+    ``2i`` and ``2i + 1`` and the leaves start at ``self.leaves``; updates and
+    prefix-sum lookups then run one vectorized step per tree level.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.nodes = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.nodes[1])
+
+    def __getitem__(self, indices) -> np.ndarray:
+        return self.nodes[self.leaves + np.asarray(indices)]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray):
+        """Set leaf priorities and recompute their ancestors."""
+        nodes = np.asarray(indices) + self.leaves
+        self.nodes[nodes] = priorities
+        while self.leaves > 1:
+            nodes = np.unique(nodes // 2)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+
+    def update_one(self, index: int, priority: float):
+        """Scalar version of update (much cheaper for a single leaf)."""
+        nodes = self.nodes
+        node = index + self.leaves
+        nodes[node] = priority
+        node //= 2
+        while node >= 1:
+            nodes[node] = nodes[2 * node] + nodes[2 * node + 1]
+            node //= 2
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf indices whose prefix-sum interval contains each value."""
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            left_sum = self.nodes[left]
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Proportional prioritized replay (Schaul et al., 2016) on a SumTree.
+
+    Transitions are sampled with probability p_i^alpha / sum_k p_k^alpha and
+    returned with importance-sampling weights (N * P(i))^-beta normalized by
+    their maximum. New transitions get the current maximum priority so they
+    are replayed at least once.
+    """
+
+    def __init__(self, capacity: int, obs_dim: int, alpha: float = 0.6,
+                 epsilon: float = 1e-6, **kwargs):
+        """
+        Args:
+            capacity: Maximum number of transitions
+            obs_dim: Width of one encoded observation
+            alpha: Priority exponent (0 = uniform)
+            epsilon: Added to priorities so no transition gets probability 0
+            **kwargs: Passed to ReplayBuffer (obs_dtype, storage_dir, seed, ...)
+        """
+        super().__init__(capacity, obs_dim, **kwargs)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def add(self, obs, action, reward, next_obs, done, **extras) -> int:
+        index = super().add(obs, action, reward, next_obs, done, **extras)
+        self.tree.update_one(index, self.max_priority ** self.alpha)
+        return index
+
+    def add_batch(self, obs, actions, rewards, next_obs, dones, **extras) -> np.ndarray:
+        indices = super().add_batch(obs, actions, rewards, next_obs, dones, **extras)
+        self.tree.update(indices, np.full(len(indices), self.max_priority ** self.alpha))
+        return indices
+
+    def sample(self, batch_size: int, beta: float = 0.4) -> Dict[str, np.ndarray]:
+        """
+        Sample transitions proportionally to their priority.
+
+        The total priority mass is split into ``batch_size`` equal segments
+        and one value is drawn per segment (stratified sampling).
+
+        Args:
+            batch_size: Number of transitions
+            beta: Importance-sampling exponent (annealed towards 1 in training)
+
+        Returns:
+            Dictionary with obs, actions, rewards, next_obs, dones, indices
+            and weights
+        """
+        if self.size == 0:
+            raise ValueError("cannot sample from an empty buffer")
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        # Float round-off can walk past the last filled leaf into empty slots
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+
+        probabilities = self.tree[indices] / total
+        weights = (self.size * probabilities) ** -beta
+        weights /= weights.max()
+
+        batch = self.gather(indices)
+        batch['weights'] = weights.astype(np.float32)
+        return batch
+
+    def update_priorities(self, indices: np.ndarray, priorities: np.ndarray):
+        """
+        Set new priorities (typically |TD error|) for sampled transitions.
+
+        Args:
+            indices: Indices returned by sample()
+            priorities: Non-negative priorities, same length as indices
+        """
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
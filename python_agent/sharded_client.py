@@ -0,0 +1,409 @@
+"""
+Sharded TeamsClone-RL Client
+
+Client for the backend's cluster mode (``npm run start:cluster``), where
+several worker processes each keep their own share of the episodes in
+memory. Worker ``i`` listens on ``PORT + i`` and owns every episode whose id
+hashes to ``i``:
+
+    shard = zlib.crc32(episode_id) % num_shards
+
+The same function is used by the backend (backend/src/cluster/sharding.js),
+so the client can route ``step`` and the other per-episode calls without a
+lookup table. ``reset`` sends new episodes to the least-loaded shard and
+picks an episode id that hashes to it.
+
+    with ShardedTeamsEnvClient.discover('http://localhost:3001') as client:
+        result = client.reset()
+        client.step(action, result['episodeId'])
+
+The client has the same methods as TeamsEnvClient, so VecTeamsEnv, the
+episode driver and the agents can use it unchanged (always pass the episode
+id to ``step``: there is no single "current" episode across shards).
+"""
+
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from client import TeamsEnvClient, unix_socket_path
+from metrics import ClientMetrics
+
+
+def shard_for(episode_id: str, num_shards: int) -> int:
+    """Index of the shard that owns ``episode_id``."""
+    return zlib.crc32(episode_id.encode('utf-8')) % num_shards
+
+
+def shard_episode_id(shard: int, num_shards: int) -> str:
+    """Random episode id owned by ``shard`` (about ``num_shards`` tries)."""
+    while True:
+        episode_id = str(uuid.uuid4())
+        if shard_for(episode_id, num_shards) == shard:
+            return episode_id
+
+
+class ShardedTeamsEnvClient:
+    """
+    Routes TeamsEnvClient calls to the backend worker that owns each episode.
+
+    New episodes go to the shard with the fewest active episodes. The load
+    per shard is the ``activeEpisodes`` count from ``GET /env/load`` (which
+    includes other clients' episodes), refreshed every ``load_refresh``
+    seconds, plus the resets and finished episodes this client has seen
+    since the last refresh.
+    """
+
+    def __init__(self, base_urls: Sequence[str],
+                 load_refresh: Optional[float] = 1.0,
+                 max_workers: Optional[int] = None,
+                 metrics: Optional[ClientMetrics] = None,
+                 **client_kwargs):
+        """
+        Args:
+            base_urls: Base URL of every shard, in shard order
+                (``http://localhost:3001``, ``http://localhost:3002``, ...)
+            load_refresh: Seconds between ``/env/load`` polls used to balance
+                resets (None or 0 balances on this client's own counts only)
+            max_workers: Threads used to send the per-shard parts of
+                ``reset_many``/``step_many`` concurrently (defaults to the
+                number of shards)
+            metrics: ClientMetrics shared by all shard clients
+                (a new one is created by default)
+            **client_kwargs: Passed to each shard's TeamsEnvClient
+                (timeout, pool_maxsize, wire_format, ...)
+        """
+        if not base_urls:
+            raise ValueError("ShardedTeamsEnvClient needs at least one base URL")
+
+        self.base_urls = list(base_urls)
+        self.num_shards = len(self.base_urls)
+        self.metrics = metrics if metrics is not None else ClientMetrics()
+        self.shards = [TeamsEnvClient(url, metrics=self.metrics, **client_kwargs)
+                       for url in self.base_urls]
+        self.load_refresh = load_refresh
+        self.last_episode_id: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._loads = [0] * self.num_shards
+        self._loads_updated: Optional[float] = None
+        self._executor = (ThreadPoolExecutor(max_workers=max_workers or self.num_shards,
+                                             thread_name_prefix='shard')
+                          if self.num_shards > 1 else None)
+
+    @classmethod
+    def discover(cls, base_url: str = 'http://localhost:3001',
+                 **kwargs) -> 'ShardedTeamsEnvClient':
+        """
+        Build a client from the shard list of any one worker.
+
+        Asks ``base_url`` for ``GET /env/load`` and connects to every port it
+        lists on the same host. For a ``unix://`` URL (``SOCKET_PATH`` set),
+        worker ``i`` listens on ``SOCKET_PATH.i``. A standalone (non-cluster)
+        server reports one shard, so this also works without cluster mode.
+
+        Args:
+            base_url: Base URL of any worker
+            **kwargs: Passed to the constructor
+
+        Returns:
+            ShardedTeamsEnvClient for all shards
+        """
+        probe_kwargs = {key: kwargs[key] for key in ('timeout',) if key in kwargs}
+        with TeamsEnvClient(base_url, **probe_kwargs) as probe:
+            shard = probe.get_load().get('shard', {})
+
+        ports = shard.get('ports') or []
+        if len(ports) <= 1:
+            return cls([base_url], **kwargs)
+        if unix_socket_path(base_url):
+            prefix = base_url.rstrip('/')
+            suffix = f".{shard.get('index', 0)}"
+            if prefix.endswith(suffix):
+                prefix = prefix[:-len(suffix)]
+            return cls([f"{prefix}.{i}" for i in range(len(ports))], **kwargs)
+        scheme, _, host = base_url.rstrip('/').rpartition('://')
+        host = host.rsplit(':', 1)[0]
+        return cls([f"{scheme}://{host}:{port}" for port in ports], **kwargs)
+
+    def shard_for(self, episode_id: str) -> int:
+        """Index of the shard that owns ``episode_id``."""
+        return shard_for(episode_id, self.num_shards)
+
+    def _client_for(self, episode_id: Optional[str]) -> TeamsEnvClient:
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        if episode_id is None:
+            raise ValueError("An episode_id is required: no episode has been reset yet")
+        return self.shards[self.shard_for(episode_id)]
+
+    def _map_shards(self, fn: Callable[[int], Any], shards: Sequence[int]) -> list:
+        """Run fn for each shard index, concurrently when there are several."""
+        if self._executor is None or len(shards) <= 1:
+            return [fn(shard) for shard in shards]
+        return list(self._executor.map(fn, shards))
+
+    def refresh_loads(self, timeout: Optional[float] = None) -> List[int]:
+        """
+        Fetch every shard's active episode count.
+
+        Shards that cannot be reached keep their last known count.
+
+        Returns:
+            Active episodes per shard
+        """
+        def fetch(shard):
+            try:
+                return self.shards[shard].get_load(timeout=timeout).get('activeEpisodes')
+            except Exception:
+                return None
+
+        counts = self._map_shards(fetch, range(self.num_shards))
+        with self._lock:
+            for shard, count in enumerate(counts):
+                if count is not None:
+                    self._loads[shard] = count
+            self._loads_updated = time.monotonic()
+            return list(self._loads)
+
+    def load(self) -> List[int]:
+        """Current load estimate (active episodes) per shard."""
+        with self._lock:
+            return list(self._loads)
+
+    def _maybe_refresh_loads(self):
+        if not self.load_refresh:
+            return
+        updated = self._loads_updated
+        if updated is None or time.monotonic() - updated >= self.load_refresh:
+            self.refresh_loads()
+
+    def _assign_shards(self, count: int) -> List[int]:
+        """Pick a shard for each new episode, filling the least-loaded first."""
+        self._maybe_refresh_loads()
+        with self._lock:
+            shards = []
+            for _ in range(count):
+                shard = min(range(self.num_shards), key=self._loads.__getitem__)
+                self._loads[shard] += 1
+                shards.append(shard)
+            return shards
+
+    def _track_done(self, episode_id: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        if episode_id and result.get('done'):
+            shard = self.shard_for(episode_id)
+            with self._lock:
+                self._loads[shard] = max(self._loads[shard] - 1, 0)
+        return result
+
+    def reset(self, episode_id: Optional[str] = None, task_type: Optional[str] = None,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Start a new episode on the least-loaded shard.
+
+        Args:
+            episode_id: Optional episode ID (the episode then lives on the
+                shard the ID hashes to)
+            task_type: Optional task type to assign
+            timeout: Optional timeout override for this call
+
+        Returns:
+            Reset result (episodeId, state, task)
+        """
+        if episode_id is None:
+            shard = self._assign_shards(1)[0]
+            episode_id = shard_episode_id(shard, self.num_shards)
+        else:
+            shard = self.shard_for(episode_id)
+            with self._lock:
+                self._loads[shard] += 1
+
+        result = self.shards[shard].reset(episode_id=episode_id, task_type=task_type,
+                                          timeout=timeout)
+        self.last_episode_id = result.get('episodeId', episode_id)
+        return result
+
+    def step(self, action: Dict[str, Any], episode_id: Optional[str] = None,
+             timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute an action on the shard that owns the episode.
+
+        Args:
+            action: Action dictionary with 'type' and 'payload'
+            episode_id: Episode ID (defaults to the last episode reset
+                through this client)
+            timeout: Optional timeout override for this call
+
+        Returns:
+            Step result (state, reward, done, info)
+        """
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        result = self._client_for(episode_id).step(action, episode_id, timeout=timeout)
+        return self._track_done(episode_id, result)
+
+    def reset_many(self, count: Optional[int] = None,
+                   task_types: Union[None, str, Sequence[Optional[str]]] = None,
+                   episode_ids: Optional[Sequence[Optional[str]]] = None,
+                   raise_on_error: bool = True,
+                   timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Start several episodes, spread over the shards by load.
+
+        Each shard gets one /env/reset_batch request for its part; the shards
+        are called concurrently. Same arguments and result order as
+        TeamsEnvClient.reset_many.
+        """
+        if count is None:
+            if isinstance(task_types, (list, tuple)):
+                count = len(task_types)
+            elif episode_ids is not None:
+                count = len(episode_ids)
+            else:
+                raise ValueError("reset_many needs count, task_types or episode_ids")
+
+        ids = list(episode_ids) if episode_ids is not None else [None] * count
+        missing = [i for i, episode_id in enumerate(ids) if not episode_id]
+        for i, shard in zip(missing, self._assign_shards(len(missing))):
+            ids[i] = shard_episode_id(shard, self.num_shards)
+        if len(missing) < count:
+            given = set(range(count)).difference(missing)
+            with self._lock:
+                for i in given:
+                    self._loads[self.shard_for(ids[i])] += 1
+
+        groups: Dict[int, List[int]] = {}
+        for i, episode_id in enumerate(ids):
+            groups.setdefault(self.shard_for(episode_id), []).append(i)
+
+        def run(shard):
+            indices = groups[shard]
+            types = ([task_types[i] for i in indices]
+                     if isinstance(task_types, (list, tuple)) else task_types)
+            return self.shards[shard].reset_many(
+                len(indices), task_types=types, episode_ids=[ids[i] for i in indices],
+                raise_on_error=raise_on_error, timeout=timeout)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * count
+        for shard, shard_results in zip(groups, self._map_shards(run, list(groups))):
+            for i, result in zip(groups[shard], shard_results):
+                results[i] = result
+        if count:
+            self.last_episode_id = ids[-1]
+        return results
+
+    def step_many(self, actions: Sequence[Dict[str, Any]], episode_ids: Sequence[str],
+                  raise_on_error: bool = True,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Step several episodes with one /env/step_batch request per shard.
+
+        The shards are called concurrently. Same arguments and result order
+        as TeamsEnvClient.step_many.
+        """
+        if len(actions) != len(episode_ids):
+            raise ValueError("actions and episode_ids must have the same length")
+
+        groups: Dict[int, List[int]] = {}
+        for i, episode_id in enumerate(episode_ids):
+            groups.setdefault(self.shard_for(episode_id), []).append(i)
+
+        def run(shard):
+            indices = groups[shard]
+            return self.shards[shard].step_many(
+                [actions[i] for i in indices], [episode_ids[i] for i in indices],
+                raise_on_error=raise_on_error, timeout=timeout)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        for shard, shard_results in zip(groups, self._map_shards(run, list(groups))):
+            for i, result in zip(groups[shard], shard_results):
+                results[i] = self._track_done(episode_ids[i], result)
+        return results
+
+    def get_state(self, timeout: Optional[float] = None,
+                  episode_id: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Get an episode's state (defaults to the last episode reset), optionally only some sections."""
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        return self._client_for(episode_id).get_state(timeout=timeout, episode_id=episode_id,
+                                                      fields=fields)
+
+    def get_actions(self, timeout: Optional[float] = None,
+                    episode_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get available actions and an episode's channels (defaults to the last episode reset)."""
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        client = self._client_for(episode_id) if episode_id else self.shards[0]
+        return client.get_actions(timeout=timeout, episode_id=episode_id)
+
+    def get_stats(self, episode_id: Optional[str] = None,
+                  timeout: Optional[float] = None,
+                  include_store: bool = False) -> Dict[str, Any]:
+        """
+        Get an episode's statistics (defaults to the last episode reset).
+
+        With ``include_store`` the 'store' counters are those of the
+        episode's shard.
+        """
+        if episode_id is None:
+            episode_id = self.last_episode_id
+        return self._client_for(episode_id).get_stats(episode_id, timeout=timeout,
+                                                      include_store=include_store)
+
+    def get_episode_info(self, episode_id: str,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get detailed information about an episode from its shard."""
+        return self._client_for(episode_id).get_episode_info(episode_id, timeout=timeout)
+
+    def get_load(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the summed episode counts of all shards.
+
+        Returns:
+            Dictionary with activeEpisodes, episodes and completedEpisodes
+            totals, plus ``shards`` with each shard's own /env/load response
+        """
+        loads = self._map_shards(lambda shard: self.shards[shard].get_load(timeout=timeout),
+                                 range(self.num_shards))
+        totals = {key: sum(load.get(key, 0) for load in loads)
+                  for key in ('activeEpisodes', 'episodes', 'completedEpisodes')}
+        return {'success': True, **totals, 'shards': loads}
+
+    def get_history(self, limit: int = 10, timeout: Optional[float] = None) -> list:
+        """Get the most recently completed episodes across all shards."""
+        histories = self._map_shards(
+            lambda shard: self.shards[shard].get_history(limit, timeout=timeout),
+            range(self.num_shards))
+        merged = [entry for history in histories for entry in history]
+        merged.sort(key=lambda entry: entry.get('endTime', 0))
+        return merged[-limit:] if limit else merged
+
+    def get_tasks(self, timeout: Optional[float] = None) -> list:
+        """Get all task definitions (identical on every shard)."""
+        return self.shards[0].get_tasks(timeout=timeout)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Connection reuse counters summed over all shards."""
+        totals: Dict[str, int] = {}
+        for client in self.shards:
+            for key, value in client.connection_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def close(self):
+        """Close every shard's pooled connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for client in self.shards:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,207 @@
+"""
+TeamsClone-RL Socket Session Client
+
+Drop-in alternative to TeamsEnvClient that talks to the backend's Socket.IO
+``/env`` namespace over one persistent connection instead of one HTTP request
+per call. Requests are tagged with a request id, so many of them can be in
+flight at once: ``step_many``/``reset_many`` send every item in a single frame
+and ``submit`` returns a future for custom pipelining.
+"""
+
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Union
+
+import requests
+import socketio
+
+from client import TeamsEnvClient, unix_socket_path
+from metrics import ClientMetrics, endpoint_name
+
+ENV_NAMESPACE = '/env'
+
+
+class SocketTeamsEnvClient(TeamsEnvClient):
+    """TeamsEnvClient API over a persistent Socket.IO connection."""
+
+    def __init__(self, base_url: str = "http://localhost:3001",
+                 timeout: float = 10.0,
+                 transports: Optional[List[str]] = None,
+                 delta_observations: bool = False,
+                 max_delta_bases: int = 4096,
+                 cache_ttl: Optional[float] = 60.0,
+                 prefetch: bool = False,
+                 metrics: Optional[ClientMetrics] = None):
+        """
+        Connect to the backend's RL session namespace.
+
+        Args:
+            base_url: Base URL of the backend server
+            timeout: Default timeout in seconds for connecting and for each
+                call (overridable per call via ``timeout=``)
+            transports: Socket.IO transports (defaults to websocket only)
+            delta_observations: Ask for delta-encoded step observations
+                (see TeamsEnvClient)
+            max_delta_bases: Maximum number of episodes whose last state is
+                kept for delta decoding
+            cache_ttl: Seconds to cache ``get_tasks``/``get_actions``
+                responses (see TeamsEnvClient)
+            prefetch: Fill the cache once connected
+            metrics: ClientMetrics to record round trips into (request and
+                response sizes are not tracked over the socket)
+        """
+        if unix_socket_path(base_url):
+            raise ValueError("Socket.IO sessions need an http:// URL; the Unix "
+                             "domain socket only serves the HTTP API")
+        super().__init__(base_url, timeout=timeout,
+                         delta_observations=delta_observations,
+                         max_delta_bases=max_delta_bases,
+                         cache_ttl=cache_ttl,
+                         metrics=metrics)
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._requests_sent = 0
+        self._connects = 0
+
+        # websocket-client validates UTF-8 of every text frame in pure Python,
+        # which dominates the cost of large (batched) responses; the JSON
+        # decoder rejects invalid UTF-8 anyway
+        self.sio = socketio.Client(
+            reconnection=True,
+            websocket_extra_options={'skip_utf8_validation': True})
+        self.sio.on('connect', self._on_connect, namespace=ENV_NAMESPACE)
+        self.sio.on('disconnect', self._on_disconnect, namespace=ENV_NAMESPACE)
+        self.sio.on('env:response', self._on_response, namespace=ENV_NAMESPACE)
+        self.sio.connect(base_url, namespaces=[ENV_NAMESPACE],
+                         transports=transports or ['websocket'],
+                         wait_timeout=timeout)
+        if prefetch:
+            self.prefetch()
+
+    def _on_connect(self):
+        self._connects += 1
+
+    def _on_disconnect(self, *args):
+        # Replies to in-flight requests are lost with the connection
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError("Socket disconnected before the response arrived"))
+
+    def _on_response(self, message: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        # Array requests are answered with one array of responses
+        for response in message if isinstance(message, list) else [message]:
+            with self._pending_lock:
+                future = self._pending.pop(response.pop('id', None), None)
+            if future is not None:
+                future.set_result(response)
+
+    def _emit(self, messages: List[Dict[str, Any]]) -> List[Future]:
+        """Tag messages with request ids, send them in one frame and return their futures."""
+        futures = []
+        with self._pending_lock:
+            for message in messages:
+                message['id'] = next(self._ids)
+                future = Future()
+                self._pending[message['id']] = future
+                futures.append(future)
+            self._requests_sent += len(messages)
+        self.sio.emit('env:request', messages if len(messages) > 1 else messages[0],
+                      namespace=ENV_NAMESPACE)
+        return futures
+
+    def submit(self, op: str, **fields) -> Future:
+        """
+        Send one request without waiting for its response.
+
+        Args:
+            op: Operation name ('reset', 'step', 'state', 'stats', 'actions',
+                'info', 'history', 'load' or 'tasks')
+            **fields: Request fields, e.g. ``action=..., episodeId=...``
+
+        Returns:
+            Future resolving to the raw response ({'success': ..., ...})
+        """
+        return self._emit([dict(fields, op=op)])[0]
+
+    def _request(self, method: str, path: str,
+                 timeout: Optional[float] = None,
+                 json: Optional[Any] = None,
+                 params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Map an ``/env`` route onto a socket operation and wait for its response."""
+        # '/step' -> 'step', '/info/<episodeId>' -> 'info' with that episodeId
+        op, _, episode_id = path.lstrip('/').partition('/')
+        message = dict(json or {}, **(params or {}))
+        if episode_id:
+            message['episodeId'] = episode_id
+
+        response = self._wait([self.submit(op, **message)], path, timeout)[0]
+        if not response.get('success', False):
+            raise self._response_error(op, path, response)
+        return response
+
+    def _response_error(self, op: str, path: str, response: Dict[str, Any]) -> requests.HTTPError:
+        """
+        Build the HTTPError TeamsEnvClient would raise for a failed response,
+        so callers can check ``error.response.status_code`` on either client.
+        """
+        status = response.get('status') or 500
+        http_response = requests.Response()
+        http_response.status_code = status
+        http_response.url = f"{self.env_url}{path}"
+        http_response.headers['Content-Type'] = 'application/json'
+        http_response._content = json.dumps(response).encode()
+        return requests.HTTPError(
+            f"{status} Error: {op} failed: {response.get('error', 'unknown error')}",
+            response=http_response)
+
+    def _wait(self, futures: List[Future], path: str,
+              timeout: Optional[float]) -> List[Dict[str, Any]]:
+        """Wait for responses, recording the round trip in ``self.metrics``."""
+        endpoint = endpoint_name('SOCKET', path)
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            responses = [future.result(timeout) for future in futures]
+        except Exception as e:
+            self.metrics.record(endpoint, time.perf_counter() - start, error=str(e) or type(e).__name__)
+            raise
+        failed = sum(1 for response in responses if not response.get('success', False))
+        self.metrics.record(endpoint, time.perf_counter() - start,
+                            error=f"{failed} failed" if failed else None)
+        return responses
+
+    def _batch(self, path: str, items: List[Dict[str, Any]],
+               raise_on_error: bool, timeout: Optional[float]) -> List[Dict[str, Any]]:
+        """Pipeline one reset/step per item instead of calling the batch route."""
+        if not items:
+            return []
+        op = 'reset' if path == '/reset_batch' else 'step'
+        futures = self._emit([dict(item, op=op) for item in items])
+        return self._check_batch(self._wait(futures, path, timeout), raise_on_error)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Report how many requests were sent over the persistent connection.
+
+        Returns:
+            Dictionary with requests, new_connections (connects, including
+            reconnects) and reused_connections
+        """
+        with self._pending_lock:
+            requests = self._requests_sent
+        return {
+            'new_connections': self._connects,
+            'reused_connections': max(requests - self._connects, 0),
+            'requests': requests,
+        }
+
+    def close(self):
+        """Disconnect the socket."""
+        self.sio.disconnect()
+        super().close()
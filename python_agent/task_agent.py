@@ -6,6 +6,7 @@ Demonstrates how to train an agent with task-based learning and episode manageme
 
 import time
 from client import TeamsEnvClient
+from episode_driver import EpisodeDriver
 
 
 class TaskAgent:
@@ -15,12 +16,16 @@ class TaskAgent:
     Can be used in two ways:
     1. With client: agent = TaskAgent(client); agent.run_episode()
     2. Without client: agent = TaskAgent(); action = agent.select_action(state)
+
+    With ``prefetch_resets=True`` the next episode's reset is sent in the
+    background while the current episode runs (see episode_driver).
     """
 
-    def __init__(self, client=None):
+    def __init__(self, client=None, prefetch_resets=False):
         self.client = client
         self.episode_id = None
         self.task_type = None
+        self.episodes = EpisodeDriver(client, prefetch=prefetch_resets) if client is not None else None
 
     def select_action(self, state):
         """
@@ -212,7 +217,7 @@ class TaskAgent:
             'payload': {'content': 'Hello team!'}
         }
 
-    def run_episode(self, task_type=None, max_steps=None, verbose=True):
+    def run_episode(self, task_type=None, max_steps=None, verbose=True, prefetch_next=True):
         """
         Run a complete episode.
 
@@ -220,6 +225,8 @@ class TaskAgent:
             task_type: Specific task to attempt (None for random)
             max_steps: Maximum steps (None uses task default)
             verbose: Whether to print progress
+            prefetch_next: With prefetch_resets, start the next episode's reset
+                (same task type) now; pass False for the last episode
 
         Returns:
             Episode summary dictionary
@@ -230,7 +237,7 @@ class TaskAgent:
             print("Starting new episode...")
             print(f"{'='*60}\n")
 
-        reset_result = self.client.reset(task_type=task_type)
+        reset_result = self.episodes.next_episode(task_type, prefetch_next=prefetch_next)
         self.episode_id = reset_result['episodeId']
         task = reset_result['task']
         state = reset_result['state']
@@ -310,16 +317,21 @@ class TaskAgent:
         }
 
 
-def train_multiple_episodes(num_episodes=5, task_type=None):
+def train_multiple_episodes(num_episodes=5, task_type=None, show_metrics=False,
+                            prefetch_resets=True):
     """
     Train agent over multiple episodes.
 
     Args:
         num_episodes: Number of episodes to run
         task_type: Specific task to practice (None for random)
+        show_metrics: Print the client's per-endpoint latency summary (and
+            the reset prefetch counters) at the end
+        prefetch_resets: Reset the next episode in the background while the
+            current one runs
     """
     client = TeamsEnvClient()
-    agent = TaskAgent(client)
+    agent = TaskAgent(client, prefetch_resets=prefetch_resets)
 
     print(f"\n{'='*60}")
     print(f"Training agent for {num_episodes} episodes")
@@ -331,7 +343,8 @@ def train_multiple_episodes(num_episodes=5, task_type=None):
 
     for i in range(num_episodes):
         print(f"\n\nEpisode {i+1}/{num_episodes}")
-        result = agent.run_episode(task_type=task_type, verbose=True)
+        result = agent.run_episode(task_type=task_type, verbose=True,
+                                   prefetch_next=i < num_episodes - 1)
         results.append(result)
 
         time.sleep(0.5)
@@ -364,6 +377,17 @@ def train_multiple_episodes(num_episodes=5, task_type=None):
         print(f"{status} {h['taskType']:20s} Reward: {h['totalReward']:6.2f}  "
               f"Steps: {h['steps']}  Duration: {h['duration']/1000:.1f}s")
 
+    if show_metrics:
+        print(f"\n{'='*60}")
+        print("Client Metrics")
+        print(f"{'='*60}")
+        print(client.metrics.format_summary())
+        resets = agent.episodes.stats()
+        print(f"Resets: {resets['resets']} ({resets['prefetch_hits']} prefetched), "
+              f"waited {resets['wait_seconds']:.3f}s of {resets['reset_seconds']:.3f}s "
+              f"round-trip time, {resets['saved_seconds']:.3f}s saved")
+    agent.episodes.close()
+
 
 if __name__ == "__main__":
     # Example 1: Single episode with specific task
@@ -377,7 +401,7 @@ if __name__ == "__main__":
     print("\n\n" + "="*60)
     print("Example 2: Multiple episodes with random tasks")
     print("="*60)
-    train_multiple_episodes(num_episodes=3)
+    train_multiple_episodes(num_episodes=3, show_metrics=True)
 
     # Example 3: Practice specific task multiple times
     time.sleep(2)
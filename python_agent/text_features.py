@@ -0,0 +1,225 @@
+"""
+Text Features for TeamsClone-RL
+
+Hashed bag-of-n-grams features for message content. Word unigrams and bigrams
+are hashed into a fixed number of buckets with a signed hash, so there is no
+vocabulary to fit and the width never changes.
+
+The same recent messages appear in observation after observation, so each
+message's vector is memoized by message ``id`` in a bounded LRU cache. Per
+step only the messages that are new since the last observation are hashed.
+
+    featurizer = TextFeaturizer(dim=256)
+    x = featurizer.encode_state(state)          # (dim,) mean over recentMessages
+    X = featurizer.encode_batch(states)         # (len(states), dim)
+    W = featurizer.encode_window(states)        # (len(states), window, dim)
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Mentions keep their '@' so '@agent' and 'agent' hash differently
+TOKEN_PATTERN = re.compile(r"@?[a-z0-9']+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of ``text``."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TextFeaturizer:
+    """
+    Hashed bag-of-n-grams featurizer with a per-message LRU cache.
+
+    Each n-gram is hashed with CRC32 (stable across processes, unlike
+    ``hash``); the low bits pick the bucket and the top bit the sign, so
+    collisions tend to cancel instead of piling up. Rows are L2-normalized.
+    Message vectors are cached by id, so message content is assumed not to
+    change after it is posted (reactions do not affect the features).
+    """
+
+    def __init__(self, dim: int = 256, ngram_range: tuple = (1, 2),
+                 cache_size: int = 4096, window: int = 10):
+        """
+        Args:
+            dim: Number of hash buckets (feature width)
+            ngram_range: (min_n, max_n) word n-gram sizes
+            cache_size: Maximum number of message vectors kept in the cache
+            window: Number of messages per state in encode_window
+        """
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+        self.min_n, self.max_n = ngram_range
+        self.cache_size = cache_size
+        self.window = window
+        self._cache: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def featurize(self, text: str) -> np.ndarray:
+        """
+        Hash one text (uncached).
+
+        Args:
+            text: Message content
+
+        Returns:
+            New float32 array of shape (dim,)
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = tokenize(text)
+        dim = self.dim
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                h = zlib.crc32(' '.join(tokens[i:i + n]).encode('utf-8'))
+                vector[h % dim] += -1.0 if h & 0x80000000 else 1.0
+        norm = float(np.sqrt(np.dot(vector, vector)))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def message_features(self, message: Dict[str, Any]) -> np.ndarray:
+        """
+        Features of one message, memoized by its id.
+
+        Args:
+            message: Message dict with 'id' and 'content'
+
+        Returns:
+            Read-only float32 array of shape (dim,), shared with the cache
+        """
+        message_id = message.get('id')
+        cache = self._cache
+        if message_id is not None:
+            vector = cache.get(message_id)
+            if vector is not None:
+                cache.move_to_end(message_id)
+                self.hits += 1
+                return vector
+
+        self.misses += 1
+        vector = self.featurize(message.get('content', ''))
+        vector.flags.writeable = False
+        if message_id is not None and self.cache_size > 0:
+            cache[message_id] = vector
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return vector
+
+    def encode_messages(self, messages: Sequence[Dict[str, Any]],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Stack the features of several messages.
+
+        Args:
+            messages: Message dicts
+            out: Optional float32 array of shape (len(messages), dim) to fill
+
+        Returns:
+            float32 array of shape (len(messages), dim)
+        """
+        out = self._check_out(out, (len(messages), self.dim))
+        for i, message in enumerate(messages):
+            out[i] = self.message_features(message)
+        return out
+
+    def encode_state(self, state: Dict[str, Any]) -> np.ndarray:
+        """
+        Mean of the recent message vectors of one state.
+
+        Args:
+            state: State observation
+
+        Returns:
+            New float32 array of shape (dim,) (zeros when there are no messages)
+        """
+        out = np.zeros(self.dim, dtype=np.float32)
+        self._pool(state.get('recentMessages') or (), out)
+        return out
+
+    def encode_batch(self, states: Sequence[Dict[str, Any]],
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Mean-pooled recent message features for several states.
+
+        Args:
+            states: State observations
+            out: Optional float32 array of shape (len(states), dim) to fill
+
+        Returns:
+            float32 array of shape (len(states), dim)
+        """
+        out = self._check_out(out, (len(states), self.dim))
+        for i, state in enumerate(states):
+            self._pool(state.get('recentMessages') or (), out[i])
+        return out
+
+    def encode_window(self, states: Sequence[Dict[str, Any]],
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Per-message features for the last ``window`` messages of each state.
+
+        Messages are right-aligned (the newest is always in the last slot)
+        and missing slots are zero.
+
+        Args:
+            states: State observations
+            out: Optional float32 array of shape (len(states), window, dim)
+
+        Returns:
+            float32 array of shape (len(states), window, dim)
+        """
+        window = self.window
+        out = self._check_out(out, (len(states), window, self.dim))
+        for i, state in enumerate(states):
+            messages = (state.get('recentMessages') or [])[-window:]
+            pad = window - len(messages)
+            if pad:
+                out[i, :pad] = 0.0
+            for j, message in enumerate(messages, pad):
+                out[i, j] = self.message_features(message)
+        return out
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Cache size, capacity, hits and misses."""
+        return {
+            'size': len(self._cache),
+            'capacity': self.cache_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear_cache(self):
+        """Drop all cached message vectors and reset the counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies (e.g. sent to another process) start with an empty cache
+        state = self.__dict__.copy()
+        state.update(_cache=OrderedDict(), hits=0, misses=0)
+        return state
+
+    def _pool(self, messages, row: np.ndarray):
+        """Write the mean of the message vectors into ``row``."""
+        if not messages:
+            row[:] = 0.0
+            return
+        row[:] = self.message_features(messages[0])
+        for message in messages[1:]:
+            row += self.message_features(message)
+        row /= len(messages)
+
+    @staticmethod
+    def _check_out(out: Optional[np.ndarray], shape: tuple) -> np.ndarray:
+        if out is None:
+            return np.zeros(shape, dtype=np.float32)
+        if out.shape != shape or out.dtype != np.float32:
+            raise ValueError(f"out must be a float32 array of shape {shape}")
+        return out
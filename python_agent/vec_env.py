@@ -0,0 +1,220 @@
+"""
+Vectorized TeamsClone-RL Environment
+
+Holds N episodes side by side and steps them together, returning stacked
+rewards/dones (and observations, when an encoder is given). Finished
+sub-episodes are reset automatically so every slot always holds a live
+episode, which is what batched rollout collection expects.
+
+Four backends are available:
+    - 'local': in-process LocalEnvironment (no server)
+    - 'http':  TeamsEnvClient, fanning requests out concurrently over a
+               thread pool and addressing each slot by its episodeId
+    - 'socket': SocketTeamsEnvClient, pipelining every slot's request over
+                one persistent Socket.IO connection
+    - 'sharded': ShardedTeamsEnvClient for the backend's cluster mode,
+                 spreading the slots' episodes over the worker processes
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from client import TeamsEnvClient
+from local_env import LocalTeamsEnv
+
+
+class VecTeamsEnv:
+    """Vectorized environment running ``num_envs`` episodes in lockstep."""
+
+    def __init__(self, num_envs: int,
+                 backend: str = 'local',
+                 base_url: str = 'http://localhost:3001',
+                 task_type: Union[None, str, Sequence[Optional[str]]] = None,
+                 encode_fn: Optional[Callable[[Dict[str, Any]], np.ndarray]] = None,
+                 action_fn: Optional[Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = None,
+                 max_workers: Optional[int] = None,
+                 batch_requests: bool = False,
+                 seed: Optional[int] = None,
+                 client: Any = None):
+        """
+        Args:
+            num_envs: Number of episodes run side by side
+            backend: 'local' (in-process simulator), 'http', 'socket' or
+                'sharded' (cluster mode; the shards are discovered from base_url)
+            base_url: Backend URL for the remote backends
+            task_type: Task for every slot, a per-slot list, or None for random
+            encode_fn: Optional state -> 1-D array encoder. When given,
+                observations are returned as one stacked float32 array.
+                Encoders with ``encode_batch`` and ``dim`` (such as
+                encoders.StateEncoder) encode all slots in one call.
+            action_fn: Optional (action, state) -> action dict decoder, used
+                when actions are passed as indices/arrays instead of dicts
+            max_workers: Threads used to fan out HTTP requests
+                (defaults to num_envs)
+            batch_requests: Step/reset all slots with one step_many/reset_many
+                call (one round trip via /env/step_batch) instead of one
+                request per slot
+            seed: Seed for the local simulator
+            client: Optional pre-built client (TeamsEnvClient or LocalTeamsEnv)
+        """
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+
+        self.num_envs = num_envs
+        self.backend = backend
+        self.encode_fn = encode_fn
+        self.action_fn = action_fn
+
+        if isinstance(task_type, (list, tuple)):
+            if len(task_type) != num_envs:
+                raise ValueError("task_type list must have one entry per env")
+            self.task_types = list(task_type)
+        else:
+            self.task_types = [task_type] * num_envs
+
+        if client is not None:
+            self.client = client
+        elif backend == 'local':
+            self.client = LocalTeamsEnv(seed=seed)
+        elif backend == 'http':
+            self.client = TeamsEnvClient(base_url, pool_maxsize=max(num_envs, 10))
+        elif backend == 'socket':
+            from socket_client import SocketTeamsEnvClient
+            self.client = SocketTeamsEnvClient(base_url)
+            # step_many/reset_many pipeline over the socket; no thread pool needed
+            batch_requests = True
+        elif backend == 'sharded':
+            from sharded_client import ShardedTeamsEnvClient
+            self.client = ShardedTeamsEnvClient.discover(base_url, pool_maxsize=max(num_envs, 10))
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self.batch_requests = batch_requests
+        self._executor = None
+        if backend in ('http', 'sharded') and not batch_requests:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers or num_envs)
+
+        self.episode_ids: List[Optional[str]] = [None] * num_envs
+        self.states: List[Dict[str, Any]] = [{} for _ in range(num_envs)]
+        self.episode_rewards = np.zeros(num_envs, dtype=np.float64)
+        self.episode_lengths = np.zeros(num_envs, dtype=np.int64)
+        self._obs_buffer: Optional[np.ndarray] = None
+
+    def _map(self, fn: Callable, *iterables) -> list:
+        """Run fn over the slots, concurrently for the HTTP backend."""
+        if self._executor is None:
+            return list(map(fn, *iterables))
+        return list(self._executor.map(fn, *iterables))
+
+    def _reset_slots(self, indices: Sequence[int]) -> List[Dict[str, Any]]:
+        if self.batch_requests:
+            return self.client.reset_many(task_types=[self.task_types[i] for i in indices])
+        return self._map(lambda i: self.client.reset(task_type=self.task_types[i]), indices)
+
+    def _observations(self):
+        if self.encode_fn is None:
+            return list(self.states)
+        if hasattr(self.encode_fn, 'encode_batch'):
+            # Batch encoders (e.g. encoders.StateEncoder) fill the buffer in one call
+            if self._obs_buffer is None:
+                self._obs_buffer = np.zeros((self.num_envs, self.encode_fn.dim), dtype=np.float32)
+            return self.encode_fn.encode_batch(self.states, out=self._obs_buffer).copy()
+        for i, state in enumerate(self.states):
+            encoded = np.asarray(self.encode_fn(state), dtype=np.float32)
+            if self._obs_buffer is None:
+                self._obs_buffer = np.zeros((self.num_envs, encoded.shape[0]), dtype=np.float32)
+            self._obs_buffer[i] = encoded
+        return self._obs_buffer.copy()
+
+    def reset(self):
+        """
+        Start a fresh episode in every slot.
+
+        Returns:
+            Observations: list of state dicts, or a (num_envs, dim) float32
+            array when ``encode_fn`` is set
+        """
+        results = self._reset_slots(range(self.num_envs))
+        for i, result in enumerate(results):
+            self.episode_ids[i] = result['episodeId']
+            self.states[i] = result['state']
+        self.episode_rewards[:] = 0.0
+        self.episode_lengths[:] = 0
+        return self._observations()
+
+    def step(self, actions: Union[Sequence[Any], np.ndarray]) -> Tuple[Any, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Step every slot with its action.
+
+        Finished episodes are reset in place. Their final observation is kept
+        in ``info['terminal_observation']`` and their totals in
+        ``info['episode']``.
+
+        Args:
+            actions: One action per slot, either action dicts or values that
+                ``action_fn`` turns into action dicts
+
+        Returns:
+            Tuple of (observations, rewards float32[N], dones bool[N], infos)
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}")
+        if any(episode_id is None for episode_id in self.episode_ids):
+            raise RuntimeError("Call reset() before step()")
+
+        if self.action_fn is not None:
+            actions = [self.action_fn(a, s) for a, s in zip(actions, self.states)]
+
+        if self.batch_requests:
+            results = self.client.step_many(actions, self.episode_ids)
+        else:
+            results = self._map(self.client.step, actions, self.episode_ids)
+
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=np.bool_)
+        infos: List[Dict[str, Any]] = []
+        finished = []
+
+        for i, result in enumerate(results):
+            rewards[i] = result['reward']
+            dones[i] = result['done']
+            info = dict(result.get('info', {}))
+            self.states[i] = result['state']
+            self.episode_rewards[i] += result['reward']
+            self.episode_lengths[i] += 1
+
+            if result['done']:
+                info['terminal_observation'] = result['state']
+                info['episode'] = {
+                    'episode_id': self.episode_ids[i],
+                    'r': float(self.episode_rewards[i]),
+                    'l': int(self.episode_lengths[i]),
+                    'task_type': result['state'].get('task', {}).get('type'),
+                    'completed': result['state'].get('stats', {}).get('taskCompleted', False),
+                }
+                finished.append(i)
+            infos.append(info)
+
+        if finished:
+            for i, reset_result in zip(finished, self._reset_slots(finished)):
+                self.episode_ids[i] = reset_result['episodeId']
+                self.states[i] = reset_result['state']
+                self.episode_rewards[i] = 0.0
+                self.episode_lengths[i] = 0
+
+        return self._observations(), rewards, dones, infos
+
+    def close(self):
+        """Shut down worker threads and close the client."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -15,8 +15,17 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
 # Now import from python_agent
 
 
-def run_demo(base_url="http://localhost:3001", task_type="greeting_response"):
-    """Run a single demonstration episode"""
+def run_demo(base_url="http://localhost:3001", task_type="greeting_response",
+             show_metrics=False, metrics_json=None):
+    """
+    Run a single demonstration episode
+
+    Args:
+        base_url: Backend server URL
+        task_type: Task type to run
+        show_metrics: Print the client's per-endpoint latency summary at the end
+        metrics_json: Optional path to write the metrics summary to as JSON
+    """
 
     print("=" * 60)
     print("🚀 TeamsClone-RL Demo")
@@ -130,6 +139,14 @@ def run_demo(base_url="http://localhost:3001", task_type="greeting_response"):
     except:
         pass
 
+    if show_metrics:
+        print("\n⏱️  Client Metrics:")
+        print(client.metrics.format_summary())
+        print("=" * 60)
+    if metrics_json:
+        with open(metrics_json, "w") as f:
+            f.write(client.metrics.to_json())
+
     return {
         "total_reward": total_reward,
         "steps": step_count,
@@ -154,11 +171,22 @@ def main():
                  "message_reaction", "status_update"],
         help="Task type to run (default: greeting_response)"
     )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print per-endpoint latency/size metrics at the end"
+    )
+    parser.add_argument(
+        "--metrics-json",
+        default=None,
+        help="Write the metrics summary to this JSON file"
+    )
 
     args = parser.parse_args()
 
     try:
-        result = run_demo(base_url=args.url, task_type=args.task)
+        result = run_demo(base_url=args.url, task_type=args.task,
+                          show_metrics=args.metrics, metrics_json=args.metrics_json)
         print("\n✅ Demo completed successfully!")
         return 0
     except KeyboardInterrupt:
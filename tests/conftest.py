@@ -0,0 +1,339 @@
+"""
+Shared Test Helpers
+
+serve: fixture that starts in-process HTTP servers (TCP or Unix domain
+socket) from a route table, for tests that put a client in front of a
+stand-in backend. Each server counts the connections it accepts and the
+requests it receives. local_env_routes(env) is the /env route table served
+from a LocalTeamsEnv.
+
+NodeBridge: runs backend code in a node subprocess and calls it one JSON
+line at a time (skip tests with requires_node where node is missing).
+
+backend: fixture that serves the real /env route handlers
+(backend/src/routes/envHandlers.js on models/environment.js) through a
+NodeBridge, without express.
+"""
+
+import json
+import os
+import shutil
+import socketserver
+import subprocess
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+
+requires_node = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+# Route reply that closes the connection without sending a response
+DROP = object()
+
+
+class StubRequest:
+    """One request as a route sees it."""
+
+    def __init__(self, method, url, headers, body):
+        parsed = urlparse(url)
+        self.method = method
+        self.path = parsed.path
+        self.url = url
+        self.query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body or b'{}')
+
+    @property
+    def fields(self):
+        """Query parameters of a GET, the JSON body otherwise."""
+        return self.query if self.method == 'GET' else self.json()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Looks up 'METHOD /path' (or '*') in the server's routes. A route takes a
+    StubRequest and returns (status, result) to send result as JSON,
+    (status, payload_bytes, content_type), or DROP. An exception is answered
+    with its `status` attribute, or 500.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        with self.server.lock:
+            self.server.connections += 1
+        super().setup()
+
+    def _dispatch(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        request = StubRequest(self.command, self.path, self.headers, body)
+        server = self.server
+        with server.lock:
+            server.received[(request.method, request.path)] += 1
+
+        route = server.routes.get(f'{request.method} {request.path}') or server.routes.get('*')
+        if route is None:
+            reply = (404, {'success': False, 'error': 'Not found'})
+        else:
+            try:
+                reply = route(request)
+            except Exception as error:
+                reply = (getattr(error, 'status', 500), {'success': False, 'error': str(error)})
+        if reply is DROP:
+            # The request arrived; the connection closes before any response
+            self.close_connection = True
+            return
+
+        if len(reply) == 3:
+            status, payload, content_type = reply
+        else:
+            status, result = reply
+            payload, content_type = json.dumps(result).encode(), 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _dispatch
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServerMixin:
+    daemon_threads = True
+
+    def init_stub(self, routes):
+        self.routes = dict(routes or {})
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.received = Counter()
+
+
+class StubHTTPServer(_StubServerMixin, ThreadingHTTPServer):
+    pass
+
+
+class StubUnixServer(_StubServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+
+def local_env_routes(env):
+    """
+    Routes serving the /env API from a LocalTeamsEnv. Episode ids and session
+    tokens (fields or X-Session-Token) are resolved by
+    LocalEnvironment.resolve_episode_id, with the backend's error statuses.
+    """
+    def scope(request, optional=False):
+        fields = request.fields
+        return env.env.resolve_episode_id(
+            fields.get('episodeId'),
+            fields.get('sessionToken') or request.headers.get('X-Session-Token'),
+            optional=optional)
+
+    def state(request):
+        fields = request.fields.get('fields')
+        return 200, {'success': True, 'state': env.get_state(
+            episode_id=scope(request), fields=fields.split(',') if fields else None)}
+
+    def stats(request):
+        episode_id = scope(request, optional=True)
+        return 200, {'success': True,
+                     'stats': env.get_stats(episode_id) if episode_id else None}
+
+    return {
+        'POST /env/reset': lambda request: (200, env.reset(
+            request.fields.get('episodeId'), request.fields.get('taskType'))),
+        'POST /env/step': lambda request: (200, env.step(
+            request.fields['action'], scope(request))),
+        'GET /env/state': state,
+        'GET /env/actions': lambda request: (200, env.get_actions(episode_id=scope(request))),
+        'GET /env/stats': stats,
+        'GET /env/tasks': lambda request: (200, {'success': True, 'tasks': env.get_tasks()}),
+    }
+
+
+@pytest.fixture
+def serve():
+    """
+    Start stub servers: serve(routes, unix_socket=False) -> server with .url,
+    .routes (may be changed while serving), .connections and .received.
+    """
+    servers = []
+
+    def start(routes=None, unix_socket=False):
+        if unix_socket:
+            path = os.path.join(tempfile.mkdtemp(), 'env.sock')
+            server = StubUnixServer(path, StubHandler)
+            server.url = f'unix://{path}'
+        else:
+            server = StubHTTPServer(('127.0.0.1', 0), StubHandler)
+            server.url = f'http://127.0.0.1:{server.server_address[1]}'
+        server.init_stub(routes)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+        if isinstance(server, StubUnixServer):
+            os.unlink(server.server_address)
+
+
+# Appended to a NodeBridge script, which defines `ops`:
+# one JSON request per line, { op, args } -> { ok, result } / { ok: false, error }
+NODE_LOOP = """
+const { createInterface } = await import("node:readline");
+createInterface({ input: process.stdin }).on("line", (line) => {
+  const { op, args } = JSON.parse(line);
+  let out;
+  try {
+    out = { ok: true, result: ops[op](args) };
+  } catch (error) {
+    out = { ok: false, error: error.message };
+  }
+  process.stdout.write(JSON.stringify(out) + "\\n");
+});
+"""
+
+
+class NodeBridge:
+    """A node subprocess (cwd backend/) running `script`, called one request at a time."""
+
+    def __init__(self, script, *args, env=None):
+        self.proc = subprocess.Popen(
+            ['node', '--input-type=module', '-e', script + NODE_LOOP, *args],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8',
+            cwd=BACKEND, env={**os.environ, **(env or {})},
+        )
+        self.lock = threading.Lock()
+
+    def call(self, op, args=None):
+        with self.lock:
+            self.proc.stdin.write(json.dumps({'op': op, 'args': args}) + '\n')
+            self.proc.stdin.flush()
+            out = json.loads(self.proc.stdout.readline())
+        if not out['ok']:
+            raise RuntimeError(out['error'])
+        return out['result']
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+# Runs the /env handlers of routes/envHandlers.js (argv[1]) on the
+# environment of models/environment.js (argv[2]) with plain req/res objects
+NODE_ENV_ROUTES = """
+const { envRoutes } = await import(process.argv[1]);
+const { environment } = await import(process.argv[2]);
+// Never completes, so one episode can take every kind of step
+environment.taskDefinitions.open_ended = {
+  name: "Open Ended",
+  description: "Never completes",
+  checkCompletion: () => false,
+  reward: 0,
+  maxSteps: 1000,
+};
+const routes = envRoutes.flatMap(([method, paths, handler]) =>
+  paths.map((path) => ({ method: method.toUpperCase(), parts: path.split("/").slice(1), handler }))
+);
+function match(method, path) {
+  const parts = path.split("/").slice(1);
+  for (const route of routes) {
+    if (route.method !== method || route.parts.length !== parts.length) continue;
+    const params = {};
+    const matches = route.parts.every((part, i) => {
+      if (part.startsWith(":")) params[part.slice(1)] = decodeURIComponent(parts[i]);
+      return part.startsWith(":") || part === parts[i];
+    });
+    if (matches) return { handler: route.handler, params };
+  }
+  return null;
+}
+const ops = {
+  request: ({ method, url, headers, body }) => {
+    const { pathname, searchParams } = new URL(url, "http://localhost");
+    const route = pathname.startsWith("/env/") && match(method, pathname.slice("/env".length));
+    if (!route) return { status: 404, body: { success: false, error: "Not found" } };
+    const reply = { status: 200 };
+    const req = {
+      method,
+      params: route.params,
+      query: Object.fromEntries(searchParams),
+      body,
+      get: (name) => headers[name.toLowerCase()],
+    };
+    const res = {
+      status(code) {
+        reply.status = code;
+        return this;
+      },
+      json(data) {
+        reply.body = data;
+        return this;
+      },
+    };
+    route.handler(req, res);
+    return reply;
+  },
+  configure: ({ requireEpisode = false, store = {} }) => {
+    environment.requireEpisode = requireEpisode;
+    Object.assign(environment.episodes, store);
+    return {};
+  },
+  episodes: () => ({
+    current: environment.currentEpisodeId,
+    stored: [...environment.episodes.live.keys(), ...environment.episodes.finished.keys()],
+    sessions: environment.sessions.size,
+  }),
+};
+"""
+
+
+@pytest.fixture
+def backend(serve):
+    """
+    Start the real /env handlers: backend(env=None) -> server (see serve)
+    with .node, the NodeBridge; `env` adds environment variables such as
+    ENV_MAX_BATCH_SIZE. node.call('configure', {...}) sets requireEpisode
+    and episode store limits; node.call('episodes') lists what is stored.
+    """
+    bridges = []
+
+    def start(env=None):
+        node = NodeBridge(NODE_ENV_ROUTES,
+                          (BACKEND / 'src' / 'routes' / 'envHandlers.js').as_uri(),
+                          (BACKEND / 'src' / 'models' / 'environment.js').as_uri(), env=env)
+        bridges.append(node)
+
+        def forward(request):
+            reply = node.call('request', {
+                'method': request.method,
+                'url': request.url,
+                'headers': {name.lower(): value for name, value in request.headers.items()},
+                'body': request.json() if request.method == 'POST' else {},
+            })
+            return reply['status'], reply['body']
+
+        server = serve({'*': forward})
+        server.node = node
+        return server
+
+    yield start
+    for node in bridges:
+        node.close()
@@ -0,0 +1,313 @@
+"""
+Record reference trajectories from the Node RL environment.
+
+Plays a fixed set of scenarios (TaskAgent policies plus hand-written edge
+cases) against the backend and stores the normalized results in
+tests/fixtures/env_trajectories.json. test_local_env.py replays the same
+actions against LocalTeamsEnv and checks it matches step for step.
+
+Usage:
+    # Against a running backend (cd backend && npm start)
+    python tests/record_env_trajectories.py
+
+    # Directly against backend/src/models/environment.js (needs node +
+    # backend dependencies installed, no server required)
+    python tests/record_env_trajectories.py --direct
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from task_agent import TaskAgent  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_PATH = Path(__file__).resolve().parent / 'fixtures' / 'env_trajectories.json'
+PLACEHOLDER = re.compile(r'^\$recent\[(-?\d+)\]$')
+
+LONG_EMOJI_MESSAGE = '🎉' * 250 + '!'  # 501 UTF-16 code units, 251 code points
+
+SCENARIOS = [
+    {'name': 'task_agent_greeting_response', 'taskType': 'greeting_response', 'policy': 'task_agent'},
+    {'name': 'task_agent_channel_explorer', 'taskType': 'channel_explorer', 'policy': 'task_agent'},
+    {'name': 'task_agent_active_participant', 'taskType': 'active_participant', 'policy': 'task_agent'},
+    {'name': 'task_agent_meeting_joiner', 'taskType': 'meeting_joiner', 'policy': 'task_agent'},
+    {'name': 'task_agent_social_butterfly', 'taskType': 'social_butterfly', 'policy': 'task_agent'},
+    {
+        'name': 'message_rules',
+        'taskType': 'active_participant',
+        'policy': [
+            {'type': 'send_message'},
+            {'type': 'send_message', 'payload': {'content': ''}},
+            {'type': 'send_message', 'payload': {'content': '   '}},
+            {'type': 'send_message', 'payload': {'content': LONG_EMOJI_MESSAGE}},
+            {'type': 'send_message', 'payload': {'content': 'x' * 500}},
+            {'type': 'send_message', 'payload': {'content': 'spam'}},
+            {'type': 'send_message', 'payload': {'content': 'spam'}},
+            {'type': 'send_message', 'payload': {'content': 'spam'}},
+            {'type': 'send_message', 'payload': {'content': 'To design', 'channelId': 'channel-5'}},
+            {'type': 'send_message', 'payload': {'content': 'Into the void', 'channelId': 'channel-99'}},
+        ],
+    },
+    {
+        'name': 'greeting_rules',
+        'taskType': 'greeting_response',
+        'policy': [
+            {'type': 'set_status', 'payload': {'status': 'busy'}},
+            {'type': 'send_message', 'payload': {'content': 'this is fine'}},
+            {'type': 'send_message', 'payload': {'content': 'hi again'}},
+        ],
+    },
+    {
+        'name': 'greeting_keyword_bonus',
+        'taskType': 'greeting_response',
+        'policy': [{'type': 'send_message', 'payload': {'content': 'HELLO, world'}}],
+    },
+    {
+        'name': 'greeting_too_late',
+        'taskType': 'greeting_response',
+        'policy': [{'type': 'set_status', 'payload': {'status': 'available'}}] * 5 + [
+            {'type': 'send_message', 'payload': {'content': 'hey all'}},
+        ] + [{'type': 'set_status', 'payload': {'status': 'away'}}] * 5,
+    },
+    {
+        'name': 'channel_rules',
+        'taskType': 'channel_explorer',
+        'policy': [
+            {'type': 'switch_channel', 'payload': {'channelId': 'channel-1'}},
+            {'type': 'switch_channel', 'payload': {'channelId': 'channel-404'}},
+            {'type': 'switch_channel', 'payload': {}},
+            {'type': 'switch_channel'},
+            {'type': 'switch_channel', 'payload': {'channelId': 'channel-4'}},
+            {'type': 'send_message', 'payload': {'content': 'ping general', 'channelId': 'channel-1'}},
+            {'type': 'switch_channel', 'payload': {'channelId': 'channel-1'}},
+            {'type': 'switch_channel', 'payload': {'channelId': 'channel-2'}},
+        ],
+    },
+    {
+        'name': 'reaction_status_call_rules',
+        'taskType': 'social_butterfly',
+        'policy': [
+            {'type': 'react_to_message', 'payload': {'messageId': '$recent[0]', 'reaction': '👍'}},
+            {'type': 'react_to_message', 'payload': {'messageId': '$recent[-1]', 'reaction': '❤️'}},
+            {'type': 'react_to_message', 'payload': {'messageId': 'msg-missing', 'reaction': '👍'}},
+            {'type': 'react_to_message', 'payload': {'messageId': '$recent[0]'}},
+            {'type': 'set_status', 'payload': {'status': 'dnd'}},
+            {'type': 'set_status', 'payload': {'status': 'sleeping'}},
+            {'type': 'join_call', 'payload': {'channelId': 'channel-3'}},
+            {'type': 'dance', 'payload': {}},
+            {'type': 'react_to_message', 'payload': {'messageId': '$recent[0]', 'reaction': '🎉'}},
+            {'type': 'send_message', 'payload': {'content': 'Nice work!'}},
+            {'type': 'send_message', 'payload': {'content': 'Agreed'}},
+            {'type': 'send_message', 'payload': {'content': 'Ship it'}},
+        ],
+    },
+    {
+        'name': 'too_many_invalid_actions',
+        'taskType': 'meeting_joiner',
+        'policy': [
+            {'type': 'dance', 'payload': {}},
+            {'type': 'join_call', 'payload': {'channelId': 'channel-404'}},
+            {'type': 'set_status'},
+            {'type': 'fly', 'payload': {}},
+            {'type': 'sing', 'payload': {}},
+            {'type': 'join_call', 'payload': {}},
+        ],
+    },
+    {
+        'name': 'mention_bonus',
+        'taskType': 'meeting_joiner',
+        'policy': [
+            {'type': 'send_message', 'payload': {'content': 'On my way'}},
+            {'type': 'join_call', 'payload': {}},
+            {'type': 'send_message', 'payload': {'content': 'Too late?'}},
+        ],
+    },
+    {
+        'name': 'max_steps',
+        'taskType': 'meeting_joiner',
+        'policy': [{'type': 'switch_channel', 'payload': {'channelId': 'channel-2'}},
+                   {'type': 'switch_channel', 'payload': {'channelId': 'channel-3'}}] * 8,
+    },
+]
+
+
+def normalize_state(state):
+    """Strip ids and timestamps so states from different runs can be compared."""
+    state = copy.deepcopy(state)
+    state.pop('episodeId', None)
+    state.pop('timestamp', None)
+    state.get('stats', {}).pop('startTime', None)
+    for msg in state.get('recentMessages', []):
+        msg.pop('id', None)
+        msg.pop('timestamp', None)
+        for reaction in msg.get('reactions', []):
+            reaction.pop('timestamp', None)
+    return state
+
+
+def resolve_action(action, state):
+    """Replace ``$recent[k]`` message placeholders with real message ids."""
+    payload = action.get('payload')
+    if not isinstance(payload, dict):
+        return action
+    match = PLACEHOLDER.match(str(payload.get('messageId', '')))
+    if not match:
+        return action
+    messages = state.get('recentMessages', [])
+    index = int(match.group(1))
+    message_id = messages[index]['id'] if -len(messages) <= index < len(messages) else 'msg-missing'
+    return {**action, 'payload': {**payload, 'messageId': message_id}}
+
+
+def templatize_action(action, state):
+    """Replace a recent message id in an action with its ``$recent[k]`` placeholder."""
+    payload = action.get('payload')
+    if not isinstance(payload, dict) or 'messageId' not in payload:
+        return action
+    for index, msg in enumerate(state.get('recentMessages', [])):
+        if msg['id'] == payload['messageId']:
+            return {**action, 'payload': {**payload, 'messageId': f'$recent[{index}]'}}
+    return action
+
+
+class HttpBackend:
+    """Records through TeamsEnvClient against a running server."""
+
+    def __init__(self, base_url):
+        from client import TeamsEnvClient
+        self.client = TeamsEnvClient(base_url)
+
+    def reset(self, task_type):
+        return self.client.reset(task_type=task_type)
+
+    def step(self, action, episode_id):
+        return self.client.step(action, episode_id)
+
+    def close(self):
+        self.client.close()
+
+
+NODE_BRIDGE = """
+import readline from "node:readline";
+const { environment } = await import(process.argv[1]);
+const rl = readline.createInterface({ input: process.stdin });
+rl.on("line", (line) => {
+  const { op, args } = JSON.parse(line);
+  let out;
+  try {
+    const result = op === "reset"
+      ? environment.reset(args)
+      : environment.step(args.action, args.episodeId);
+    out = { ok: true, result: { success: true, ...result } };
+  } catch (error) {
+    out = { ok: false, error: error.message };
+  }
+  process.stdout.write(JSON.stringify(out) + "\\n");
+});
+"""
+
+
+class NodeBackend:
+    """Records by importing environment.js in a node subprocess (no HTTP)."""
+
+    def __init__(self):
+        module_url = (ROOT / 'backend' / 'src' / 'models' / 'environment.js').as_uri()
+        self.proc = subprocess.Popen(
+            ['node', '--input-type=module', '-e', NODE_BRIDGE, module_url],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8',
+            cwd=ROOT / 'backend',
+        )
+
+    def _call(self, op, args):
+        self.proc.stdin.write(json.dumps({'op': op, 'args': args}) + '\n')
+        self.proc.stdin.flush()
+        out = json.loads(self.proc.stdout.readline())
+        if not out['ok']:
+            raise RuntimeError(out['error'])
+        return out['result']
+
+    def reset(self, task_type):
+        return self._call('reset', {'taskType': task_type})
+
+    def step(self, action, episode_id):
+        return self._call('step', {'action': action, 'episodeId': episode_id})
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def record_scenario(backend, scenario, max_steps=40):
+    """Play one scenario and return its normalized trajectory."""
+    reset_result = backend.reset(scenario['taskType'])
+    episode_id = reset_result['episodeId']
+    state = reset_result['state']
+    trajectory = {
+        'name': scenario['name'],
+        'taskType': scenario['taskType'],
+        'task': reset_result['task'],
+        'reset': normalize_state(state),
+        'steps': [],
+    }
+
+    agent = TaskAgent() if scenario['policy'] == 'task_agent' else None
+    scripted = [] if agent else list(scenario['policy'])
+
+    for _ in range(max_steps):
+        if agent:
+            action = agent.select_action(state)
+            template = templatize_action(action, state)
+        else:
+            if not scripted:
+                break
+            template = scripted.pop(0)
+            action = resolve_action(template, state)
+
+        result = backend.step(action, episode_id)
+        trajectory['steps'].append({
+            'action': template,
+            'reward': result['reward'],
+            'done': result['done'],
+            'info': result['info'],
+            'state': normalize_state(result['state']),
+        })
+        state = result['state']
+        if result['done'] and agent:
+            break
+
+    return trajectory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    parser.add_argument('--direct', action='store_true',
+                        help='import environment.js with node instead of calling the server')
+    parser.add_argument('--output', default=str(FIXTURE_PATH))
+    args = parser.parse_args()
+
+    backend = NodeBackend() if args.direct else HttpBackend(args.base_url)
+    try:
+        trajectories = [record_scenario(backend, scenario) for scenario in SCENARIOS]
+    finally:
+        backend.close()
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'trajectories': trajectories}, f, ensure_ascii=False)
+        f.write('\n')
+
+    steps = sum(len(t['steps']) for t in trajectories)
+    print(f"✅ Recorded {len(trajectories)} trajectories ({steps} steps) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Action Space Tests
+
+Checks the discrete action catalog, its validity masks, and that masked
+random play on the local simulator never takes a penalized action.
+
+Usage:
+    python -m pytest tests/test_action_space.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from action_space import ActionSpace  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+
+def test_catalog_and_actions():
+    """Indices map to fixed actions; state fills in message ids and text"""
+    space = ActionSpace()
+    assert len(space) == space.n == len(space.names)
+    state = LocalTeamsEnv(seed=0).reset(task_type='greeting_response')['state']
+
+    switch = space.to_action(space.index('switch_channel[channel-3]'), state)
+    assert switch == {'type': 'switch_channel', 'payload': {'channelId': 'channel-3'}}
+    react = space.to_action(space.index('react_to_message[0]'), state)
+    assert react['payload']['messageId'] == state['recentMessages'][-1]['id']
+    assert space.to_action(space.index('join_call'), state)['type'] == 'join_call'
+
+
+def test_masks():
+    """Current channel, missing messages and repeated messages are masked"""
+    space = ActionSpace(react_slots=3)
+    state = LocalTeamsEnv(seed=0).reset(task_type='meeting_joiner')['state']
+    state['recentMessages'] = state['recentMessages'][:1]
+    mask = space.mask(state)
+
+    current = state['agentState']['currentChannelId']
+    assert not mask[space.index(f'switch_channel[{current}]')]
+    assert mask[space.index('react_to_message[0]')]
+    assert not mask[space.index('react_to_message[1]')]
+    assert mask[space.index('send_message[greeting]')]
+
+    state['recentMessages'].append({'id': 'm', 'userId': 'agent', 'reactions': [],
+                                    'content': space.message_content('greeting', state)})
+    assert not space.mask(state)[space.index('send_message[greeting]')]
+
+    batch = space.mask_batch([state, {}])
+    assert batch.shape == (2, space.n)
+    assert not batch[1, space.index('react_to_message[0]')]
+
+
+def test_masked_random_play_is_never_penalized():
+    """Uniform play over masked actions gets no negative rewards"""
+    space = ActionSpace()
+    env = LocalTeamsEnv(seed=1)
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        state, done = env.reset()['state'], False
+        while not done:
+            index = rng.choice(np.flatnonzero(space.mask(state)))
+            result = env.step(space.to_action(index, state))
+            assert result['reward'] >= 0, (space.names[index], result['info'])
+            state, done = result['state'], result['done']
+
+
+if __name__ == '__main__':
+    test_catalog_and_actions()
+    test_masks()
+    test_masked_random_play_is_never_penalized()
+    print("✅ Action space tests passed")
@@ -0,0 +1,57 @@
+"""
+Actor-Learner Tests
+
+Runs RLAgent's multiprocess actor-learner mode briefly on the local simulator
+and checks the shared-memory plumbing.
+
+Usage:
+    python -m pytest tests/test_actor_learner.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent', 'agents'))
+
+from actor_learner import SharedArrays  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+from rl_agent import RLAgent  # noqa: E402
+
+
+def test_shared_arrays_attach():
+    """A second handle on the same block sees the same data"""
+    specs = {'flags': ((3,), np.bool_), 'params': ((2, 5), np.float32)}
+    owner = SharedArrays(specs)
+    try:
+        owner['params'][1] = 7.0
+        other = SharedArrays(specs, name=owner.name)
+        assert other['params'][1].tolist() == [7.0] * 5
+        other['flags'][2] = True
+        assert owner['flags'].tolist() == [False, False, True]
+        other.close()
+    finally:
+        owner.close(unlink=True)
+
+
+def test_actor_learner_training():
+    """Actors feed the learner's replay buffer and the learner updates"""
+    agent = RLAgent(LocalTeamsEnv(seed=0), learning_starts=200, replay_capacity=10_000, seed=0)
+    initial = agent.dqn.online.flat_params.copy()
+    stats = agent.train_actor_learner(1500, num_actors=2, chunk_size=32, seed=0, verbose=False)
+
+    assert stats['steps'] >= 1500
+    assert sum(stats['actor_steps']) == stats['steps'] == len(agent.replay)
+    assert all(steps > 0 for steps in stats['actor_steps'])
+    assert stats['updates'] > 0 and stats['episode_rewards']
+    assert agent.total_steps == stats['steps']
+    assert not np.array_equal(initial, agent.dqn.online.flat_params)
+    assert agent.replay.next_masks[:len(agent.replay)].any(axis=1).all()
+
+
+if __name__ == '__main__':
+    test_shared_arrays_attach()
+    test_actor_learner_training()
+    print("✅ Actor-learner tests passed")
@@ -0,0 +1,171 @@
+"""
+Async Client Tests
+
+Runs AsyncTeamsEnvClient and run_concurrent_episodes against a stub server
+(an in-process HTTP server backed by LocalTeamsEnv, which checks session
+tokens like the backend, that counts the episodes in flight). Checks that the async
+client scopes calls to its own episode with the session token from its reset,
+that run_concurrent_episodes never has more than ``concurrency`` episodes in
+flight, and that failing episodes are collected in ``errors`` without
+stopping the others.
+
+Usage:
+    python -m pytest tests/test_async_client.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from async_client import AsyncTeamsEnvClient, run_concurrent_episodes  # noqa: E402
+from conftest import local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+JOIN = {'type': 'join_call', 'payload': {}}
+
+
+class EpisodeTracker:
+    """Episode bookkeeping shared by the server threads."""
+
+    def __init__(self, step_delay=0.0, fail_every=0):
+        self.step_delay = step_delay
+        self.fail_every = fail_every     # every Nth reset gets an episode whose steps fail
+        self.lock = threading.Lock()
+        self.resets = 0
+        self.active = set()
+        self.max_active = 0
+        self.failing = set()
+        self.unscoped = []
+        self.tokens = []
+
+    def reset(self, handler):
+        def route(request):
+            status, result = handler(request)
+            with self.lock:
+                self.resets += 1
+                if self.fail_every and self.resets % self.fail_every == 0:
+                    self.failing.add(result['episodeId'])
+                self.active.add(result['episodeId'])
+                self.max_active = max(self.max_active, len(self.active))
+            return status, result
+        return route
+
+    def step(self, handler):
+        def route(request):
+            time.sleep(self.step_delay)
+            episode_id = request.fields.get('episodeId')
+            if episode_id in self.failing:
+                with self.lock:
+                    self.active.discard(episode_id)
+                return 500, {'success': False, 'error': 'Step failed'}
+            status, result = handler(request)
+            if result['done']:
+                with self.lock:
+                    self.active.discard(episode_id)
+            return status, result
+        return route
+
+    def scoped(self, handler):
+        def route(request):
+            if request.fields.get('episodeId'):
+                self.tokens.append(request.fields.get('sessionToken'))
+            else:
+                self.unscoped.append(request.path)
+            return handler(request)
+        return route
+
+
+@pytest.fixture
+def start_server(serve):
+    def start(**options):
+        env = LocalTeamsEnv(seed=0)
+        tracker = EpisodeTracker(**options)
+        routes = local_env_routes(env)
+        routes['POST /env/step'] = tracker.step(routes['POST /env/step'])
+        routes = {path: tracker.scoped(handler) for path, handler in routes.items()}
+        routes['POST /env/reset'] = tracker.reset(local_env_routes(env)['POST /env/reset'])
+        return serve(routes).url, tracker
+
+    return start
+
+
+def test_calls_are_scoped_with_session_token(start_server):
+    """Calls without an episode id act on the client's own reset, with its token"""
+    base_url, stub = start_server()
+
+    async def scenario():
+        async with AsyncTeamsEnvClient(base_url) as first, \
+                AsyncTeamsEnvClient(base_url) as second:
+            a = await first.reset(task_type='meeting_joiner')
+            b = await second.reset(task_type='greeting_response')
+            assert first.last_episode_id == a['episodeId']
+
+            # The server's "current" episode is b now; first still steps a
+            result = await first.step(JOIN)
+            assert result['done'] and result['state']['episodeId'] == a['episodeId']
+            assert (await second.get_state())['episodeId'] == b['episodeId']
+            assert (await first.get_stats())['callsJoined'] == 1
+            assert (await second.get_actions())['channels']
+            return a, b
+
+    a, b = asyncio.run(scenario())
+    assert stub.unscoped == []
+    assert set(stub.tokens) == {a['sessionToken'], b['sessionToken']}
+
+
+def test_reset_by_another_client_is_detected(start_server):
+    """A stale session token is rejected instead of acting on the new run"""
+    base_url, _ = start_server()
+
+    async def scenario():
+        async with AsyncTeamsEnvClient(base_url) as first, \
+                AsyncTeamsEnvClient(base_url) as second:
+            await first.reset(episode_id='shared', task_type='meeting_joiner')
+            await second.reset(episode_id='shared', task_type='meeting_joiner')
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await first.step(JOIN)
+            assert error.value.status == 409
+            assert (await second.step(JOIN))['done']
+
+    asyncio.run(scenario())
+
+
+def test_concurrency_is_bounded(start_server):
+    """No more than `concurrency` episodes are in flight at once"""
+    base_url, stub = start_server(step_delay=0.02)
+    results = asyncio.run(run_concurrent_episodes(
+        12, select_action=lambda state: JOIN, base_url=base_url,
+        concurrency=3, task_type='meeting_joiner'))
+
+    assert results['errors'] == []
+    assert results['num_episodes'] == results['completed'] == 12
+    assert results['total_steps'] == 12
+    assert stub.resets == 12 and not stub.active
+    assert stub.max_active == 3
+
+
+def test_errors_are_aggregated(start_server):
+    """Failing episodes end up in `errors`; the rest still run to completion"""
+    base_url, stub = start_server(step_delay=0.01, fail_every=3)
+    results = asyncio.run(run_concurrent_episodes(
+        9, select_action=lambda state: JOIN, base_url=base_url,
+        concurrency=2, task_type='meeting_joiner'))
+
+    assert len(results['errors']) == 3
+    assert all('ClientResponseError' in error and '500' in error
+               for error in results['errors'])
+    assert results['num_episodes'] == results['completed'] == 6
+    assert {episode['episode_id'] for episode in results['episodes']}.isdisjoint(stub.failing)
+    assert stub.resets == 9 and stub.max_active <= 2
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_async_client.py")
@@ -0,0 +1,143 @@
+"""
+Client Response Cache Tests
+
+Checks the TTL cache behind TeamsEnvClient.get_tasks/get_actions with a fake
+clock: expiry, per-episode action lists, invalidation on reset and on the
+step that finishes an episode, prefetch, and the hit/miss counters in
+cache_stats() and ClientMetrics. Runs against an in-process HTTP server
+backed by LocalTeamsEnv that counts the requests it serves.
+
+Usage:
+    python -m pytest tests/test_client_cache.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient, _TTLCache  # noqa: E402
+from conftest import local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+JOIN = {'type': 'join_call', 'payload': {}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def server(serve):
+    return serve(local_env_routes(LocalTeamsEnv(seed=0)))
+
+
+def cache_counters(client, endpoint):
+    summary = client.metrics.summary()['endpoints'][endpoint]
+    return summary['cache_hits'], summary['cache_misses']
+
+
+def test_ttl_expiry():
+    """Entries live for exactly `ttl` seconds of the cache's clock"""
+    clock = FakeClock()
+    cache = _TTLCache(10, clock=clock)
+    assert cache.get(('tasks',)) is None
+    cache.put(('tasks',), ['a'])
+    clock.advance(9.9)
+    assert cache.get(('tasks',)) == ['a']
+    clock.advance(0.1)
+    assert cache.get(('tasks',)) is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 0}
+
+    cache.put(('actions', 'ep-1'), 1)
+    cache.put(('actions', 'ep-2'), 2)
+    cache.put(('tasks',), 3)
+    cache.discard(('actions', 'ep-1'))
+    assert cache.stats()['size'] == 2
+    cache.invalidate('actions')
+    assert cache.get(('tasks',)) == 3 and cache.stats()['size'] == 1
+
+    disabled = _TTLCache(None, clock=clock)
+    disabled.put(('tasks',), ['a'])
+    assert disabled.get(('tasks',)) is None
+    assert disabled.stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+def test_actions_cached_per_episode(server):
+    """Each episode's action list is its own entry and expires with the TTL"""
+    clock = FakeClock()
+    with TeamsEnvClient(server.url, cache_ttl=30) as client:
+        client._cache.clock = clock
+        first = client.reset(task_type='meeting_joiner')['episodeId']
+        second = client.reset(task_type='greeting_response')['episodeId']
+
+        for _ in range(3):
+            client.get_actions(episode_id=first)
+            client.get_actions(episode_id=second)
+        assert server.received[('GET', '/env/actions')] == 2
+        assert client.cache_stats() == {'hits': 4, 'misses': 2, 'size': 2}
+
+        clock.advance(29)
+        client.get_actions()  # defaults to the last reset episode
+        assert server.received[('GET', '/env/actions')] == 2
+        clock.advance(1)
+        client.get_actions(episode_id=first)
+        assert server.received[('GET', '/env/actions')] == 3
+
+        assert cache_counters(client, 'GET /actions') == (5, 3)
+        assert client.metrics.summary()['endpoints']['GET /actions']['count'] == 3
+
+
+def test_invalidation_on_reset_and_step(server):
+    """reset drops the action lists; a finishing step drops its episode's entry"""
+    with TeamsEnvClient(server.url, cache_ttl=60) as client:
+        client.get_tasks()
+        episode_id = client.reset(task_type='meeting_joiner')['episodeId']
+        client.get_actions()
+        client.step({'type': 'set_status', 'payload': {'status': 'busy'}})
+        client.get_actions()
+        assert server.received[('GET', '/env/actions')] == 1
+
+        assert client.step(JOIN)['done']
+        assert client.cache_stats()['size'] == 1  # only the task list is left
+        client.get_actions(episode_id=episode_id)
+        assert server.received[('GET', '/env/actions')] == 2
+
+        client.reset(task_type='meeting_joiner')
+        client.get_actions()
+        client.get_tasks()
+        assert server.received[('GET', '/env/actions')] == 3
+        assert server.received[('GET', '/env/tasks')] == 1
+        assert cache_counters(client, 'GET /tasks') == (1, 1)
+
+
+def test_prefetch(server):
+    """prefetch=True fills the task and action lists up front"""
+    with TeamsEnvClient(server.url, prefetch=True) as client:
+        assert server.received == {('GET', '/env/tasks'): 1, ('GET', '/env/actions'): 1}
+        assert 'meeting_joiner' in client.get_tasks()
+        assert client.get_actions()['actions']
+        assert server.received == {('GET', '/env/tasks'): 1, ('GET', '/env/actions'): 1}
+        assert cache_counters(client, 'GET /tasks') == (1, 1)
+        assert cache_counters(client, 'GET /actions') == (1, 1)
+
+    with TeamsEnvClient(server.url, cache_ttl=None) as client:
+        client.get_tasks()
+        client.get_tasks()
+        assert server.received[('GET', '/env/tasks')] == 3
+        assert cache_counters(client, 'GET /tasks') == (0, 0)
+        assert client.cache_stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+
+if __name__ == '__main__':
+    test_ttl_expiry()
+    print("✅ Client cache tests passed (run with pytest for the server fixtures)")
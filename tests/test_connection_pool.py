@@ -0,0 +1,126 @@
+"""
+Connection Pool Tests
+
+Runs TeamsEnvClient against a local keep-alive HTTP server (backed by
+LocalTeamsEnv) that counts the TCP connections it accepts and the requests it
+receives. Checks that connection_stats() matches what the server saw (reused
+versus newly opened connections, also from several threads), and the retry
+policy: POSTs are retried only when the connection could not be opened,
+never once the request was sent, while GETs are also retried on dropped
+connections and 502/503/504.
+
+Usage:
+    python -m pytest tests/test_connection_pool.py
+"""
+
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from conftest import DROP, local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+STATUS = {'type': 'set_status', 'payload': {'status': 'busy'}}
+
+
+@pytest.fixture
+def server(serve):
+    env = LocalTeamsEnv(seed=0)
+    failure = {'reply': None}   # None, DROP, or an HTTP status to answer with
+
+    def route(handler):
+        def guarded(request):
+            reply = failure['reply']
+            if reply is DROP:
+                return DROP
+            if reply is not None:
+                return reply, {'success': False, 'error': 'Unavailable'}
+            return handler(request)
+        return guarded
+
+    server = serve({path: route(handler) for path, handler in local_env_routes(env).items()})
+    server.failure = failure
+    return server
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+
+def test_keep_alive_reuses_one_connection(server):
+    """Sequential calls share one connection; connection_stats() says so"""
+    with TeamsEnvClient(server.url) as client:
+        client.reset(task_type='greeting_response')
+        for _ in range(8):
+            client.step(STATUS)
+        client.get_state()
+        assert client.connection_stats() == {'new_connections': 1,
+                                             'reused_connections': 9, 'requests': 10}
+    assert server.connections == 1
+
+
+def test_without_keep_alive_every_call_connects(server):
+    """keep_alive=False opens (and counts) a new connection per request"""
+    with TeamsEnvClient(server.url, keep_alive=False) as client:
+        client.reset(task_type='greeting_response')
+        for _ in range(4):
+            client.step(STATUS)
+        assert client.connection_stats() == {'new_connections': 5,
+                                             'reused_connections': 0, 'requests': 5}
+    assert server.connections == 5
+
+
+def test_threads_share_the_pool(server):
+    """Threads reuse at most pool_maxsize connections between them"""
+    with TeamsEnvClient(server.url, pool_maxsize=4) as client:
+        ids = [client.reset(task_type='greeting_response')['episodeId'] for _ in range(4)]
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda i: client.step(STATUS, ids[i % 4]), range(100)))
+        stats = client.connection_stats()
+    assert stats['requests'] == 104
+    assert stats['new_connections'] == server.connections <= 4
+
+
+def test_post_retried_only_when_connect_fails():
+    """A refused connection is retried for POST: nothing was sent yet"""
+    with TeamsEnvClient(closed_port_url(), max_retries=2, backoff_factor=0) as client:
+        with pytest.raises(requests.ConnectionError):
+            client.reset()
+        assert client.connection_stats()['requests'] == 3
+        assert client.metrics.summary()['endpoints']['POST /reset']['errors'] == 1
+
+
+@pytest.mark.parametrize('failure', ['drop', 503])
+def test_post_not_retried_after_sending(server, failure):
+    """Once a POST reached the server it is not sent again"""
+    with TeamsEnvClient(server.url, max_retries=3, backoff_factor=0) as client:
+        client.reset(task_type='greeting_response')
+        server.failure['reply'] = DROP if failure == 'drop' else failure
+        with pytest.raises((requests.ConnectionError, requests.HTTPError)) as error:
+            client.step(STATUS)
+        if failure == 503:
+            assert error.value.response.status_code == 503
+    assert server.received[('POST', '/env/step')] == 1
+
+
+@pytest.mark.parametrize('failure', ['drop', 503])
+def test_get_retried(server, failure):
+    """GETs are idempotent, so dropped connections and 503s are retried"""
+    with TeamsEnvClient(server.url, max_retries=2, backoff_factor=0) as client:
+        server.failure['reply'] = DROP if failure == 'drop' else failure
+        with pytest.raises((requests.ConnectionError, requests.HTTPError)):
+            client.get_state()
+    assert server.received[('GET', '/env/state')] == 3
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_connection_pool.py")
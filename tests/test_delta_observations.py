@@ -0,0 +1,125 @@
+"""
+Delta Observation Tests
+
+Serves the real /env route handlers (backend/src/routes/envHandlers.js, run
+in a node subprocess by the conftest.py backend fixture) and steps episodes
+with TeamsEnvClient(delta_observations=True). After every step the state the
+client rebuilt from the server's stateDelta must equal a fresh get_state(),
+also across resets and for batches that step one episode several times.
+Skipped without node.
+
+Usage:
+    python -m pytest tests/test_delta_observations.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from conftest import requires_node  # noqa: E402
+
+pytestmark = requires_node
+
+
+@pytest.fixture
+def node_server(backend):
+    server = backend()
+    server.deltas = 0
+    forward = server.routes['*']
+
+    def count_deltas(request):
+        status, body = forward(request)
+        server.deltas += sum('stateDelta' in result for result in body.get('results', [body]))
+        return status, body
+
+    server.routes['*'] = count_deltas
+    return server
+
+
+def without_timestamp(state):
+    return {key: value for key, value in state.items() if key != 'timestamp'}
+
+
+def message(content, channel_id=None):
+    payload = {'content': content}
+    if channel_id:
+        payload['channelId'] = channel_id
+    return {'type': 'send_message', 'payload': payload}
+
+
+def check_step(client, episode_id, action):
+    """Step in delta mode and compare the rebuilt state with the server's."""
+    result = client.step(action, episode_id)
+    assert without_timestamp(result['state']) == \
+        without_timestamp(client.get_state(episode_id=episode_id)), action
+    return result
+
+
+def test_rebuilt_state_matches_server(node_server):
+    """Every delta kind: appends, a full window, channel switches, reactions, status"""
+    with TeamsEnvClient(node_server.url, delta_observations=True) as client:
+        episode_id = client.reset(task_type='open_ended')['episodeId']
+        first_message = client.get_state()['recentMessages'][0]['id']
+
+        check_step(client, episode_id, message('Hello team'))
+        for i in range(12):  # ten or more appends replace the whole window
+            check_step(client, episode_id, message(f'Update {i}'))
+        check_step(client, episode_id, message('Over there', 'channel-2'))
+        check_step(client, episode_id, {'type': 'switch_channel',
+                                        'payload': {'channelId': 'channel-2'}})
+        check_step(client, episode_id, {'type': 'react_to_message',
+                                        'payload': {'messageId': first_message, 'reaction': 'x'}})
+        latest = client.get_state()['recentMessages'][-1]['id']
+        check_step(client, episode_id, {'type': 'react_to_message',
+                                        'payload': {'messageId': latest, 'reaction': 'y'}})
+        check_step(client, episode_id, {'type': 'set_status', 'payload': {'status': 'busy'}})
+        check_step(client, episode_id, {'type': 'unknown_action', 'payload': {}})
+        assert node_server.deltas == 19
+
+
+def test_rebuilt_state_across_resets(node_server):
+    """Resetting an episode id replaces the held base; finished episodes drop it"""
+    with TeamsEnvClient(node_server.url, delta_observations=True) as client:
+        client.reset(episode_id='fixed', task_type='open_ended')
+        for i in range(3):
+            check_step(client, 'fixed', message(f'Before {i}'))
+
+        client.reset(episode_id='fixed', task_type='open_ended')
+        for i in range(3):
+            result = check_step(client, 'fixed', message(f'After {i}'))
+        assert result['state']['version'] == 3
+        assert not any(msg['content'].startswith('Before')
+                       for msg in result['state']['recentMessages'])
+
+        episode_id = client.reset(task_type='meeting_joiner')['episodeId']
+        assert check_step(client, episode_id, {'type': 'join_call', 'payload': {}})['done']
+        assert episode_id not in client._delta_bases
+        check_step(client, episode_id, {'type': 'join_call', 'payload': {}})
+        assert node_server.deltas == 7
+
+
+def test_batch_with_repeated_episode(node_server):
+    """Items for the same episode are all decoded against the pre-batch base"""
+    with TeamsEnvClient(node_server.url, delta_observations=True) as client:
+        first = client.reset(task_type='open_ended')['episodeId']
+        second = client.reset(task_type='open_ended')['episodeId']
+        ids = [first, first, second, first]
+        results = client.step_many([message(f'Batch {i}') for i in range(4)], ids)
+        assert node_server.deltas == 4
+
+        assert [result['state']['version'] for result in results] == [1, 2, 1, 3]
+        contents = [msg['content'] for msg in results[-1]['state']['recentMessages']]
+        assert contents[-3:] == ['Batch 0', 'Batch 1', 'Batch 3']
+        assert len(contents) == len(set(msg['id'] for msg in results[-1]['state']['recentMessages']))
+        for episode_id, result in ((first, results[3]), (second, results[2])):
+            assert without_timestamp(result['state']) == \
+                without_timestamp(client.get_state(episode_id=episode_id))
+        check_step(client, first, message('After the batch'))
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_delta_observations.py")
@@ -0,0 +1,103 @@
+"""
+NumPy DQN Tests
+
+Checks MLP gradients against finite differences, that DQN learns a small
+contextual bandit, checkpoint round trips, and a short RLAgent training run
+on the in-process simulator.
+
+Usage:
+    python -m pytest tests/test_dqn.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent', 'agents'))
+
+from dqn import DQN, LinearSchedule  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+from mlp import MLP  # noqa: E402
+from rl_agent import RLAgent  # noqa: E402
+
+
+def test_mlp_gradients_match_finite_differences():
+    """backward() gradients equal numerical gradients of sum(output * c)"""
+    rng = np.random.default_rng(0)
+    net = MLP([5, 8, 6, 3], seed=1)
+    x = rng.standard_normal((4, 5)).astype(np.float32)
+    c = rng.standard_normal((4, 3)).astype(np.float32)
+
+    net.forward(x)
+    net.backward(c)
+    analytic = net.flat_grads.copy()
+
+    def loss():
+        return float((net.forward(x).astype(np.float64) * c).sum())
+
+    eps = 1e-2
+    for index in rng.choice(len(net.flat_params), size=20, replace=False):
+        original = net.flat_params[index]
+        net.flat_params[index] = original + eps
+        plus = loss()
+        net.flat_params[index] = original - eps
+        minus = loss()
+        net.flat_params[index] = original
+        assert abs((plus - minus) / (2 * eps) - analytic[index]) < 1e-2
+
+
+def test_dqn_learns_contextual_bandit():
+    """One-step episodes: reward 1 for the action matching the one-hot context"""
+    rng = np.random.default_rng(0)
+    dqn = DQN(4, 4, hidden_sizes=(32,), lr=1e-2, target_update=50, seed=0)
+    for _ in range(300):
+        contexts = rng.integers(0, 4, size=32)
+        actions = rng.integers(0, 4, size=32)
+        obs = np.eye(4, dtype=np.float32)[contexts]
+        dqn.update({
+            'obs': obs, 'actions': actions,
+            'rewards': (contexts == actions).astype(np.float32),
+            'next_obs': obs, 'dones': np.ones(32, dtype=bool),
+        })
+    greedy = [dqn.act(np.eye(4, dtype=np.float32)[i]) for i in range(4)]
+    assert greedy == [0, 1, 2, 3]
+    assert dqn.act(np.eye(4, dtype=np.float32)[0], mask=np.array([False, True, True, True])) != 0
+
+
+def test_checkpoint_round_trip():
+    """save()/load() restore networks, optimizer state and extras"""
+    dqn = DQN(6, 3, hidden_sizes=(8,), seed=0)
+    batch = {
+        'obs': np.ones((2, 6), dtype=np.float32), 'actions': np.array([0, 2]),
+        'rewards': np.array([1.0, -1.0], dtype=np.float32),
+        'next_obs': np.zeros((2, 6), dtype=np.float32), 'dones': np.array([False, True]),
+    }
+    dqn.update(batch)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dqn.npz')
+        dqn.save(path, total_steps=42)
+        restored = DQN(6, 3, hidden_sizes=(8,), seed=1)
+        assert int(restored.load(path)['total_steps']) == 42
+    assert np.array_equal(restored.online.flat_params, dqn.online.flat_params)
+    assert np.array_equal(restored.optimizer.v, dqn.optimizer.v)
+    assert restored.updates == 1
+    assert LinearSchedule(1.0, 0.0, 10)(5) == 0.5
+
+
+def test_rl_agent_trains_locally():
+    """RLAgent runs train/evaluate against LocalTeamsEnv and performs updates"""
+    agent = RLAgent(LocalTeamsEnv(seed=0), learning_starts=50, seed=0)
+    result = agent.train(num_episodes=8, verbose=False)
+    assert result['updates'] > 0 and len(agent.replay) == result['steps']
+    assert len(agent.evaluate(num_episodes=2)) == 2
+
+
+if __name__ == '__main__':
+    test_mlp_gradients_match_finite_differences()
+    test_dqn_learns_contextual_bandit()
+    test_checkpoint_round_trip()
+    test_rl_agent_trains_locally()
+    print("✅ NumPy DQN tests passed")
@@ -0,0 +1,91 @@
+"""
+State Encoder Tests
+
+Checks that StateEncoder produces fixed-width vectors that do not depend on
+channel order, and that the batch path matches per-state encoding.
+
+Usage:
+    python -m pytest tests/test_encoders.py
+"""
+
+import copy
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from encoders import (ACTION_VOCAB, CHANNEL_VOCAB, USER_VOCAB,  # noqa: E402
+                      StateEncoder, encode_action_types)
+from local_env import LocalTeamsEnv  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+
+
+def rollout_states(num_steps=200):
+    env = LocalTeamsEnv(seed=0)
+    agent = TaskAgent()
+    states = []
+    while len(states) < num_steps:
+        result = env.reset()
+        state, done = result['state'], False
+        while not done:
+            response = env.step(agent.select_action(state), result['episodeId'])
+            state, done = response['state'], response['done']
+            states.append(state)
+    return states
+
+
+def test_vocabularies_cover_simulator():
+    """Every channel and user id the environment emits is in the vocabulary"""
+    state = LocalTeamsEnv(seed=1).reset()['state']
+    channel_ids = [c['id'] for team in state['teams'] for c in team['channels']]
+    assert all(CHANNEL_VOCAB.lookup(c) != CHANNEL_VOCAB.unknown for c in channel_ids)
+    assert all(USER_VOCAB.lookup(u['id']) != USER_VOCAB.unknown for u in state['users'])
+
+
+def test_fixed_width_and_order_independent():
+    """Reordering or dropping channels keeps the width and column meaning"""
+    encoder = StateEncoder()
+    state = LocalTeamsEnv(seed=2).reset(task_type='channel_explorer')['state']
+    shuffled = copy.deepcopy(state)
+    shuffled['teams'] = shuffled['teams'][::-1]
+    for team in shuffled['teams']:
+        team['channels'] = team['channels'][::-1]
+
+    assert encoder.encode(state).shape == (encoder.dim,)
+    assert np.array_equal(encoder.encode(state), encoder.encode(shuffled))
+
+    trimmed = copy.deepcopy(state)
+    trimmed['teams'] = trimmed['teams'][:1]
+    trimmed['agentState']['currentChannelId'] = 'channel-99'
+    encoded = encoder.encode(trimmed)
+    assert encoded.shape == (encoder.dim,)
+    assert encoded[encoder.layout['channel']][-1] == 1.0  # unknown slot
+    assert len(encoder.feature_names()) == encoder.dim
+
+
+def test_batch_matches_single_and_reuses_buffer():
+    """encode_batch equals stacked encode() and fills a caller-provided matrix"""
+    encoder = StateEncoder()
+    states = rollout_states()
+    expected = np.stack([encoder.encode(s) for s in states])
+
+    out = np.full((len(states), encoder.dim), np.nan, dtype=np.float32)
+    assert encoder.encode_batch(states, out=out) is out
+    assert np.array_equal(out, expected)
+    assert np.array_equal(encoder.encode_batch(states), expected)
+
+
+def test_action_types():
+    """Action dicts map to stable indices, unknown types to the unknown slot"""
+    ids = encode_action_types([{'type': 'join_call'}, {'type': 'dance'}])
+    assert ids.tolist() == [ACTION_VOCAB.lookup('join_call'), ACTION_VOCAB.unknown]
+
+
+if __name__ == '__main__':
+    test_vocabularies_cover_simulator()
+    test_fixed_width_and_order_independent()
+    test_batch_matches_single_and_reuses_buffer()
+    test_action_types()
+    print("✅ State encoder tests passed")
@@ -0,0 +1,107 @@
+"""
+Batch Route Tests
+
+Calls the real POST /env/reset_batch and /env/step_batch handlers
+(backend/src/routes/envHandlers.js, served by the conftest.py backend
+fixture) over HTTP. Checks the ENV_MAX_BATCH_SIZE limit (413), that failing
+items are reported per item without affecting the others, that repeated
+episode ids are stepped in order, and that a reset with an unknown task type
+stores no episode. Skipped without node.
+
+Usage:
+    python -m pytest tests/test_env_batch_routes.py
+"""
+
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from conftest import requires_node  # noqa: E402
+
+pytestmark = requires_node
+
+STATUS = {'type': 'set_status', 'payload': {'status': 'busy'}}
+
+
+@pytest.fixture
+def server(backend):
+    return backend(env={'ENV_MAX_BATCH_SIZE': '5'})
+
+
+def post(server, path, body):
+    return requests.post(f'{server.url}/env/{path}', json=body)
+
+
+def test_batch_size_limit(server):
+    """Batches over ENV_MAX_BATCH_SIZE get a 413, malformed ones a 400"""
+    response = post(server, 'reset_batch', {'items': [{}] * 6})
+    assert response.status_code == 413
+    assert response.json()['error'] == 'Batch too large: 6 items (max 5)'
+    assert server.node.call('episodes')['stored'] == []
+
+    assert post(server, 'step_batch', {'items': 'all'}).status_code == 400
+    assert post(server, 'reset_batch', {'items': [{}] * 5}).json()['count'] == 5
+
+
+def test_failing_items_are_reported_per_item(server):
+    """A bad item fails alone; the items around it still run"""
+    first = post(server, 'reset', {'taskType': 'open_ended'}).json()
+    results = post(server, 'step_batch', {'items': [
+        {'action': STATUS},
+        {'episodeId': first['episodeId'], 'action': {'payload': {}}},
+        {'episodeId': 'missing', 'action': STATUS},
+        {'sessionToken': 'not-a-token', 'action': STATUS},
+        {'sessionToken': first['sessionToken'], 'action': STATUS},
+    ]}).json()['results']
+
+    assert [result['success'] for result in results] == [False, False, False, False, True]
+    assert results[0]['error'] == 'Missing episodeId'
+    assert results[1]['error'].startswith('Invalid action format')
+    assert results[2]['error'] == 'No active episode found'
+    assert results[3]['error'] == 'Invalid or expired session token'
+    assert results[4]['state']['episodeId'] == first['episodeId']
+
+
+def test_repeated_episode_ids_step_in_order(server):
+    """Items naming the same episode are applied one after another"""
+    resets = post(server, 'reset_batch', {'items': [{'taskType': 'open_ended'}] * 2}).json()
+    first, second = (result['episodeId'] for result in resets['results'])
+    contents = ['one', 'two', 'other', 'three']
+    results = post(server, 'step_batch', {'items': [
+        {'episodeId': episode_id, 'action': {'type': 'send_message', 'payload': {'content': content}}}
+        for episode_id, content in zip([first, first, second, first], contents)
+    ]}).json()['results']
+
+    assert [result['state']['version'] for result in results] == [1, 2, 1, 3]
+    messages = [message['content'] for message in results[-1]['state']['recentMessages']]
+    assert messages[-3:] == ['one', 'two', 'three']
+    stats = requests.get(f'{server.url}/env/stats', params={'episodeId': first}).json()
+    assert stats['stats']['stepCount'] == 3
+
+
+def test_unknown_task_type_stores_nothing(server):
+    """An unknown taskType fails before the episode, its token or the current id change"""
+    good = post(server, 'reset', {'taskType': 'open_ended'}).json()
+    before = server.node.call('episodes')
+
+    response = post(server, 'reset', {'episodeId': 'broken', 'taskType': 'no_such_task'})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Unknown task type: no_such_task'
+
+    results = post(server, 'reset_batch', {'items': [
+        {'episodeId': 'broken', 'taskType': 'no_such_task'},
+    ]}).json()['results']
+    assert results == [{'success': False, 'error': 'Unknown task type: no_such_task'}]
+    assert server.node.call('episodes') == before
+    assert before['current'] == good['episodeId']
+
+    state = requests.get(f'{server.url}/env/state').json()['state']
+    assert state['episodeId'] == good['episodeId']
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_env_batch_routes.py")
@@ -0,0 +1,104 @@
+"""
+Episode Driver Tests
+
+Checks that EpisodeDriver overlaps resets with the running episode, using a
+local simulator behind an artificial round-trip delay.
+
+Usage:
+    python -m pytest tests/test_episode_driver.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent', 'agents'))
+
+from episode_driver import EpisodeDriver  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+from rl_agent import RLAgent  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+
+LATENCY = 0.02
+
+
+class SlowClient:
+    """LocalTeamsEnv with a fixed reset round trip; calls are serialized like a server."""
+
+    def __init__(self, seed=0, latency=None):
+        self.env = LocalTeamsEnv(seed=seed)
+        self.lock = threading.Lock()
+        self.latency = latency or {}   # task type -> reset round trip
+
+    def reset(self, episode_id=None, task_type=None):
+        time.sleep(self.latency.get(task_type, LATENCY))
+        with self.lock:
+            return self.env.reset(episode_id=episode_id, task_type=task_type)
+
+    def step(self, action, episode_id=None):
+        with self.lock:
+            return self.env.step(action, episode_id)
+
+
+def test_prefetch_hides_reset_latency():
+    """The second reset is ready by the time the first episode ends"""
+    with EpisodeDriver(SlowClient()) as driver:
+        first = driver.next_episode('greeting_response')
+        time.sleep(2 * LATENCY)  # play the episode
+        second = driver.next_episode('greeting_response', prefetch_next=False)
+        stats = driver.stats()
+
+    assert first['episodeId'] != second['episodeId']
+    assert second['task']['type'] == 'greeting_response'
+    assert stats['resets'] == 2 and stats['prefetch_hits'] == 1
+    assert stats['reset_seconds'] >= 2 * LATENCY
+    assert stats['saved_seconds'] >= 0.5 * LATENCY
+
+
+def test_task_type_mismatch_and_local_env():
+    """A prefetch for another task type is discarded; local envs never prefetch"""
+    with EpisodeDriver(SlowClient()) as driver:
+        driver.next_episode('greeting_response')
+        result = driver.next_episode('meeting_joiner', prefetch_next=False)
+        assert result['task']['type'] == 'meeting_joiner'
+        assert driver.stats()['discarded'] == 1
+
+    assert not EpisodeDriver(LocalTeamsEnv(seed=0)).prefetch_enabled
+
+
+def test_discarded_prefetch_lands_first():
+    """A slow discarded prefetch cannot take over the client's default episode"""
+    client = SlowClient(latency={'greeting_response': 5 * LATENCY})
+    with EpisodeDriver(client) as driver:
+        driver.next_episode('meeting_joiner', next_task_type='greeting_response')
+        result = driver.next_episode('meeting_joiner', prefetch_next=False)
+        assert driver.stats()['discarded'] == 1
+
+    assert client.env.last_episode_id == result['episodeId']
+    assert client.env.get_state()['episodeId'] == result['episodeId']
+
+
+def test_agents_step_their_own_episode():
+    """With a reset in flight, agents keep stepping the episode they started"""
+    client = SlowClient()
+    agent = TaskAgent(client, prefetch_resets=True)
+    for i in range(3):
+        result = agent.run_episode('channel_explorer', verbose=False, prefetch_next=i < 2)
+        assert result['completed']
+    assert agent.episodes.stats()['prefetch_hits'] == 2
+    agent.episodes.close()
+
+    rl_agent = RLAgent(SlowClient(), learning_starts=10_000, seed=0)
+    stats = rl_agent.train(num_episodes=5, verbose=False)
+    assert stats['resets']['resets'] == 5 and stats['resets']['prefetch_hits'] == 4
+    assert len(rl_agent.client.env.get_history(limit=100)) == 5
+
+
+if __name__ == '__main__':
+    test_prefetch_hides_reset_latency()
+    test_task_type_mismatch_and_local_env()
+    test_discarded_prefetch_lands_first()
+    test_agents_step_their_own_episode()
+    print("✅ Episode driver tests passed")
@@ -0,0 +1,181 @@
+"""
+Episode Scope Tests
+
+Runs the real /env route handlers and Environment.resolveEpisodeId
+(backend/src/routes/envHandlers.js on models/environment.js, served by the
+conftest.py backend fixture). Two TeamsEnvClients share the server: calls
+without an explicit episode id act on each client's own episode, and a
+client notices when another one resets its episode id. Also checks the
+status of every scope error (409, 401, 404, and 400 with
+ENV_REQUIRE_EPISODE), the X-Session-Token header, and /env/stats without an
+episode. Skipped without node, except the LocalTeamsEnv check.
+
+Usage:
+    python -m pytest tests/test_episode_scope.py
+"""
+
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from conftest import requires_node  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+JOIN = {'type': 'join_call', 'payload': {}}
+
+
+@pytest.fixture
+def server(backend):
+    server = backend()
+    # Calls that name no episode fail instead of using the latest reset
+    server.node.call('configure', {'requireEpisode': True})
+    return server
+
+
+def get(server, path, headers=None, **params):
+    return requests.get(f'{server.url}/env/{path}', params=params, headers=headers)
+
+
+def post(server, path, body, headers=None):
+    return requests.post(f'{server.url}/env/{path}', json=body, headers=headers)
+
+
+@requires_node
+def test_clients_keep_their_own_episode(server):
+    """Interleaved clients never act on each other's episode"""
+    with TeamsEnvClient(server.url) as first, TeamsEnvClient(server.url) as second:
+        a = first.reset(task_type='meeting_joiner')
+        b = second.reset(task_type='greeting_response')
+        assert a['sessionToken'] != b['sessionToken']
+
+        # The server's "current" episode is b now; first still steps a
+        result = first.step(JOIN)
+        assert result['done'] and result['state']['episodeId'] == a['episodeId']
+        assert second.get_state()['episodeId'] == b['episodeId']
+        assert first.get_state()['stats']['callsJoined'] == 1
+        assert second.get_state()['stats']['stepCount'] == 0
+        assert first.get_actions()['channels']
+        assert set(second.get_state(fields=['stats'])) == {'episodeId', 'version',
+                                                           'stats', 'timestamp'}
+
+
+@requires_node
+def test_reset_by_another_client_is_detected(server):
+    """A stale session token is rejected instead of acting on the new run"""
+    with TeamsEnvClient(server.url) as first, TeamsEnvClient(server.url) as second:
+        first.reset(episode_id='shared', task_type='meeting_joiner')
+        second.reset(episode_id='shared', task_type='meeting_joiner')
+        with pytest.raises(requests.HTTPError) as error:
+            first.step(JOIN)
+        assert error.value.response.status_code == 409
+        assert second.step(JOIN)['done']
+
+
+@requires_node
+def test_scope_errors(server):
+    """Each way of naming the wrong episode gets its own status"""
+    old = post(server, 'reset', {'episodeId': 'shared', 'taskType': 'meeting_joiner'}).json()
+    new = post(server, 'reset', {'episodeId': 'shared', 'taskType': 'meeting_joiner'}).json()
+
+    # Token of a run that another session has reset since
+    response = post(server, 'step', {'episodeId': 'shared', 'sessionToken': old['sessionToken'],
+                                     'action': JOIN})
+    assert response.status_code == 409
+    assert 'reset by another session' in response.json()['error']
+    # Unknown token
+    assert get(server, 'state', sessionToken='nope').status_code == 401
+    assert get(server, 'state', sessionToken=old['sessionToken']).status_code == 401
+    # Valid token sent with an id that does not exist
+    response = get(server, 'state', episodeId='other', sessionToken=new['sessionToken'])
+    assert response.status_code == 404 and response.json()['error'] == 'Episode not found'
+    # ENV_REQUIRE_EPISODE and nothing names an episode
+    response = get(server, 'actions')
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Missing episodeId or session token'
+    assert post(server, 'step', {'action': JOIN}).status_code == 400
+
+
+@requires_node
+def test_session_token_header_and_optional_stats(server):
+    """X-Session-Token scopes a call; /stats answers stats: null without an episode"""
+    episode = post(server, 'reset', {'taskType': 'meeting_joiner'}).json()
+    token = {'X-Session-Token': episode['sessionToken']}
+
+    assert post(server, 'step', {'action': JOIN}, headers=token).json()['done']
+    state = get(server, 'state', headers=token).json()['state']
+    assert state['episodeId'] == episode['episodeId'] and state['stats']['callsJoined'] == 1
+    # The :episodeId path parameter is checked against the header's token
+    response = get(server, f"episodes/{episode['episodeId']}/state", headers={'X-Session-Token': 'nope'})
+    assert response.status_code == 409
+
+    stats = get(server, 'stats').json()
+    assert stats['success'] and stats['stats'] is None and 'store' in stats
+    assert get(server, 'stats', headers=token).json()['stats']['callsJoined'] == 1
+    assert get(server, 'stats', sessionToken='nope').status_code == 401
+
+    server.node.call('configure', {'requireEpisode': False})
+    assert get(server, 'stats').json()['stats']['callsJoined'] == 1
+
+
+@requires_node
+def test_compacted_episode_token(server):
+    """A compacted episode's token gets the same 410 as its id until the summary goes"""
+    server.node.call('configure', {'requireEpisode': True,
+                                   'store': {'maxEpisodes': 1, 'maxHistory': 2}})
+    first = post(server, 'reset', {'episodeId': 'first', 'taskType': 'meeting_joiner'}).json()
+    assert post(server, 'step', {'episodeId': 'first', 'action': JOIN}).json()['done']
+    post(server, 'reset', {'episodeId': 'second', 'taskType': 'meeting_joiner'})
+
+    # 'first' was compacted to make room for 'second'
+    assert get(server, 'info/first').json()['episode']['compacted']
+    by_id = get(server, 'state', episodeId='first')
+    by_token = get(server, 'state', sessionToken=first['sessionToken'])
+    assert by_id.status_code == by_token.status_code == 410
+    assert by_id.json()['error'] == by_token.json()['error']
+    assert post(server, 'step', {'action': JOIN}, headers={
+        'X-Session-Token': first['sessionToken']}).status_code == 410
+
+    # Once its summary leaves the history the token is forgotten
+    post(server, 'step', {'episodeId': 'second', 'action': JOIN})
+    post(server, 'reset', {'episodeId': 'third', 'taskType': 'meeting_joiner'})
+    post(server, 'step', {'episodeId': 'third', 'action': JOIN})
+    assert get(server, 'info/first').status_code == 404
+    assert get(server, 'state', sessionToken=first['sessionToken']).status_code == 401
+
+
+@requires_node
+def test_reset_of_compacted_episode_drops_its_token(server):
+    """The token of a compacted run does not scope the next run of the same id"""
+    server.node.call('configure', {'requireEpisode': True, 'store': {'maxEpisodes': 1}})
+    old = post(server, 'reset', {'episodeId': 'shared', 'taskType': 'meeting_joiner'}).json()
+    post(server, 'step', {'episodeId': 'shared', 'action': JOIN})
+    post(server, 'reset', {'taskType': 'meeting_joiner'})
+    assert get(server, 'state', sessionToken=old['sessionToken']).status_code == 410
+
+    new = post(server, 'reset', {'episodeId': 'shared', 'taskType': 'meeting_joiner'}).json()
+    assert get(server, 'state', sessionToken=old['sessionToken']).status_code == 401
+    response = get(server, 'state', episodeId='shared', sessionToken=old['sessionToken'])
+    assert response.status_code == 409
+    assert get(server, 'state', sessionToken=new['sessionToken']).json()['state']['episodeId'] == 'shared'
+    # Only the new run's token is left (the unnamed episode was evicted live)
+    assert server.node.call('episodes')['sessions'] == 1
+
+
+def test_local_env_is_episode_scoped():
+    """LocalTeamsEnv issues tokens and lists channels per episode"""
+    env = LocalTeamsEnv(seed=0)
+    first = env.reset(task_type='meeting_joiner')
+    env.reset(task_type='greeting_response')
+    assert len(first['sessionToken']) == 32
+    assert env.get_state(episode_id=first['episodeId'])['episodeId'] == first['episodeId']
+    assert len(env.get_actions(episode_id=first['episodeId'])['channels']) == 5
+
+
+if __name__ == '__main__':
+    test_local_env_is_episode_scoped()
+    print("✅ Episode scope tests passed (run with pytest for the server fixtures)")
@@ -0,0 +1,263 @@
+"""
+Episode Store Tests
+
+Checks the bounded episode store: TTL and LRU eviction, the live-episode and
+memory caps, compaction of finished episodes to their summary, and the
+counters returned by get_stats(include_store=True). The same scenarios run
+against backend/src/models/episodeStore.js and environment.js in a node
+subprocess (skipped without node) and against the Python port in local_env.
+Runs without a backend.
+
+Usage:
+    python -m pytest tests/test_episode_store.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from local_env import EpisodeStore, LocalTeamsEnv  # noqa: E402
+
+JOIN = {'type': 'join_call', 'payload': {}}
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+MEMORY_PRESSURE_BYTES = 12500
+
+requires_node = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+# Runs the backend store scenarios and prints what the tests assert on
+NODE_SCENARIOS = """
+const { EpisodeStore } = await import(process.argv[1]);
+const { default: Environment } = await import(process.argv[2]);
+const out = {};
+let now = 0;
+const clock = () => now;
+const episode = (id) => ({ id, messages: { "channel-1": [{}] }, actionHistory: [] });
+const evictions = (store) => store.stats().evictions;
+
+// Capacity: finished episodes go first, then the least recently used live one
+let store = new EpisodeStore({ maxEpisodes: 3, now: clock });
+for (const id of "abc") store.set(id, episode(id));
+store.finish("b", { id: "b" });
+store.set("d", episode("d"));
+out.capacity = { afterFinished: [...store.live.keys()], finished: [...store.finished.keys()] };
+store.touch("a");
+store.set("e", episode("e"));
+Object.assign(out.capacity, {
+  live: [...store.live.keys()], evictions: evictions(store), summary: store.getSummary("b"),
+});
+
+// TTL and memory caps
+store = new EpisodeStore({ finishedTtlMs: 100, idleTtlMs: 1000, now: clock });
+store.set("a", episode("a"));
+store.set("b", episode("b"));
+store.finish("a", { id: "a" });
+now = 150;
+store.set("c", episode("c"));
+out.ttl = { afterFinishedTtl: [...store.live.keys(), ...store.finished.keys()] };
+now = 1100;
+store.touch("c");
+store.set("d", episode("d"));
+Object.assign(out.ttl, { live: [...store.live.keys()], evictions: evictions(store) });
+const small = new EpisodeStore({ maxBytes: 10000 });
+for (const id of "xyz") small.set(id, episode(id));
+out.memory = { size: small.size, bytes: small.bytes, evictions: evictions(small) };
+
+// Environment: compaction to summaries, 410 on compacted episodes
+let env = new Environment({ episodeStore: { maxEpisodes: 4, maxHistory: 5 } });
+const finished = [];
+for (let i = 0; i < 10; i++) {
+  const { episodeId } = env.reset({ taskType: "meeting_joiner" });
+  env.step({ type: "join_call", payload: {} }, episodeId);
+  finished.push(episodeId);
+}
+let compactedError = null;
+try {
+  env.getState(finished[5]);
+} catch (error) {
+  compactedError = { status: error.status, message: error.message };
+}
+out.environment = {
+  finished,
+  store: env.getStoreStats(),
+  history: env.getHistory(10).map((entry) => entry.id),
+  held: env.getEpisodeInfo(finished[6]),
+  compacted: env.getEpisodeInfo(finished[5]),
+  gone: env.getEpisodeInfo(finished[0]),
+  compactedError,
+};
+
+// Terminal step while the store is over its memory cap
+env = new Environment({ episodeStore: { maxBytes: Number(process.argv[3]) } });
+const { episodeId } = env.reset({ taskType: "active_participant" });
+env.reset({ taskType: "active_participant" });
+out.pressure = [];
+for (let i = 0; i < 5; i++) {
+  const result = env.step({ type: "send_message", payload: { content: `Update ${i}` } }, episodeId);
+  out.pressure.push({ reward: result.reward, done: result.done, stepCount: result.state.stats.stepCount });
+}
+out.pressure.push(env.getStoreStats());
+
+process.stdout.write(JSON.stringify(out));
+"""
+
+
+@pytest.fixture(scope='module')
+def node_results():
+    """Outcome of NODE_SCENARIOS against the backend's own modules."""
+    models = BACKEND / 'src' / 'models'
+    completed = subprocess.run(
+        ['node', '--input-type=module', '-e', NODE_SCENARIOS,
+         (models / 'episodeStore.js').as_uri(), (models / 'environment.js').as_uri(),
+         str(MEMORY_PRESSURE_BYTES)],
+        cwd=BACKEND, capture_output=True, text=True, encoding='utf-8', timeout=60, check=True)
+    return json.loads(completed.stdout)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def episode(episode_id):
+    return {'id': episode_id, 'messages': {'channel-1': [{}]}, 'actionHistory': []}
+
+
+def test_capacity_evicts_finished_before_live():
+    """Over the cap, finished episodes go first, then the least recently used live one"""
+    clock = FakeClock()
+    store = EpisodeStore(max_episodes=3, clock=clock)
+    for episode_id in 'abc':
+        store.set(episode_id, episode(episode_id))
+    store.finish('b', {'id': 'b'})
+
+    store.set('d', episode('d'))
+    assert list(store.live) == ['a', 'c', 'd'] and not store.finished
+    store.touch('a')
+    store.set('e', episode('e'))
+    assert list(store.live) == ['d', 'a', 'e']
+    assert store.stats()['evictions'] == {'total': 2, 'finished': 1, 'active': 1,
+                                          'ttl': 0, 'capacity': 2, 'memory': 0}
+    assert store.get_summary('b') == {'id': 'b'}
+
+
+def test_ttl_and_memory_caps():
+    """Idle finished/live episodes expire, and the byte estimate is capped"""
+    clock = FakeClock()
+    store = EpisodeStore(finished_ttl_ms=100, idle_ttl_ms=1000, clock=clock)
+    store.set('a', episode('a'))
+    store.set('b', episode('b'))
+    store.finish('a', {'id': 'a'})
+    clock.now = 150
+    store.set('c', episode('c'))
+    assert 'a' not in store and 'b' in store
+    clock.now = 1100
+    store.touch('c')
+    store.set('d', episode('d'))
+    assert list(store.live) == ['c', 'd'] and store.stats()['evictions']['ttl'] == 2
+
+    small = EpisodeStore(max_bytes=10000)
+    for episode_id in 'xyz':
+        small.set(episode_id, episode(episode_id))
+    assert len(small) == 2 and small.bytes <= 10000
+    assert small.stats()['evictions']['memory'] == 1
+
+
+def test_terminal_step_under_memory_pressure():
+    """The step that finishes an episode still returns its reward and state"""
+    env = LocalTeamsEnv(seed=0, episode_store={'max_bytes': MEMORY_PRESSURE_BYTES})
+    episode_id = env.reset(task_type='active_participant')['episodeId']
+    env.reset(task_type='active_participant')
+    for i in range(5):
+        result = env.step({'type': 'send_message', 'payload': {'content': f'Update {i}'}},
+                          episode_id)
+        assert result['state']['stats']['stepCount'] == i + 1
+    assert result['done'] and result['reward'] == pytest.approx(2.6)
+    assert env.env.get_store_stats()['evictions']['memory'] >= 1
+
+
+@requires_node
+def test_backend_store_capacity_and_ttl(node_results):
+    """episodeStore.js: LRU order, capacity, TTL and memory caps"""
+    capacity = node_results['capacity']
+    assert capacity['afterFinished'] == ['a', 'c', 'd'] and capacity['finished'] == []
+    assert capacity['live'] == ['d', 'a', 'e']
+    assert capacity['evictions'] == {'total': 2, 'finished': 1, 'active': 1,
+                                     'ttl': 0, 'capacity': 2, 'memory': 0}
+    assert capacity['summary'] == {'id': 'b'}
+
+    ttl = node_results['ttl']
+    assert ttl['afterFinishedTtl'] == ['b', 'c']
+    assert ttl['live'] == ['c', 'd'] and ttl['evictions']['ttl'] == 2
+
+    memory = node_results['memory']
+    assert memory['size'] == 2 and memory['bytes'] <= 10000
+    assert memory['evictions']['memory'] == 1
+
+
+@requires_node
+def test_backend_environment_compaction(node_results):
+    """environment.js: compacted episodes keep a summary and answer 410"""
+    result = node_results['environment']
+    finished = result['finished']
+    store = result['store']
+    assert store['liveEpisodes'] + store['finishedEpisodes'] <= 4
+    assert store['completedEpisodes'] == 10 and store['historySize'] == 5
+    assert store['evictions']['finished'] == 6
+    assert result['history'] == finished[-5:]
+
+    assert result['held']['taskName'] == 'Meeting Joiner'
+    assert result['compacted']['compacted'] and result['compacted']['steps'] == 1
+    assert result['gone'] is None
+    assert result['compactedError']['status'] == 410
+
+
+@requires_node
+def test_backend_terminal_step_under_memory_pressure(node_results):
+    """environment.js: finishing an episode never evicts it before its final observation"""
+    *steps, store = node_results['pressure']
+    assert [step['stepCount'] for step in steps] == [1, 2, 3, 4, 5]
+    assert steps[-1]['done'] and steps[-1]['reward'] == pytest.approx(2.6)
+    assert store['evictions']['memory'] >= 1
+
+
+def test_environment_compacts_finished_episodes():
+    """Finished episodes shrink to their summary; history and counters stay bounded"""
+    env = LocalTeamsEnv(seed=0, episode_store={'max_episodes': 4, 'max_history': 5})
+    finished = []
+    for _ in range(10):
+        episode_id = env.reset(task_type='meeting_joiner')['episodeId']
+        assert env.step(JOIN, episode_id)['done']
+        finished.append(episode_id)
+
+    store = env.get_stats(include_store=True)['store']
+    assert store['liveEpisodes'] + store['finishedEpisodes'] <= 4
+    assert store['completedEpisodes'] == 10 and store['historySize'] == 5
+    assert store['evictions']['finished'] == 6
+    assert [entry['id'] for entry in env.get_history(limit=10)] == finished[-5:]
+
+    # Held in full: the last 4; summary only: the one before; gone: the rest
+    assert 'taskName' in env.get_episode_info(finished[-4])
+    info = env.get_episode_info(finished[-5])
+    assert info['compacted'] and info['completed'] and info['steps'] == 1
+    with pytest.raises(LookupError, match='compacted'):
+        env.get_state(episode_id=finished[-5])
+    with pytest.raises(LookupError):
+        env.get_episode_info(finished[0])
+
+
+if __name__ == '__main__':
+    test_capacity_evicts_finished_before_live()
+    test_ttl_and_memory_caps()
+    test_environment_compacts_finished_episodes()
+    test_terminal_step_under_memory_pressure()
+    print("✅ Episode store tests passed")
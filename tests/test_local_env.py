@@ -0,0 +1,207 @@
+"""
+Parity Tests for the In-Process Environment
+
+Replays trajectories recorded from the Node backend
+(tests/fixtures/env_trajectories.json, see record_env_trajectories.py)
+against LocalTeamsEnv and checks rewards, termination, info and the full
+normalized observation match at every step. Runs without a backend.
+
+Usage:
+    python -m pytest tests/test_local_env.py
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+sys.path.append(os.path.dirname(__file__))
+
+from local_env import EpisodeScopeError, LocalEnvironment, LocalTeamsEnv  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+from record_env_trajectories import FIXTURE_PATH, normalize_state, resolve_action  # noqa: E402
+
+
+def load_trajectories():
+    with open(FIXTURE_PATH, encoding='utf-8') as f:
+        return json.load(f)['trajectories']
+
+
+def replay(trajectory):
+    """Replay one recorded trajectory locally, asserting parity at every step."""
+    env = LocalTeamsEnv(seed=0)
+    reset_result = env.reset(task_type=trajectory['taskType'])
+    name = trajectory['name']
+
+    assert reset_result['task'] == trajectory['task'], name
+    assert normalize_state(reset_result['state']) == trajectory['reset'], name
+
+    state = reset_result['state']
+    for index, expected in enumerate(trajectory['steps']):
+        where = f"{name} step {index + 1}"
+        action = resolve_action(expected['action'], state)
+        result = env.step(action, reset_result['episodeId'])
+
+        assert abs(result['reward'] - expected['reward']) < 1e-9, where
+        assert result['done'] == expected['done'], where
+        assert result['info'] == expected['info'], where
+        assert normalize_state(result['state']) == expected['state'], where
+        state = result['state']
+
+
+def test_recorded_trajectories_match():
+    """Every recorded server trajectory is reproduced exactly"""
+    trajectories = load_trajectories()
+    assert len(trajectories) >= 5
+    for trajectory in trajectories:
+        replay(trajectory)
+
+
+def test_all_tasks_covered():
+    """Fixtures cover all five task types"""
+    task_types = {t['taskType'] for t in load_trajectories()}
+    assert task_types == set(LocalTeamsEnv().get_tasks())
+
+
+def test_drop_in_for_task_agent():
+    """TaskAgent.run_episode works unchanged with LocalTeamsEnv as its client"""
+    agent = TaskAgent(LocalTeamsEnv(seed=1))
+    for task_type in agent.client.get_tasks():
+        result = agent.run_episode(task_type=task_type, verbose=False)
+        assert result['completed'], task_type
+
+    history = agent.client.get_history(limit=10)
+    assert len(history) == 5
+    info = agent.client.get_episode_info(history[-1]['id'])
+    assert info['done'] is True
+
+
+def test_episodes_are_isolated():
+    """Stepping one episode by id does not touch another one"""
+    env = LocalTeamsEnv(seed=2)
+    first = env.reset(task_type='active_participant')['episodeId']
+    second = env.reset(task_type='active_participant')['episodeId']
+
+    env.step({'type': 'send_message', 'payload': {'content': 'one'}}, first)
+    assert env.get_stats(first)['messagesSent'] == 1
+    assert env.get_stats(second)['messagesSent'] == 0
+
+
+def test_indexes_follow_long_histories():
+    """Channel and message lookups use the episode indexes, not a history scan"""
+    env = LocalTeamsEnv(seed=4)
+    episode_id = env.reset(task_type='social_butterfly')['episodeId']
+    episode = env.env.episodes.get(episode_id)
+    for i in range(5000):
+        env.env.add_message_to_episode(episode, f'channel-{i % 5 + 1}', 'user-1', f'm{i}')
+    assert len(episode['messagesById']) == sum(map(len, episode['messages'].values()))
+    assert episode['teams'][1]['channels'][1]['unread'] == 1000
+
+    last = episode['messages']['channel-5'][-1]['id']
+    react = env.step({'type': 'react_to_message',
+                      'payload': {'messageId': last, 'reaction': 'x'}}, episode_id)
+    assert react['reward'] == 0.05
+    switch = env.step({'type': 'switch_channel', 'payload': {'channelId': 'channel-5'}}, episode_id)
+    assert switch['state']['agentState']['currentTeamId'] == 'team-2'
+    assert switch['state']['currentChannel'] == {'id': 'channel-5', 'name': 'Design',
+                                                 'teamId': 'team-2', 'unread': 0}
+    # Ids that are not strings are not found, as in the backend
+    assert env.step({'type': 'react_to_message',
+                     'payload': {'messageId': [last], 'reaction': 'x'}}, episode_id)['reward'] == -0.2
+    assert env.step({'type': 'switch_channel',
+                     'payload': {'channelId': ['channel-1']}}, episode_id)['reward'] == -0.3
+
+
+def test_state_field_selection():
+    """get_state(fields=...) builds only the selected sections; get_stats skips the rest"""
+    env = LocalTeamsEnv(seed=5)
+    episode_id = env.reset(task_type='meeting_joiner')['episodeId']
+    full = env.get_state(episode_id=episode_id)
+
+    state = env.get_state(episode_id=episode_id, fields=['stats', 'agentState'])
+    assert list(state) == ['episodeId', 'version', 'agentState', 'stats', 'timestamp']
+    assert state['stats'] == full['stats'] and state['agentState'] == full['agentState']
+    with pytest.raises(ValueError, match='bogus'):
+        env.get_state(episode_id=episode_id, fields=['stats', 'bogus'])
+
+    stats = env.get_stats(episode_id)
+    stats['stepCount'] = 99
+    assert env.get_stats(episode_id) == full['stats']
+
+
+def test_session_tokens_are_checked():
+    """Scope errors carry the backend's statuses: 409, 401, 404 and 400"""
+    shared = LocalEnvironment(seed=0)
+    first, second = LocalTeamsEnv(environment=shared), LocalTeamsEnv(environment=shared)
+    old = first.reset(episode_id='shared', task_type='meeting_joiner')
+    new = second.reset(episode_id='shared', task_type='meeting_joiner')
+    join = {'type': 'join_call', 'payload': {}}
+
+    with pytest.raises(EpisodeScopeError) as error:
+        first.step(join)
+    assert error.value.status == 409
+    assert second.step(join)['done']
+
+    for scope, status in [({'session_token': old['sessionToken']}, 401),
+                          ({'session_token': 'nope'}, 401),
+                          ({'episode_id': 'other', 'session_token': new['sessionToken']}, 404)]:
+        with pytest.raises(EpisodeScopeError) as error:
+            shared.resolve_episode_id(**scope)
+        assert error.value.status == status
+
+    shared.require_episode = True
+    with pytest.raises(EpisodeScopeError) as error:
+        shared.resolve_episode_id()
+    assert error.value.status == 400
+    assert shared.resolve_episode_id(optional=True) is None
+    assert second.get_state()['episodeId'] == 'shared'
+
+
+def test_compacted_episode_keeps_its_token():
+    """By token or by id, a compacted episode is reported as compacted"""
+    env = LocalTeamsEnv(seed=0, episode_store={'max_episodes': 1, 'max_history': 1})
+    first = env.reset(episode_id='first', task_type='meeting_joiner')
+    env.step({'type': 'join_call', 'payload': {}})
+    env.reset(episode_id='second', task_type='meeting_joiner')
+
+    assert env.env.resolve_episode_id(session_token=first['sessionToken']) == 'first'
+    with pytest.raises(LookupError, match='compacted'):
+        env.get_state(episode_id='first')
+
+    env.step({'type': 'join_call', 'payload': {}})   # its summary pushes out 'first'
+    with pytest.raises(EpisodeScopeError) as error:
+        env.env.resolve_episode_id(session_token=first['sessionToken'])
+    assert error.value.status == 401
+
+
+def test_local_throughput():
+    """Local stepping is fast enough for tight training loops"""
+    env = LocalTeamsEnv(seed=3)
+    action = {'type': 'switch_channel', 'payload': {'channelId': 'channel-2'}}
+    steps = 0
+    start = time.perf_counter()
+    while steps < 2000:
+        episode_id = env.reset(task_type='active_participant')['episodeId']
+        done = False
+        while not done:
+            done = env.step(action, episode_id)['done']
+            steps += 1
+    rate = steps / (time.perf_counter() - start)
+    # About 46k steps/s measured; the floor leaves room for slow CI machines
+    assert rate > 10000, f"{rate:.0f} steps/s"
+
+
+if __name__ == '__main__':
+    test_recorded_trajectories_match()
+    test_all_tasks_covered()
+    test_drop_in_for_task_agent()
+    test_episodes_are_isolated()
+    test_indexes_follow_long_histories()
+    test_state_field_selection()
+    test_session_tokens_are_checked()
+    test_compacted_episode_keeps_its_token()
+    test_local_throughput()
+    print("✅ LocalTeamsEnv matches recorded server trajectories")
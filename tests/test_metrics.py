@@ -0,0 +1,79 @@
+"""
+Client Metrics Tests
+
+Checks ClientMetrics aggregation, hooks and exports without a backend.
+
+Usage:
+    python -m pytest tests/test_metrics.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from metrics import ClientMetrics, endpoint_name, parse_server_timing  # noqa: E402
+
+
+def test_percentiles_and_counters():
+    """Latency percentiles, bytes and errors are aggregated per endpoint"""
+    metrics = ClientMetrics()
+    for ms in range(1, 101):
+        metrics.record('POST /step', ms / 1000, bytes_out=10, bytes_in=100,
+                       decode_time=0.0001, server_time=0.0005)
+    metrics.record('GET /tasks', 0.002, error='HTTP 500')
+
+    step = metrics.summary()['endpoints']['POST /step']
+    assert step['count'] == 100 and step['errors'] == 0
+    assert round(step['p50_ms']) == 50 and round(step['p99_ms']) == 99
+    assert step['bytes_out'] == 1000 and step['bytes_in'] == 10000
+    assert abs(step['server_ms'] - 0.5) < 1e-9
+    assert metrics.summary()['endpoints']['GET /tasks']['errors'] == 1
+
+
+def test_hooks_and_exports():
+    """Hooks see every request; JSON and Prometheus dumps are well-formed"""
+    metrics = ClientMetrics()
+    events = []
+    metrics.add_hook(events.append)
+    metrics.record('POST /reset', 0.003, status=200)
+    metrics.record('POST /reset', 0.2, status=200)
+    assert [e['latency'] for e in events] == [0.003, 0.2]
+
+    assert json.loads(metrics.to_json())['endpoints']['POST /reset']['count'] == 2
+
+    text = metrics.to_prometheus()
+    assert '# TYPE teams_env_client_request_seconds histogram' in text
+    assert 'teams_env_client_request_seconds_bucket{endpoint="POST /reset",le="0.005"} 1' in text
+    assert 'teams_env_client_request_seconds_bucket{endpoint="POST /reset",le="+Inf"} 2' in text
+    assert 'teams_env_client_request_seconds_count{endpoint="POST /reset"} 2' in text
+
+
+def test_cache_counters():
+    """Cache lookups are counted per endpoint without adding request samples"""
+    metrics = ClientMetrics()
+    events = []
+    metrics.add_hook(events.append)
+    for hit in (False, True, True):
+        metrics.record_cache('GET /tasks', hit)
+
+    tasks = metrics.summary()['endpoints']['GET /tasks']
+    assert (tasks['cache_hits'], tasks['cache_misses'], tasks['count']) == (2, 1, 0)
+    assert events == []
+    assert 'teams_env_client_cache_hits_total{endpoint="GET /tasks"} 2' in metrics.to_prometheus()
+
+
+def test_labels_and_server_timing():
+    """Episode ids are collapsed in labels; Server-Timing durations are parsed"""
+    assert endpoint_name('GET', '/info/abc-123') == 'GET /info/:episodeId'
+    assert endpoint_name('POST', '/step') == 'POST /step'
+    assert parse_server_timing('app;dur=1.5') == 0.0015
+    assert parse_server_timing(None) is None
+
+
+if __name__ == '__main__':
+    test_percentiles_and_counters()
+    test_hooks_and_exports()
+    test_labels_and_server_timing()
+    print("✅ Client metrics tests passed")
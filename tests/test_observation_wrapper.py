@@ -0,0 +1,117 @@
+"""
+Observation Wrapper Tests
+
+Checks that ObservationWrapper's lazily built lookups (channel ids and
+index, mention flag, messages by user) describe the current observation after
+update() and after rebuilding a state with apply_delta(), and that indexes of
+sections that did not change are kept. No backend needed.
+
+Usage:
+    python -m pytest tests/test_observation_wrapper.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import ObservationWrapper  # noqa: E402
+
+
+def message(message_id, user_id, content='Hi'):
+    return {'id': message_id, 'userId': user_id, 'content': content}
+
+
+def team(name, *channel_ids):
+    return {'name': name, 'channels': [{'id': cid, 'name': cid.title()} for cid in channel_ids]}
+
+
+def make_state(messages, teams, version=0):
+    return {
+        'episodeId': 'ep-1',
+        'version': version,
+        'agentState': {'userId': 'agent', 'currentChannelId': teams[0]['channels'][0]['id']},
+        'currentChannel': teams[0]['channels'][0],
+        'recentMessages': messages,
+        'teams': teams,
+        'users': [],
+        'stats': {'stepCount': version},
+    }
+
+
+def test_update_rebuilds_indexes():
+    """Every lookup answers for the new state after update()"""
+    obs = ObservationWrapper(make_state([message('m1', 'alice'), message('m2', 'bob')],
+                                        [team('Core', 'general', 'random')]))
+    assert [m['id'] for m in obs.get_messages_by_user('alice')] == ['m1']
+    assert obs.get_channel('random')['name'] == 'Random'
+    assert obs.get_all_channel_ids() == ['general', 'random']
+    assert not obs.has_unread_mentions()
+
+    obs.update(make_state([message('m3', 'bob'), message('m4', 'alice', 'Ping @agent')],
+                          [team('Core', 'general'), team('Ops', 'incidents')], version=1))
+    assert [m['id'] for m in obs.get_messages_by_user('alice')] == ['m4']
+    assert [m['id'] for m in obs.get_messages_by_user('bob')] == ['m3']
+    assert obs.get_channel('random') is None
+    assert obs.get_channel('incidents')['name'] == 'Incidents'
+    assert obs.get_all_channel_ids() == ['general', 'incidents']
+    assert obs.has_unread_mentions()
+    assert obs.episode_stats == {'stepCount': 1}
+
+
+def test_unchanged_sections_keep_their_indexes():
+    """Sections that are the same objects are not indexed again"""
+    teams = [team('Core', 'general', 'random')]
+    messages = [message('m1', 'alice')]
+    obs = ObservationWrapper(make_state(messages, teams))
+    channel_ids = obs.get_all_channel_ids()
+    obs.get_channel('general')
+    obs.get_messages_by_user('alice')
+    channel_index, by_user = obs._channel_index, obs._messages_by_user
+
+    obs.update(make_state(messages, teams, version=1))
+    assert obs.get_all_channel_ids() is channel_ids
+    assert obs._channel_index is channel_index and obs._messages_by_user is by_user
+
+    obs.update(make_state(messages + [message('m2', 'alice')], teams, version=2))
+    assert obs.get_all_channel_ids() is channel_ids
+    assert obs._messages_by_user is None
+    assert [m['id'] for m in obs.get_messages_by_user('alice')] == ['m1', 'm2']
+
+
+def test_apply_delta_then_update():
+    """A state rebuilt from a delta is indexed like a full one"""
+    teams = [team('Core', 'general', 'random')]
+    base = make_state([message(f'm{i}', 'alice') for i in range(9)], teams)
+    obs = ObservationWrapper(base)
+    assert len(obs.get_messages_by_user('alice')) == 9
+    assert obs.get_messages_by_user('bob') == []
+    channel_ids = obs.get_all_channel_ids()
+
+    state = ObservationWrapper.apply_delta(base, {
+        'episodeId': 'ep-1', 'version': 1, 'timestamp': 1,
+        'appendedMessages': [message('m9', 'bob'), message('m10', 'bob', '@agent look')],
+        'changed': {'stats': {'stepCount': 1}},
+    })
+    assert len(base['recentMessages']) == 9
+    obs.update(state)
+    assert [m['id'] for m in obs.get_messages_by_user('bob')] == ['m9', 'm10']
+    assert [m['id'] for m in obs.get_messages_by_user('alice')] == [f'm{i}' for i in range(1, 9)]
+    assert obs.has_unread_mentions()
+    assert obs.get_all_channel_ids() is channel_ids
+
+    state = ObservationWrapper.apply_delta(state, {
+        'episodeId': 'ep-1', 'version': 2, 'timestamp': 2,
+        'changed': {'teams': [team('Core', 'general', 'random', 'design')]},
+    })
+    obs.update(state)
+    assert obs.get_all_channel_ids() == ['general', 'random', 'design']
+    assert obs.get_channel('design')['name'] == 'Design'
+    assert [m['id'] for m in obs.get_messages_by_user('bob')] == ['m9', 'm10']
+
+
+if __name__ == '__main__':
+    test_update_rebuilds_indexes()
+    test_unchanged_sections_keep_their_indexes()
+    test_apply_delta_then_update()
+    print("✅ All ObservationWrapper tests passed!")
@@ -0,0 +1,103 @@
+"""
+Replay Buffer Tests
+
+Checks ring-buffer insertion, uniform and prioritized sampling and the
+memory-mapped storage mode without a backend.
+
+Usage:
+    python -m pytest tests/test_replay_buffer.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree  # noqa: E402
+
+
+def fill(buffer, count, obs_dim=3):
+    for i in range(count):
+        obs = np.full(obs_dim, i, dtype=np.float32)
+        buffer.add(obs, i % 4, float(i), obs + 1, i % 10 == 9)
+
+
+def test_ring_buffer_wraps():
+    """Oldest transitions are overwritten once capacity is reached"""
+    buffer = ReplayBuffer(capacity=5, obs_dim=3, seed=0)
+    fill(buffer, 7)
+    assert len(buffer) == 5 and buffer.position == 2
+    assert buffer.rewards.tolist() == [5.0, 6.0, 2.0, 3.0, 4.0]
+
+    indices = buffer.add_batch(np.zeros((4, 3)), np.arange(4), np.full(4, -1.0),
+                               np.ones((4, 3)), np.ones(4, dtype=bool))
+    assert indices.tolist() == [2, 3, 4, 0]
+    assert buffer.rewards.tolist() == [-1.0, 6.0, -1.0, -1.0, -1.0]
+
+    batch = buffer.sample(64)
+    assert batch['obs'].shape == (64, 3) and batch['obs'].dtype == np.float32
+    assert np.array_equal(batch['rewards'], buffer.rewards[batch['indices']])
+
+
+def test_extra_columns():
+    """Extra per-transition columns are stored and sampled with the rest"""
+    buffer = ReplayBuffer(capacity=4, obs_dim=2, seed=0,
+                          extra_columns={'next_masks': ((3,), np.bool_)})
+    buffer.add(np.zeros(2), 0, 0.0, np.zeros(2), False, next_masks=[True, False, True])
+    batch = buffer.sample(2)
+    assert batch['next_masks'].shape == (2, 3)
+    assert batch['next_masks'][0].tolist() == [True, False, True]
+
+
+def test_sum_tree_proportional():
+    """Leaves are found with probability proportional to their priority"""
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 3.0, 0.0, 4.0]))
+    assert tree.total == 8.0
+    tree.update_one(1, 2.0)
+    assert tree.total == 10.0
+
+    values = np.random.default_rng(0).random(100000) * tree.total
+    frequencies = np.bincount(tree.find(values), minlength=5) / len(values)
+    assert np.allclose(frequencies, [0.1, 0.2, 0.3, 0.0, 0.4], atol=0.01)
+
+
+def test_prioritized_sampling_and_updates():
+    """High-priority transitions dominate; weights are normalized to <= 1"""
+    buffer = PrioritizedReplayBuffer(capacity=100, obs_dim=3, alpha=1.0, seed=0)
+    fill(buffer, 100)
+    priorities = np.full(100, 0.01)
+    priorities[7] = 100.0
+    buffer.update_priorities(np.arange(100), priorities)
+
+    batch = buffer.sample(256, beta=1.0)
+    assert (batch['indices'] == 7).mean() > 0.9
+    assert batch['weights'].max() == 1.0
+    assert batch['weights'][batch['indices'] == 7].max() < 0.1
+
+    # New transitions enter at the maximum priority seen so far
+    index = buffer.add(np.zeros(3), 0, 0.0, np.zeros(3), False)
+    assert np.isclose(buffer.tree[index], buffer.max_priority)
+
+
+def test_memmap_storage():
+    """Columns can live in memory-mapped .npy files"""
+    with tempfile.TemporaryDirectory() as storage_dir:
+        buffer = ReplayBuffer(capacity=8, obs_dim=2, storage_dir=storage_dir)
+        fill(buffer, 3, obs_dim=2)
+        buffer.flush()
+        assert np.load(os.path.join(storage_dir, 'rewards.npy')).tolist()[:3] == [0.0, 1.0, 2.0]
+        assert isinstance(buffer.obs, np.memmap)
+        del buffer
+
+
+if __name__ == '__main__':
+    test_ring_buffer_wraps()
+    test_extra_columns()
+    test_sum_tree_proportional()
+    test_prioritized_sampling_and_updates()
+    test_memmap_storage()
+    print("✅ Replay buffer tests passed")
@@ -0,0 +1,149 @@
+"""
+Sharded Client Tests
+
+Runs two in-process HTTP servers, each a LocalTeamsEnv standing in for one
+cluster worker, and checks that ShardedTeamsEnvClient routes every episode to
+the shard its id hashes to and balances resets by load.
+
+Usage:
+    python -m pytest tests/test_sharded_client.py
+"""
+
+import os
+import sys
+import zlib
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from local_env import LocalTeamsEnv  # noqa: E402
+from sharded_client import ShardedTeamsEnvClient, shard_episode_id, shard_for  # noqa: E402
+from vec_env import VecTeamsEnv  # noqa: E402
+
+ACTION = {'type': 'join_call', 'payload': {}}
+NUM_SHARDS = 2
+
+
+def shard_routes(index, ports):
+    env = LocalTeamsEnv(seed=index)
+
+    def owned(episode_id):
+        # A worker only holds the episodes that hash to it
+        return episode_id and shard_for(episode_id, len(ports)) == index
+
+    def load(request):
+        store = env.env.get_store_stats()
+        return 200, {'success': True, 'activeEpisodes': store['liveEpisodes'],
+                     'episodes': store['liveEpisodes'] + store['finishedEpisodes'],
+                     'completedEpisodes': store['completedEpisodes'],
+                     'shard': {'index': index, 'count': len(ports), 'ports': ports}}
+
+    def state(request):
+        if not owned(request.query.get('episodeId')):
+            return 404, {'success': False, 'error': 'Episode not found'}
+        return 200, {'success': True, 'state': env.env.get_state(request.query['episodeId'])}
+
+    def history(request):
+        return 200, {'success': True, 'history': env.get_history(int(request.query.get('limit', 10)))}
+
+    def post(handler):
+        def route(request):
+            body = request.json()
+            items = body.get('items', [body])
+            if not all(owned(item.get('episodeId')) for item in items):
+                return 404, {'success': False, 'error': 'Episode not found'}
+            return 200, handler(body, items)
+        return route
+
+    return {
+        'GET /env/load': load,
+        'GET /env/state': state,
+        'GET /env/history': history,
+        'POST /env/reset': post(lambda body, items: env.reset(body['episodeId'], body.get('taskType'))),
+        'POST /env/step': post(lambda body, items: env.step(body['action'], body['episodeId'])),
+        'POST /env/reset_batch': post(lambda body, items: {'success': True, 'results': env.reset_many(
+            task_types=[item.get('taskType') for item in items],
+            episode_ids=[item['episodeId'] for item in items])}),
+        'POST /env/step_batch': post(lambda body, items: {'success': True, 'results': env.step_many(
+            [item['action'] for item in items], [item['episodeId'] for item in items])}),
+    }
+
+
+@pytest.fixture
+def shard_urls(serve):
+    servers = [serve() for _ in range(NUM_SHARDS)]
+    ports = [server.server_address[1] for server in servers]
+    for index, server in enumerate(servers):
+        server.routes = shard_routes(index, ports)
+    return [server.url for server in servers]
+
+
+def test_shard_hash_matches_backend():
+    """Same crc32 routing as backend/src/cluster/sharding.js"""
+    assert [shard_for(key, 7) for key in ['abc', 'ep-1', '日本']] == [5, 5, 0]
+    assert zlib.crc32(b'abc') % 7 == 5
+    for shard in range(4):
+        assert shard_for(shard_episode_id(shard, 4), 4) == shard
+
+
+def test_discover_and_route(shard_urls):
+    """discover() finds both shards and step/get_state reach the owning one"""
+    with ShardedTeamsEnvClient.discover(shard_urls[1]) as client:
+        assert client.base_urls == shard_urls
+
+        result = client.reset(task_type='meeting_joiner')
+        episode_id = result['episodeId']
+        step = client.step(ACTION, episode_id)
+        assert step['done'] and step['reward'] > 0
+        assert client.get_state(episode_id=episode_id)['task']['type'] == 'meeting_joiner'
+        assert [entry['id'] for entry in client.get_history()] == [episode_id]
+
+
+def test_reset_balances_shards(shard_urls):
+    """New episodes fill the least-loaded shard and done episodes free it"""
+    with ShardedTeamsEnvClient(shard_urls, load_refresh=None) as client:
+        ids = [client.reset(task_type='greeting_response')['episodeId'] for _ in range(4)]
+        assert sorted(client.shard_for(episode_id) for episode_id in ids) == [0, 0, 1, 1]
+        assert client.load() == [2, 2]
+
+        client.step(ACTION, ids[0])
+        client.step({'type': 'send_message', 'payload': {'content': 'Hi there!'}}, ids[0])
+        freed = client.shard_for(ids[0])
+        assert client.load()[freed] == 1
+        assert client.shard_for(client.reset()['episodeId']) == freed
+
+        # Server-side counts replace the local estimate on refresh
+        assert client.refresh_loads() == [2, 2]
+
+
+def test_batches_keep_order(shard_urls):
+    """reset_many/step_many split by shard and return results in order"""
+    with ShardedTeamsEnvClient(shard_urls) as client:
+        task_types = ['meeting_joiner', 'greeting_response'] * 3
+        resets = client.reset_many(task_types=task_types)
+        ids = [result['episodeId'] for result in resets]
+        assert {client.shard_for(episode_id) for episode_id in ids} == {0, 1}
+        assert [result['task']['type'] for result in resets] == task_types
+
+        steps = client.step_many([ACTION] * len(ids), ids)
+        assert [step['done'] for step in steps] == [True, False] * 3
+        assert client.get_load()['completedEpisodes'] == 3
+
+
+def test_vec_env_sharded_backend(shard_urls):
+    """VecTeamsEnv drives episodes across shards"""
+    env = VecTeamsEnv(4, backend='sharded', base_url=shard_urls[0],
+                      task_type='meeting_joiner', batch_requests=True)
+    try:
+        env.reset()
+        _, rewards, dones, infos = env.step([ACTION] * 4)
+        assert dones.all() and (rewards > 0).all()
+        assert all(info['episode']['completed'] for info in infos)
+    finally:
+        env.close()
+
+
+if __name__ == '__main__':
+    test_shard_hash_matches_backend()
+    print("✅ Sharded client tests passed (run with pytest for the server fixtures)")
@@ -0,0 +1,251 @@
+"""
+Socket Session Client Tests
+
+Runs a python-socketio server (aiohttp, in a background thread) that mirrors
+the backend's /env namespace (backend/src/socket/envSession.js) on top of
+LocalTeamsEnv, and checks SocketTeamsEnvClient against it: the TeamsEnvClient
+surface including get_load, HTTPError with the route's status code on
+failures, responses matched to requests by id (also out of order), batches
+sent as one array frame, and pending requests failing on disconnect. The
+backend's own operation table (envSession.js) is run in a node subprocess
+with a stub Socket.IO server (skipped without node).
+
+Usage:
+    python -m pytest tests/test_socket_client.py
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+import pytest
+import requests
+
+socketio = pytest.importorskip('socketio')
+web = pytest.importorskip('aiohttp.web')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from local_env import LocalTeamsEnv  # noqa: E402
+from socket_client import SocketTeamsEnvClient  # noqa: E402
+
+JOIN = {'type': 'join_call', 'payload': {}}
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+
+# Feeds env:request messages from argv[2] through initEnvSession with a stub
+# io/socket and prints the env:response payloads
+NODE_SESSION = """
+const { initEnvSession } = await import(process.argv[1]);
+const handlers = {};
+const responses = [];
+const socket = {
+  on: (event, handler) => { handlers[event] = handler; },
+  emit: (event, payload) => responses.push(payload),
+};
+console.log = () => {};
+initEnvSession({ of: () => ({ on: (event, connect) => connect(socket) }) });
+for (const message of JSON.parse(process.argv[2])) handlers["env:request"](message);
+process.stdout.write(JSON.stringify(responses));
+"""
+
+
+class EnvSessionServer:
+    """The /env Socket.IO namespace, served from a LocalTeamsEnv."""
+
+    def __init__(self):
+        self.env = LocalTeamsEnv(seed=0)
+        self.frames = []           # every env:request message as received
+        self.sids = []
+        self.reverse_arrays = False
+        self.sio = socketio.AsyncServer(async_mode='aiohttp')
+        self.app = web.Application()
+        self.sio.attach(self.app)
+        self.sio.on('connect', self.on_connect, namespace='/env')
+        self.sio.on('env:request', self.on_request, namespace='/env')
+
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        threading.Thread(target=self._serve, args=(ready,), daemon=True).start()
+        ready.wait(10)
+        self.url = f'http://127.0.0.1:{self.port}'
+
+    def _serve(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.runner = web.AppRunner(self.app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def close(self):
+        self.run(self.sio.shutdown())
+        self.run(self.runner.cleanup())
+        self.run(self._cancel_tasks())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def _cancel_tasks(self):
+        # engine.io keeps per-socket ping tasks running until they are cancelled
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def on_connect(self, sid, environ, auth=None):
+        self.sids.append(sid)
+
+    async def on_request(self, sid, message):
+        self.frames.append(message)
+        if isinstance(message, list):
+            responses = [self.handle(item) for item in message]
+            if self.reverse_arrays:
+                responses.reverse()
+            await self.sio.emit('env:response', responses, to=sid, namespace='/env')
+            return
+        # 'delay' holds one response back so later requests are answered first
+        await asyncio.sleep(message.pop('delay', 0))
+        await self.sio.emit('env:response', self.handle(message), to=sid, namespace='/env')
+
+    def handle(self, message):
+        fields = dict(message)
+        request_id = fields.pop('id', None)
+        op = fields.pop('op', None)
+        env = self.env
+        operations = {
+            'reset': lambda: env.reset(fields.get('episodeId'), fields.get('taskType')),
+            'step': lambda: env.step(fields.get('action'), fields.get('episodeId')),
+            'state': lambda: {'state': env.get_state(episode_id=fields.get('episodeId'))},
+            'stats': lambda: {'stats': env.get_stats(fields.get('episodeId')),
+                              'store': env.env.get_store_stats()},
+            'info': lambda: {'episode': env.get_episode_info(fields['episodeId'])},
+            'history': lambda: {'history': env.get_history(int(fields.get('limit', 10)))},
+            'tasks': lambda: {'tasks': env.get_tasks()},
+            'load': lambda: {'activeEpisodes': len(env.env.episodes.live),
+                             'shard': {'index': 0, 'count': 1, 'ports': [self.port]}},
+        }
+        if op not in operations:
+            return {'id': request_id, 'success': False,
+                    'error': f'Unknown operation: {op}', 'status': 404}
+        try:
+            return {'id': request_id, **operations[op](), 'success': True}
+        except ValueError as error:
+            return {'id': request_id, 'success': False, 'error': str(error), 'status': 400}
+        except LookupError as error:
+            return {'id': request_id, 'success': False, 'error': str(error), 'status': 404}
+
+
+@pytest.fixture
+def server():
+    server = EnvSessionServer()
+    yield server
+    server.close()
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_backend_session_operations():
+    """envSession.js answers load, carries HTTP statuses and keeps array order"""
+    messages = [
+        {'id': 1, 'op': 'reset', 'episodeId': 'ep-1', 'taskType': 'meeting_joiner'},
+        {'id': 2, 'op': 'load'},
+        {'id': 3, 'op': 'info', 'episodeId': 'missing'},
+        {'id': 4, 'op': 'step', 'episodeId': 'ep-1', 'action': {}},
+        {'id': 5, 'op': 'bogus'},
+        [{'id': 6, 'op': 'step', 'episodeId': 'ep-1', 'action': JOIN},
+         {'id': 7, 'op': 'stats', 'episodeId': 'ep-1'}],
+    ]
+    completed = subprocess.run(
+        ['node', '--input-type=module', '-e', NODE_SESSION,
+         (BACKEND / 'src' / 'socket' / 'envSession.js').as_uri(), json.dumps(messages)],
+        cwd=BACKEND, capture_output=True, text=True, encoding='utf-8', timeout=60, check=True)
+    reset, load, info, step, bogus, batch = json.loads(completed.stdout)
+
+    assert reset['id'] == 1 and reset['success'] and reset['sessionToken']
+    assert load['success'] and load['activeEpisodes'] == 1 and load['shard']['count'] == 1
+    assert (info['status'], info['error']) == (404, 'Episode not found')
+    assert step['status'] == 400 and bogus['status'] == 404
+    assert [response['id'] for response in batch] == [6, 7]
+    assert batch[0]['done'] and batch[1]['stats']['callsJoined'] == 1
+
+
+def test_drop_in_surface(server):
+    """The TeamsEnvClient methods work over the socket, including get_load"""
+    with SocketTeamsEnvClient(server.url, cache_ttl=None) as client:
+        episode_id = client.reset(task_type='meeting_joiner')['episodeId']
+        assert client.get_state()['episodeId'] == episode_id
+        assert client.step(JOIN, episode_id)['done']
+        assert client.get_stats(episode_id)['callsJoined'] == 1
+        assert client.get_episode_info(episode_id)['done']
+        assert [entry['id'] for entry in client.get_history()] == [episode_id]
+        assert 'meeting_joiner' in client.get_tasks()
+        assert client.get_load()['shard']['count'] == 1
+
+
+def test_errors_are_http_errors(server):
+    """Failed responses raise requests.HTTPError with the route's status code"""
+    with SocketTeamsEnvClient(server.url) as client:
+        with pytest.raises(requests.HTTPError) as error:
+            client.get_episode_info('missing')
+        assert error.value.response.status_code == 404
+        assert error.value.response.json()['error'] == 'Episode not found'
+
+        client.reset(task_type='meeting_joiner')
+        with pytest.raises(requests.HTTPError) as error:
+            client.step({'payload': {}})
+        assert error.value.response.status_code == 400
+
+
+def test_responses_matched_by_request_id(server):
+    """Out-of-order responses reach the request that carries their id"""
+    with SocketTeamsEnvClient(server.url) as client:
+        episode_id = client.reset(task_type='meeting_joiner')['episodeId']
+        slow = client.submit('history', delay=0.3)
+        fast = client.submit('state', episodeId=episode_id)
+        assert fast.result(5)['state']['episodeId'] == episode_id
+        assert not slow.done()
+        assert slow.result(5)['history'] == []
+
+        server.reverse_arrays = True
+        ids = [result['episodeId'] for result in client.reset_many(
+            task_types=['meeting_joiner', 'greeting_response', 'channel_explorer'])]
+        states = client.step_many([JOIN] * 3, ids)
+        assert [state['state']['episodeId'] for state in states] == ids
+        assert [state['done'] for state in states] == [True, False, False]
+
+
+def test_batches_are_one_frame(server):
+    """reset_many/step_many send one array message instead of one per item"""
+    with SocketTeamsEnvClient(server.url) as client:
+        resets = client.reset_many(count=4, task_types='meeting_joiner')
+        client.step_many([JOIN] * 4, [result['episodeId'] for result in resets])
+        assert [len(frame) for frame in server.frames] == [4, 4]
+        assert all(isinstance(frame, list) for frame in server.frames)
+        assert client.connection_stats() == {'new_connections': 1,
+                                             'reused_connections': 7, 'requests': 8}
+
+
+def test_disconnect_fails_pending_requests(server):
+    """Requests in flight when the connection drops fail instead of hanging"""
+    client = SocketTeamsEnvClient(server.url)
+    try:
+        pending = client.submit('history', delay=5)
+        with pytest.raises(FutureTimeoutError):
+            pending.result(0.2)
+        server.run(server.sio.disconnect(server.sids[0], namespace='/env'))
+        with pytest.raises(ConnectionError):
+            pending.result(5)
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_socket_client.py")
@@ -0,0 +1,75 @@
+"""
+Text Feature Tests
+
+Checks the hashed n-gram featurizer, its per-message cache and the batched
+APIs without a backend.
+
+Usage:
+    python -m pytest tests/test_text_features.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from text_features import TextFeaturizer, tokenize  # noqa: E402
+
+
+def make_state(*contents):
+    return {'recentMessages': [
+        {'id': f'msg-{i}', 'userId': 'user-1', 'content': content}
+        for i, content in enumerate(contents)
+    ]}
+
+
+def test_hashing_is_stable_and_normalized():
+    """Same text -> same unit vector; mentions are distinct tokens"""
+    featurizer = TextFeaturizer(dim=64)
+    a = featurizer.featurize('Hey @agent, standup call now!')
+    b = TextFeaturizer(dim=64).featurize('hey @AGENT standup call now')
+    assert a.shape == (64,) and a.dtype == np.float32
+    assert np.array_equal(a, b)
+    assert abs(float(np.linalg.norm(a)) - 1.0) < 1e-6
+    assert not featurizer.featurize('').any()
+    assert tokenize('Hi @agent!') == ['hi', '@agent']
+
+
+def test_cache_hits_and_eviction():
+    """Messages are hashed once per id; the cache stays bounded"""
+    featurizer = TextFeaturizer(dim=32, cache_size=2)
+    state = make_state('hello', 'welcome aboard')
+    featurizer.encode_state(state)
+    featurizer.encode_state(state)
+    assert featurizer.cache_stats() == {'size': 2, 'capacity': 2, 'hits': 2, 'misses': 2}
+
+    featurizer.encode_state(make_state('hello', 'welcome aboard', 'a third message'))
+    assert featurizer.cache_stats()['size'] == 2
+    assert not featurizer.message_features({'id': 'msg-0', 'content': 'x'}).flags.writeable
+
+
+def test_batch_apis_match_single():
+    """encode_batch rows equal encode_state; encode_window right-aligns messages"""
+    featurizer = TextFeaturizer(dim=32, window=3)
+    states = [make_state(), make_state('hi'), make_state('a', 'b c', 'd', 'e f g')]
+
+    batch = featurizer.encode_batch(states)
+    assert batch.shape == (3, 32)
+    for row, state in zip(batch, states):
+        assert np.allclose(row, featurizer.encode_state(state))
+
+    window = featurizer.encode_window(states)
+    assert window.shape == (3, 3, 32)
+    assert not window[0].any()
+    assert not window[1, :2].any()
+    assert np.array_equal(window[1, 2], featurizer.featurize('hi'))
+    assert np.array_equal(window[2, 0], featurizer.featurize('b c'))
+
+
+if __name__ == '__main__':
+    test_hashing_is_stable_and_normalized()
+    test_cache_hits_and_eviction()
+    test_batch_apis_match_single()
+    print("✅ Text feature tests passed")
@@ -0,0 +1,76 @@
+"""
+Unix Domain Socket Client Tests
+
+Serves a LocalTeamsEnv over HTTP on a Unix domain socket (like the backend
+with SOCKET_PATH set) and checks that TeamsEnvClient and AsyncTeamsEnvClient
+work with a unix:// base URL.
+
+Usage:
+    python -m pytest tests/test_unix_socket.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from async_client import AsyncTeamsEnvClient  # noqa: E402
+from client import TeamsEnvClient, unix_socket_path  # noqa: E402
+from conftest import local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+ACTION = {'type': 'set_status', 'payload': {'status': 'busy'}}
+
+
+@pytest.fixture
+def server(serve):
+    return serve(local_env_routes(LocalTeamsEnv(seed=0)), unix_socket=True)
+
+
+def test_unix_socket_path():
+    """Only unix:// URLs name a socket"""
+    assert unix_socket_path('unix:///tmp/teams.sock') == '/tmp/teams.sock'
+    assert unix_socket_path('http://localhost:3001') is None
+    with pytest.raises(ValueError):
+        unix_socket_path('unix://')
+
+
+def test_client_over_unix_socket(server):
+    """reset/step go over the socket and reuse one keep-alive connection"""
+    with TeamsEnvClient(server.url) as client:
+        episode_id = client.reset(task_type='active_participant')['episodeId']
+        for _ in range(3):
+            result = client.step(ACTION, episode_id)
+        assert result['info']['action'] == 'status_changed'
+        assert client.connection_stats() == {'new_connections': 1, 'reused_connections': 3,
+                                             'requests': 4}
+
+
+def test_missing_socket_raises_connection_error():
+    """A socket path nobody listens on fails like a refused TCP connection"""
+    client = TeamsEnvClient('unix:///nonexistent/env.sock', max_retries=0)
+    with pytest.raises(requests.ConnectionError):
+        client.reset()
+
+
+def test_async_client_over_unix_socket(server):
+    """AsyncTeamsEnvClient uses an aiohttp UnixConnector for unix:// URLs"""
+    async def run():
+        client = AsyncTeamsEnvClient(server.url)
+        try:
+            episode_id = (await client.reset())['episodeId']
+            return await client.step(ACTION, episode_id)
+        finally:
+            await client.close()
+
+    assert asyncio.run(run())['info']['action'] == 'status_changed'
+
+
+if __name__ == '__main__':
+    test_unix_socket_path()
+    test_missing_socket_raises_connection_error()
+    print("✅ Unix socket tests passed (run with pytest for the server fixtures)")
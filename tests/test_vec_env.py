@@ -0,0 +1,163 @@
+"""
+Vectorized Environment Tests
+
+Exercises VecTeamsEnv on the in-process backend: stacked outputs,
+auto-reset of finished slots and per-slot task assignment. The 'http'
+backend's thread-pool fan-out runs against a stub server backed by
+LocalTeamsEnv.
+
+Usage:
+    python -m pytest tests/test_vec_env.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import TeamsEnvClient  # noqa: E402
+from conftest import local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+from task_agent import TaskAgent  # noqa: E402
+from vec_env import VecTeamsEnv  # noqa: E402
+
+
+def test_stacked_step_outputs():
+    """step() returns one reward/done per slot"""
+    env = VecTeamsEnv(4, task_type='active_participant', seed=0)
+    states = env.reset()
+    assert len(states) == 4
+    assert len(set(env.episode_ids)) == 4
+
+    actions = [{'type': 'send_message', 'payload': {'content': f'hi {i}'}} for i in range(4)]
+    states, rewards, dones, infos = env.step(actions)
+    assert rewards.shape == (4,) and rewards.dtype == np.float32
+    assert dones.shape == (4,) and dones.dtype == np.bool_
+    assert np.allclose(rewards, 0.1)
+    assert all(s['stats']['messagesSent'] == 1 for s in states)
+    env.close()
+
+
+def test_auto_reset_and_encoded_observations():
+    """Finished slots are reset in place and report their episode totals"""
+    encode = lambda s: [s['stats']['stepCount'], len(s['recentMessages'])]  # noqa: E731
+    env = VecTeamsEnv(2, task_type=['meeting_joiner', 'channel_explorer'],
+                      encode_fn=encode, seed=1)
+    obs = env.reset()
+    assert obs.shape == (2, 2) and obs.dtype == np.float32
+
+    old_ids = list(env.episode_ids)
+    actions = [{'type': 'join_call', 'payload': {}},
+               {'type': 'switch_channel', 'payload': {'channelId': 'channel-2'}}]
+    obs, rewards, dones, infos = env.step(actions)
+
+    assert dones.tolist() == [True, False]
+    assert infos[0]['episode']['completed'] is True
+    assert infos[0]['episode']['l'] == 1
+    assert infos[0]['terminal_observation']['stats']['callsJoined'] == 1
+    assert env.episode_ids[0] != old_ids[0]
+    assert env.episode_ids[1] == old_ids[1]
+    assert obs[0, 0] == 0 and obs[1, 0] == 1
+    env.close()
+
+
+def test_batched_requests_match_per_slot_requests():
+    """batch_requests=True routes through step_many/reset_many with the same results"""
+    actions = [{'type': 'set_status', 'payload': {'status': 'busy'}},
+               {'type': 'dance', 'payload': {}}]
+    outputs = []
+    for batched in (False, True):
+        env = VecTeamsEnv(2, task_type='active_participant', batch_requests=batched, seed=3)
+        env.reset()
+        _, rewards, dones, infos = env.step(actions)
+        outputs.append((rewards.tolist(), dones.tolist(), [i.get('action') for i in infos]))
+        env.close()
+    assert outputs[0] == outputs[1]
+
+
+def test_step_many_reports_item_errors():
+    """A bad item fails alone when raise_on_error is False"""
+    env = VecTeamsEnv(1, seed=4)
+    env.reset()
+    results = env.client.step_many(
+        [{'type': 'join_call', 'payload': {}}, {'type': 'join_call', 'payload': {}}],
+        [env.episode_ids[0], 'missing-episode'],
+        raise_on_error=False)
+    assert results[0]['success'] is True
+    assert results[1] == {'success': False, 'error': 'No active episode found'}
+    env.close()
+
+
+def test_task_agent_rollout():
+    """A policy can drive all slots for many steps"""
+    agent = TaskAgent()
+    env = VecTeamsEnv(8, seed=2)
+    states = env.reset()
+    completed = 0
+    for _ in range(50):
+        states, rewards, dones, infos = env.step([agent.select_action(s) for s in states])
+        completed += sum(1 for info in infos if info.get('episode', {}).get('completed'))
+    assert completed > 0
+    env.close()
+
+
+@pytest.mark.parametrize('delta_observations', [False, True])
+def test_http_backend_fans_out(serve, delta_observations):
+    """The 'http' backend sends the slots' requests concurrently over one client"""
+    lock = threading.Lock()
+    in_flight = {'now': 0, 'max': 0}
+
+    def serialized(handler):
+        # Requests overlap on the wire; the environment applies them one at a time
+        def route(request):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            time.sleep(0.01)
+            try:
+                with lock:
+                    return handler(request)
+            finally:
+                with lock:
+                    in_flight['now'] -= 1
+        return route
+
+    routes = local_env_routes(LocalTeamsEnv(seed=0))
+    server = serve({path: serialized(handler) for path, handler in routes.items()})
+    client = TeamsEnvClient(server.url, delta_observations=delta_observations)
+    env = VecTeamsEnv(4, backend='http', client=client,
+                      task_type=['meeting_joiner', 'greeting_response'] * 2)
+    try:
+        states = env.reset()
+        assert [state['episodeId'] for state in states] == env.episode_ids
+        assert len(set(env.episode_ids)) == 4
+        first_ids = list(env.episode_ids)
+
+        _, rewards, dones, infos = env.step([{'type': 'join_call', 'payload': {}}] * 4)
+        assert dones.tolist() == [True, False, True, False]
+        assert [info['episode']['episode_id'] for info in infos if 'episode' in info] == \
+            first_ids[0::2]
+        assert env.episode_ids[1::2] == first_ids[1::2]
+        assert all(state['episodeId'] == episode_id
+                   for state, episode_id in zip(env.states, env.episode_ids))
+        assert client.connection_stats()['requests'] == 10
+        if delta_observations:
+            assert sorted(client._delta_bases) == sorted(env.episode_ids)
+    finally:
+        env.close()
+    assert in_flight['max'] > 1
+    assert server.connections <= 4
+
+
+if __name__ == '__main__':
+    test_stacked_step_outputs()
+    test_auto_reset_and_encoded_observations()
+    test_batched_requests_match_per_slot_requests()
+    test_step_many_reports_item_errors()
+    test_task_agent_rollout()
+    print("✅ VecTeamsEnv tests passed")
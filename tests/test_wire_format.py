@@ -0,0 +1,159 @@
+"""
+Wire Format Tests
+
+Checks MessagePack content negotiation between TeamsEnvClient and the
+backend. An in-process HTTP server backed by LocalTeamsEnv follows the rules
+of backend/src/middleware/msgpackMiddleware.js (MessagePack bodies are
+decoded, responses are MessagePack when Accept prefers it), or answers JSON
+only, like a backend without the middleware. The middleware itself is run
+under express in a node subprocess when the backend's dependencies are
+installed (npm install in backend/).
+
+Usage:
+    python -m pytest tests/test_wire_format.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+import requests
+
+msgpack = pytest.importorskip('msgpack')
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'python_agent'))
+
+from client import MSGPACK_CONTENT_TYPE, TeamsEnvClient  # noqa: E402
+from conftest import BACKEND, local_env_routes  # noqa: E402
+from local_env import LocalTeamsEnv  # noqa: E402
+
+GREETING = {'type': 'send_message', 'payload': {'content': 'Héllo team 👋'}}
+
+# Mounts the middleware like routes/env.js and echoes what it parsed
+NODE_APP = """
+const { default: express } = await import("express");
+const { msgpackBodyParser, negotiateFormat } = await import(process.argv[1]);
+const router = express.Router();
+router.use(msgpackBodyParser);
+router.use(negotiateFormat);
+router.post("/echo", (req, res) =>
+  res.json({ success: true, received: req.body, contentType: req.get("content-type") ?? null })
+);
+router.get("/state", (req, res) =>
+  res.json({ success: true, state: { episodeId: req.query.episodeId ?? null, note: "Héllo 👋" } })
+);
+const app = express();
+app.use(express.json());
+app.use("/env", router);
+const server = app.listen(0, "127.0.0.1", () => console.log(server.address().port));
+"""
+
+
+@pytest.fixture
+def start_server(serve):
+    def start(supports_msgpack):
+        seen = []   # (method, path, Content-Type, Accept, body)
+
+        def negotiate(handler):
+            def route(request):
+                content_type = request.headers.get('Content-Type', '') if request.method == 'POST' else None
+                seen.append((request.method, request.path, content_type,
+                             request.headers.get('Accept'), request.body))
+                if content_type == MSGPACK_CONTENT_TYPE:
+                    # A server without the middleware leaves such bodies unparsed
+                    fields = msgpack.unpackb(request.body, raw=False) if supports_msgpack else {}
+                    request.body = json.dumps(fields).encode()
+                status, result = handler(request)
+                if supports_msgpack and request.headers.get('Accept', '').startswith(MSGPACK_CONTENT_TYPE):
+                    return status, msgpack.packb(result), MSGPACK_CONTENT_TYPE
+                return status, result
+            return route
+
+        routes = local_env_routes(LocalTeamsEnv(seed=0))
+        server = serve({path: negotiate(handler) for path, handler in routes.items()})
+        return server.url, seen
+
+    return start
+
+
+def test_msgpack_round_trip(start_server):
+    """Bodies go out and come back as MessagePack and decode to the same data"""
+    base_url, seen = start_server(supports_msgpack=True)
+    with TeamsEnvClient(base_url, wire_format='msgpack') as client:
+        episode_id = client.reset(task_type='greeting_response')['episodeId']
+        result = client.step(GREETING)
+        assert result['state']['recentMessages'][-1]['content'] == GREETING['payload']['content']
+        assert client.get_state()['episodeId'] == episode_id
+        assert client._msgpack_requests
+
+    posts = [request for request in seen if request[0] == 'POST']
+    assert [path for _, path, *_ in posts] == ['/env/reset', '/env/step']
+    assert all(content_type == MSGPACK_CONTENT_TYPE for _, _, content_type, _, _ in posts)
+    step_body = msgpack.unpackb(posts[1][4], raw=False)
+    assert step_body['action'] == GREETING and step_body['episodeId'] == episode_id
+    assert all(accept.startswith(MSGPACK_CONTENT_TYPE) for *_, accept, _ in seen)
+
+    response = requests.get(f'{base_url}/env/state', params={'episodeId': episode_id},
+                            headers={'Accept': MSGPACK_CONTENT_TYPE})
+    assert response.headers['Content-Type'] == MSGPACK_CONTENT_TYPE
+    assert msgpack.unpackb(response.content, raw=False)['state']['episodeId'] == episode_id
+
+
+def test_falls_back_to_json(start_server):
+    """A server that answers JSON switches the client's request bodies to JSON"""
+    base_url, seen = start_server(supports_msgpack=False)
+    with TeamsEnvClient(base_url, wire_format='msgpack') as client:
+        episode_id = client.reset()['episodeId']
+        assert not client._msgpack_requests
+        client.reset(episode_id=episode_id, task_type='greeting_response')
+        result = client.step(GREETING, episode_id)
+        assert result['state']['recentMessages'][-1]['content'] == GREETING['payload']['content']
+
+    content_types = [content_type for method, _, content_type, _, _ in seen if method == 'POST']
+    assert content_types == [MSGPACK_CONTENT_TYPE, 'application/json', 'application/json']
+    assert json.loads(seen[-1][4])['action'] == GREETING
+
+
+@pytest.mark.skipif(shutil.which('node') is None
+                    or not (BACKEND / 'node_modules' / 'express').is_dir()
+                    or not (BACKEND / 'node_modules' / '@msgpack' / 'msgpack').is_dir(),
+                    reason='node or the backend dependencies (npm install) are missing')
+def test_backend_middleware():
+    """msgpackMiddleware.js decodes MessagePack bodies and negotiates responses"""
+    proc = subprocess.Popen(
+        ['node', '--input-type=module', '-e', NODE_APP,
+         (BACKEND / 'src' / 'middleware' / 'msgpackMiddleware.js').as_uri()],
+        cwd=BACKEND, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+    try:
+        base_url = f'http://127.0.0.1:{int(proc.stdout.readline())}/env'
+        body = {'action': GREETING, 'episodeId': 'ep-1'}
+
+        response = requests.post(f'{base_url}/echo', data=msgpack.packb(body),
+                                 headers={'Content-Type': MSGPACK_CONTENT_TYPE,
+                                          'Accept': MSGPACK_CONTENT_TYPE})
+        assert response.headers['Content-Type'].startswith(MSGPACK_CONTENT_TYPE)
+        assert 'Accept' in response.headers['Vary']
+        echoed = msgpack.unpackb(response.content, raw=False)
+        assert echoed['received'] == body and echoed['contentType'] == MSGPACK_CONTENT_TYPE
+
+        response = requests.post(f'{base_url}/echo', json=body)
+        assert response.headers['Content-Type'].startswith('application/json')
+        assert response.json()['received'] == body
+
+        response = requests.post(f'{base_url}/echo', data=b'\xc1',
+                                 headers={'Content-Type': MSGPACK_CONTENT_TYPE})
+        assert response.status_code == 400
+
+        with TeamsEnvClient(base_url[:-len('/env')], wire_format='msgpack') as client:
+            assert client.get_state(episode_id='ep-1')['note'] == 'Héllo 👋'
+            assert client._msgpack_requests
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == '__main__':
+    print("✅ Run with pytest: python -m pytest tests/test_wire_format.py")